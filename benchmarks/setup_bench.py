@@ -0,0 +1,141 @@
+"""Compare setup.sh against the in-process gitfs writer for every exercise.
+
+For each shipped exercise this runs setup.sh (the way ``gitgym start`` does),
+records the objects and refs it produced, and then times writing that same
+repository with :class:`gitgym.gitfs.repo.RepoWriter` -- objects, one pack,
+refs, a checkout of HEAD and the index -- without starting any process.
+
+Only committed state is replayed: uncommitted files, stashes' working tree and
+in-progress operations that some setup scripts create are not, so the gitfs
+column is a lower bound on what a [setup] spec for that exercise would cost.
+
+Usage::
+
+    python benchmarks/setup_bench.py [--repeat N] [FILTER]
+"""
+
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from gitgym.exercise import load_all_exercises
+from gitgym.gitfs.repo import RepoWriter
+from gitgym.runner import _setup_env
+
+
+def _run_setup_sh(exercise, directory: Path) -> None:
+    subprocess.run(
+        [str(exercise.path / "setup.sh"), str(directory)],
+        capture_output=True,
+        env=_setup_env(exercise),
+        check=True,
+    )
+
+
+def _snapshot(directory: Path) -> dict:
+    """Read every object, ref and HEAD from the repository setup.sh built."""
+    if not (directory / ".git").is_dir():
+        return {"objects": [], "refs": [], "head": "main", "head_commit": None}
+    batch = subprocess.run(
+        ["git", "cat-file", "--batch-all-objects", "--batch"],
+        cwd=directory,
+        capture_output=True,
+        check=True,
+    ).stdout
+    objects = []
+    pos = 0
+    while pos < len(batch):
+        eol = batch.index(b"\n", pos)
+        _sha, kind, size = batch[pos:eol].decode().split()
+        start = eol + 1
+        objects.append((kind, batch[start : start + int(size)]))
+        pos = start + int(size) + 1
+    refs = subprocess.run(
+        ["git", "for-each-ref", "--format=%(objectname) %(refname)"],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split("\n")
+    head = subprocess.run(
+        ["git", "symbolic-ref", "--short", "HEAD"],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    head_commit = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", "HEAD"],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    return {
+        "objects": objects,
+        "refs": [line.split(" ", 1) for line in refs if line],
+        "head": head or "main",
+        "head_commit": head_commit or None,
+    }
+
+
+def _replay(snapshot: dict, directory: Path) -> None:
+    repo = RepoWriter(directory, head=snapshot["head"])
+    for kind, data in snapshot["objects"]:
+        repo.add_object(kind, data)
+    for sha, ref in snapshot["refs"]:
+        repo.set_ref(ref, sha)
+    if snapshot["head_commit"]:
+        repo.checkout(snapshot["head_commit"])
+    repo.finish()
+
+
+def _time(fn, repeat: int) -> float:
+    """Return the median wall time of fn(fresh_tmpdir) in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            fn(Path(tmp))
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("filter", nargs="?", default="", help="substring of topic/name")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for exercise in load_all_exercises():
+        key = f"{exercise.path.parent.name}/{exercise.path.name}"
+        if args.filter not in key:
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            _run_setup_sh(exercise, Path(tmp))
+            snapshot = _snapshot(Path(tmp))
+        script_ms = _time(lambda d: _run_setup_sh(exercise, d), args.repeat)
+        gitfs_ms = _time(lambda d: _replay(snapshot, d), args.repeat)
+        rows.append((key, len(snapshot["objects"]), script_ms, gitfs_ms))
+
+    print(
+        f"{'exercise':<40} {'objects':>7} {'setup.sh':>10} {'gitfs':>9} {'speedup':>8}"
+    )
+    for key, count, script_ms, gitfs_ms in rows:
+        print(
+            f"{key:<40} {count:>7} {script_ms:>8.1f}ms {gitfs_ms:>7.2f}ms "
+            f"{script_ms / gitfs_ms:>7.0f}x"
+        )
+    if rows:
+        script_total = sum(r[2] for r in rows)
+        gitfs_total = sum(r[3] for r in rows)
+        print(
+            f"{'total':<40} {'':>7} {script_total:>8.1f}ms {gitfs_total:>7.2f}ms "
+            f"{script_total / gitfs_total:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
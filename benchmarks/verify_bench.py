@@ -0,0 +1,135 @@
+"""Compare each exercise's verify.sh with taking one repository snapshot.
+
+For each shipped exercise with a verify.sh this sets up the starting
+repository with setup.sh (the way ``gitgym start`` does) and reports:
+
+- how many git processes verify.sh starts (counted through a ``git`` shim
+  on PATH, in a separate run)
+- verify.sh's median wall time, in the hermetic environment ``verify`` uses
+- what those git processes cost in startup alone: the count times the median
+  time of ``git --version``
+- the median time of :func:`gitgym.snapshot.take`, which answers the usual
+  questions (refs, branch, status, history) with three git processes run
+  side by side
+
+The starting state usually fails verification early, so the counts are a
+lower bound on what a learner's finished workspace costs.
+
+Usage::
+
+    python benchmarks/verify_bench.py [--repeat N] [FILTER]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from gitgym.exercise import load_all_exercises
+from gitgym.runner import _VERIFY_ENV_SCRIPT, _git_env, _setup_env
+from gitgym.snapshot import SnapshotError, take
+
+_SHIM = """#!/bin/sh
+echo >> "$GITGYM_BENCH_COUNT"
+exec {git} "$@"
+"""
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _verify_sh(exercise, workspace: Path, env: dict[str, str]) -> None:
+    subprocess.run(
+        [str(exercise.path / "verify.sh"), str(workspace)],
+        capture_output=True,
+        stdin=subprocess.DEVNULL,
+        env={**env, "BASH_ENV": str(_VERIFY_ENV_SCRIPT)},
+    )
+
+
+def _count_git_calls(exercise, workspace: Path, env: dict[str, str]) -> int:
+    real_git = subprocess.run(
+        ["sh", "-c", "command -v git"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    with tempfile.TemporaryDirectory() as tmp:
+        shim = Path(tmp) / "git"
+        shim.write_text(_SHIM.format(git=real_git))
+        shim.chmod(0o755)
+        count = Path(tmp) / "count"
+        count.touch()
+        _verify_sh(
+            exercise,
+            workspace,
+            {
+                **env,
+                "PATH": f"{tmp}{os.pathsep}{env.get('PATH', '')}",
+                "GITGYM_BENCH_COUNT": str(count),
+            },
+        )
+        return len(count.read_text().splitlines())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("filter", nargs="?", default="", help="substring of topic/name")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    startup_ms = _median_ms(
+        lambda: subprocess.run(["git", "--version"], capture_output=True), args.repeat
+    )
+    rows = []
+    for exercise in load_all_exercises():
+        key = f"{exercise.path.parent.name}/{exercise.path.name}"
+        if args.filter not in key or not (exercise.path / "verify.sh").exists():
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = Path(tmp)
+            subprocess.run(
+                [str(exercise.path / "setup.sh"), str(workspace)],
+                capture_output=True,
+                env=_setup_env(exercise),
+                check=True,
+            )
+            env = _git_env(exercise)
+            calls = _count_git_calls(exercise, workspace, env)
+            script_ms = _median_ms(
+                lambda: _verify_sh(exercise, workspace, env), args.repeat
+            )
+            try:
+                snapshot_ms = _median_ms(lambda: take(workspace, env), args.repeat)
+            except SnapshotError:
+                # The exercise starts without a repository (e.g. git init).
+                snapshot_ms = None
+        rows.append((key, calls, script_ms, calls * startup_ms, snapshot_ms))
+
+    print(f"git startup (git --version): {startup_ms:.2f}ms\n")
+    print(
+        f"{'exercise':<40} {'git calls':>9} {'verify.sh':>11} "
+        f"{'startup':>9} {'snapshot':>10}"
+    )
+    for key, calls, script_ms, spawn_ms, snapshot_ms in rows:
+        snapshot = "-" if snapshot_ms is None else f"{snapshot_ms:.1f}ms"
+        print(
+            f"{key:<40} {calls:>9} {script_ms:>9.1f}ms "
+            f"{spawn_ms:>7.1f}ms {snapshot:>10}"
+        )
+    if rows:
+        print(
+            f"{'total':<40} {sum(r[1] for r in rows):>9} "
+            f"{sum(r[2] for r in rows):>9.1f}ms {sum(r[3] for r in rows):>7.1f}ms "
+            f"{sum(r[4] or 0 for r in rows):>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
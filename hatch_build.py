@@ -0,0 +1,46 @@
+"""Hatch build hook that prebuilds every exercise's repository into the wheel.
+
+Each exercise is set up once with gitgym.runner.prebuild and shipped as
+``gitgym/prebuilt/<topic>/<exercise>/`` (see gitgym.prebuilt), so a fresh
+install restores workspaces with one ``git bundle unbundle`` instead of
+running setup.sh. Exercises that fail to prebuild are skipped with a
+warning; gitgym falls back to running their setup. Setups run against a
+temporary managed git config, so the build leaves ~/.gitgym untouched.
+
+Set GITGYM_SKIP_PREBUILD=1 to build a wheel without prebuilt repositories.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class PrebuildHook(BuildHookInterface):
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict) -> None:
+        if self.target_name != "wheel" or os.environ.get("GITGYM_SKIP_PREBUILD"):
+            return
+        sys.path.insert(0, str(Path(self.root) / "src"))
+        from gitgym.exercise import load_all_exercises
+        from gitgym.runner import prebuild
+
+        self._out = Path(tempfile.mkdtemp(prefix="gitgym-prebuilt-"))
+        built = 0
+        for exercise in load_all_exercises():
+            key = f"{exercise.path.parent.name}/{exercise.path.name}"
+            if prebuild(exercise, self._out / key):
+                built += 1
+            else:
+                self.app.display_warning(f"Skipping prebuilt repository for {key}")
+        self.app.display_info(f"Prebuilt {built} exercise repositories")
+        build_data["force_include"][str(self._out)] = "gitgym/prebuilt"
+
+    def finalize(self, version: str, build_data: dict, artifact_path: str) -> None:
+        out = getattr(self, "_out", None)
+        if out is not None:
+            shutil.rmtree(out, ignore_errors=True)
@@ -0,0 +1,236 @@
+"""Long-lived bash processes that run verify.sh without starting bash each time.
+
+``gitgym watch`` verifies after every change in the workspace. Forking
+verify.sh each time starts a new bash, which sources verify_env.sh (through
+BASH_ENV) and parses the script before doing any work. A :class:`BashWorker`
+keeps one bash per workspace running shell/verify_worker.sh instead: it
+loads the script once as a function (again only when the file changes) and
+calls it in a subshell for every verification, so a run costs a fork rather
+than an interpreter startup. The subshell keeps ``cd``, ``set -e``,
+``exit``, variables and traps from reaching the next run.
+
+Only scripts whose ``#!`` line names bash can run this way; others, and
+scripts with a syntax error, are run as before by the caller. A worker that
+dies is restarted on the next request, and a request interrupted by its
+death is retried once with a fresh worker. Workers exit when gitgym closes
+their stdin, at the latest when the process exits.
+"""
+
+import os
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).parent / "shell" / "verify_worker.sh"
+
+# '#!' lines of scripts the worker can run.
+_BASH_SHEBANGS = ("#!/usr/bin/env bash", "#!/bin/bash", "#!/usr/bin/bash")
+
+
+class BashWorkerError(Exception):
+    """Raised when a worker keeps dying or can't be started."""
+
+
+def runs_in_worker(script: Path) -> bool:
+    """Whether script is a bash script a worker can run."""
+    try:
+        with open(script, "rb") as f:
+            first = f.readline(128).decode(errors="replace").strip()
+    except OSError:
+        return False
+    return first in _BASH_SHEBANGS
+
+
+class BashWorker:
+    """A bash process running verify scripts for one workspace, started on first use.
+
+    Safe to share between threads; requests are serialised.
+    """
+
+    def __init__(self, env: dict[str, str]) -> None:
+        self.env = env
+        self._proc: subprocess.Popen | None = None
+        self._tmp: Path | None = None
+        # (path, mtime_ns, size) of the script defined in the worker.
+        self._loaded: tuple[str, int, int] | None = None
+        # Set by kill(): the request in progress fails instead of retrying.
+        self._killed = False
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> int | None:
+        """The worker's pid (and process group), or None when it isn't running."""
+        proc = self._proc
+        return None if proc is None or proc.poll() is not None else proc.pid
+
+    def _start(self) -> subprocess.Popen:
+        try:
+            proc = subprocess.Popen(
+                ["bash", str(WORKER_SCRIPT)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=self.env,
+                bufsize=0,
+                start_new_session=True,
+            )
+        except OSError as e:
+            raise BashWorkerError(f"could not start bash: {e}") from e
+        self._loaded = None
+        if self._tmp is None:
+            self._tmp = Path(tempfile.mkdtemp(prefix="gitgym-worker-"))
+        return proc
+
+    def _request(self, fields: list[str]) -> str | None:
+        """Send one request and return the reply line, or None if the worker died."""
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = self._start()
+        proc = self._proc
+        try:
+            proc.stdin.write(b"".join(f.encode() + b"\0" for f in fields))
+            reply = b""
+            while not reply.endswith(b"\n"):
+                select.select([proc.stdout], [], [])
+                chunk = os.read(proc.stdout.fileno(), 64)
+                if not chunk:
+                    break
+                reply += chunk
+        except OSError:
+            reply = b""
+        if not reply.endswith(b"\n"):
+            self._stop()
+            return None
+        return reply.decode().strip()
+
+    def run(self, script: Path, args: list[str]) -> tuple[int, str, bytes] | None:
+        """Run script with args; return (exit code, output, reports).
+
+        output is stdout and stderr combined, reports what the script wrote
+        to GITGYM_RESULTS_FD. Returns None when the worker can't load the
+        script (e.g. a syntax error), so the caller can run it directly and
+        show bash's own error. Raises BashWorkerError if the worker dies
+        twice in a row or is killed.
+        """
+        st = script.stat()
+        identity = (str(script), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            self._killed = False
+            for _ in range(2):
+                if self._loaded != identity:
+                    reply = self._request(["load", str(script)])
+                    if reply is None:
+                        if self._killed:
+                            break
+                        continue
+                    if reply != "ok":
+                        return None
+                    self._loaded = identity
+                out = self._tmp / "output"
+                reports = self._tmp / "reports"
+                reply = self._request(
+                    ["run", str(out), str(reports), str(len(args)), *args]
+                )
+                if reply is not None:
+                    result = (
+                        int(reply),
+                        out.read_text(errors="replace"),
+                        reports.read_bytes(),
+                    )
+                    # Removed rather than truncated by the next run: ext4
+                    # flushes a file to disk when it is truncated to zero.
+                    out.unlink()
+                    reports.unlink()
+                    return result
+                if self._killed:
+                    break
+            if self._killed:
+                raise BashWorkerError(f"the bash worker running {script} was killed")
+            raise BashWorkerError(f"the bash worker for {script} keeps exiting")
+
+    def kill(self) -> None:
+        """Kill the worker and anything a script started, even mid-run.
+
+        Doesn't wait for a request in progress; it fails with
+        BashWorkerError. The next request starts a fresh worker.
+        """
+        self._killed = True
+        proc = self._proc
+        if proc is not None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        self._loaded = None
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        try:
+            # Also reaps anything a script left running in the background.
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        proc.wait()
+
+    def close(self) -> None:
+        """Stop the worker; it restarts if used again."""
+        with self._lock:
+            self._stop()
+            if self._tmp is not None:
+                shutil.rmtree(self._tmp, ignore_errors=True)
+                self._tmp = None
+
+
+class WorkerPool:
+    """A BashWorker per workspace, keeping at most max_workers alive at once.
+
+    The least recently used workspace's worker is stopped when a new one is
+    needed.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        self.max_workers = max_workers
+        self._workers: OrderedDict[Path, tuple[tuple, BashWorker]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, workspace: Path, env: dict[str, str]) -> BashWorker:
+        """Return the worker for workspace, with a fresh one if env changed.
+
+        A workspace that was re-created also gets a fresh worker.
+        """
+        st = workspace.stat()
+        identity = (st.st_dev, st.st_ino, tuple(sorted(env.items())))
+        stale = []
+        with self._lock:
+            entry = self._workers.get(workspace)
+            if entry is not None and entry[0] == identity:
+                self._workers.move_to_end(workspace)
+                return entry[1]
+            if entry is not None:
+                stale.append(entry[1])
+            worker = BashWorker(env)
+            self._workers[workspace] = (identity, worker)
+            while len(self._workers) > self.max_workers:
+                stale.append(self._workers.popitem(last=False)[1][1])
+        for old in stale:
+            old.close()
+        return worker
+
+    def close(self) -> None:
+        """Stop every worker in the pool."""
+        with self._lock:
+            workers = [worker for _, worker in self._workers.values()]
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,263 @@
+"""Content-addressed cache of pristine exercise workspaces.
+
+setup.sh runs once per version of an exercise and the resulting directory is
+stored under CACHE_DIR as a template. Later setups restore the workspace from
+the template instead of re-running the script. Entries are keyed by a hash of
+every file in the exercise directory, so editing setup.sh (or anything next to
+it) invalidates the template automatically.
+
+Layout::
+
+    CACHE_DIR/<digest>/meta.json       # exercise key, size, created_at
+    CACHE_DIR/<digest>/manifest.json   # recorded state of template/
+    CACHE_DIR/<digest>/template/       # the post-setup workspace
+
+The mtime of ``meta.json`` records when the entry was last used and drives
+least-recently-used eviction once the cache grows past CACHE_MAX_BYTES.
+
+``manifest.json`` records every file in the template (refs, HEAD, index,
+config, objects and the working tree) so that :func:`refresh` can reset a
+used workspace by repairing only what the learner changed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from gitgym import objectstore
+from gitgym.config import CACHE_DIR, CACHE_MAX_BYTES
+from gitgym.exercise import Exercise
+from gitgym.materialize import manifest, materialize, sync
+
+# Bump when the template layout or the way templates are produced changes.
+CACHE_FORMAT = 3
+
+_META_FILE = "meta.json"
+_MANIFEST_FILE = "manifest.json"
+_TEMPLATE_DIR = "template"
+
+
+def _exercise_key(exercise: Exercise) -> str:
+    """Derive the progress key (topic_dir/exercise_dir) from the exercise path."""
+    return f"{exercise.path.parent.name}/{exercise.path.name}"
+
+
+def definition_digest(exercise: Exercise) -> str:
+    """Return a hex digest of every file in the exercise directory.
+
+    File names, contents and the executable bit all contribute, so any edit
+    to setup.sh or its neighbours yields a new digest.
+    """
+    h = hashlib.sha256(f"gitgym-cache-v{CACHE_FORMAT}\0".encode())
+    for path in sorted(p for p in exercise.path.rglob("*") if p.is_file()):
+        data = path.read_bytes()
+        rel = path.relative_to(exercise.path).as_posix()
+        mode = "x" if os.access(path, os.X_OK) else "-"
+        h.update(f"{rel}\0{mode}\0{len(data)}\0".encode())
+        h.update(data)
+    return h.hexdigest()
+
+
+def exercise_digest(exercise: Exercise) -> str:
+    """Return the cache key for the exercise's template.
+
+    This is the definition digest, plus the shared object store's location
+    when one is in use, since templates built with a store borrow its objects.
+    """
+    digest = definition_digest(exercise)
+    if not objectstore.enabled():
+        return digest
+    h = hashlib.sha256(f"{digest}\0store={objectstore.OBJECT_STORE}\0".encode())
+    return h.hexdigest()
+
+
+def _dir_size(directory: Path) -> int:
+    """Return the total size in bytes of all files under directory."""
+    total = 0
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def clear_directory(directory: Path) -> None:
+    """Remove everything inside directory but keep the directory itself.
+
+    The learner's shell is often sitting inside the workspace, so deleting and
+    re-creating the directory would leave them in a stale cwd.
+    """
+    for child in directory.iterdir():
+        if child.is_dir() and not child.is_symlink():
+            shutil.rmtree(child)
+        else:
+            child.unlink()
+
+
+def lookup(exercise: Exercise) -> Path | None:
+    """Return the cached template for the exercise, or None on a cache miss.
+
+    A hit refreshes the entry's last-used time.
+    """
+    entry = CACHE_DIR / exercise_digest(exercise)
+    template = entry / _TEMPLATE_DIR
+    if not template.is_dir():
+        return None
+    try:
+        os.utime(entry / _META_FILE)
+    except OSError:
+        return None
+    return template
+
+
+def store(exercise: Exercise, source: Path) -> Path | None:
+    """Copy a freshly set-up workspace into the cache and return the template path.
+
+    Returns None if the template could not be written (e.g. disk full); callers
+    should treat that as a cache miss rather than an error.
+    """
+    digest = exercise_digest(exercise)
+    entry = CACHE_DIR / digest
+    staging = CACHE_DIR / f".{digest}.{os.getpid()}.tmp"
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if staging.exists():
+            shutil.rmtree(staging)
+        materialize(source, staging / _TEMPLATE_DIR)
+        meta = {
+            "version": CACHE_FORMAT,
+            "exercise": _exercise_key(exercise),
+            "size": _dir_size(staging / _TEMPLATE_DIR),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        (staging / _MANIFEST_FILE).write_text(
+            json.dumps(manifest(staging / _TEMPLATE_DIR))
+        )
+        (staging / _META_FILE).write_text(json.dumps(meta, indent=2))
+        try:
+            staging.rename(entry)
+        except OSError:
+            # Another gitgym process stored the same template first.
+            shutil.rmtree(staging, ignore_errors=True)
+            if not (entry / _TEMPLATE_DIR).is_dir():
+                return None
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+    evict(keep=digest)
+    return entry / _TEMPLATE_DIR
+
+
+def restore(template: Path, destination: Path) -> str:
+    """Replace the contents of destination with a copy of template.
+
+    Returns the materialization strategy that was used (e.g. 'hardlink+copy').
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    clear_directory(destination)
+    return materialize(template, destination)
+
+
+def refresh(template: Path, destination: Path) -> str:
+    """Bring destination back to the state of template, changing only what differs.
+
+    Uses the manifest recorded when the template was stored; without one, or
+    if destination doesn't exist yet, falls back to a full :func:`restore`.
+    Returns the strategy label, e.g. 'incremental: 3 changed (copy)'.
+    """
+    try:
+        entries = json.loads((template.parent / _MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        entries = None
+    if entries is None or not destination.is_dir() or not any(destination.iterdir()):
+        return restore(template, destination)
+    strategy, changed = sync(template, destination, entries)
+    if not changed:
+        return "incremental: unchanged"
+    return f"incremental: {changed} changed ({strategy})"
+
+
+def _entries() -> list[dict]:
+    """Return metadata for every complete cache entry, least recently used first."""
+    if not CACHE_DIR.exists():
+        return []
+    entries = []
+    for entry in CACHE_DIR.iterdir():
+        meta_path = entry / _META_FILE
+        if entry.name.startswith(".") or not meta_path.is_file():
+            continue
+        try:
+            meta = json.loads(meta_path.read_text())
+            last_used = meta_path.stat().st_mtime
+        except (OSError, ValueError):
+            continue
+        entries.append(
+            {
+                "digest": entry.name,
+                "exercise": meta.get("exercise", "?"),
+                "size": meta.get("size", 0),
+                "created_at": meta.get("created_at"),
+                "last_used": last_used,
+                "path": entry,
+            }
+        )
+    entries.sort(key=lambda e: (e["last_used"], e["digest"]))
+    return entries
+
+
+def evict(max_bytes: int | None = None, keep: str | None = None) -> list[str]:
+    """Delete least-recently-used entries until the cache fits in max_bytes.
+
+    The entry whose digest equals *keep* is never evicted. Returns the digests
+    that were removed.
+    """
+    if max_bytes is None:
+        max_bytes = CACHE_MAX_BYTES
+    entries = _entries()
+    total = sum(e["size"] for e in entries)
+    removed = []
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry["digest"] == keep:
+            continue
+        shutil.rmtree(entry["path"], ignore_errors=True)
+        total -= entry["size"]
+        removed.append(entry["digest"])
+    return removed
+
+
+def cache_stats() -> dict:
+    """Return a summary of the cache: location, size cap, and per-entry details."""
+    entries = _entries()
+    return {
+        "path": CACHE_DIR,
+        "max_bytes": CACHE_MAX_BYTES,
+        "total_bytes": sum(e["size"] for e in entries),
+        "entries": [
+            {
+                "exercise": e["exercise"],
+                "digest": e["digest"],
+                "size": e["size"],
+                "last_used": datetime.fromtimestamp(
+                    e["last_used"], timezone.utc
+                ).isoformat(),
+            }
+            for e in reversed(entries)
+        ],
+    }
+
+
+def clear_cache() -> int:
+    """Delete every cached template. Returns the number of entries removed."""
+    if not CACHE_DIR.exists():
+        return 0
+    count = len(_entries())
+    shutil.rmtree(CACHE_DIR)
+    return count
@@ -0,0 +1,328 @@
+"""Evaluate an exercise's declarative [[checks]] in-process.
+
+Most verify scripts test the same handful of things. An exercise can list
+them in exercise.toml instead, and gitgym evaluates them in Python against
+a :class:`gitgym.repo.Repo` (backed by the pooled cat-file processes)
+without starting bash::
+
+    [[checks]]
+    type = "branch"                   # the checked-out branch
+    name = "main"
+
+    [[checks]]
+    type = "ref"                      # a branch (or tag = "v1", or a full
+    branch = "feature"                # name = "refs/...") exists; target:
+    target = "main"                   # it points at rev's commit; exists =
+                                      # false: it must be gone; annotated:
+                                      # an annotated or a lightweight tag
+
+    [[checks]]
+    type = "no_operation"             # no merge, rebase, cherry-pick,
+                                      # revert or bisect in progress
+
+    [[checks]]
+    type = "file_committed"           # working tree file equals the version
+    path = "hello.txt"                # committed at rev (default HEAD)
+
+    [[checks]]
+    type = "commit_count"             # commits reachable from rev but not
+    rev = "feature"                   # from since (``git rev-list
+    since = "main"                    # since..rev``); count, or min/max
+    count = 2
+
+    [[checks]]
+    type = "config"                   # git config --get key == value
+    key = "alias.st"
+    value = "status"
+
+    [[checks]]
+    type = "message"                  # commit message of rev (default HEAD)
+    matches = "^Fix"                  # re.search, multi-line
+    not_matches = "WIP"
+
+Every check accepts ``message``, the text shown to the learner when it
+fails, in place of the generated one. Checks stop at the first failure;
+gitgym.checkstats decides which runs first, from how often and how cheaply
+each one has failed before, so a failing learner sees the failure that was
+quickest to find rather than the first declared. When an exercise also has
+a verify.py or verify.sh, it runs after the checks pass, for anything they
+can't express.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+
+from gitgym.gitfs.refs import valid_name
+from gitgym.repo import Repo
+
+
+class CheckError(Exception):
+    """Raised when a [[checks]] entry is invalid."""
+
+
+# Required and optional parameters of each check type, besides 'type' and
+# 'message'.
+_PARAMS: dict[str, tuple[set[str], set[str]]] = {
+    "branch": ({"name"}, set()),
+    "ref": (set(), {"branch", "tag", "name", "exists", "target", "annotated"}),
+    "no_operation": (set(), set()),
+    "file_committed": ({"path"}, {"rev"}),
+    "commit_count": ({"rev"}, {"since", "count", "min", "max"}),
+    "config": ({"key", "value"}, set()),
+    "message": (set(), {"rev", "matches", "not_matches"}),
+}
+
+# Parameters whose value is a string (a name, path, revision or pattern).
+_STRING_PARAMS = {
+    "name",
+    "branch",
+    "tag",
+    "target",
+    "path",
+    "rev",
+    "since",
+    "key",
+    "value",
+    "matches",
+    "not_matches",
+}
+
+
+@dataclass(frozen=True)
+class Check:
+    kind: str
+    params: dict = field(hash=False)
+    # Shown instead of the generated failure message.
+    message: str | None = None
+
+    @property
+    def label(self) -> str:
+        """A short description for reports, e.g. 'branch name=main'."""
+        args = " ".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.kind} {args}".rstrip()
+
+
+@dataclass
+class CheckResult:
+    check: Check
+    passed: bool
+    # Why the check failed (empty when it passed).
+    detail: str
+    seconds: float
+
+
+def parse_checks(entries: list[dict]) -> list[Check]:
+    """Validate the [[checks]] array from exercise.toml.
+
+    Raises CheckError naming the offending entry.
+    """
+    checks = []
+    for i, raw in enumerate(entries):
+        where = f"checks[{i}]"
+        if not isinstance(raw, dict):
+            raise CheckError(f"{where} must be a table")
+        kind = raw.get("type")
+        if kind not in _PARAMS:
+            raise CheckError(
+                f"{where}: unknown type {kind!r} (expected one of "
+                f"{', '.join(sorted(_PARAMS))})"
+            )
+        required, optional = _PARAMS[kind]
+        params = {k: v for k, v in raw.items() if k not in ("type", "message")}
+        missing = required - params.keys()
+        if missing:
+            raise CheckError(
+                f"{where} ({kind}) is missing {', '.join(sorted(missing))}"
+            )
+        unknown = params.keys() - required - optional
+        if unknown:
+            raise CheckError(
+                f"{where} ({kind}): unknown key {', '.join(sorted(unknown))}"
+            )
+        for key in sorted(_STRING_PARAMS & params.keys()):
+            if not isinstance(params[key], str):
+                raise CheckError(f"{where} ({kind}): {key} must be a string")
+        if "message" in raw and not isinstance(raw["message"], str):
+            raise CheckError(f"{where} ({kind}): message must be a string")
+        if kind == "commit_count":
+            for key in ("count", "min", "max"):
+                if key in params and not isinstance(params[key], int):
+                    raise CheckError(f"{where}: {key} must be an integer")
+            if not {"count", "min", "max"} & params.keys():
+                raise CheckError(f"{where} (commit_count) needs count, min or max")
+        if kind == "ref":
+            if len({"branch", "tag", "name"} & params.keys()) != 1:
+                raise CheckError(f"{where} (ref) needs one of branch, tag or name")
+            if "name" in params and not valid_name(params["name"]):
+                raise CheckError(
+                    f"{where}: name must be a full ref name such as refs/heads/main"
+                )
+            for key in ("exists", "annotated"):
+                if key in params and not isinstance(params[key], bool):
+                    raise CheckError(f"{where}: {key} must be true or false")
+        if kind == "message":
+            if not {"matches", "not_matches"} & params.keys():
+                raise CheckError(f"{where} (message) needs matches or not_matches")
+            for key in ("matches", "not_matches"):
+                if key in params:
+                    try:
+                        re.compile(params[key])
+                    except re.error as e:
+                        raise CheckError(f"{where}: invalid {key} pattern: {e}") from e
+        checks.append(Check(kind, params, raw.get("message")))
+    return checks
+
+
+def _check_branch(repo: Repo, name: str) -> str:
+    current = repo.head_branch()
+    if current == name:
+        return ""
+    if current is None:
+        return f"HEAD is detached; switch to '{name}'."
+    return f"You are on branch '{current}', not '{name}'."
+
+
+def _check_ref(
+    repo: Repo,
+    branch: str | None = None,
+    tag: str | None = None,
+    name: str | None = None,
+    exists: bool = True,
+    target: str | None = None,
+    annotated: bool | None = None,
+) -> str:
+    if branch is not None:
+        full, what = f"refs/heads/{branch}", f"Branch '{branch}'"
+    elif tag is not None:
+        full, what = f"refs/tags/{tag}", f"Tag '{tag}'"
+    else:
+        full, what = name, f"'{name}'"
+    oid = repo.ref(full)
+    if not exists:
+        return f"{what} still exists." if oid is not None else ""
+    if oid is None:
+        return f"{what} does not exist."
+    if annotated is not None:
+        info = repo.info(full)
+        is_tag = info is not None and info[1] == "tag"
+        if annotated and not is_tag:
+            return f"{what} is a lightweight tag; it should be annotated."
+        if not annotated and is_tag:
+            return f"{what} is an annotated tag; it should be lightweight."
+    if target is not None:
+        expected = repo.commit(target)
+        if expected is None:
+            return f"'{target}' does not exist."
+        commit = repo.commit(full)
+        if commit is None or commit.oid != expected.oid:
+            return f"{what} does not point to the same commit as {target}."
+    return ""
+
+
+def _check_no_operation(repo: Repo) -> str:
+    operation = repo.operation()
+    if operation is not None:
+        return f"There is a {operation} in progress; finish or abort it first."
+    return ""
+
+
+def _check_file_committed(repo: Repo, path: str, rev: str = "HEAD") -> str:
+    committed = repo.read(f"{rev}:{path}")
+    if committed is None or committed[0] != "blob":
+        return f"'{path}' is not committed in {rev}."
+    try:
+        current = (repo.path / path).read_bytes()
+    except OSError:
+        return f"'{path}' is missing from the working tree."
+    if current != committed[1]:
+        return f"'{path}' differs from the version committed in {rev}."
+    return ""
+
+
+def _check_commit_count(
+    repo: Repo,
+    rev: str,
+    since: str | None = None,
+    count: int | None = None,
+    min: int | None = None,
+    max: int | None = None,
+) -> str:
+    if repo.commit(rev) is None:
+        return f"'{rev}' does not exist."
+    if since is not None and repo.commit(since) is None:
+        return f"'{since}' does not exist."
+    n = len(repo.commits(rev, [since] if since else None))
+    what = f"{since}..{rev}" if since else rev
+    if count is not None and n != count:
+        return f"Expected {count} commit(s) in {what}, found {n}."
+    if min is not None and n < min:
+        return f"Expected at least {min} commit(s) in {what}, found {n}."
+    if max is not None and n > max:
+        return f"Expected at most {max} commit(s) in {what}, found {n}."
+    return ""
+
+
+def _check_config(repo: Repo, key: str, value: str) -> str:
+    actual = repo.config(key)
+    if actual is None:
+        return f"'{key}' is not set."
+    if actual != value:
+        return f"'{key}' is '{actual}', expected '{value}'."
+    return ""
+
+
+def _check_message(
+    repo: Repo,
+    rev: str = "HEAD",
+    matches: str | None = None,
+    not_matches: str | None = None,
+) -> str:
+    commit = repo.commit(rev)
+    if commit is None:
+        return f"'{rev}' does not exist."
+    if matches is not None and not re.search(matches, commit.message, re.MULTILINE):
+        return f"The message of {rev} ('{commit.subject}') should match /{matches}/."
+    if not_matches is not None and re.search(not_matches, commit.message, re.MULTILINE):
+        return (
+            f"The message of {rev} ('{commit.subject}') should not match "
+            f"/{not_matches}/."
+        )
+    return ""
+
+
+_CHECKS = {
+    "branch": _check_branch,
+    "ref": _check_ref,
+    "no_operation": _check_no_operation,
+    "file_committed": _check_file_committed,
+    "commit_count": _check_commit_count,
+    "config": _check_config,
+    "message": _check_message,
+}
+
+
+def run_checks(
+    checks: list[Check],
+    repo: Repo,
+    step: Callable[[str], AbstractContextManager] | None = None,
+) -> list[CheckResult]:
+    """Evaluate checks against repo, stopping at the first that fails.
+
+    Returns one result per check evaluated, with its duration. With step,
+    each check is evaluated inside step(check.label) (see gitgym.explain).
+    """
+    results = []
+    for check in checks:
+        start = time.perf_counter()
+        with step(check.label) if step is not None else nullcontext():
+            detail = _CHECKS[check.kind](repo, **check.params)
+        passed = not detail
+        if not passed and check.message:
+            detail = check.message
+        results.append(CheckResult(check, passed, detail, time.perf_counter() - start))
+        if not passed:
+            break
+    return results
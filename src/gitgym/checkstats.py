@@ -0,0 +1,154 @@
+"""Order an exercise's [[checks]] by how often, and how cheaply, they fail.
+
+Checks stop at the first failure, and the goal is met only if every check
+passes, so their order changes how quickly "not done yet" is known but
+never the verdict. Every evaluated check is counted in CHECK_STATS_FILE::
+
+    {"version": 1, "exercises": {"01_basics/01_init": {
+        "branch name=main": {"runs": 12, "failures": 9, "seconds": 0.0011}}}}
+
+(``seconds`` is the total time spent in the check.) :func:`order` runs
+first the checks with the lowest expected cost per failure found: mean
+duration divided by failure rate. The rate is smoothed, (failures + 1) /
+(runs + 2), and a check without runs is assumed to take COST_PRIORS[kind],
+so before any statistics exist cheap checks (the branch, refs, operation
+state) gate the ones that walk history or read objects. The order depends
+only on the statistics, with the declared order breaking ties.
+
+``gitgym checks stats`` shows the counts and the resulting order. Reading
+the file never raises; a damaged file counts as no statistics, and so does
+a damaged entry for the check it is about.
+"""
+
+import json
+import os
+import threading
+
+from gitgym.checks import Check, CheckError, CheckResult, parse_checks
+from gitgym.config import CHECK_STATS_FILE
+from gitgym.exercise import Exercise
+
+# Assumed duration in seconds of a check that has never run, by type.
+COST_PRIORS = {
+    "branch": 0.0001,
+    "no_operation": 0.0001,
+    "ref": 0.0001,
+    "file_committed": 0.001,
+    "message": 0.001,
+    "commit_count": 0.003,
+    "config": 0.005,
+}
+
+# Serialises the read-modify-write in record().
+_lock = threading.Lock()
+
+
+def load() -> dict:
+    """Return the statistics, or empty ones if the file is missing or damaged."""
+    try:
+        data = json.loads(CHECK_STATS_FILE.read_text())
+    except (OSError, ValueError):
+        return {"version": 1, "exercises": {}}
+    if not isinstance(data, dict) or not isinstance(data.get("exercises"), dict):
+        return {"version": 1, "exercises": {}}
+    return data
+
+
+def _entry(stats: dict, label: str) -> dict:
+    """Return the statistics of one check, or zero counts if missing or damaged."""
+    entry = stats.get(label)
+    if (
+        isinstance(entry, dict)
+        and all(
+            type(entry.get(key)) is int and entry[key] >= 0
+            for key in ("runs", "failures")
+        )
+        and type(entry.get("seconds")) in (int, float)
+        and entry["seconds"] >= 0
+    ):
+        return entry
+    return {"runs": 0, "failures": 0, "seconds": 0.0}
+
+
+def _score(check: Check, stats: dict) -> float:
+    """Expected seconds spent per failure found by running check."""
+    entry = _entry(stats, check.label)
+    runs = entry["runs"]
+    failures = entry["failures"]
+    if runs:
+        cost = entry["seconds"] / runs
+    else:
+        cost = COST_PRIORS.get(check.kind, 0.001)
+    return cost * (runs + 2) / (failures + 1)
+
+
+def order(checks: list[Check], stats: dict) -> list[Check]:
+    """Return checks in the order to run them, given one exercise's statistics."""
+    ranked = sorted(
+        enumerate(checks), key=lambda item: (_score(item[1], stats), item[0])
+    )
+    return [check for _, check in ranked]
+
+
+def exercise_stats(exercise_key: str, data: dict | None = None) -> dict:
+    """Return the per-check statistics of one exercise (from data, or the file)."""
+    data = load() if data is None else data
+    stats = data["exercises"].get(exercise_key, {})
+    return stats if isinstance(stats, dict) else {}
+
+
+def record(exercise_key: str, results: list[CheckResult]) -> None:
+    """Count the outcome and duration of each evaluated check."""
+    if not results:
+        return
+    with _lock:
+        data = load()
+        stats = data["exercises"].get(exercise_key)
+        if not isinstance(stats, dict):
+            stats = data["exercises"][exercise_key] = {}
+        for result in results:
+            entry = stats[result.check.label] = dict(_entry(stats, result.check.label))
+            entry["runs"] += 1
+            entry["failures"] += not result.passed
+            entry["seconds"] = round(entry["seconds"] + result.seconds, 6)
+        tmp = CHECK_STATS_FILE.with_name(f".{CHECK_STATS_FILE.name}.{os.getpid()}.tmp")
+        try:
+            CHECK_STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, CHECK_STATS_FILE)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+def summary(exercises: list[Exercise]) -> dict:
+    """Return the statistics of every exercise with [[checks]], in run order."""
+    data = load()
+    entries = []
+    for exercise in exercises:
+        try:
+            checks = parse_checks(exercise.checks)
+        except CheckError:
+            continue
+        if not checks:
+            continue
+        key = f"{exercise.path.parent.name}/{exercise.path.name}"
+        stats = exercise_stats(key, data)
+        rows = []
+        for check in order(checks, stats):
+            entry = _entry(stats, check.label)
+            runs = entry["runs"]
+            rows.append(
+                {
+                    "check": check.label,
+                    "runs": runs,
+                    "failures": entry["failures"],
+                    "mean_seconds": entry["seconds"] / runs if runs else None,
+                }
+            )
+        entries.append({"exercise": key, "checks": rows})
+    return {"path": CHECK_STATS_FILE, "exercises": entries}
+
+
+def clear() -> None:
+    """Forget all statistics; checks go back to the cost-based order."""
+    CHECK_STATS_FILE.unlink(missing_ok=True)
@@ -1,26 +1,49 @@
+import json
 import shutil
 import subprocess
+import time
 
 import click
 
-from gitgym import __version__
-from gitgym.config import GITGYM_HOME, WORKSPACE_DIR
+from gitgym import __version__, checkstats
+from gitgym.cache import cache_stats, clear_cache
+from gitgym.config import GITGYM_HOME, OBJECT_STORE, WORKSPACE_DIR
 from gitgym.display import (
+    print_cache_stats,
+    print_check_stats,
     print_exercise_header,
     print_exercise_list,
+    print_prepare_report,
     print_progress_summary,
+    print_store_stats,
+    print_verify_explanation,
+    print_verify_report,
 )
 from gitgym.exercise import Exercise, load_all_exercises
+from gitgym.gitpool import GitPoolError
+from gitgym.golden import COMPONENTS, DEFAULT_COVERS
+from gitgym.objectstore import dissociate_all, store_stats
+from gitgym.prepare import default_jobs, prepare
+from gitgym.prewarm import claim, spawn_worker, upcoming
 from gitgym.progress import (
     get_current_exercise,
     increment_hints_used,
     load_progress,
     mark_completed,
+    mark_completed_many,
     mark_in_progress,
     reset_all_progress,
     reset_exercise_progress,
 )
-from gitgym.runner import run_setup, run_verify
+from gitgym.runner import (
+    goal_digest,
+    hermetic_env,
+    run_setup,
+    run_verification,
+    run_verify,
+    verify_timeout,
+)
+from gitgym.verifyall import provisioned, verify_all
 from gitgym.watcher import watch_and_verify
 
 
@@ -117,9 +140,19 @@ def _find_by_name(exercises: list[Exercise], name: str) -> Exercise | None:
     return None
 
 
+_verbose_option = click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    default=False,
+    help="Show how the exercise workspace was provisioned.",
+)
+
+
 @main.command("start")
 @click.argument("exercise", required=False)
-def start_exercise(exercise: str | None):
+@_verbose_option
+def start_exercise(exercise: str | None, verbose: bool):
     """Set up an exercise repo. If no name given, starts the next incomplete exercise."""
     exercises = load_all_exercises()
     progress = load_progress()
@@ -144,24 +177,31 @@ def start_exercise(exercise: str | None):
             )
             return
 
-    success = run_setup(target)
-    if not success:
-        raise SystemExit(1)
+    workspace_path = WORKSPACE_DIR / target.path.parent.name / target.path.name
+    if claim(target, workspace_path):
+        if verbose:
+            click.echo("Workspace taken from the pre-warmed staging area.")
+    else:
+        success = run_setup(target, verbose=verbose)
+        if not success:
+            raise SystemExit(1)
 
     key = _exercise_key(target)
     mark_in_progress(key)
+    # Provision the next exercises in the background while the learner works.
+    spawn_worker(upcoming(exercises, progress, target))
 
-    workspace_path = WORKSPACE_DIR / target.path.parent.name / target.path.name
     click.echo(click.style(f"Exercise directory: {workspace_path}", fg="cyan"))
     click.echo(f"  cd {workspace_path}\n")
     print_exercise_header(target)
 
 
 @main.command("next")
+@_verbose_option
 @click.pass_context
-def next_exercise(ctx: click.Context):
+def next_exercise(ctx: click.Context, verbose: bool):
     """Alias for 'gitgym start' with no argument (starts the next incomplete exercise)."""
-    ctx.invoke(start_exercise)
+    ctx.invoke(start_exercise, verbose=verbose)
 
 
 @main.command("describe")
@@ -199,8 +239,50 @@ def describe_exercise():
 
 
 @main.command("verify")
-def verify_exercise():
-    """Check if the current exercise's goal state is met."""
+@click.option(
+    "--all",
+    "all_workspaces",
+    is_flag=True,
+    default=False,
+    help="Verify every exercise workspace, in parallel, and update progress.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of workspaces to verify in parallel with --all [default: CPU count].",
+)
+@click.option(
+    "--explain",
+    is_flag=True,
+    default=False,
+    help="Show how long each check and script step took and the processes it started.",
+)
+def verify_exercise(all_workspaces: bool, jobs: int | None, explain: bool):
+    """Check if the current exercise's goal state is met.
+
+    With --all, every exercise that has a workspace is verified and the
+    ones whose goal is met are marked completed. With --explain, the
+    verification runs afresh (no cached result) and each step is listed
+    with its duration and process count before the verdict.
+    """
+    if all_workspaces and explain:
+        click.echo(
+            click.style("Error: --explain can't be used with --all.", fg="red"),
+            err=True,
+        )
+        raise SystemExit(1)
+    if all_workspaces:
+        _verify_all_workspaces(jobs)
+        return
+    if jobs is not None:
+        click.echo(
+            click.style("Error: --jobs can only be used with --all.", fg="red"),
+            err=True,
+        )
+        raise SystemExit(1)
+
     current_key = get_current_exercise()
     if current_key is None:
         click.echo(
@@ -229,7 +311,19 @@ def verify_exercise():
         )
         raise SystemExit(1)
 
-    success, output, is_script_error = run_verify(target)
+    if explain:
+        result = run_verification(target, explain=True)
+        print_verify_explanation(result.steps, verify_timeout(target))
+        click.echo()
+        success, output, is_script_error = (
+            result.success,
+            result.output,
+            result.is_script_error,
+        )
+        if not success and not is_script_error and result.progress:
+            output = f"{output}\n{result.progress}".strip()
+    else:
+        success, output, is_script_error = run_verify(target)
 
     if output:
         click.echo(output)
@@ -255,6 +349,87 @@ def verify_exercise():
         raise SystemExit(1)
 
 
+def _verify_all_workspaces(jobs: int | None) -> None:
+    """Verify every provisioned workspace for 'gitgym verify --all'."""
+    exercises = provisioned(load_all_exercises())
+    jobs = jobs or default_jobs()
+    total = len(exercises)
+    live = click.get_text_stream("stdout").isatty()
+    done = 0
+
+    def _show_progress(result) -> None:
+        nonlocal done
+        done += 1
+        if live:
+            click.echo(f"\r\033[K[{done}/{total}] {result.key}", nl=False)
+
+    start = time.perf_counter()
+    results = verify_all(exercises, jobs=jobs, on_result=_show_progress)
+    if live:
+        click.echo("\r\033[K", nl=False)
+    print_verify_report(results, time.perf_counter() - start)
+
+    mark_completed_many([r.key for r in results if r.ok])
+    if any(r.ok for r in results):
+        _check_all_completed()
+    if not results or any(not r.ok for r in results):
+        raise SystemExit(1)
+
+
+@main.command("goal-digest")
+@click.option(
+    "--covers",
+    "covers",
+    multiple=True,
+    type=click.Choice(COMPONENTS),
+    help="A part of the state to include. May be repeated "
+    f"[default: {', '.join(DEFAULT_COVERS)}, or the exercise's own].",
+)
+def goal_digest_command(covers: tuple[str, ...]):
+    """Print a [goal] digest table matching the current workspace.
+
+    For exercise authors: solve the exercise, then paste the output into its
+    exercise.toml so that verify recognises the solved state directly.
+    """
+    current_key = get_current_exercise()
+    if current_key is None:
+        click.echo(
+            click.style("No exercise is currently in progress.", fg="yellow"),
+            err=True,
+        )
+        click.echo(
+            "Run 'gitgym start' or 'gitgym list' to begin an exercise.", err=True
+        )
+        raise SystemExit(1)
+
+    exercises = load_all_exercises()
+    target = None
+    for exercise in exercises:
+        if _exercise_key(exercise) == current_key:
+            target = exercise
+            break
+
+    if target is None:
+        click.echo(
+            click.style(
+                f"Error: Exercise '{current_key}' not found in exercise definitions.",
+                fg="red",
+            ),
+            err=True,
+        )
+        raise SystemExit(1)
+
+    covers = covers or tuple(target.goal.get("covers", DEFAULT_COVERS))
+    try:
+        digest = goal_digest(target, covers)
+    except GitPoolError as e:
+        click.echo(click.style(f"Error: {e}", fg="red"), err=True)
+        raise SystemExit(1)
+    click.echo("[goal]")
+    click.echo(f"covers = {json.dumps(list(covers))}")
+    click.echo(f'digest = "{digest}"')
+
+
 @main.command("hint")
 def hint_exercise():
     """Show the next progressive hint for the current exercise."""
@@ -312,7 +487,8 @@ def hint_exercise():
     default=False,
     help="Reset all exercises and clear progress.",
 )
-def reset_exercise(exercise: str | None, reset_all: bool):
+@_verbose_option
+def reset_exercise(exercise: str | None, reset_all: bool, verbose: bool):
     """Reset an exercise to its initial state.
 
     If --all is given, deletes the workspace and clears all progress.
@@ -369,7 +545,7 @@ def reset_exercise(exercise: str | None, reset_all: bool):
             )
             raise SystemExit(1)
 
-    success = run_setup(target)
+    success = run_setup(target, verbose=verbose)
     if not success:
         raise SystemExit(1)
 
@@ -378,6 +554,91 @@ def reset_exercise(exercise: str | None, reset_all: bool):
     click.echo(click.style(f"Exercise '{target.name}' has been reset.", fg="green"))
 
 
+@main.command("prepare")
+@click.option(
+    "--all",
+    "prepare_all",
+    is_flag=True,
+    default=False,
+    help="Prepare every exercise.",
+)
+@click.option(
+    "--topic",
+    "topics",
+    multiple=True,
+    help="Prepare the exercises of a topic (name or directory, e.g. Basics or "
+    "01_basics). May be repeated.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of exercises to set up in parallel [default: CPU count].",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Re-create workspaces that already exist (discards work in them).",
+)
+def prepare_exercises(
+    prepare_all: bool, topics: tuple[str, ...], jobs: int | None, force: bool
+):
+    """Set up many exercise workspaces at once, in parallel.
+
+    Useful for pre-baking a classroom image. Progress is not changed, and
+    existing workspaces are left alone unless --force is given.
+    """
+    if not prepare_all and not topics:
+        click.echo(
+            click.style("Error: Pass --all or at least one --topic.", fg="red"),
+            err=True,
+        )
+        raise SystemExit(1)
+
+    exercises = load_all_exercises()
+    if topics:
+        wanted = {t.lower() for t in topics}
+        selected = [
+            ex
+            for ex in exercises
+            if ex.topic.lower() in wanted or ex.path.parent.name.lower() in wanted
+        ]
+        if not selected:
+            click.echo(
+                click.style(
+                    f"Error: No exercises found for topic {', '.join(topics)}.",
+                    fg="red",
+                ),
+                err=True,
+            )
+            click.echo("Run 'gitgym list' to see the topics.", err=True)
+            raise SystemExit(1)
+        exercises = selected
+
+    jobs = jobs or default_jobs()
+    total = len(exercises)
+    live = click.get_text_stream("stdout").isatty()
+    done = 0
+
+    def _show_progress(result) -> None:
+        nonlocal done
+        done += 1
+        if live:
+            click.echo(f"\r\033[K[{done}/{total}] {result.key}", nl=False)
+
+    click.echo(f"Preparing {total} exercise(s) with {jobs} parallel job(s)...")
+    start = time.perf_counter()
+    results = prepare(exercises, jobs=jobs, force=force, on_result=_show_progress)
+    if live:
+        click.echo("\r\033[K", nl=False)
+    print_prepare_report(results, time.perf_counter() - start)
+
+    if any(not r.ok for r in results):
+        raise SystemExit(1)
+
+
 @main.command("watch")
 def watch_exercise():
     """Watch mode: automatically re-verify on repo changes."""
@@ -439,3 +700,74 @@ def clean():
 
     shutil.rmtree(GITGYM_HOME)
     click.echo(click.style("All cleaned up. Happy gitting!", fg="green"))
+    if OBJECT_STORE is not None and not OBJECT_STORE.is_relative_to(GITGYM_HOME):
+        click.echo(f"The shared object store at {OBJECT_STORE} was left in place.")
+
+
+@main.group("cache")
+def cache_group():
+    """Inspect or clear the cache of pristine exercise workspaces."""
+
+
+@cache_group.command("stats")
+def cache_stats_command():
+    """Show cached templates, their sizes, and when each was last used."""
+    print_cache_stats(cache_stats())
+
+
+@cache_group.command("clear")
+def cache_clear_command():
+    """Delete all cached templates (exercise progress is not affected)."""
+    removed = clear_cache()
+    click.echo(click.style(f"Removed {removed} cached template(s).", fg="green"))
+
+
+@main.group("checks")
+def checks_group():
+    """Inspect or reset the statistics that order exercises' [[checks]]."""
+
+
+@checks_group.command("stats")
+def checks_stats_command():
+    """Show each exercise's checks in run order, with runs, failures and timing."""
+    print_check_stats(checkstats.summary(load_all_exercises()))
+
+
+@checks_group.command("clear")
+def checks_clear_command():
+    """Forget the check statistics."""
+    checkstats.clear()
+    click.echo(click.style("Check statistics cleared.", fg="green"))
+
+
+@main.group("store")
+def store_group():
+    """Inspect or detach from the shared object store (GITGYM_OBJECT_STORE)."""
+
+
+@store_group.command("stats")
+def store_stats_command():
+    """Show the shared object store's size and how many workspaces use it."""
+    print_store_stats(store_stats())
+
+
+@store_group.command("dissociate")
+def store_dissociate_command():
+    """Copy borrowed objects back into every workspace so the store can be removed.
+
+    Cached templates are cleared too, since they borrow from the store.
+    """
+    done, failed = dissociate_all(hermetic_env())
+    clear_cache()
+    click.echo(
+        click.style(f"Dissociated {done} workspace(s) from the store.", fg="green")
+    )
+    for repo in failed:
+        click.echo(click.style(f"  Failed to repack {repo}", fg="red"), err=True)
+    if OBJECT_STORE is not None:
+        click.echo(
+            "Unset GITGYM_OBJECT_STORE before removing the store, or new "
+            "workspaces will borrow from it again."
+        )
+    if failed:
+        raise SystemExit(1)
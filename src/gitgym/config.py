@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # User's home directory for workspace and progress file
@@ -5,5 +6,51 @@ GITGYM_HOME = Path.home() / ".gitgym"
 WORKSPACE_DIR = GITGYM_HOME / "exercises"
 PROGRESS_FILE = GITGYM_HOME / "progress.json"
 
+# Pristine post-setup workspaces, keyed by a hash of the exercise definition
+CACHE_DIR = GITGYM_HOME / "cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Workspaces provisioned in the background for the next exercises
+STAGING_DIR = GITGYM_HOME / "staging"
+PREWARM_COUNT = 2
+
+# Optional bare repository whose objects every workspace borrows through
+# .git/objects/info/alternates. Set GITGYM_OBJECT_STORE to a path to enable it;
+# several learners on one server can point at the same store.
+OBJECT_STORE = (
+    Path(os.environ["GITGYM_OBJECT_STORE"]).expanduser()
+    if os.environ.get("GITGYM_OBJECT_STORE")
+    else None
+)
+
+# Global git config used by setup and verify scripts instead of the learner's
+GIT_CONFIG_FILE = GITGYM_HOME / "gitconfig"
+
+# Seconds setup.sh may run before its whole process group is killed. An
+# exercise can raise it with setup_timeout in its [environment] table.
+SETUP_TIMEOUT = 60
+
+# Seconds a verification may run before it is stopped (verify.sh's whole
+# process group killed) and reported as a script error. An exercise can
+# change it with verify_timeout in its [environment] table.
+VERIFY_TIMEOUT = 30
+
+# Setups and verifications runner.run_setup_async/run_verify_async run at
+# once per event loop, unless the caller passes its own semaphore
+ASYNC_CONCURRENCY = os.cpu_count() or 1
+
+# Timing records for setup runs (JSON lines), rotated past METRICS_MAX_BYTES
+METRICS_FILE = GITGYM_HOME / "metrics.jsonl"
+METRICS_MAX_BYTES = 1024 * 1024
+
+# Last verify result per exercise, with the workspace fingerprint it is for
+VERIFY_CACHE_FILE = GITGYM_HOME / "verify_cache.json"
+
+# Pass/fail counts and durations of each exercise's [[checks]], used to run
+# the checks most likely to fail first
+CHECK_STATS_FILE = GITGYM_HOME / "check_stats.json"
+
 # Package-relative exercises directory (shipped with the package)
 EXERCISES_DIR = Path(__file__).parent / "exercises"
+# Exercise repositories built at wheel build time (absent in a source checkout)
+PREBUILT_DIR = Path(__file__).parent / "prebuilt"
@@ -93,3 +93,193 @@ def print_progress_summary(exercises: list[Exercise], progress: dict) -> None:
             )
         )
         click.echo("Run 'gitgym clean' to remove exercise data from your system.")
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count as a short human-readable string (e.g. '1.5 MiB')."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    size = num_bytes / 1024
+    for unit in ("KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_cache_stats(stats: dict) -> None:
+    """Print the template cache location, total size, and per-exercise entries."""
+    entries = stats["entries"]
+    click.echo(click.style(f"Template cache: {stats['path']}", bold=True))
+    click.echo(f"  Templates: {len(entries)}")
+    click.echo(
+        f"  Size:      {_format_size(stats['total_bytes'])}"
+        f" / {_format_size(stats['max_bytes'])}"
+    )
+    if not entries:
+        return
+    click.echo()
+    for entry in entries:
+        click.echo(
+            f"  {entry['exercise']:<36} {_format_size(entry['size']):>10}"
+            f"  last used {entry['last_used'][:19].replace('T', ' ')}"
+        )
+
+
+def print_prepare_report(results: list, elapsed: float) -> None:
+    """Print per-exercise setup times for 'gitgym prepare', then any failures."""
+    prepared = [r for r in results if r.ok and not r.skipped]
+    skipped = [r for r in results if r.skipped]
+    failed = [r for r in results if not r.ok]
+
+    for result in results:
+        if result.skipped:
+            status = click.style("skipped (workspace exists)", fg="white")
+        elif result.ok:
+            status = f"{result.seconds:6.2f}s"
+        else:
+            status = click.style(f"{result.seconds:6.2f}s  FAILED", fg="red")
+        click.echo(f"  {result.key:<40} {status}")
+
+    click.echo()
+    summary = f"Prepared {len(prepared)} exercise(s) in {elapsed:.1f}s"
+    if skipped:
+        summary += f", {len(skipped)} skipped"
+    if failed:
+        summary += f", {len(failed)} failed"
+    click.echo(click.style(summary + ".", fg="red" if failed else "green"))
+
+    if not failed:
+        return
+    click.echo()
+    click.echo(click.style("Failures:", fg="red", bold=True))
+    for result in failed:
+        click.echo(click.style(f"  {result.key}", bold=True))
+        for line in (result.output or "(no output)").splitlines():
+            click.echo(f"    {line}")
+
+
+def print_verify_report(results: list, elapsed: float) -> None:
+    """Print 'gitgym verify --all' results grouped by topic, then any script errors."""
+    if not results:
+        click.echo("No exercise workspaces to verify.")
+        click.echo("Run 'gitgym start' or 'gitgym prepare --all' first.")
+        return
+
+    topics: dict[str, list] = {}
+    for result in results:
+        topics.setdefault(result.topic, []).append(result)
+
+    for topic, topic_results in topics.items():
+        passed = sum(1 for r in topic_results if r.ok)
+        total_in_topic = len(topic_results)
+        bar_filled = int(passed / total_in_topic * 10)
+        bar = "█" * bar_filled + "░" * (10 - bar_filled)
+        click.echo(
+            click.style(f"{topic:<22}", bold=True)
+            + f"[{bar}] {passed}/{total_in_topic}"
+        )
+        for result in topic_results:
+            if result.ok:
+                indicator = click.style("✓", fg="green")
+                status = ""
+            elif result.is_script_error:
+                indicator = click.style("!", fg="red")
+                status = click.style("error", fg="red")
+            else:
+                indicator = click.style("✗", fg="yellow")
+                status = result.progress
+            row = f"  {indicator} {result.name:<20} {result.seconds:6.2f}s  {status}"
+            click.echo(row.rstrip())
+
+    passed = [r for r in results if r.ok]
+    errors = [r for r in results if r.is_script_error]
+    click.echo()
+    summary = (
+        f"{len(passed)}/{len(results)} exercise(s) passing, verified in {elapsed:.1f}s"
+    )
+    if errors:
+        summary += f", {len(errors)} error(s)"
+        color = "red"
+    elif len(passed) == len(results):
+        color = "green"
+    else:
+        color = "yellow"
+    click.echo(click.style(summary + ".", fg=color))
+
+    if not errors:
+        return
+    click.echo()
+    click.echo(click.style("Errors:", fg="red", bold=True))
+    for result in errors:
+        click.echo(click.style(f"  {result.key}", bold=True))
+        for line in (result.output or "(no output)").splitlines():
+            click.echo(f"    {line}")
+
+
+def print_check_stats(stats: dict) -> None:
+    """Print each exercise's [[checks]] in the order they run, with their outcomes."""
+    click.echo(click.style(f"Check statistics: {stats['path']}", bold=True))
+    if not stats["exercises"]:
+        click.echo("  No exercise has [[checks]].")
+        return
+    for entry in stats["exercises"]:
+        click.echo()
+        click.echo(click.style(entry["exercise"], fg="yellow"))
+        for position, row in enumerate(entry["checks"], start=1):
+            if row["runs"]:
+                failed = f"{row['failures'] / row['runs']:4.0%} failed"
+                mean = f"{row['mean_seconds'] * 1000:8.2f} ms"
+            else:
+                failed = "  never run"
+                mean = ""
+            click.echo(
+                f"  {position:>2}. {row['check']:<40} {row['runs']:>6} runs"
+                f"  {failed}  {mean}".rstrip()
+            )
+
+
+def print_store_stats(stats: dict) -> None:
+    """Print the shared object store location, contents and borrowing workspaces."""
+    if stats["path"] is None:
+        click.echo("The shared object store is disabled.")
+        click.echo("Set GITGYM_OBJECT_STORE to a directory to enable it.")
+        return
+    click.echo(click.style(f"Object store: {stats['path']}", bold=True))
+    click.echo(f"  Loose objects: {stats['loose']}")
+    click.echo(f"  Packs:         {stats['packs']}")
+    click.echo(f"  Size:          {_format_size(stats['bytes'])}")
+    click.echo(f"  Workspaces:    {stats['workspaces']} borrowing objects")
+
+
+def _step_rows(steps: list, depth: int = 0) -> list:
+    rows = []
+    for step in steps:
+        rows.append(("  " * depth + step.name, step))
+        rows.extend(_step_rows(step.steps, depth + 1))
+    return rows
+
+
+def print_verify_explanation(steps: list, timeout: float) -> None:
+    """Print what each step of 'gitgym verify --explain' took, and the total."""
+    click.echo(click.style(f"Verification steps (timeout {timeout:g}s):", bold=True))
+    for name, step in _step_rows(steps):
+        if len(name) > 44:
+            name = name[:41] + "..."
+        seconds = "?" if step.seconds is None else f"{step.seconds * 1000:.2f} ms"
+        processes = ""
+        if step.processes is not None:
+            plural = "" if step.processes == 1 else "es"
+            processes = f"{step.processes} process{plural}"
+        click.echo(
+            f"  {name:<44} {seconds:>11}  {processes:<13}  {step.detail}".rstrip()
+        )
+    total = sum(step.seconds or 0 for step in steps)
+    processes = sum(step.processes or 0 for step in steps)
+    plural = "" if processes == 1 else "es"
+    click.echo(
+        click.style(
+            f"  {'total':<44} {total * 1000:>8.2f} ms  {processes} process{plural}",
+            bold=True,
+        )
+    )
@@ -1,5 +1,5 @@
 import tomllib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from gitgym.config import EXERCISES_DIR
@@ -14,6 +14,15 @@ class Exercise:
     goal_summary: str
     hints: list[str]
     path: Path
+    # Declarative initial repository (the [setup] table); see gitgym.history.
+    setup: dict = field(default_factory=dict)
+    # Overrides for the environment scripts run in (the [environment] table);
+    # see gitgym.runner.
+    environment: dict = field(default_factory=dict)
+    # Declarative goal checks (the [[checks]] array); see gitgym.checks.
+    checks: list[dict] = field(default_factory=list)
+    # The [goal] table besides its summary (digest, covers); see gitgym.golden.
+    goal: dict = field(default_factory=dict)
 
 
 def load_exercise(exercise_dir: Path) -> "Exercise":
@@ -30,6 +39,10 @@ def load_exercise(exercise_dir: Path) -> "Exercise":
         goal_summary=data["goal"]["summary"],
         hints=hints,
         path=exercise_dir,
+        setup=data.get("setup", {}),
+        environment=data.get("environment", {}),
+        checks=data.get("checks", []),
+        goal={k: v for k, v in data["goal"].items() if k != "summary"},
     )
 
 
@@ -0,0 +1,184 @@
+"""Record what a verification spends its time on, for ``gitgym verify --explain``.
+
+A :class:`Trace` follows one verification through its steps (fingerprinting
+the workspace, the [goal] digest, each [[checks]] entry, verify.py or
+verify.sh) and knows which step is running, so a verification stopped by
+its timeout can say where it hung, and which commands verify.sh (or a git
+command verify.py or a check started) was still running.
+
+With ``count=True`` (explain mode) it also counts the processes each step
+starts: those started from Python (git cat-file, git status, the verify.sh
+interpreter, ...) through a ``sys.audit`` hook, and the git commands
+verify.sh runs through a ``git`` wrapper put first on its PATH, which logs
+each command with its duration. Other commands a script runs (grep, wc)
+aren't counted.
+"""
+
+import asyncio
+import contextvars
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from gitgym.verification import Step
+
+# Logs each git command verify.sh runs: start and end (EPOCHREALTIME, empty
+# before bash 5) and the arguments.
+_GIT_WRAPPER = """#!/usr/bin/env bash
+__gitgym_start=${EPOCHREALTIME:-}
+"$GITGYM_EXPLAIN_GIT" "$@"
+__gitgym_status=$?
+__gitgym_args="$*"
+printf '%s %s git %s\\n' "${__gitgym_start:--}" "${EPOCHREALTIME:--}" \\
+	"${__gitgym_args//$'\\n'/ }" >>"$GITGYM_EXPLAIN_LOG"
+exit $__gitgym_status
+"""
+
+# The steps processes started in this context are counted towards. A
+# ContextVar, so asyncio.to_thread carries it into worker threads.
+_COUNTING: contextvars.ContextVar[tuple[Step, ...]] = contextvars.ContextVar(
+    "gitgym_explain_counting", default=()
+)
+_hook_installed = False
+
+
+def _audit(event: str, args: tuple) -> None:
+    if event == "subprocess.Popen":
+        for step in _COUNTING.get():
+            step.processes += 1
+
+
+def group_commands(pgid: int, *, leader: bool = False) -> list[str]:
+    """Return the command lines running in process group pgid, but its leader.
+
+    Subshells of the leader (same command line) are left out too; with
+    leader=True, the leader's comes first instead. Returns [] if ps isn't
+    available.
+    """
+    try:
+        listing = subprocess.run(
+            ["ps", "-A", "-o", "pid=", "-o", "pgid=", "-o", "args="],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    leader_args = None
+    members = []
+    for line in listing.splitlines():
+        fields = line.split(None, 2)
+        if len(fields) < 3 or not fields[0].isdigit() or not fields[1].isdigit():
+            continue
+        pid, group, args = int(fields[0]), int(fields[1]), fields[2]
+        if group != pgid:
+            continue
+        if pid == pgid:
+            leader_args = args
+        else:
+            members.append(args)
+    members = [args for args in members if args != leader_args]
+    if leader and leader_args is not None:
+        return [leader_args, *members]
+    return members
+
+
+class Trace:
+    """The steps of one verification, as a tree of timed :class:`Step`."""
+
+    def __init__(self, *, count: bool = False) -> None:
+        global _hook_installed
+        self.count = count
+        self.steps: list[Step] = []
+        # The steps that were running when the verification was cancelled
+        # (by its timeout), e.g. "[[checks]] > branch name=main"
+        self.stopped_in = ""
+        # Commands still running when the verification was stopped (see
+        # stopped())
+        self.hung: list[str] = []
+        self._stack: list[Step] = []
+        self._tmp: Path | None = None
+        if count and not _hook_installed:
+            sys.addaudithook(_audit)
+            _hook_installed = True
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[Step]:
+        """Time the block as a step, nested in the step running around it."""
+        step = Step(name, processes=0 if self.count else None)
+        (self._stack[-1].steps if self._stack else self.steps).append(step)
+        self._stack.append(step)
+        token = _COUNTING.set(_COUNTING.get() + (step,)) if self.count else None
+        start = time.perf_counter()
+        try:
+            yield step
+        except asyncio.CancelledError:
+            # The innermost step is cancelled first.
+            if not self.stopped_in:
+                self.stopped_in = self.running()
+            raise
+        finally:
+            step.seconds = time.perf_counter() - start
+            if token is not None:
+                _COUNTING.reset(token)
+            if self._stack and self._stack[-1] is step:
+                self._stack.pop()
+
+    def running(self) -> str:
+        """Name the steps running now, outermost first, e.g. "verify.sh"."""
+        return " > ".join(step.name for step in self._stack)
+
+    def stopped(self, pgid: int, *, leader: bool = False) -> None:
+        """Note what process group pgid was running before it is killed.
+
+        leader=True includes the group's leader, for a git command rather
+        than the shell running verify.sh.
+        """
+        self.hung.extend(group_commands(pgid, leader=leader))
+
+    def script_env(self, env: dict[str, str]) -> dict[str, str]:
+        """Return env for verify.sh, logging its git commands when counting."""
+        git = shutil.which("git", path=env.get("PATH"))
+        if not self.count or git is None:
+            return env
+        if self._tmp is None:
+            self._tmp = Path(tempfile.mkdtemp(prefix="gitgym-explain-"))
+            wrapper = self._tmp / "bin" / "git"
+            wrapper.parent.mkdir()
+            wrapper.write_text(_GIT_WRAPPER)
+            wrapper.chmod(0o755)
+        log = self._tmp / "git.log"
+        log.unlink(missing_ok=True)
+        return {
+            **env,
+            "PATH": f"{self._tmp / 'bin'}:{env.get('PATH', '')}",
+            "GITGYM_EXPLAIN_GIT": git,
+            "GITGYM_EXPLAIN_LOG": str(log),
+        }
+
+    def script_commands(self, step: Step) -> None:
+        """Add the git commands verify.sh ran to step, as child steps."""
+        if self._tmp is None:
+            return
+        try:
+            lines = (self._tmp / "git.log").read_text(errors="replace").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            start, end, command = (line.split(" ", 2) + ["", ""])[:3]
+            try:
+                seconds = float(end) - float(start)
+            except ValueError:
+                seconds = None
+            step.steps.append(Step(command, seconds, 1))
+            step.processes = (step.processes or 0) + 1
+
+    def close(self) -> None:
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
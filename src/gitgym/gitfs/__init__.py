@@ -0,0 +1,9 @@
+"""A minimal, pure-Python git repository writer.
+
+Builds exercise repositories in-process (objects, one packfile with its
+index, refs and the staging area) so setup doesn't fork a git process per
+command. Apart from decoding the index (gitfs.index.read_index) and
+reading refs (gitfs.refs), only writing is supported; anything else that
+needs to read or modify an existing repository still goes through the git
+CLI.
+"""
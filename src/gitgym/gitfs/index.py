@@ -0,0 +1,110 @@
+"""Writing and reading the staging area (``.git/index``)."""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+_SIGNATURE = b"DIRC"
+_VERSION = 2
+_NAME_MASK = 0xFFF
+_EXTENDED_FLAG = 0x4000
+# ctime, mtime (seconds and nanoseconds), dev, ino, mode, uid, gid, size
+_STAT_SIZE = 40
+
+
+def _entry(path: str, mode: int, sha: str, st: os.stat_result) -> bytes:
+    name = path.encode()
+    fields = struct.pack(
+        ">10I",
+        int(st.st_ctime) & 0xFFFFFFFF,
+        st.st_ctime_ns % 1_000_000_000,
+        int(st.st_mtime) & 0xFFFFFFFF,
+        st.st_mtime_ns % 1_000_000_000,
+        st.st_dev & 0xFFFFFFFF,
+        st.st_ino & 0xFFFFFFFF,
+        mode,
+        st.st_uid & 0xFFFFFFFF,
+        st.st_gid & 0xFFFFFFFF,
+        st.st_size & 0xFFFFFFFF,
+    )
+    entry = fields + bytes.fromhex(sha) + struct.pack(">H", min(len(name), _NAME_MASK))
+    entry += name
+    # NUL-terminate and pad the entry to a multiple of eight bytes.
+    return entry + b"\0" * (8 - len(entry) % 8)
+
+
+def write_index(
+    index_path: Path, worktree: Path, entries: dict[str, tuple[int, str]]
+) -> None:
+    """Write an index for entries mapping path -> (mode, hex sha).
+
+    Stat data is read from the files under worktree, which must already be
+    written, so that ``git status`` sees them as unmodified without
+    re-hashing.
+    """
+    out = bytearray(_SIGNATURE + struct.pack(">II", _VERSION, len(entries)))
+    for path in sorted(entries, key=str.encode):
+        mode, sha = entries[path]
+        st = os.lstat(worktree / path)
+        out += _entry(path, mode, sha, st)
+    out += hashlib.sha1(out).digest()
+    tmp = index_path.with_name("index.lock")
+    tmp.write_bytes(out)
+    os.replace(tmp, index_path)
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Decode the offset varint used by index v4 path compression."""
+    byte = data[pos]
+    value = byte & 0x7F
+    pos += 1
+    while byte & 0x80:
+        byte = data[pos]
+        value = ((value + 1) << 7) | (byte & 0x7F)
+        pos += 1
+    return value, pos
+
+
+def read_index(data: bytes) -> list[tuple[str, int, str, int]]:
+    """Return (path, mode, hex sha, stage) for every entry of an index file.
+
+    Handles versions 2 to 4; stat data and extensions are skipped. Raises
+    ValueError if data isn't a SHA-1 index git could have written.
+    """
+    if data[:4] != _SIGNATURE or len(data) < 12:
+        raise ValueError("not an index file")
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3, 4):
+        raise ValueError(f"unsupported index version {version}")
+    entries = []
+    pos = 12
+    name = b""
+    try:
+        for _ in range(count):
+            start = pos
+            (mode,) = struct.unpack(">I", data[pos + 24 : pos + 28])
+            pos += _STAT_SIZE
+            sha = data[pos : pos + 20].hex()
+            (flags,) = struct.unpack(">H", data[pos + 20 : pos + 22])
+            pos += 22
+            if version >= 3 and flags & _EXTENDED_FLAG:
+                pos += 2
+            if version == 4:
+                strip, pos = _varint(data, pos)
+                end = data.index(b"\0", pos)
+                name = name[: len(name) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b"\0", pos)
+                name = data[pos:end]
+                # Entries are NUL-padded to a multiple of eight bytes.
+                pos = start + (end - start + 8) // 8 * 8
+            entries.append(
+                (name.decode(errors="surrogateescape"), mode, sha, (flags >> 12) & 3)
+            )
+    except (struct.error, ValueError, IndexError) as e:
+        raise ValueError(f"truncated index: {e}") from e
+    if pos > len(data) - 20:
+        raise ValueError("truncated index")
+    return entries
@@ -0,0 +1,74 @@
+"""Encoding and hashing of git objects (blobs, trees, commits and tags)."""
+
+import hashlib
+import zlib
+
+MODE_FILE = "100644"
+MODE_EXECUTABLE = "100755"
+MODE_SYMLINK = "120000"
+MODE_TREE = "40000"
+
+# Object type numbers used in pack entry headers.
+TYPE_NUMBERS = {"commit": 1, "tree": 2, "blob": 3, "tag": 4}
+
+
+def header(kind: str, size: int) -> bytes:
+    """Return the '<kind> <size>\\0' prefix that is hashed with every object."""
+    return f"{kind} {size}\0".encode()
+
+
+def hash_object(kind: str, data: bytes) -> str:
+    """Return the hex object id git would assign to data of the given kind."""
+    h = hashlib.sha1(header(kind, len(data)))
+    h.update(data)
+    return h.hexdigest()
+
+
+def loose_object(kind: str, data: bytes) -> bytes:
+    """Return the zlib-compressed contents of a loose object file."""
+    return zlib.compress(header(kind, len(data)) + data)
+
+
+def _tree_sort_key(entry: tuple[str, str, str]) -> bytes:
+    mode, name, _sha = entry
+    # Git orders directories as if their name ended in '/'.
+    return name.encode() + (b"/" if mode == MODE_TREE else b"")
+
+
+def encode_tree(entries: list[tuple[str, str, str]]) -> bytes:
+    """Encode (mode, name, hex sha) entries as tree object data."""
+    out = bytearray()
+    for mode, name, sha in sorted(entries, key=_tree_sort_key):
+        out += f"{mode} {name}\0".encode() + bytes.fromhex(sha)
+    return bytes(out)
+
+
+def parse_tree(data: bytes) -> list[tuple[str, str, str]]:
+    """Decode tree object data into (mode, name, hex sha) entries."""
+    entries = []
+    pos = 0
+    while pos < len(data):
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        mode = data[pos:space].decode()
+        name = data[space + 1 : nul].decode()
+        sha = data[nul + 1 : nul + 21].hex()
+        entries.append((mode, name, sha))
+        pos = nul + 21
+    return entries
+
+
+def encode_commit(
+    tree: str, parents: list[str], author: str, committer: str, message: bytes
+) -> bytes:
+    """Encode a commit. author/committer are 'Name <email> <epoch> <tz>' lines."""
+    lines = [f"tree {tree}"]
+    lines += [f"parent {parent}" for parent in parents]
+    lines += [f"author {author}", f"committer {committer}"]
+    return "\n".join(lines).encode() + b"\n\n" + message
+
+
+def encode_tag(target: str, kind: str, name: str, tagger: str, message: bytes) -> bytes:
+    """Encode an annotated tag pointing at target (an object of the given kind)."""
+    head = f"object {target}\ntype {kind}\ntag {name}\ntagger {tagger}\n\n"
+    return head.encode() + message
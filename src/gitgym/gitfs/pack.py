@@ -0,0 +1,100 @@
+"""Writing a packfile and its version 2 index.
+
+Objects are stored whole (no deltas): exercise repositories are tiny, and
+skipping delta search keeps writing a pack cheaper than writing the same
+objects loose.
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+
+from gitgym.gitfs.objects import TYPE_NUMBERS
+
+_PACK_SIGNATURE = b"PACK"
+_IDX_SIGNATURE = b"\377tOc"
+_VERSION = 2
+# Offsets at or above this go in the index's 64-bit offset table.
+_LARGE_OFFSET = 0x80000000
+
+
+def _entry_header(kind: str, size: int) -> bytes:
+    """Encode the type and size varint that precedes each packed object."""
+    byte = (TYPE_NUMBERS[kind] << 4) | (size & 0x0F)
+    size >>= 4
+    out = bytearray()
+    while size:
+        out.append(byte | 0x80)
+        byte = size & 0x7F
+        size >>= 7
+    out.append(byte)
+    return bytes(out)
+
+
+def _index(entries: list[tuple[bytes, int, int]], pack_sha: bytes) -> bytes:
+    """Build idx v2 data for (binary sha, offset, crc32) entries."""
+    entries = sorted(entries)
+    out = bytearray(_IDX_SIGNATURE + struct.pack(">I", _VERSION))
+    counts = [0] * 256
+    for sha, _offset, _crc in entries:
+        counts[sha[0]] += 1
+    total = 0
+    for count in counts:
+        total += count
+        out += struct.pack(">I", total)
+    for sha, _offset, _crc in entries:
+        out += sha
+    for _sha, _offset, crc in entries:
+        out += struct.pack(">I", crc)
+    large = []
+    for _sha, offset, _crc in entries:
+        if offset >= _LARGE_OFFSET:
+            out += struct.pack(">I", _LARGE_OFFSET | len(large))
+            large.append(offset)
+        else:
+            out += struct.pack(">I", offset)
+    for offset in large:
+        out += struct.pack(">Q", offset)
+    out += pack_sha
+    out += hashlib.sha1(out).digest()
+    return bytes(out)
+
+
+def write_pack(objects: Iterable[tuple[str, str, bytes]], pack_dir: Path) -> Path:
+    """Write (hex sha, kind, data) objects as one pack plus .idx in pack_dir.
+
+    Returns the path of the .pack file. Both files are written under temporary
+    names and renamed into place, index last, so git never sees a pack
+    without its index.
+    """
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    objects = list(objects)
+    tmp_pack = pack_dir / f"tmp_pack_{os.getpid()}"
+    tmp_idx = pack_dir / f"tmp_idx_{os.getpid()}"
+
+    checksum = hashlib.sha1()
+    entries = []
+    with open(tmp_pack, "wb") as f:
+
+        def emit(chunk: bytes) -> None:
+            checksum.update(chunk)
+            f.write(chunk)
+
+        emit(_PACK_SIGNATURE + struct.pack(">II", _VERSION, len(objects)))
+        offset = 12
+        for sha, kind, data in objects:
+            chunk = _entry_header(kind, len(data)) + zlib.compress(data)
+            entries.append((bytes.fromhex(sha), offset, zlib.crc32(chunk)))
+            emit(chunk)
+            offset += len(chunk)
+        pack_sha = checksum.digest()
+        f.write(pack_sha)
+
+    tmp_idx.write_bytes(_index(entries, pack_sha))
+    name = f"pack-{pack_sha.hex()}"
+    os.replace(tmp_pack, pack_dir / f"{name}.pack")
+    os.replace(tmp_idx, pack_dir / f"{name}.idx")
+    return pack_dir / f"{name}.pack"
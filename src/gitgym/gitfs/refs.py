@@ -0,0 +1,354 @@
+"""Reading refs straight from .git, without running git.
+
+Answers "which branch is checked out", "does refs/heads/x exist" and "what
+does tag v1 point to" in microseconds, where ``git rev-parse`` or ``git
+for-each-ref`` cost a process each. Covers HEAD (symbolic or detached),
+loose refs, ``packed-refs`` (a loose ref shadows a packed one of the same
+name), symbolic refs and peeled tags: from the ``^`` lines of
+``packed-refs`` where git recorded them, otherwise by reading the tag
+objects, loose or stored whole in a pack, including ones borrowed through
+``objects/info/alternates``.
+
+In a linked worktree, HEAD and the per-worktree refs are read from its own
+git directory and everything else from the common one. Repositories using
+the reftable backend raise RefError, as does a ref directory that can't be
+read; callers fall back to git.
+"""
+
+import os
+import re
+import struct
+import zlib
+from pathlib import Path
+
+# A sha1 or sha256 object id.
+_OID = re.compile(r"[0-9a-f]{40}(?:[0-9a-f]{24})?\b")
+# HEAD, ORIG_HEAD, MERGE_HEAD, ...
+_PSEUDO_REF = re.compile(r"[A-Z_]*HEAD")
+# Characters git doesn't allow in ref names (besides control characters).
+_BAD_CHARS = set(" ~^:?*[\\")
+# Refs kept in each worktree's own git directory.
+_PER_WORKTREE = ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+# How many symbolic refs (or tags) are followed before giving up, as git does.
+_MAX_DEPTH = 5
+
+_IDX_SIGNATURE = b"\377tOc"
+_LARGE_OFFSET = 0x80000000
+_TYPE_NAMES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+# packed-refs parsed per file, with the (inode, mtime, size) it was read at:
+# (refs, peeled).
+_PACKED: dict[Path, tuple[tuple[int, int, int], dict[str, str], dict[str, str]]] = {}
+
+
+class RefError(Exception):
+    """Raised when a repository's refs can't be read from the filesystem."""
+
+
+def valid_name(name: str) -> bool:
+    """Whether name is a full ref name git would accept, or a pseudo-ref like HEAD."""
+    if _PSEUDO_REF.fullmatch(name):
+        return True
+    if not name.startswith("refs/") or name.endswith((".lock", "/", ".")):
+        return False
+    if "@{" in name or any(c in _BAD_CHARS or ord(c) < 32 for c in name):
+        return False
+    return all(
+        part and not part.startswith(".") and ".." not in part
+        for part in name.split("/")
+    )
+
+
+def _common_dir(git_dir: Path) -> Path:
+    try:
+        common = git_dir / (git_dir / "commondir").read_text().strip()
+    except FileNotFoundError:
+        common = git_dir
+    except OSError as e:
+        raise RefError(f"cannot read {git_dir / 'commondir'}: {e}") from e
+    if (common / "reftable").is_dir():
+        raise RefError(f"{common} stores its refs in a reftable")
+    return common
+
+
+def _is_per_worktree(name: str) -> bool:
+    return "/" not in name or name.startswith(_PER_WORKTREE)
+
+
+def _packed(common: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """Return (name -> object id, name -> peeled object id) from packed-refs."""
+    path = common / "packed-refs"
+    try:
+        st = path.stat()
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = _PACKED.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        text = path.read_text(errors="replace")
+    except FileNotFoundError:
+        return {}, {}
+    except OSError as e:
+        raise RefError(f"cannot read {path}: {e}") from e
+    refs: dict[str, str] = {}
+    peeled: dict[str, str] = {}
+    last = None
+    for line in text.splitlines():
+        if line.startswith("^"):
+            if last is not None:
+                peeled[last] = line[1:].strip()
+        elif line and not line.startswith("#"):
+            oid, _, last = line.partition(" ")
+            refs[last] = oid
+    _PACKED[path] = (stamp, refs, peeled)
+    return refs, peeled
+
+
+def _read_loose(path: Path) -> str | None:
+    try:
+        return path.read_text(errors="replace")
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
+    except OSError as e:
+        raise RefError(f"cannot read {path}: {e}") from e
+
+
+def _read(git_dir: Path, common: Path, name: str) -> tuple[str | None, str | None]:
+    """Return (object id, symbolic target) of one ref, without following it."""
+    per_worktree = _is_per_worktree(name)
+    content = _read_loose((git_dir if per_worktree else common) / name)
+    if content is not None:
+        if content.startswith("ref:"):
+            return None, content[4:].strip()
+        match = _OID.match(content)
+        return (match.group() if match else None), None
+    # Pseudo-refs are never packed, nor are a linked worktree's own refs.
+    if "/" not in name or (per_worktree and git_dir != common):
+        return None, None
+    return _packed(common)[0].get(name), None
+
+
+def read_symref(git_dir: Path, name: str) -> str | None:
+    """Return the ref name is a symbolic ref to ('refs/heads/main'), or None."""
+    if not valid_name(name):
+        return None
+    return _read(git_dir, _common_dir(git_dir), name)[1]
+
+
+def resolve_ref(git_dir: Path, name: str) -> str | None:
+    """Return the object id the full ref name points to, following symbolic refs.
+
+    None when it doesn't exist (or HEAD is unborn). Only full names are
+    accepted: 'refs/heads/main', 'refs/tags/v1', 'HEAD', 'MERGE_HEAD'.
+    """
+    if not valid_name(name):
+        return None
+    common = _common_dir(git_dir)
+    for _ in range(_MAX_DEPTH):
+        oid, target = _read(git_dir, common, name)
+        if target is None or not valid_name(target):
+            return oid
+        name = target
+    return None
+
+
+def dwim_ref(git_dir: Path, name: str) -> tuple[str, str] | None:
+    """Return (full ref name, object id) for a name as git would expand it.
+
+    'main' is tried as refs/main, refs/tags/main, refs/heads/main,
+    refs/remotes/main and refs/remotes/main/HEAD, in git's order; a full
+    name or HEAD is taken as it is. None when no ref matches, including for
+    anything that isn't a plain ref name ('HEAD~1', 'main:file', an object
+    id).
+    """
+    if _OID.fullmatch(name):
+        return None
+    for rule in ("{}", "refs/{}", "refs/tags/{}", "refs/heads/{}", "refs/remotes/{}"):
+        full = rule.format(name)
+        oid = resolve_ref(git_dir, full)
+        if oid is not None:
+            return full, oid
+    full = f"refs/remotes/{name}/HEAD"
+    oid = resolve_ref(git_dir, full)
+    return None if oid is None else (full, oid)
+
+
+def read_head(git_dir: Path) -> tuple[str | None, str | None]:
+    """Return (ref HEAD points to, commit) as ('refs/heads/main', oid).
+
+    The ref is None when HEAD is detached, the commit when the branch is
+    unborn.
+    """
+    target = read_symref(git_dir, "HEAD")
+    return target, resolve_ref(git_dir, "HEAD")
+
+
+def head_branch(git_dir: Path) -> str | None:
+    """Return the checked-out branch ('main'), or None when HEAD is detached."""
+    target = read_symref(git_dir, "HEAD")
+    if target is None or not target.startswith("refs/heads/"):
+        return None
+    return target.removeprefix("refs/heads/")
+
+
+def _walk(directory: Path, base: str, names: set[str]) -> None:
+    """Add the loose ref names under directory (named base) to names."""
+    try:
+        entries = list(os.scandir(directory))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    except OSError as e:
+        raise RefError(f"cannot read {directory}: {e}") from e
+    for entry in entries:
+        name = f"{base}/{entry.name}"
+        if entry.is_dir(follow_symlinks=False):
+            _walk(Path(entry.path), name, names)
+        elif valid_name(name):
+            names.add(name)
+
+
+def list_refs(git_dir: Path, prefix: str = "refs/") -> dict[str, str]:
+    """Return every ref under prefix with the object it points to, sorted by name.
+
+    Like ``git for-each-ref``: symbolic refs are resolved, and ones left
+    dangling skipped. prefix should end with '/' (or be a full ref name).
+    """
+    common = _common_dir(git_dir)
+    # The directory to walk: prefix itself, or the one containing it.
+    start = prefix[:-1] if prefix.endswith("/") else prefix.rpartition("/")[0]
+    loose: set[str] = set()
+    _walk(common / start, start, loose)
+    if git_dir != common:
+        worktree: set[str] = set()
+        _walk(git_dir / start, start, worktree)
+        loose = {name for name in loose if not _is_per_worktree(name)}
+        loose |= {name for name in worktree if _is_per_worktree(name)}
+    names = {name for name in _packed(common)[0] if name.startswith(prefix)}
+    names |= {name for name in loose if name.startswith(prefix)}
+    refs = {}
+    for name in sorted(names, key=str.encode):
+        oid = resolve_ref(git_dir, name)
+        if oid is not None:
+            refs[name] = oid
+    return refs
+
+
+def _object_dirs(objects: Path) -> list[Path]:
+    """objects and the object directories it borrows from, transitively."""
+    dirs = [objects]
+    for directory in dirs:
+        try:
+            lines = (directory / "info" / "alternates").read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                alternate = (directory / line).resolve()
+                if alternate not in dirs and len(dirs) < 8:
+                    dirs.append(alternate)
+    return dirs
+
+
+def _pack_offset(idx: bytes, oid: bytes) -> int | None:
+    """Find oid (binary) in idx v2 data; return its offset in the pack."""
+    if idx[:4] != _IDX_SIGNATURE or struct.unpack_from(">I", idx, 4)[0] != 2:
+        return None
+    count = struct.unpack_from(">I", idx, 8 + 255 * 4)[0]
+    lo = struct.unpack_from(">I", idx, 8 + (oid[0] - 1) * 4)[0] if oid[0] else 0
+    hi = struct.unpack_from(">I", idx, 8 + oid[0] * 4)[0]
+    names = 8 + 256 * 4
+    while lo < hi:
+        mid = (lo + hi) // 2
+        found = idx[names + mid * 20 : names + mid * 20 + 20]
+        if found == oid:
+            offsets = names + count * 24
+            offset = struct.unpack_from(">I", idx, offsets + mid * 4)[0]
+            if offset & _LARGE_OFFSET:
+                large = offsets + count * 4 + (offset & ~_LARGE_OFFSET) * 8
+                offset = struct.unpack_from(">Q", idx, large)[0]
+            return offset
+        if found < oid:
+            lo = mid + 1
+        else:
+            hi = mid
+    return None
+
+
+def _read_packed(pack: Path, offset: int) -> tuple[str, bytes] | None:
+    """Read the object at offset in pack; None for a delta (or a bad entry)."""
+    with open(pack, "rb") as f:
+        f.seek(offset)
+        byte = f.read(1)[0]
+        kind = _TYPE_NAMES.get((byte >> 4) & 7)
+        while byte & 0x80:
+            byte = f.read(1)[0]
+        if kind is None:
+            return None
+        inflate = zlib.decompressobj()
+        data = b""
+        while not inflate.eof:
+            chunk = f.read(4096)
+            if not chunk:
+                return None
+            data += inflate.decompress(chunk)
+    return kind, data
+
+
+def _read_object(common: Path, oid: str) -> tuple[str, bytes] | None:
+    """Return (type, content) of a loose or undeltified packed object, or None."""
+    if len(oid) != 40:
+        return None
+    binary = bytes.fromhex(oid)
+    try:
+        for objects in _object_dirs(common / "objects"):
+            try:
+                raw = zlib.decompress((objects / oid[:2] / oid[2:]).read_bytes())
+            except FileNotFoundError:
+                pass
+            else:
+                header, _, data = raw.partition(b"\0")
+                return header.split(b" ")[0].decode(), data
+            for idx in sorted((objects / "pack").glob("*.idx")):
+                offset = _pack_offset(idx.read_bytes(), binary)
+                if offset is not None:
+                    return _read_packed(idx.with_suffix(".pack"), offset)
+    except (OSError, zlib.error, IndexError, struct.error):
+        return None
+    return None
+
+
+def peel(git_dir: Path, oid: str) -> str | None:
+    """Return the object a chain of annotated tags starting at oid ends at.
+
+    oid itself when it isn't a tag; None when a tag can't be read here
+    (e.g. it is stored as a delta).
+    """
+    common = _common_dir(git_dir)
+    for _ in range(_MAX_DEPTH):
+        obj = _read_object(common, oid)
+        if obj is None:
+            return None
+        kind, data = obj
+        if kind != "tag":
+            return oid
+        match = _OID.match(data.decode(errors="replace").removeprefix("object "))
+        if match is None:
+            return None
+        oid = match.group()
+    return None
+
+
+def peel_ref(git_dir: Path, name: str) -> str | None:
+    """Return the object the full ref name points to with tags peeled, or None.
+
+    Uses the peeled value git recorded in packed-refs when the ref is
+    packed, so no object is read.
+    """
+    common = _common_dir(git_dir)
+    oid = resolve_ref(git_dir, name)
+    if oid is None:
+        return None
+    refs, peeled = _packed(common)
+    if name in peeled and refs.get(name) == oid:
+        return peeled[name]
+    return peel(git_dir, oid)
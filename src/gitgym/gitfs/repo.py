@@ -0,0 +1,182 @@
+"""Building a complete repository in-process, without running git."""
+
+import os
+from pathlib import Path
+
+from gitgym.gitfs.index import write_index
+from gitgym.gitfs.objects import (
+    MODE_EXECUTABLE,
+    MODE_FILE,
+    MODE_SYMLINK,
+    MODE_TREE,
+    encode_commit,
+    encode_tag,
+    encode_tree,
+    hash_object,
+    loose_object,
+    parse_tree,
+)
+from gitgym.gitfs.pack import write_pack
+
+# The [core] section `git init` writes for a non-bare repository.
+CORE_CONFIG = (
+    "[core]\n"
+    "\trepositoryformatversion = 0\n"
+    "\tfilemode = true\n"
+    "\tbare = false\n"
+    "\tlogallrefupdates = true\n"
+)
+
+
+class RepoWriter:
+    """Accumulate objects and refs in memory, then write them out in one go.
+
+    Typical use::
+
+        repo = RepoWriter(directory, head="main")
+        tree = repo.write_tree({"README.md": (MODE_FILE, repo.add_blob(b"hi\\n"))})
+        commit = repo.add_commit(tree, [], ident, ident, b"Initial commit\\n")
+        repo.set_ref("refs/heads/main", commit)
+        repo.checkout(commit)
+        repo.finish()
+
+    Nothing is written under ``.git`` until :meth:`finish`; :meth:`checkout`
+    and :meth:`stage` write working-tree files immediately so their stat data
+    can be recorded in the index.
+    """
+
+    def __init__(self, directory: Path, head: str = "main") -> None:
+        self.directory = Path(directory)
+        self.git_dir = self.directory / ".git"
+        self.head = head
+        self.objects: dict[str, tuple[str, bytes]] = {}
+        self.refs: dict[str, str] = {}
+        # path -> (mode, hex sha) for every staged file
+        self.index: dict[str, tuple[int, str]] = {}
+
+    # --- objects ---
+
+    def add_object(self, kind: str, data: bytes) -> str:
+        sha = hash_object(kind, data)
+        self.objects.setdefault(sha, (kind, data))
+        return sha
+
+    def add_blob(self, data: bytes) -> str:
+        return self.add_object("blob", data)
+
+    def add_tree(self, entries: list[tuple[str, str, str]]) -> str:
+        return self.add_object("tree", encode_tree(entries))
+
+    def add_commit(
+        self,
+        tree: str,
+        parents: list[str],
+        author: str,
+        committer: str,
+        message: bytes,
+    ) -> str:
+        return self.add_object(
+            "commit", encode_commit(tree, parents, author, committer, message)
+        )
+
+    def add_tag(
+        self, target: str, name: str, tagger: str, message: bytes, kind: str = "commit"
+    ) -> str:
+        return self.add_object("tag", encode_tag(target, kind, name, tagger, message))
+
+    def write_tree(self, files: dict[str, tuple[str, str]]) -> str:
+        """Store the trees for a flat map of path -> (mode, blob sha); return the root."""
+        root: dict = {}
+        for path, entry in files.items():
+            node = root
+            *dirs, name = path.split("/")
+            for part in dirs:
+                node = node.setdefault(part, {})
+            node[name] = entry
+
+        def store(node: dict) -> str:
+            entries = []
+            for name, child in node.items():
+                if isinstance(child, dict):
+                    entries.append((MODE_TREE, name, store(child)))
+                else:
+                    mode, sha = child
+                    entries.append((mode, name, sha))
+            return self.add_tree(entries)
+
+        return store(root)
+
+    def set_ref(self, ref: str, sha: str) -> None:
+        self.refs[ref] = sha
+
+    # --- working tree and index ---
+
+    def _flatten(self, tree: str, prefix: str = "") -> dict[str, tuple[str, str]]:
+        files = {}
+        for mode, name, sha in parse_tree(self.objects[tree][1]):
+            path = f"{prefix}{name}"
+            if mode == MODE_TREE:
+                files.update(self._flatten(sha, f"{path}/"))
+            else:
+                files[path] = (mode, sha)
+        return files
+
+    def _write_file(self, path: str, mode: str, data: bytes) -> None:
+        target = self.directory / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_symlink() or target.exists():
+            target.unlink()
+        if mode == MODE_SYMLINK:
+            os.symlink(data, target)
+            return
+        target.write_bytes(data)
+        target.chmod(0o755 if mode == MODE_EXECUTABLE else 0o644)
+
+    def checkout(self, commit: str) -> None:
+        """Write commit's tree into the working tree and stage all of it."""
+        kind, data = self.objects[commit]
+        if kind != "commit":
+            raise ValueError(f"{commit} is a {kind}, not a commit")
+        tree = data.split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+        for path, (mode, sha) in self._flatten(tree).items():
+            self._write_file(path, mode, self.objects[sha][1])
+            self.index[path] = (int(mode, 8), sha)
+
+    def stage(self, path: str, data: bytes, executable: bool = False) -> None:
+        """Write a file to the working tree and add it to the index."""
+        mode = MODE_EXECUTABLE if executable else MODE_FILE
+        sha = self.add_blob(data)
+        self._write_file(path, mode, data)
+        self.index[path] = (int(mode, 8), sha)
+
+    # --- output ---
+
+    def _write_loose(self) -> None:
+        objects_dir = self.git_dir / "objects"
+        for sha, (kind, data) in self.objects.items():
+            path = objects_dir / sha[:2] / sha[2:]
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(loose_object(kind, data))
+
+    def finish(self, config: str = "", *, pack: bool = True) -> None:
+        """Write .git: config, HEAD, objects (one pack, or loose), refs and index."""
+        for sub in ("objects/info", "objects/pack", "refs/heads", "refs/tags"):
+            (self.git_dir / sub).mkdir(parents=True, exist_ok=True)
+        (self.git_dir / "config").write_text(CORE_CONFIG + config)
+        (self.git_dir / "HEAD").write_text(f"ref: refs/heads/{self.head}\n")
+
+        if pack and self.objects:
+            write_pack(
+                ((sha, kind, data) for sha, (kind, data) in self.objects.items()),
+                self.git_dir / "objects" / "pack",
+            )
+        elif self.objects:
+            self._write_loose()
+
+        for ref, sha in self.refs.items():
+            path = self.git_dir / ref
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(sha + "\n")
+
+        if self.index:
+            write_index(self.git_dir / "index", self.directory, self.index)
@@ -0,0 +1,312 @@
+"""Long-lived ``git cat-file`` processes for reading exercise repositories.
+
+Checks that ask many small questions of a repository (what does this ref
+point to, what is in this commit, which commits are on this branch) would
+otherwise start one git process per question. A :class:`GitBatch` keeps a
+``git cat-file --batch-check`` and a ``git cat-file --batch`` process for
+one workspace and answers those questions over their pipes, and a
+:class:`GitPool` hands them out per workspace so watch mode reuses the same
+processes for every verification.
+
+cat-file resolves refs and looks objects up afresh for every request
+(re-scanning packs when an object isn't found), so the answers stay current
+while the learner keeps working. A workspace that is deleted and re-created
+gets new processes.
+"""
+
+import heapq
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+_OBJECT_TYPES = ("blob", "tree", "commit", "tag")
+
+
+class GitPoolError(Exception):
+    """Raised when a cat-file process dies and can't be restarted."""
+
+
+@dataclass(frozen=True)
+class Commit:
+    oid: str
+    tree: str
+    parents: tuple[str, ...]
+    # 'Name <email> <epoch> <tz>', as stored in the commit
+    author: str
+    committer: str
+    message: str
+
+    @property
+    def subject(self) -> str:
+        return self.message.split("\n", 1)[0]
+
+    @property
+    def committer_time(self) -> int:
+        return int(self.committer.rsplit(" ", 2)[1])
+
+
+def parse_commit(oid: str, data: bytes) -> Commit:
+    """Decode raw commit object data."""
+    head, _, message = data.decode(errors="replace").partition("\n\n")
+    fields: dict[str, list[str]] = {}
+    for line in head.split("\n"):
+        if line.startswith(" "):
+            # Continuation of a multi-line header (gpgsig, mergetag).
+            continue
+        key, _, value = line.partition(" ")
+        fields.setdefault(key, []).append(value)
+    return Commit(
+        oid=oid,
+        tree=fields["tree"][0],
+        parents=tuple(fields.get("parent", [])),
+        author=fields.get("author", [""])[0],
+        committer=fields.get("committer", [""])[0],
+        message=message,
+    )
+
+
+def _clean_env() -> dict[str, str]:
+    """The current environment without GIT_* variables that could redirect git."""
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith("GIT_") or key == "GIT_EXEC_PATH"
+    }
+
+
+class GitBatch:
+    """cat-file processes for one repository, started on first use.
+
+    Safe to share between threads; requests are serialised.
+    """
+
+    def __init__(self, repo: Path, env: dict[str, str] | None = None) -> None:
+        self.repo = repo
+        self._env = env if env is not None else _clean_env()
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        # Set by stop(): no more processes are started.
+        self.stopped = False
+        # Set by retire(): processes only live for one request.
+        self.retired = False
+
+    def _start(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "cat-file", mode],
+            cwd=self.repo,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self._env,
+        )
+
+    def _request(self, mode: str, rev: str) -> tuple[str, str, int, bytes] | None:
+        """Send rev to the cat-file process for mode and read one answer.
+
+        Returns (oid, type, size, content), content being empty for
+        --batch-check, or None if rev doesn't name an object. A process that
+        has died is restarted once, unless the batch was stopped.
+        """
+        if not rev or "\n" in rev:
+            return None
+        for attempt in range(2):
+            if self.stopped:
+                raise GitPoolError(f"git cat-file in {self.repo} was stopped")
+            proc = self._procs.get(mode)
+            if proc is None or proc.poll() is not None:
+                try:
+                    proc = self._procs[mode] = self._start(mode)
+                except OSError as e:
+                    raise GitPoolError(f"could not start git cat-file: {e}") from e
+            try:
+                proc.stdin.write(rev.encode() + b"\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = b""
+            if line:
+                break
+            self._kill(mode)
+        else:
+            raise GitPoolError(f"git cat-file {mode} in {self.repo} keeps exiting")
+
+        parts = line.decode().split()
+        if len(parts) != 3 or parts[1] not in _OBJECT_TYPES:
+            # '<rev> missing' or '<rev> ambiguous'
+            return None
+        oid, kind, size = parts[0], parts[1], int(parts[2])
+        content = b""
+        if mode == "--batch":
+            content = proc.stdout.read(size + 1)[:size]
+        return oid, kind, size, content
+
+    def _ask(self, mode: str, rev: str) -> tuple[str, str, int, bytes] | None:
+        """_request under the lock; a retired batch's processes stop after it."""
+        with self._lock:
+            try:
+                return self._request(mode, rev)
+            finally:
+                if self.retired:
+                    for running in list(self._procs):
+                        self._kill(running)
+
+    def info(self, rev: str) -> tuple[str, str, int] | None:
+        """Return (oid, type, size) for a revision, or None if it doesn't exist."""
+        answer = self._ask("--batch-check", rev)
+        return None if answer is None else answer[:3]
+
+    def resolve(self, rev: str) -> str | None:
+        """Return the object id rev names (a ref, 'HEAD~2', 'main:file', ...)."""
+        info = self.info(rev)
+        return None if info is None else info[0]
+
+    def read(self, rev: str) -> tuple[str, bytes] | None:
+        """Return (type, content) of the object rev names, or None."""
+        answer = self._ask("--batch", rev)
+        return None if answer is None else (answer[1], answer[3])
+
+    def commit(self, rev: str) -> Commit | None:
+        """Return the commit rev names (tags are peeled), or None."""
+        answer = self._ask("--batch", f"{rev}^{{commit}}")
+        if answer is None:
+            return None
+        return parse_commit(answer[0], answer[3])
+
+    def commits(
+        self, include: str | list[str], exclude: list[str] | None = None
+    ) -> list[Commit]:
+        """Return the commits reachable from include but not from exclude.
+
+        The equivalent of ``git rev-list include ^exclude...``, newest
+        committer date first; ``commits("feature", ["main"])`` lists what
+        ``git log main..feature`` would. Revisions that don't resolve are
+        ignored.
+        """
+        if isinstance(include, str):
+            include = [include]
+        hidden: set[str] = set()
+        stack = [c.oid for c in map(self.commit, exclude or []) if c is not None]
+        while stack:
+            oid = stack.pop()
+            if oid in hidden:
+                continue
+            hidden.add(oid)
+            commit = self.commit(oid)
+            if commit is not None:
+                stack.extend(commit.parents)
+
+        result = []
+        seen = set(hidden)
+        heap = []
+        for commit in map(self.commit, include):
+            if commit is not None and commit.oid not in seen:
+                seen.add(commit.oid)
+                heapq.heappush(heap, (-commit.committer_time, commit.oid, commit))
+        while heap:
+            _, _, commit = heapq.heappop(heap)
+            result.append(commit)
+            for parent in commit.parents:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                parent_commit = self.commit(parent)
+                if parent_commit is not None:
+                    heapq.heappush(
+                        heap, (-parent_commit.committer_time, parent, parent_commit)
+                    )
+        return result
+
+    def _kill(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+    def close(self) -> None:
+        """Stop the cat-file processes; they restart if the batch is used again."""
+        with self._lock:
+            for mode in list(self._procs):
+                self._kill(mode)
+
+    def retire(self) -> None:
+        """Stop the processes, and from now on only keep them for one request.
+
+        For a batch the pool no longer tracks while a caller may still hold
+        it: it keeps answering, but leaves no processes behind.
+        """
+        with self._lock:
+            self.retired = True
+            for mode in list(self._procs):
+                self._kill(mode)
+
+    def stop(self) -> None:
+        """Kill the cat-file processes for good; later requests raise GitPoolError.
+
+        Unlike close(), doesn't wait for a request in progress (a request
+        blocked on a process returns when it dies). GitPool replaces a
+        stopped batch.
+        """
+        self.stopped = True
+        for proc in list(self._procs.values()):
+            if proc.poll() is None:
+                proc.kill()
+
+
+class GitPool:
+    """A GitBatch per workspace, keeping at most max_repos alive at once.
+
+    The least recently used workspace's batch is retired when a new one is
+    needed (see GitBatch.retire), so a caller still using it gets answers
+    without the pool losing track of processes.
+    """
+
+    def __init__(self, max_repos: int = 8) -> None:
+        self.max_repos = max_repos
+        self._batches: OrderedDict[Path, tuple[tuple[int, int], GitBatch]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, repo: Path, env: dict[str, str] | None = None) -> GitBatch:
+        """Return the GitBatch for repo, starting a fresh one if repo was re-created.
+
+        A batch that was stopped is replaced too. env is the environment new
+        cat-file processes run in.
+        """
+        st = repo.stat()
+        identity = (st.st_dev, st.st_ino)
+        stale = None
+        evicted = []
+        with self._lock:
+            entry = self._batches.get(repo)
+            if entry is not None and entry[0] == identity and not entry[1].stopped:
+                self._batches.move_to_end(repo)
+                return entry[1]
+            if entry is not None:
+                stale = entry[1]
+            batch = GitBatch(repo, env)
+            self._batches[repo] = (identity, batch)
+            self._batches.move_to_end(repo)
+            while len(self._batches) > self.max_repos:
+                evicted.append(self._batches.popitem(last=False)[1][1])
+        for old in ([stale] if stale else []) + evicted:
+            old.retire()
+        return batch
+
+    def close(self) -> None:
+        """Stop every process in the pool."""
+        with self._lock:
+            batches = [batch for _, batch in self._batches.values()]
+            self._batches.clear()
+        for batch in batches:
+            batch.close()
@@ -0,0 +1,147 @@
+"""Recognise a solved exercise by a digest of its repository state.
+
+setup.sh and [setup] build the same repository on every machine, so the
+state a learner is asked to reach can often be described exactly. An
+exercise can record that state's digest next to its goal summary::
+
+    [goal]
+    summary = "Merge 'feature' into 'main'."
+    covers = ["head", "branches", "ancestry", "operation"]
+    digest = "3f9c..."
+
+and gitgym compares it against the workspace before running any check or
+script: a match means the goal is met. On a mismatch the exercise's
+[[checks]], verify.py or verify.sh run as usual and decide, with their
+messages (without any, the goal is simply not met).
+
+The digest is a SHA-256 of a canonical description of the parts of the
+state listed in ``covers``:
+
+- ``head``: the checked-out branch (or that HEAD is detached) and the tree
+  HEAD points at
+- ``branches`` / ``tags``: every branch or tag with the tree it points at
+  (tags are peeled)
+- ``ancestry``: the shape of each branch's history: every commit's tree
+  and its parents' shapes, recursively. Authors, dates and messages are
+  left out, so a learner's own commits match the reference solution's.
+- ``operation``: the merge, rebase, cherry-pick, revert or bisect in
+  progress, if any
+- ``status``: ``git status --porcelain`` (staged, modified and untracked
+  files)
+
+``gitgym goal-digest`` prints the table for the current workspace, to be
+pasted into exercise.toml once the exercise has been solved by hand.
+"""
+
+import hashlib
+
+from gitgym.repo import Repo
+
+COMPONENTS = ("head", "branches", "tags", "ancestry", "operation", "status")
+DEFAULT_COVERS = ("head", "branches", "ancestry", "operation")
+
+
+class GoalError(Exception):
+    """Raised when the digest spec in [goal] is invalid."""
+
+
+def parse_goal(goal: dict) -> tuple[tuple[str, ...], str]:
+    """Validate the digest spec from [goal]; return (covers, digest).
+
+    Raises GoalError naming the problem.
+    """
+    digest = goal.get("digest")
+    if not isinstance(digest, str) or len(digest) != 64:
+        raise GoalError("goal.digest must be a 64-character SHA-256 hex digest")
+    covers = goal.get("covers", list(DEFAULT_COVERS))
+    if not isinstance(covers, list) or not covers:
+        raise GoalError("goal.covers must be a non-empty list")
+    unknown = [c for c in covers if c not in COMPONENTS]
+    if unknown:
+        raise GoalError(
+            f"goal.covers: unknown component {', '.join(map(str, unknown))} "
+            f"(expected some of {', '.join(COMPONENTS)})"
+        )
+    return tuple(covers), digest.lower()
+
+
+def _refs(repo: Repo, prefix: str) -> list[tuple[str, str]]:
+    """Return (short name, object id) for every ref under prefix, sorted."""
+    return sorted(
+        (name.removeprefix(prefix), oid) for name, oid in repo.refs(prefix).items()
+    )
+
+
+def _tree(repo: Repo, rev: str) -> str:
+    """The tree rev points at (through tags), or a marker for anything else."""
+    commit = repo.commit(rev)
+    if commit is not None:
+        return commit.tree
+    info = repo.info(rev)
+    return "-" if info is None else f"{info[1]}:{info[0]}"
+
+
+def _shape(repo: Repo, oid: str, shapes: dict[str, str]) -> str:
+    """Hash of a commit's tree and its parents' shapes, memoized in shapes."""
+    stack = [oid]
+    while stack:
+        current = stack[-1]
+        if current in shapes:
+            stack.pop()
+            continue
+        commit = repo.commit(current)
+        if commit is None:
+            shapes[current] = "-"
+            stack.pop()
+            continue
+        missing = [p for p in commit.parents if p not in shapes]
+        if missing:
+            stack.extend(missing)
+            continue
+        h = hashlib.sha256(commit.tree.encode())
+        for parent in commit.parents:
+            h.update(shapes[parent].encode())
+        shapes[current] = h.hexdigest()
+        stack.pop()
+    return shapes[oid]
+
+
+def describe(repo: Repo, covers: tuple[str, ...] = DEFAULT_COVERS) -> str:
+    """Return the canonical description of the state components in covers."""
+    lines = []
+    branches = (
+        _refs(repo, "refs/heads/") if {"branches", "ancestry"} & set(covers) else []
+    )
+    for component in COMPONENTS:
+        if component not in covers:
+            continue
+        if component == "head":
+            branch = repo.head_branch()
+            lines.append(f"head {branch or '(detached)'} {_tree(repo, 'HEAD')}")
+        elif component == "branches":
+            for name, oid in branches:
+                lines.append(f"branch {name} {_tree(repo, oid)}")
+        elif component == "tags":
+            for name, oid in _refs(repo, "refs/tags/"):
+                lines.append(f"tag {name} {_tree(repo, oid)}")
+        elif component == "ancestry":
+            shapes: dict[str, str] = {}
+            tips = [(f"branch {name}", oid) for name, oid in branches]
+            if repo.head_branch() is None:
+                tips.append(("HEAD", repo.resolve("HEAD") or "-"))
+            for label, oid in tips:
+                lines.append(f"shape {label} {_shape(repo, oid, shapes)}")
+        elif component == "operation":
+            lines.append(f"operation {repo.operation() or '(none)'}")
+        elif component == "status":
+            result = repo.git(
+                "status", "--porcelain", "-z", "--no-renames", "--untracked-files=all"
+            )
+            for entry in sorted(filter(None, result.stdout.split("\0"))):
+                lines.append(f"status {entry}")
+    return "\n".join(lines) + "\n"
+
+
+def digest(repo: Repo, covers: tuple[str, ...] = DEFAULT_COVERS) -> str:
+    """Return the SHA-256 of describe(repo, covers)."""
+    return hashlib.sha256(describe(repo, covers).encode()).hexdigest()
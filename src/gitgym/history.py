@@ -0,0 +1,316 @@
+"""Build an exercise's initial repository from the declarative [setup] table.
+
+Instead of a bash script that forks one ``git`` per add/commit/switch, an
+exercise can describe its starting repository in exercise.toml::
+
+    [setup]
+    head = "main"                     # branch checked out at the end
+
+    [[setup.commits]]
+    id = "base"                       # optional name for later references
+    branch = "main"                   # default "main"
+    message = "Initial commit"
+    files = { "README.md" = "# Project\\n" }
+
+    [[setup.commits]]
+    branch = "feature"
+    from = "base"                     # parent of the first commit on a branch
+    message = "Add script"
+    files = { "run.sh" = { content = "echo hi\\n", executable = true } }
+    delete = ["README.md"]            # optional
+
+    [[setup.tags]]
+    name = "v1.0"
+    commit = "base"                   # commit id or branch name
+    message = "Release 1.0"           # optional; makes the tag annotated
+
+    [setup.branches]                  # extra branches
+    release = "base"
+
+    [setup.staged]                    # in the index and the working tree
+    "notes.txt" = "staged\\n"
+
+    [setup.worktree]                  # in the working tree only
+    "scratch.txt" = "dirty\\n"
+
+    [setup.config]
+    "alias.st" = "status"
+
+A commit's parent defaults to the current tip of its branch; the first commit
+on a new branch has no parent unless ``from`` is given. ``merge`` lists extra
+parents for merge commits. Every commit's tree starts from its first parent,
+so a merge commit must list the files it brings in from the other side.
+
+The repository is written in-process by :mod:`gitgym.gitfs`, without
+starting any git processes.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from gitgym.gitfs.objects import MODE_EXECUTABLE, MODE_FILE
+from gitgym.gitfs.repo import RepoWriter
+
+DEFAULT_BRANCH = "main"
+DEFAULT_AUTHOR = ("Git Gym", "gitgym@example.com")
+# Seconds between successive commits and tags in the generated history.
+TICK = 60
+
+
+class HistoryError(Exception):
+    """Raised when a [setup] spec is invalid or its repository can't be written."""
+
+
+@dataclass(frozen=True)
+class FileSpec:
+    content: bytes
+    executable: bool = False
+
+
+@dataclass
+class CommitSpec:
+    mark: int
+    branch: str
+    parents: list[int]
+    message: str
+    author: tuple[str, str]
+    timestamp: int
+    # path -> new contents, or None to delete the path
+    changes: dict[str, FileSpec | None]
+
+
+@dataclass
+class TagSpec:
+    name: str
+    target: int
+    message: str | None
+    tagger: tuple[str, str]
+    timestamp: int
+
+
+@dataclass
+class History:
+    head: str
+    commits: list[CommitSpec] = field(default_factory=list)
+    # Final position of every branch, including branches built by commits.
+    branches: dict[str, int] = field(default_factory=dict)
+    tags: list[TagSpec] = field(default_factory=list)
+    staged: dict[str, FileSpec] = field(default_factory=dict)
+    worktree: dict[str, FileSpec] = field(default_factory=dict)
+    config: dict[str, str] = field(default_factory=dict)
+
+
+def _check_path(path: str, where: str) -> str:
+    parts = path.split("/")
+    if (
+        not path
+        or any(c in path for c in "\0\n")
+        or any(part in ("", ".", "..") for part in parts)
+        or parts[0] == ".git"
+    ):
+        raise HistoryError(f"{where}: invalid path {path!r}")
+    return path
+
+
+def _parse_file(path: str, value) -> FileSpec:
+    if isinstance(value, str):
+        return FileSpec(value.encode())
+    if isinstance(value, dict) and isinstance(value.get("content"), str):
+        return FileSpec(value["content"].encode(), bool(value.get("executable")))
+    raise HistoryError(f"file '{path}' must be a string or {{ content = ... }}")
+
+
+def _parse_files(table: dict, where: str) -> dict[str, FileSpec]:
+    if not isinstance(table, dict):
+        raise HistoryError(f"{where} must be a table of path = content")
+    return {
+        _check_path(path, where): _parse_file(path, value)
+        for path, value in table.items()
+    }
+
+
+def _parse_identity(value: str | None) -> tuple[str, str]:
+    if value is None:
+        return DEFAULT_AUTHOR
+    name, sep, rest = value.partition("<")
+    if not sep or not rest.endswith(">"):
+        raise HistoryError(f"identity '{value}' must look like 'Name <email>'")
+    return name.strip(), rest[:-1].strip()
+
+
+def parse_spec(spec: dict, epoch: int) -> History:
+    """Validate a [setup] table and resolve it into a History.
+
+    Commit and tag timestamps start at epoch and advance by TICK seconds, so
+    the resulting object hashes depend only on the spec.
+    """
+    commits = spec.get("commits", [])
+    head = spec.get("head") or (
+        commits[0].get("branch", DEFAULT_BRANCH) if commits else DEFAULT_BRANCH
+    )
+    history = History(head=head)
+    ids: dict[str, int] = {}
+    tick = 0
+
+    def resolve(ref: str, where: str) -> int:
+        if ref in ids:
+            return ids[ref]
+        if ref in history.branches:
+            return history.branches[ref]
+        raise HistoryError(f"{where}: unknown commit or branch '{ref}'")
+
+    for index, raw in enumerate(commits, start=1):
+        where = f"setup.commits[{index}]"
+        if "message" not in raw:
+            raise HistoryError(f"{where} is missing 'message'")
+        branch = raw.get("branch", DEFAULT_BRANCH)
+        if "from" in raw:
+            parents = [resolve(raw["from"], where)]
+        elif branch in history.branches:
+            parents = [history.branches[branch]]
+        else:
+            parents = []
+        parents += [resolve(ref, where) for ref in raw.get("merge", [])]
+        changes: dict[str, FileSpec | None] = dict(
+            _parse_files(raw.get("files", {}), f"{where}.files")
+        )
+        for path in raw.get("delete", []):
+            changes[_check_path(path, f"{where}.delete")] = None
+        tick += 1
+        commit = CommitSpec(
+            mark=index,
+            branch=branch,
+            parents=parents,
+            message=raw["message"],
+            author=_parse_identity(raw.get("author")),
+            timestamp=epoch + tick * TICK,
+            changes=changes,
+        )
+        history.commits.append(commit)
+        history.branches[branch] = commit.mark
+        if "id" in raw:
+            if raw["id"] in ids:
+                raise HistoryError(f"{where}: duplicate id '{raw['id']}'")
+            ids[raw["id"]] = commit.mark
+
+    for name, ref in spec.get("branches", {}).items():
+        history.branches[name] = resolve(ref, f"setup.branches.{name}")
+
+    for index, raw in enumerate(spec.get("tags", []), start=1):
+        where = f"setup.tags[{index}]"
+        if "name" not in raw or "commit" not in raw:
+            raise HistoryError(f"{where} needs 'name' and 'commit'")
+        tick += 1
+        history.tags.append(
+            TagSpec(
+                name=raw["name"],
+                target=resolve(raw["commit"], where),
+                message=raw.get("message"),
+                tagger=_parse_identity(raw.get("tagger")),
+                timestamp=epoch + tick * TICK,
+            )
+        )
+
+    if history.commits and head not in history.branches:
+        raise HistoryError(f"setup.head: no branch named '{head}'")
+    history.staged = _parse_files(spec.get("staged", {}), "setup.staged")
+    history.worktree = _parse_files(spec.get("worktree", {}), "setup.worktree")
+    history.config = {str(k): str(v) for k, v in spec.get("config", {}).items()}
+    return history
+
+
+def _ident(identity: tuple[str, str], timestamp: int) -> str:
+    name, email = identity
+    return f"{name} <{email}> {timestamp} +0000"
+
+
+def _message(text: str) -> bytes:
+    return text.encode() if text.endswith("\n") else text.encode() + b"\n"
+
+
+def _config_text(config: dict[str, str]) -> str:
+    """Render 'section.key' / 'section.sub.key' pairs as git config file text."""
+    sections: dict[str, list[str]] = {}
+    for dotted, value in config.items():
+        section, _, key = dotted.rpartition(".")
+        if not section or not key:
+            raise HistoryError(f"setup.config: '{dotted}' is not a section.key name")
+        head, dot, sub = section.partition(".")
+        header = f'[{head} "{sub}"]' if dot else f"[{head}]"
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        sections.setdefault(header, []).append(f'\t{key} = "{escaped}"')
+    return "".join(f"{h}\n" + "\n".join(lines) + "\n" for h, lines in sections.items())
+
+
+def _write_files(directory: Path, files: dict[str, FileSpec]) -> None:
+    for rel, spec in files.items():
+        path = directory / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(spec.content)
+        path.chmod(0o755 if spec.executable else 0o644)
+
+
+def _write_history(history: History, directory: Path, config: dict[str, str]) -> None:
+    """Write history into directory with gitfs, without running git."""
+    repo = RepoWriter(directory, head=history.head)
+    shas: dict[int, str] = {}
+    # The flat path -> (mode, blob sha) tree of every commit, by mark.
+    trees: dict[int, dict[str, tuple[str, str]]] = {}
+
+    for commit in history.commits:
+        files = dict(trees[commit.parents[0]]) if commit.parents else {}
+        for path, spec in commit.changes.items():
+            if spec is None:
+                # Like 'git rm -r', deleting a directory removes its contents.
+                for existing in [
+                    p for p in files if p == path or p.startswith(path + "/")
+                ]:
+                    del files[existing]
+            else:
+                mode = MODE_EXECUTABLE if spec.executable else MODE_FILE
+                files[path] = (mode, repo.add_blob(spec.content))
+        trees[commit.mark] = files
+        ident = _ident(commit.author, commit.timestamp)
+        shas[commit.mark] = repo.add_commit(
+            repo.write_tree(files),
+            [shas[parent] for parent in commit.parents],
+            ident,
+            ident,
+            _message(commit.message),
+        )
+
+    for name, mark in history.branches.items():
+        repo.set_ref(f"refs/heads/{name}", shas[mark])
+    for tag in history.tags:
+        target = shas[tag.target]
+        if tag.message is not None:
+            target = repo.add_tag(
+                target,
+                tag.name,
+                _ident(tag.tagger, tag.timestamp),
+                _message(tag.message),
+            )
+        repo.set_ref(f"refs/tags/{tag.name}", target)
+
+    if history.head in history.branches:
+        repo.checkout(shas[history.branches[history.head]])
+    for path, spec in history.staged.items():
+        repo.stage(path, spec.content, spec.executable)
+    repo.finish(_config_text(config))
+
+
+def build_repository(spec: dict, directory: Path, epoch: int) -> None:
+    """Create the repository described by spec inside directory.
+
+    directory should be empty. Raises HistoryError if the spec is invalid or
+    the repository can't be written.
+    """
+    history = parse_spec(spec, epoch)
+    directory.mkdir(parents=True, exist_ok=True)
+    name, email = DEFAULT_AUTHOR
+    config = {"user.name": name, "user.email": email, **history.config}
+    try:
+        _write_history(history, directory, config)
+    except OSError as e:
+        raise HistoryError(f"could not write repository: {e}") from e
+    _write_files(directory, history.worktree)
@@ -0,0 +1,211 @@
+"""Cheap copies of cached workspace templates.
+
+A workspace is materialized from its template file by file, using the
+cheapest method the filesystem supports:
+
+- ``hardlink`` for immutable git objects (loose objects and packs). Git never
+  rewrites these in place, so the workspace and the template can share them.
+- ``reflink`` (copy-on-write clone via the FICLONE ioctl) for everything else,
+  on filesystems that support it (btrfs, XFS, bcachefs, ...).
+- ``copy`` as the fallback for mutable files such as the index, HEAD, refs and
+  the working tree when reflinks are unavailable.
+
+:func:`manifest` records a tree's state (every directory, file and symlink,
+with sizes, executable bits and content hashes) and :func:`sync` uses it to
+bring a used copy back to that state by touching only what differs.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from collections import Counter
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# Linux _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+STRATEGIES = ("reflink", "hardlink", "copy")
+
+_IMMUTABLE_OBJECT = re.compile(
+    r"^\.git/objects/(?:[0-9a-f]{2}/[0-9a-f]{38,62}|pack/pack-[0-9a-f]+\.(?:pack|idx|rev))$"
+)
+
+
+def _is_immutable_object(rel: str) -> bool:
+    """Return True if rel (a posix path relative to the workspace) is a git object file."""
+    return _IMMUTABLE_OBJECT.match(rel) is not None
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Clone src to dst with FICLONE. Returns False if the filesystem can't."""
+    if fcntl is None:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, dst)
+    return True
+
+
+class _Materializer:
+    """Copy one tree into another, remembering which strategies work."""
+
+    def __init__(self) -> None:
+        self.used: Counter[str] = Counter()
+        self._can_reflink = True
+        self._can_hardlink = True
+
+    def file(self, src: str, dst: str, rel: str) -> None:
+        if self._can_hardlink and _is_immutable_object(rel):
+            try:
+                os.link(src, dst)
+                self.used["hardlink"] += 1
+                return
+            except OSError:
+                # Cross-device or unsupported: stop trying for this tree.
+                self._can_hardlink = False
+        if self._can_reflink:
+            if _reflink(src, dst):
+                self.used["reflink"] += 1
+                return
+            self._can_reflink = False
+        shutil.copy2(src, dst)
+        self.used["copy"] += 1
+
+    def tree(self, source: Path, destination: Path) -> None:
+        for root, dirs, files in os.walk(source):
+            rel_root = os.path.relpath(root, source)
+            target_root = destination if rel_root == "." else destination / rel_root
+            target_root.mkdir(parents=True, exist_ok=True)
+            for name in dirs + files:
+                src = os.path.join(root, name)
+                if not os.path.islink(src):
+                    continue
+                os.symlink(os.readlink(src), target_root / name)
+            for name in files:
+                src = os.path.join(root, name)
+                if os.path.islink(src):
+                    continue
+                rel = name if rel_root == "." else f"{rel_root}/{name}"
+                self.file(src, str(target_root / name), rel.replace(os.sep, "/"))
+
+
+def describe(used: Counter) -> str:
+    """Return a short label such as 'hardlink+copy' for the strategies used."""
+    names = [name for name in STRATEGIES if used.get(name)]
+    return "+".join(names) if names else "copy"
+
+
+def materialize(source: Path, destination: Path) -> str:
+    """Copy the tree at source into destination as cheaply as possible.
+
+    destination must be empty or missing. Returns a label naming the
+    strategies that were used (see :func:`describe`).
+    """
+    materializer = _Materializer()
+    materializer.tree(source, destination)
+    return describe(materializer.used)
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def manifest(directory: Path) -> dict[str, list]:
+    """Describe every entry under directory, keyed by posix relative path.
+
+    Values are ``["d"]`` for directories, ``["l", target]`` for symlinks and
+    ``["f", size, executable, sha256]`` for regular files.
+    """
+    entries: dict[str, list] = {}
+    for root, dirs, files in os.walk(directory):
+        rel_root = os.path.relpath(root, directory)
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            rel = (name if rel_root == "." else f"{rel_root}/{name}").replace(
+                os.sep, "/"
+            )
+            if os.path.islink(path):
+                entries[rel] = ["l", os.readlink(path)]
+            elif name in dirs:
+                entries[rel] = ["d"]
+            else:
+                st = os.stat(path)
+                executable = bool(st.st_mode & 0o100)
+                entries[rel] = ["f", st.st_size, executable, _file_hash(path)]
+    return entries
+
+
+def _matches(path: str, rel: str, expected: list) -> bool:
+    """Return True if the entry at path is what the manifest expects."""
+    if os.path.islink(path):
+        return expected[0] == "l" and os.readlink(path) == expected[1]
+    if os.path.isdir(path):
+        return expected[0] == "d"
+    if expected[0] != "f":
+        return False
+    st = os.stat(path)
+    if st.st_size != expected[1] or bool(st.st_mode & 0o100) != expected[2]:
+        return False
+    # Object files are named after their content.
+    return _is_immutable_object(rel) or _file_hash(path) == expected[3]
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def sync(source: Path, destination: Path, entries: dict[str, list]) -> tuple[str, int]:
+    """Make destination match source, whose state entries records.
+
+    Entries missing from destination or different from the manifest are
+    copied from source (as cheaply as :func:`materialize` would), and
+    anything the manifest doesn't list is deleted -- stray work-tree files,
+    new objects and refs, in-progress merge or rebase state. Unchanged files
+    are left alone. Returns (strategy label, number of entries changed).
+    """
+    materializer = _Materializer()
+    changed: set[str] = set()
+    for root, dirs, files in os.walk(destination):
+        rel_root = os.path.relpath(root, destination)
+        for name in list(dirs) + files:
+            path = os.path.join(root, name)
+            rel = (name if rel_root == "." else f"{rel_root}/{name}").replace(
+                os.sep, "/"
+            )
+            expected = entries.get(rel)
+            if expected is not None and _matches(path, rel, expected):
+                continue
+            _remove(path)
+            changed.add(rel)
+            if name in dirs:
+                dirs.remove(name)
+
+    for rel, expected in entries.items():
+        target = destination / rel
+        if os.path.lexists(target):
+            continue
+        if expected[0] == "d":
+            target.mkdir(parents=True, exist_ok=True)
+        elif expected[0] == "l":
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.symlink(expected[1], target)
+            changed.add(rel)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            materializer.file(str(source / rel), str(target), rel)
+            changed.add(rel)
+    strategy = describe(materializer.used) if materializer.used else "unchanged"
+    return strategy, len(changed)
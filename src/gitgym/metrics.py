@@ -0,0 +1,61 @@
+"""Local timing records for setup runs and verification checks.
+
+Every run_setup call appends one JSON object to METRICS_FILE::
+
+    {"event": "setup", "exercise": "07_rebase/03_rebase_conflict",
+     "source": "setup.sh", "ok": true, "seconds": 0.412, "at": "..."}
+
+and every evaluation of an exercise's [[checks]] appends a "checks" event
+with the same fields plus the duration of each check that ran.
+
+The file is meant to be collected by fleet tooling (classroom servers,
+CI images) to spot slow or hanging exercises. Once it grows past
+METRICS_MAX_BYTES it is rotated to ``metrics.jsonl.1``, so at most two
+files' worth of history is kept. Recording never raises.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from gitgym.config import METRICS_FILE, METRICS_MAX_BYTES
+
+
+def record(event: str, **fields) -> None:
+    """Append an event with the given fields to METRICS_FILE."""
+    entry = {"event": event, **fields, "at": datetime.now(timezone.utc).isoformat()}
+    try:
+        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if METRICS_FILE.stat().st_size > METRICS_MAX_BYTES:
+                os.replace(
+                    METRICS_FILE, METRICS_FILE.with_name(METRICS_FILE.name + ".1")
+                )
+        except FileNotFoundError:
+            pass
+        # One write per line, in append mode, so concurrent writers
+        # (gitgym prepare, the prewarm worker) don't interleave records.
+        with open(METRICS_FILE, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+def load(event: str | None = None) -> list[dict]:
+    """Return the recorded entries, oldest first, optionally only one event type.
+
+    Lines that aren't valid JSON (a torn write) are skipped.
+    """
+    entries = []
+    try:
+        lines = METRICS_FILE.read_text().splitlines()
+    except OSError:
+        return entries
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if event is None or entry.get("event") == event:
+            entries.append(entry)
+    return entries
@@ -0,0 +1,206 @@
+"""Shared object store for exercise workspaces (git alternates).
+
+When OBJECT_STORE is set, every freshly built workspace moves its objects
+into that bare repository and borrows them back through
+``.git/objects/info/alternates``. Exercises share most of their objects
+(README blobs, identical trees), so hundreds of workspaces and cached
+templates end up holding little more than their refs and index.
+
+The store only ever grows: it has no refs, so it is configured never to
+prune, and gitgym never runs gc in it. Before moving or deleting a store,
+run :func:`dissociate_all` (``gitgym store dissociate``), which copies each
+workspace's objects back with ``git repack -a -d`` -- the same thing
+``git clone --dissociate`` does.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from gitgym.config import OBJECT_STORE, STAGING_DIR, WORKSPACE_DIR
+
+_ALTERNATES = Path("info") / "alternates"
+
+_STORE_CONFIG = (
+    "[core]\n"
+    "\trepositoryformatversion = 0\n"
+    "\tbare = true\n"
+    "[gc]\n"
+    "\tauto = 0\n"
+    "\tpruneExpire = never\n"
+)
+
+
+def enabled() -> bool:
+    return OBJECT_STORE is not None
+
+
+def _store_objects() -> Path:
+    return OBJECT_STORE / "objects"
+
+
+def init_store() -> Path:
+    """Create the bare store if needed and return its objects directory."""
+    objects = _store_objects()
+    for sub in ("pack", "info"):
+        (objects / sub).mkdir(parents=True, exist_ok=True)
+    (OBJECT_STORE / "refs").mkdir(exist_ok=True)
+    for name, text in (("HEAD", "ref: refs/heads/main\n"), ("config", _STORE_CONFIG)):
+        path = OBJECT_STORE / name
+        if not path.exists():
+            path.write_text(text)
+    return objects
+
+
+def _object_files(objects: Path) -> list[Path]:
+    """Return the loose objects and pack files in an objects directory.
+
+    Packs come before their .idx so git never sees an index whose pack is
+    missing.
+    """
+    files = [
+        path
+        for sub in objects.iterdir()
+        if len(sub.name) == 2 and sub.is_dir()
+        for path in sub.iterdir()
+    ]
+    pack_dir = objects / "pack"
+    if pack_dir.is_dir():
+        packs = [
+            p for p in pack_dir.glob("pack-*") if p.suffix in (".pack", ".rev", ".idx")
+        ]
+        files += sorted(packs, key=lambda p: (p.suffix == ".idx", p.name))
+    return files
+
+
+def _publish(source: Path, target: Path) -> None:
+    """Put source's contents at target, unless an object with that name exists."""
+    if target.exists():
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+        return
+    except FileExistsError:
+        return
+    except OSError:
+        pass
+    # Different filesystem: copy under a temporary name, then rename.
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def borrows(repo: Path) -> bool:
+    """Return True if repo's objects/info/alternates points at the store."""
+    if not enabled():
+        return False
+    alternates = repo / ".git" / "objects" / _ALTERNATES
+    try:
+        lines = alternates.read_text().splitlines()
+    except OSError:
+        return False
+    return str(_store_objects()) in lines
+
+
+def absorb(repo: Path) -> bool:
+    """Move repo's objects into the store and borrow them back.
+
+    Returns False (leaving repo untouched) if the store is disabled or repo
+    isn't a git repository. Objects are only removed from repo after they
+    are in the store and the alternates entry is written.
+    """
+    objects = repo / ".git" / "objects"
+    if not enabled() or not objects.is_dir():
+        return False
+    store_objects = init_store()
+
+    files = _object_files(objects)
+    for path in files:
+        _publish(path, store_objects / path.relative_to(objects))
+
+    alternates = objects / _ALTERNATES
+    alternates.parent.mkdir(exist_ok=True)
+    existing = alternates.read_text().splitlines() if alternates.exists() else []
+    if str(store_objects) not in existing:
+        alternates.write_text("\n".join([*existing, str(store_objects)]) + "\n")
+
+    for path in files:
+        path.unlink()
+    for sub in objects.iterdir():
+        if len(sub.name) == 2 and sub.is_dir() and not any(sub.iterdir()):
+            sub.rmdir()
+    return True
+
+
+def dissociate(repo: Path, env: dict[str, str]) -> bool:
+    """Copy every object repo needs back into it and stop borrowing.
+
+    git runs in env, which should be hermetic (gitgym.runner.hermetic_env)
+    so the learner's repack.*, pack.* or hooks settings can't change the
+    result. Returns True if repo no longer depends on any alternates.
+    """
+    alternates = repo / ".git" / "objects" / _ALTERNATES
+    if not alternates.exists():
+        return True
+    result = subprocess.run(
+        ["git", "repack", "-a", "-d", "-q"],
+        cwd=repo,
+        capture_output=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        return False
+    alternates.unlink()
+    return True
+
+
+def _repos(root: Path) -> list[Path]:
+    """Return the topic/exercise repositories under root."""
+    if not root.is_dir():
+        return []
+    return sorted(p.parent for p in root.glob("*/*/.git") if p.is_dir())
+
+
+def dissociate_all(
+    env: dict[str, str], roots: list[Path] | None = None
+) -> tuple[int, list[Path]]:
+    """Dissociate every topic/exercise repository under roots, running git in env.
+
+    roots defaults to WORKSPACE_DIR and STAGING_DIR. Returns (number
+    dissociated, repositories that failed).
+    """
+    done = 0
+    failed = []
+    repos = [
+        repo for root in roots or [WORKSPACE_DIR, STAGING_DIR] for repo in _repos(root)
+    ]
+    for repo in repos:
+        if not (repo / ".git" / "objects" / _ALTERNATES).exists():
+            continue
+        if dissociate(repo, env):
+            done += 1
+        else:
+            failed.append(repo)
+    return done, failed
+
+
+def store_stats() -> dict:
+    """Return the store's location, object counts and size, and its borrowers."""
+    stats = {
+        "path": OBJECT_STORE,
+        "loose": 0,
+        "packs": 0,
+        "bytes": 0,
+        "workspaces": sum(1 for repo in _repos(WORKSPACE_DIR) if borrows(repo)),
+    }
+    if not enabled() or not _store_objects().is_dir():
+        return stats
+    for path in _object_files(_store_objects()):
+        if path.suffix == ".pack":
+            stats["packs"] += 1
+        elif path.parent.name != "pack":
+            stats["loose"] += 1
+        stats["bytes"] += path.stat().st_size
+    return stats
@@ -0,0 +1,163 @@
+"""Exercise repositories prebuilt when the wheel is built.
+
+The hatch build hook (hatch_build.py) runs every exercise's setup once and
+ships the result next to ``gitgym/exercises``::
+
+    PREBUILT_DIR/<topic>/<exercise>/digest       # cache.definition_digest
+    PREBUILT_DIR/<topic>/<exercise>/repo.bundle  # every object, as a git bundle
+    PREBUILT_DIR/<topic>/<exercise>/overlay.tar  # work tree and .git minus objects
+
+A bundle only carries objects reachable from refs, so blobs that exist only
+in the index (staged files) or in reflogs are pinned under temporary
+``refs/gitgym-prebuilt/`` refs while the bundle is written. The overlay keeps
+the real refs, HEAD, index, config and working tree; restoring is one
+``git bundle unbundle`` into the extracted overlay.
+
+run_setup falls back to setup.sh whenever the files are missing (a source
+checkout) or the digest no longer matches the exercise definition.
+"""
+
+import subprocess
+import tarfile
+from pathlib import Path
+
+from gitgym.cache import clear_directory, definition_digest
+from gitgym.config import PREBUILT_DIR
+from gitgym.exercise import Exercise
+
+_DIGEST_FILE = "digest"
+_BUNDLE_FILE = "repo.bundle"
+_OVERLAY_FILE = "overlay.tar"
+_PIN_PREFIX = "refs/gitgym-prebuilt/"
+
+
+class PrebuiltError(Exception):
+    """Raised when a workspace cannot be packed into a bundle and overlay."""
+
+
+def _exercise_key(exercise: Exercise) -> str:
+    """Derive the progress key (topic_dir/exercise_dir) from the exercise path."""
+    return f"{exercise.path.parent.name}/{exercise.path.name}"
+
+
+def _git(repo: Path, env: dict[str, str], *args: str, stdin: str = "") -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise PrebuiltError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _unreachable_objects(repo: Path, env: dict[str, str]) -> list[str]:
+    """Return the objects in repo that no ref reaches (index blobs, reflogs)."""
+    everything = _git(
+        repo,
+        env,
+        "cat-file",
+        "--batch-all-objects",
+        "--batch-check=%(objectname)",
+    ).split()
+    reachable = {
+        line.split(" ", 1)[0]
+        for line in _git(repo, env, "rev-list", "--objects", "--all").splitlines()
+    }
+    return [oid for oid in everything if oid not in reachable]
+
+
+def _overlay_filter(info: tarfile.TarInfo) -> tarfile.TarInfo | None:
+    """Leave objects (they travel in the bundle) and the temporary pins out."""
+    parts = Path(info.name).parts
+    if parts[:2] == (".git", "objects") and len(parts) > 2:
+        return None
+    if parts[:3] == (".git", "refs", _PIN_PREFIX.split("/")[1]):
+        return None
+    return info
+
+
+def _is_ref(name: str) -> bool:
+    """Return True for overlay members that name objects: HEAD and refs."""
+    return name in (".git/HEAD", ".git/packed-refs") or name.startswith(".git/refs/")
+
+
+def pack(workspace: Path, target: Path, digest: str, env: dict[str, str]) -> None:
+    """Write workspace as a bundle and overlay under target.
+
+    env is the environment git runs in. Raises PrebuiltError if git fails.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    if (workspace / ".git").is_dir():
+        extra = _unreachable_objects(workspace, env)
+        if extra:
+            pins = "".join(f"create {_PIN_PREFIX}{oid} {oid}\n" for oid in extra)
+            _git(workspace, env, "update-ref", "--stdin", stdin=pins)
+        if _git(workspace, env, "cat-file", "--batch-all-objects", "--batch-check"):
+            _git(
+                workspace,
+                env,
+                "bundle",
+                "create",
+                "-q",
+                str(target / _BUNDLE_FILE),
+                "--all",
+            )
+        if extra:
+            unpins = "".join(f"delete {_PIN_PREFIX}{oid}\n" for oid in extra)
+            _git(workspace, env, "update-ref", "--stdin", stdin=unpins)
+
+    with tarfile.open(target / _OVERLAY_FILE, "w") as tar:
+        for child in sorted(workspace.iterdir()):
+            tar.add(child, arcname=child.name, filter=_overlay_filter)
+    (target / _DIGEST_FILE).write_text(digest + "\n")
+
+
+def lookup(exercise: Exercise) -> Path | None:
+    """Return the prebuilt directory for the exercise, or None if missing or stale."""
+    entry = PREBUILT_DIR / _exercise_key(exercise)
+    try:
+        digest = (entry / _DIGEST_FILE).read_text().strip()
+    except OSError:
+        return None
+    if digest != definition_digest(exercise) or not (entry / _OVERLAY_FILE).is_file():
+        return None
+    return entry
+
+
+def restore(exercise: Exercise, destination: Path, env: dict[str, str]) -> bool:
+    """Recreate the exercise's prebuilt repository in destination.
+
+    Returns False, leaving destination empty, if there is no usable prebuilt
+    copy or unpacking it fails; the caller then runs the setup as usual.
+    """
+    entry = lookup(exercise)
+    if entry is None:
+        return False
+    destination.mkdir(parents=True, exist_ok=True)
+    clear_directory(destination)
+    bundle = entry / _BUNDLE_FILE
+    try:
+        with tarfile.open(entry / _OVERLAY_FILE) as tar:
+            members = tar.getmembers()
+            if not bundle.is_file():
+                tar.extractall(destination, filter="data")
+                return True
+            # git refuses to work in a repository whose refs point at missing
+            # objects, so unbundle under a placeholder HEAD and no refs first.
+            refs = [m for m in members if _is_ref(m.name)]
+            rest = [m for m in members if not _is_ref(m.name)]
+            tar.extractall(destination, members=rest, filter="data")
+            git_dir = destination / ".git"
+            (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+            for sub in ("objects/info", "objects/pack", "refs"):
+                (git_dir / sub).mkdir(parents=True, exist_ok=True)
+            _git(destination, env, "bundle", "unbundle", str(bundle))
+            tar.extractall(destination, members=refs, filter="data")
+    except (OSError, tarfile.TarError, PrebuiltError):
+        clear_directory(destination)
+        return False
+    return True
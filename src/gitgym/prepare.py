@@ -0,0 +1,139 @@
+"""Provision many exercise workspaces at once.
+
+``gitgym prepare`` runs :func:`gitgym.runner.run_setup` for a batch of
+exercises on a bounded pool of worker threads. Each setup spends its time
+in setup.sh's git subprocesses (or in gitfs, which is quick), so threads are
+enough to keep every core busy without re-importing gitgym in each worker.
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from gitgym.config import WORKSPACE_DIR
+from gitgym.exercise import Exercise
+from gitgym.runner import run_setup
+
+
+@dataclass
+class PrepareResult:
+    key: str
+    ok: bool
+    seconds: float
+    # Whatever run_setup printed (error details on failure).
+    output: str = ""
+    # True if the workspace already existed and was left alone.
+    skipped: bool = False
+
+
+def _exercise_key(exercise: Exercise) -> str:
+    """Derive the progress key (topic_dir/exercise_dir) from the exercise path."""
+    return f"{exercise.path.parent.name}/{exercise.path.name}"
+
+
+def _workspace_path(exercise: Exercise) -> Path:
+    return WORKSPACE_DIR / exercise.path.parent.name / exercise.path.name
+
+
+class _ThreadOutput:
+    """A stdout stand-in that sends each worker thread's output to its own buffer.
+
+    Threads without a buffer (the main thread drawing the progress line) write
+    straight through to the real stream.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def _per_thread_stdout():
+    original = sys.stdout
+    sys.stdout = _ThreadOutput(original)
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = original
+
+
+def _prepare_one(exercise: Exercise, output: _ThreadOutput) -> PrepareResult:
+    """Set up one exercise; an exception fails it rather than the whole run."""
+    buffer = output.capture()
+    start = time.perf_counter()
+    try:
+        ok = run_setup(exercise)
+    except Exception as e:
+        print(f"Error: setup of exercise '{exercise.name}' failed: {e!r}")
+        ok = False
+    return PrepareResult(
+        key=_exercise_key(exercise),
+        ok=ok,
+        seconds=time.perf_counter() - start,
+        output=buffer.getvalue().strip(),
+    )
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def prepare(
+    exercises: list[Exercise],
+    *,
+    jobs: int | None = None,
+    force: bool = False,
+    on_result: Callable[[PrepareResult], None] | None = None,
+) -> list[PrepareResult]:
+    """Set up the workspace of every exercise, at most jobs at a time.
+
+    Exercises whose workspace already has content are skipped unless force
+    is set, so learners' work is never thrown away. on_result is called from
+    the calling thread as each exercise finishes. Results are returned in the
+    order of exercises.
+    """
+    jobs = max(1, jobs or default_jobs())
+    results: dict[str, PrepareResult] = {}
+    pending = []
+    for exercise in exercises:
+        workspace = _workspace_path(exercise)
+        if not force and workspace.is_dir() and any(workspace.iterdir()):
+            result = PrepareResult(_exercise_key(exercise), True, 0.0, skipped=True)
+            results[result.key] = result
+            if on_result:
+                on_result(result)
+        else:
+            pending.append(exercise)
+
+    with _per_thread_stdout() as output:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(pending) or 1)) as pool:
+            futures = [pool.submit(_prepare_one, ex, output) for ex in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.key] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[_exercise_key(ex)] for ex in exercises]
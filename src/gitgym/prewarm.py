@@ -0,0 +1,196 @@
+"""Background provisioning of the learner's upcoming exercises.
+
+After ``gitgym start``/``next``, a detached low-priority worker provisions the
+next PREWARM_COUNT incomplete exercises into STAGING_DIR. The following
+``gitgym next`` then renames the ready directory into the workspace instead of
+making the learner wait for setup.
+
+Staging layout::
+
+    STAGING_DIR/.lock                  # held by the worker while it runs
+    STAGING_DIR/<topic>/<exercise>/    # ready-to-use workspace
+    STAGING_DIR/<topic>/<exercise>.ready   # digest of the exercise it was built from
+
+A staged directory is only used when its ``.ready`` marker matches the
+current exercise digest, so edited exercises are never served stale.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from gitgym.cache import exercise_digest
+from gitgym.config import EXERCISES_DIR, PREWARM_COUNT, STAGING_DIR
+from gitgym.exercise import Exercise, load_exercise
+from gitgym.runner import run_setup
+
+_LOCK_FILE = ".lock"
+
+
+def _exercise_key(exercise: Exercise) -> str:
+    """Derive the progress key (topic_dir/exercise_dir) from the exercise path."""
+    return f"{exercise.path.parent.name}/{exercise.path.name}"
+
+
+def _staged_path(key: str) -> Path:
+    return STAGING_DIR / key
+
+
+def _marker_path(key: str) -> Path:
+    return STAGING_DIR / f"{key}.ready"
+
+
+def is_staged(exercise: Exercise) -> bool:
+    """Return True if a ready workspace for the current version of exercise is staged."""
+    key = _exercise_key(exercise)
+    marker = _marker_path(key)
+    try:
+        digest = marker.read_text().strip()
+    except OSError:
+        return False
+    return digest == exercise_digest(exercise) and _staged_path(key).is_dir()
+
+
+def upcoming(
+    exercises: list[Exercise], progress: dict, current: Exercise | None = None
+) -> list[Exercise]:
+    """Return the next PREWARM_COUNT incomplete exercises after current.
+
+    Exercises are ordered the way ``gitgym next`` walks them: the first
+    exercise whose status is not 'completed', then the one after, and so on.
+    """
+    ex_progress = progress.get("exercises", {})
+    result = []
+    for exercise in exercises:
+        if current is not None and exercise.path == current.path:
+            continue
+        status = ex_progress.get(_exercise_key(exercise), {}).get("status")
+        if status == "completed":
+            continue
+        result.append(exercise)
+        if len(result) >= PREWARM_COUNT:
+            break
+    return result
+
+
+def claim(exercise: Exercise, workspace: Path) -> bool:
+    """Move a staged workspace for exercise into place.
+
+    Only succeeds when the staged copy is current and the workspace is missing
+    or empty; otherwise returns False and the caller should run setup normally.
+    The rename is atomic, so concurrent callers can't both claim the same copy.
+    """
+    if not is_staged(exercise):
+        return False
+    if workspace.exists():
+        if not workspace.is_dir() or any(workspace.iterdir()):
+            return False
+    workspace.parent.mkdir(parents=True, exist_ok=True)
+    key = _exercise_key(exercise)
+    try:
+        os.rename(_staged_path(key), workspace)
+    except OSError:
+        return False
+    _marker_path(key).unlink(missing_ok=True)
+    return True
+
+
+def spawn_worker(exercises: list[Exercise]) -> None:
+    """Start a detached worker that stages the given exercises.
+
+    Exercises that already have a current staged copy are skipped; no process
+    is started when there's nothing to do.
+    """
+    keys = [_exercise_key(ex) for ex in exercises if not is_staged(ex)]
+    if keys:
+        _launch(keys)
+
+
+def _launch(keys: list[str]) -> None:
+    """Run ``python -m gitgym.prewarm KEY...`` in its own session, fully detached."""
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "gitgym.prewarm", *keys],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def _lower_priority() -> None:
+    """Drop CPU and I/O priority so setup doesn't compete with the learner's git."""
+    try:
+        os.nice(19)
+    except OSError:
+        pass
+    pid = str(os.getpid())
+    if shutil.which("ionice"):
+        command = ["ionice", "-c", "3", "-p", pid]
+    elif shutil.which("taskpolicy"):
+        command = ["taskpolicy", "-b", "-p", pid]
+    else:
+        return
+    subprocess.run(command, capture_output=True)
+
+
+def _stage(exercise: Exercise) -> bool:
+    """Provision exercise into its staging directory. Returns True on success."""
+    key = _exercise_key(exercise)
+    staged = _staged_path(key)
+    marker = _marker_path(key)
+    building = STAGING_DIR / f".{exercise.path.name}.{os.getpid()}.tmp"
+
+    marker.unlink(missing_ok=True)
+    if staged.exists():
+        shutil.rmtree(staged, ignore_errors=True)
+    if building.exists():
+        shutil.rmtree(building)
+
+    if not run_setup(exercise, destination=building):
+        shutil.rmtree(building, ignore_errors=True)
+        return False
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    os.rename(building, staged)
+    marker.write_text(exercise_digest(exercise) + "\n")
+    return True
+
+
+def prewarm(keys: list[str]) -> int:
+    """Stage the exercises named by keys. Returns the number staged.
+
+    Holds an exclusive lock for the duration, so a second worker started by a
+    concurrent CLI call exits immediately instead of provisioning twice.
+    """
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    with open(STAGING_DIR / _LOCK_FILE, "w") as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0
+        staged = 0
+        for key in keys:
+            exercise_dir = EXERCISES_DIR / key
+            if not (exercise_dir / "exercise.toml").is_file():
+                continue
+            exercise = load_exercise(exercise_dir)
+            if is_staged(exercise):
+                continue
+            if _stage(exercise):
+                staged += 1
+        return staged
+
+
+if __name__ == "__main__":
+    _lower_priority()
+    prewarm(sys.argv[1:])
@@ -52,6 +52,22 @@ def mark_completed(exercise_key: str) -> None:
     save_progress(data)
 
 
+def mark_completed_many(exercise_keys: list[str]) -> None:
+    """Mark several exercises completed with a single read and write of the file."""
+    if not exercise_keys:
+        return
+    data = load_progress()
+    now = datetime.now(timezone.utc).isoformat()
+    for key in exercise_keys:
+        existing = data["exercises"].get(key, {})
+        data["exercises"][key] = {
+            **existing,
+            "status": "completed",
+            "completed_at": now,
+        }
+    save_progress(data)
+
+
 def increment_hints_used(exercise_key: str) -> None:
     """Increment the hints_used counter for an exercise."""
     data = load_progress()
@@ -0,0 +1,260 @@
+"""The repository handle given to verify.py and the [[checks]] engine.
+
+An exercise can ship a ``verify.py`` instead of ``verify.sh``::
+
+    from gitgym.repo import Repo, Result
+
+    def check(repo: Repo) -> Result:
+        if repo.head_branch() != "bugfix":
+            return Result(False, "Switch to the 'bugfix' branch.")
+        if repo.commit("HEAD").subject != "Fix typo":
+            return Result(False, "Commit the fix with the message 'Fix typo'.")
+        return Result(True, "Well done!")
+
+gitgym imports the module once (again only when the file changes) and calls
+``check`` in-process for every verification. A :class:`Repo` lives for one
+verification: lookups go through the workspace's pooled cat-file processes
+(see gitgym.gitpool) and are remembered for the rest of the call, so asking
+for ``HEAD`` twice costs one round trip. Branch, tag and other ref names
+are read from .git directly (see gitgym.gitfs.refs), without asking git at
+all. ``repo.snapshot()`` reads the refs, ``git status`` and the history in
+one go, for checks that need much of it.
+
+When a verification times out, the runner calls :meth:`Repo.stop`, which
+kills the git commands the Repo is still running (each leads its own
+process group, so the editor or pager it started goes too) and its
+cat-file processes; the Repo can't be used after that.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from gitgym.gitfs import refs as gitfs_refs
+from gitgym.gitpool import Commit, GitBatch
+
+if TYPE_CHECKING:
+    from gitgym.snapshot import RepoSnapshot
+
+# Files and directories git leaves in .git while an operation is unfinished.
+_OPERATION_STATE = {
+    "MERGE_HEAD": "merge",
+    "rebase-merge": "rebase",
+    "rebase-apply": "rebase",
+    "CHERRY_PICK_HEAD": "cherry-pick",
+    "REVERT_HEAD": "revert",
+    "BISECT_LOG": "bisect",
+}
+
+
+class StoppedError(Exception):
+    """Raised when a Repo is used after its verification was stopped."""
+
+
+@dataclass(frozen=True)
+class Result:
+    """The outcome of verify.py's check(): whether the goal is met and why."""
+
+    passed: bool
+    message: str = ""
+
+
+def operation_in(git_dir: Path) -> str | None:
+    """Return the operation left unfinished in git_dir ('merge', ...), if any."""
+    for entry, operation in _OPERATION_STATE.items():
+        if (git_dir / entry).exists():
+            return operation
+    return None
+
+
+def _config_key(key: str) -> str:
+    """Normalise key the way git lists it: only the subsection keeps its case."""
+    section, _, rest = key.partition(".")
+    subsection, _, name = rest.rpartition(".")
+    if not subsection:
+        return f"{section}.{name}".lower()
+    return f"{section.lower()}.{subsection}.{name.lower()}"
+
+
+class Repo:
+    """Read-only access to a workspace repository for one verification."""
+
+    def __init__(self, path: Path, batch: GitBatch, env: dict[str, str]) -> None:
+        self.path = path
+        self.git_dir = path / ".git"
+        self._batch = batch
+        self._env = env
+        self._info: dict[str, tuple[str, str, int] | None] = {}
+        self._resolved: dict[str, str | None] = {}
+        self._objects: dict[str, tuple[str, bytes] | None] = {}
+        self._commits: dict[str, Commit | None] = {}
+        self._config: dict[str, str] | None = None
+        self._snapshot: RepoSnapshot | None = None
+        # git commands running now (see stop())
+        self._running: set[subprocess.Popen] = set()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def head_branch(self) -> str | None:
+        """Return the checked-out branch name, or None if HEAD is detached."""
+        try:
+            return gitfs_refs.head_branch(self.git_dir)
+        except gitfs_refs.RefError:
+            result = self.git("symbolic-ref", "--short", "-q", "HEAD")
+            return result.stdout.strip() or None
+
+    def operation(self) -> str | None:
+        """Return the unfinished operation ('merge', 'rebase', ...), if any."""
+        return operation_in(self.git_dir)
+
+    def info(self, rev: str) -> tuple[str, str, int] | None:
+        """Return (oid, type, size) for a revision, or None if it doesn't exist."""
+        if rev not in self._info:
+            self._info[rev] = self._batch.info(rev)
+        return self._info[rev]
+
+    def resolve(self, rev: str) -> str | None:
+        """Return the object id rev names (a ref, 'HEAD~2', 'main:file', ...)."""
+        if rev not in self._resolved:
+            try:
+                found = gitfs_refs.dwim_ref(self.git_dir, rev)
+            except gitfs_refs.RefError:
+                found = None
+            if found is not None:
+                self._resolved[rev] = found[1]
+            else:
+                info = self.info(rev)
+                self._resolved[rev] = None if info is None else info[0]
+        return self._resolved[rev]
+
+    def ref(self, name: str) -> str | None:
+        """Return the object id the full ref name points to, or None if it doesn't exist."""
+        try:
+            return gitfs_refs.resolve_ref(self.git_dir, name)
+        except gitfs_refs.RefError:
+            return self.resolve(name)
+
+    def refs(self, prefix: str = "refs/") -> dict[str, str]:
+        """Return {full ref name: object id} for the refs under prefix, sorted.
+
+        For example ``repo.refs("refs/heads/")`` lists the branches.
+        """
+        try:
+            return gitfs_refs.list_refs(self.git_dir, prefix)
+        except gitfs_refs.RefError:
+            result = self.git(
+                "for-each-ref", "--format=%(refname)%00%(objectname)", prefix
+            )
+            return dict(
+                line.split("\0", 1) for line in result.stdout.splitlines() if line
+            )
+
+    def read(self, rev: str) -> tuple[str, bytes] | None:
+        """Return (type, content) of the object rev names, or None."""
+        if rev not in self._objects:
+            self._objects[rev] = self._batch.read(rev)
+        return self._objects[rev]
+
+    def commit(self, rev: str) -> Commit | None:
+        """Return the commit rev names (tags are peeled), or None."""
+        if rev not in self._commits:
+            commit = self._batch.commit(rev)
+            self._commits[rev] = commit
+            if commit is not None:
+                self._commits.setdefault(commit.oid, commit)
+        return self._commits[rev]
+
+    def commits(
+        self, include: str | list[str], exclude: list[str] | None = None
+    ) -> list[Commit]:
+        """Return the commits in ``git rev-list include ^exclude...``, newest first."""
+        return self._batch.commits(include, exclude)
+
+    def config(self, key: str) -> str | None:
+        """Return the value of a config key as git would see it, or None.
+
+        The whole configuration is read with one git process on first use.
+        """
+        if self._config is None:
+            result = self.git("config", "--list", "-z")
+            self._config = {}
+            for item in result.stdout.split("\0"):
+                if item:
+                    name, _, value = item.partition("\n")
+                    self._config[name] = value
+        return self._config.get(_config_key(key))
+
+    def snapshot(self) -> "RepoSnapshot":
+        """Return a RepoSnapshot of the refs, status and history.
+
+        Taken with three git commands on first use and kept for the call;
+        see gitgym.snapshot.
+        """
+        from gitgym.snapshot import take
+
+        if self._snapshot is None:
+            if self._stopped:
+                raise StoppedError(f"verification of {self.path} was stopped")
+            self._snapshot = take(self.path, self._env)
+        return self._snapshot
+
+    def git(self, *args: str) -> subprocess.CompletedProcess:
+        """Run a git command in the workspace, in the verification environment.
+
+        For anything the other methods don't cover; output is captured as
+        text, and stdin is /dev/null so a command can't wait for input. The
+        command runs in a new session, so stop() can kill it along with
+        anything it starts. Raises StoppedError after stop().
+        """
+        with self._lock:
+            if self._stopped:
+                raise StoppedError(f"verification of {self.path} was stopped")
+            proc = subprocess.Popen(
+                ["git", *args],
+                cwd=self.path,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace",
+                env=self._env,
+                start_new_session=True,
+            )
+            self._running.add(proc)
+        with proc:
+            try:
+                stdout, stderr = proc.communicate()
+            except BaseException:
+                proc.kill()
+                raise
+            finally:
+                with self._lock:
+                    self._running.discard(proc)
+        return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+    def stop(self, on_stop: Callable[[int], None] | None = None) -> None:
+        """Kill the git commands still running and stop the cat-file processes.
+
+        Called from another thread when the verification using the Repo
+        times out; doesn't wait for it. on_stop, if given, is called with
+        the process group of each running command (led by git) just before
+        it is killed.
+        """
+        with self._lock:
+            self._stopped = True
+            running = list(self._running)
+        for proc in running:
+            if proc.poll() is not None:
+                continue
+            if on_stop is not None:
+                on_stop(proc.pid)
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self._batch.stop()
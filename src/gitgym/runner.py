@@ -1,9 +1,112 @@
+import asyncio
+import atexit
+import contextvars
+import functools
 import os
+import signal
 import subprocess
+import tempfile
+import threading
+import time
+import traceback
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+from types import ModuleType
 
-from gitgym.config import EXERCISES_DIR, WORKSPACE_DIR
+from gitgym import (
+    __version__,
+    cache,
+    checkstats,
+    golden,
+    metrics,
+    objectstore,
+    prebuilt,
+    verifycache,
+)
+from gitgym.bashworker import BashWorkerError, WorkerPool, runs_in_worker
+from gitgym.checks import CheckError, parse_checks, run_checks
+from gitgym.config import (
+    ASYNC_CONCURRENCY,
+    EXERCISES_DIR,
+    GIT_CONFIG_FILE,
+    SETUP_TIMEOUT,
+    VERIFY_TIMEOUT,
+    WORKSPACE_DIR,
+)
 from gitgym.exercise import Exercise
+from gitgym.explain import Trace
+from gitgym.gitpool import GitBatch, GitPool, GitPoolError
+from gitgym.history import HistoryError, build_repository
+from gitgym.repo import Repo, Result
+from gitgym.verification import CheckReport, Verification, parse_reports
+
+# setup.sh runs with a pinned identity and clock so that the repositories it
+# builds are bit-for-bit reproducible: 2026-01-01T00:00:00Z, advanced by one
+# minute per git invocation (see shell/setup_env.sh).
+SETUP_EPOCH = 1767225600
+SETUP_AUTHOR_NAME = "Git Gym"
+SETUP_AUTHOR_EMAIL = "gitgym@example.com"
+
+_SETUP_ENV_SCRIPT = Path(__file__).parent / "shell" / "setup_env.sh"
+_VERIFY_ENV_SCRIPT = Path(__file__).parent / "shell" / "verify_env.sh"
+
+# Written to GIT_CONFIG_FILE and used as the only global git config for setup
+# and verify scripts, so nothing in the learner's ~/.gitconfig (signing,
+# hooks, fsmonitor, pagers, ...) can slow them down or change their result.
+# Bump cache.CACHE_FORMAT when changing anything that affects setup output.
+GIT_CONFIG = """\
+# Managed by gitgym and rewritten as needed; edits will be lost.
+[core]
+\thooksPath = /dev/null
+\tfsmonitor = false
+\tpager = cat
+[commit]
+\tgpgSign = false
+[tag]
+\tgpgSign = false
+[gc]
+\tauto = 0
+[maintenance]
+\tauto = false
+[init]
+\tdefaultBranch = main
+"""
+
+# Inherited GIT_* variables are dropped (they could point git at another
+# repository, index or config), except these.
+_KEEP_GIT_VARIABLES = {"GIT_EXEC_PATH"}
+
+# Serialises writes of GIT_CONFIG_FILE between threads (see _write_git_config).
+_git_config_lock = threading.Lock()
+# Where to write the managed config instead of GIT_CONFIG_FILE, when set
+# (prebuild keeps it out of the builder's home directory).
+_git_config_override: contextvars.ContextVar[Path | None] = contextvars.ContextVar(
+    "gitgym_git_config", default=None
+)
+
+
+# cat-file processes shared by everything in this process that reads
+# exercise repositories (see gitgym.gitpool); watch mode keeps them warm.
+_GIT_POOL = GitPool()
+atexit.register(_GIT_POOL.close)
+
+# Long-lived bash processes that run verify.sh inside a verify_workers()
+# block (see gitgym.bashworker); watch mode uses them.
+_BASH_WORKERS = WorkerPool()
+atexit.register(_BASH_WORKERS.close)
+_use_bash_workers = False
+
+# Loaded verify.py modules by path, with the (mtime, size) they were loaded
+# at, so watch mode calls check() again without re-importing.
+_VERIFY_MODULES: dict[Path, tuple[tuple[int, int], ModuleType]] = {}
+
+# The default concurrency limit of the async API, one per event loop (an
+# asyncio.Semaphore can't be shared between loops).
+_SEMAPHORES: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def _workspace_path(exercise: Exercise) -> Path:
@@ -12,63 +115,682 @@ def _workspace_path(exercise: Exercise) -> Path:
     return WORKSPACE_DIR / relative
 
 
-def run_setup(exercise: Exercise) -> bool:
+def _write_git_config() -> Path:
+    """Make sure GIT_CONFIG_FILE holds GIT_CONFIG and return its path.
+
+    Within prebuild, the file is a temporary one instead.
+    """
+    path = _git_config_override.get() or GIT_CONFIG_FILE
+    try:
+        if path.read_text() == GIT_CONFIG:
+            return path
+    except OSError:
+        pass
+    # The temporary name is only unique per process; threads take turns.
+    with _git_config_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(GIT_CONFIG)
+        os.replace(tmp, path)
+    return path
+
+
+def hermetic_env(*, learner_config: bool = False) -> dict[str, str]:
+    """Return a hermetic environment for running git outside any exercise.
+
+    System and global git config are replaced by GIT_CONFIG_FILE, inherited
+    GIT_* variables are dropped, and the locale and pager are pinned. With
+    learner_config, the learner's own global and system config stay visible.
+    """
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith("GIT_") or key in _KEEP_GIT_VARIABLES
+    }
+    env.update(
+        {
+            "LC_ALL": "C",
+            "LANG": "C",
+            "GIT_PAGER": "cat",
+            "PAGER": "cat",
+            "GIT_TERMINAL_PROMPT": "0",
+        }
+    )
+    if not learner_config:
+        env["GIT_CONFIG_NOSYSTEM"] = "1"
+        env["GIT_CONFIG_GLOBAL"] = str(_write_git_config())
+    return env
+
+
+def _git_env(exercise: Exercise, *, learner_config: bool = False) -> dict[str, str]:
+    """Return a hermetic environment for running an exercise's scripts.
+
+    See hermetic_env. With learner_config, the learner's own global and
+    system config stay visible (for exercises where the learner is asked to
+    change them).
+
+    The exercise's [environment] table can add settings::
+
+        [environment]
+        learner_config = true           # verify.sh only, see run_verify
+        setup_timeout = 120             # seconds, see build_workspace
+        verify_timeout = 60             # seconds, see run_verification
+
+        [environment.git_config]        # passed as GIT_CONFIG_KEY_n/VALUE_n
+        "merge.conflictStyle" = "diff3"
+
+        [environment.variables]         # extra environment variables
+        EDITOR = "true"
+    """
+    env = hermetic_env(learner_config=learner_config)
+    git_config = exercise.environment.get("git_config", {})
+    if git_config:
+        env["GIT_CONFIG_COUNT"] = str(len(git_config))
+        for i, (key, value) in enumerate(git_config.items()):
+            env[f"GIT_CONFIG_KEY_{i}"] = key
+            env[f"GIT_CONFIG_VALUE_{i}"] = str(value)
+    for key, value in exercise.environment.get("variables", {}).items():
+        env[key] = str(value)
+    return env
+
+
+def _setup_env(exercise: Exercise) -> dict[str, str]:
+    """Return the environment setup.sh runs in.
+
+    On top of the hermetic git environment, identity and commit dates are
+    fixed, and BASH_ENV installs a git wrapper that ticks the dates forward
+    per invocation, so the same setup.sh always produces the same commit
+    hashes.
+    """
+    date = f"@{SETUP_EPOCH} +0000"
+    return {
+        **_git_env(exercise),
+        "GIT_AUTHOR_NAME": SETUP_AUTHOR_NAME,
+        "GIT_AUTHOR_EMAIL": SETUP_AUTHOR_EMAIL,
+        "GIT_COMMITTER_NAME": SETUP_AUTHOR_NAME,
+        "GIT_COMMITTER_EMAIL": SETUP_AUTHOR_EMAIL,
+        "GIT_AUTHOR_DATE": date,
+        "GIT_COMMITTER_DATE": date,
+        "GITGYM_SETUP_EPOCH": str(SETUP_EPOCH),
+        "BASH_ENV": str(_SETUP_ENV_SCRIPT),
+        "TZ": "UTC",
+    }
+
+
+def git_batch(exercise: Exercise) -> GitBatch:
+    """Return long-lived cat-file processes for the exercise's workspace.
+
+    They run in the exercise's hermetic git environment and are shared with
+    every other caller in this process until it exits.
+    """
+    return _GIT_POOL.get(_workspace_path(exercise), _git_env(exercise))
+
+
+@contextmanager
+def verify_workers() -> Iterator[None]:
+    """Run bash verify.sh scripts in long-lived workers within the block.
+
+    For callers that verify the same workspaces again and again, like watch
+    mode: each verification then costs a fork of a waiting bash instead of
+    a new interpreter (see gitgym.bashworker). The workers are stopped when
+    the block ends.
+    """
+    global _use_bash_workers
+    previous, _use_bash_workers = _use_bash_workers, True
+    try:
+        yield
+    finally:
+        _use_bash_workers = previous
+        if not previous:
+            _BASH_WORKERS.close()
+
+
+def _print_bug_report_hint() -> None:
+    print(
+        "This looks like a bug in the exercise definition. "
+        "Please file a bug report at https://github.com/enerrio/git-gym/issues"
+    )
+
+
+def _kill_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill every process in proc's process group (it leads its own session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _run_script(
+    args: list[str],
+    env: dict[str, str],
+    timeout: float | None,
+    on_line: Callable[[str], None] | None = None,
+    pass_fds: tuple[int, ...] = (),
+    on_stop: Callable[[int], None] | None = None,
+) -> tuple[int | None, str]:
+    """Run a script in a new session, reading its combined output line by line.
+
+    on_line is called with each line as it arrives. Returns (exit code,
+    output); the exit code is None if the script hadn't finished after
+    timeout seconds (None for no limit), in which case its whole process
+    group (the script and any git, editor or pager it started) is killed.
+    The same happens when the awaiting task is cancelled, before the
+    cancellation propagates. on_stop, if given, is called with the process
+    group id just before a script that is still running is killed. Having
+    no controlling terminal and stdin from /dev/null, an editor or prompt
+    fails instead of waiting for input.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+        start_new_session=True,
+        pass_fds=pass_fds,
+    )
+    lines: list[str] = []
+    pending = b""
+    timed_out = False
+
+    def _emit(raw: bytes) -> None:
+        line = raw.decode(errors="replace").rstrip("\r\n")
+        lines.append(line)
+        if on_line is not None:
+            on_line(line)
+
+    async def _read_until_exit() -> None:
+        nonlocal pending
+        while chunk := await proc.stdout.read(65536):
+            pending += chunk
+            *complete, pending = pending.split(b"\n")
+            for raw in complete:
+                _emit(raw)
+        await proc.wait()
+
+    try:
+        async with asyncio.timeout(timeout):
+            await _read_until_exit()
+    except TimeoutError:
+        timed_out = True
+    finally:
+        if on_stop is not None and proc.returncode is None:
+            on_stop(proc.pid)
+        # Also reaps anything the script left running in the background.
+        _kill_group(proc)
+        await proc.wait()
+    if pending:
+        _emit(pending)
+    return (None if timed_out else proc.returncode), "\n".join(lines)
+
+
+@asynccontextmanager
+async def _limit(semaphore: asyncio.Semaphore | None) -> AsyncIterator[None]:
+    """Hold semaphore, or the running loop's default one, for the block."""
+    if semaphore is None:
+        loop = asyncio.get_running_loop()
+        semaphore = _SEMAPHORES.get(loop)
+        if semaphore is None:
+            semaphore = _SEMAPHORES[loop] = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    async with semaphore:
+        yield
+
+
+def _setup_timeout(exercise: Exercise) -> float:
+    return float(exercise.environment.get("setup_timeout", SETUP_TIMEOUT))
+
+
+def verify_timeout(exercise: Exercise) -> float:
+    """Seconds a verification of the exercise may take (see run_verification)."""
+    return float(exercise.environment.get("verify_timeout", VERIFY_TIMEOUT))
+
+
+def build_workspace(
+    exercise: Exercise, workspace_path: Path, *, verbose: bool = False
+) -> str | None:
+    """Build the exercise's initial repository in workspace_path.
+
+    Runs the [setup] spec if the exercise has one, setup.sh otherwise, and
+    returns a description of which was used. Returns None (after printing
+    the error) if the build failed. The cache is not consulted.
+
+    setup.sh is stopped after SETUP_TIMEOUT seconds, or the exercise's
+    setup_timeout from its [environment] table. With verbose=True its output
+    is printed line by line as it runs.
+    """
+    return asyncio.run(_build_workspace(exercise, workspace_path, verbose=verbose))
+
+
+async def _build_workspace(
+    exercise: Exercise,
+    workspace_path: Path,
+    *,
+    verbose: bool = False,
+    timeout: float | None = None,
+) -> str | None:
+    """build_workspace; timeout overrides the exercise's setup timeout."""
+    setup_script = exercise.path / "setup.sh"
+    if exercise.setup:
+        source = "the [setup] spec"
+        try:
+            await asyncio.to_thread(
+                build_repository,
+                exercise.setup,
+                workspace_path,
+                SETUP_EPOCH,
+            )
+        except HistoryError as e:
+            print(
+                f"Error: [setup] in exercise.toml for exercise '{exercise.name}' "
+                f"could not be built: {e}"
+            )
+            _print_bug_report_hint()
+            return None
+    else:
+        source = "setup.sh"
+        if timeout is None:
+            timeout = _setup_timeout(exercise)
+        returncode, output = await _run_script(
+            [str(setup_script), str(workspace_path)],
+            _setup_env(exercise),
+            timeout,
+            on_line=(lambda line: print(f"  | {line}", flush=True))
+            if verbose
+            else None,
+        )
+
+        if returncode is None:
+            print(
+                f"Error: setup.sh for exercise '{exercise.name}' did not finish "
+                f"within {timeout:g} seconds and was stopped."
+            )
+        elif returncode != 0:
+            print(
+                f"Error: setup.sh for exercise '{exercise.name}' failed (exit code {returncode})."
+            )
+        if returncode != 0:
+            # Already shown line by line in verbose mode.
+            if output and not verbose:
+                print(output)
+            _print_bug_report_hint()
+            return None
+
+    return source
+
+
+def prebuild(exercise: Exercise, target: Path) -> bool:
+    """Build the exercise once and store it as a bundle and overlay in target.
+
+    Used by the wheel build hook (hatch_build.py); see gitgym.prebuilt.
+    Returns False, after printing the error, if the setup or packing failed.
+    The managed git config is written next to the temporary workspace, not
+    to GIT_CONFIG_FILE, so building a wheel doesn't touch the home directory.
+    """
+    with tempfile.TemporaryDirectory(prefix="gitgym-prebuild-") as tmp:
+        workspace = Path(tmp) / "workspace"
+        workspace.mkdir()
+        token = _git_config_override.set(Path(tmp) / "gitconfig")
+        try:
+            if build_workspace(exercise, workspace) is None:
+                return False
+            prebuilt.pack(
+                workspace,
+                target,
+                cache.definition_digest(exercise),
+                _git_env(exercise),
+            )
+        except prebuilt.PrebuiltError as e:
+            print(f"Error: could not prebuild exercise '{exercise.name}': {e}")
+            return False
+        finally:
+            _git_config_override.reset(token)
+    return True
+
+
+def run_setup(
+    exercise: Exercise, *, verbose: bool = False, destination: Path | None = None
+) -> bool:
     """Run setup.sh for the exercise, passing the workspace path as $1.
 
+    Exercises with a [setup] table in exercise.toml are built from that spec
+    instead (see gitgym.history); setup.sh is only needed without one.
+
+    The first successful run is stored as a pristine template in the cache;
+    later runs restore the workspace from that template instead of
+    re-running the script, using the cheapest copy strategy the filesystem
+    supports (see gitgym.materialize). An existing workspace (on reset) is
+    repaired in place: only files that differ from the template are
+    rewritten and anything new is removed. On a cache miss, a repository
+    prebuilt into the wheel is unbundled if it still matches the exercise
+    (see gitgym.prebuilt). With verbose=True, prints which path was taken
+    and streams setup.sh's output. destination overrides the workspace
+    directory (used to provision staging copies ahead of time).
+
+    Every call is timed and recorded with gitgym.metrics.
+
     Returns True on success, False on failure.
-    Prints a clear error message if the script is missing, non-executable, or exits non-zero.
+    Prints a clear error message if the script is missing, non-executable,
+    exits non-zero or times out.
+
+    This runs run_setup_async in a new event loop, so it can't be called
+    from a coroutine; await run_setup_async there instead.
+    """
+    return asyncio.run(
+        run_setup_async(exercise, verbose=verbose, destination=destination)
+    )
+
+
+async def run_setup_async(
+    exercise: Exercise,
+    *,
+    verbose: bool = False,
+    destination: Path | None = None,
+    timeout: float | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> bool:
+    """Set up the exercise's workspace without blocking the event loop (see run_setup).
+
+    setup.sh runs as an asyncio subprocess and stops after timeout seconds
+    (default: the exercise's setup timeout). Copying, unbundling and [setup]
+    builds run in worker threads. At most ASYNC_CONCURRENCY setups and
+    verifications run at once per event loop, or as many as semaphore
+    allows when one is given. Cancelling the task kills setup.sh and
+    everything it started; a half-provisioned workspace is repaired by the
+    next setup.
     """
+    async with _limit(semaphore):
+        start = time.perf_counter()
+        source = await _provision(
+            exercise, destination or _workspace_path(exercise), verbose, timeout
+        )
+    metrics.record(
+        "setup",
+        exercise=f"{exercise.path.parent.name}/{exercise.path.name}",
+        source=source,
+        ok=source is not None,
+        seconds=round(time.perf_counter() - start, 3),
+    )
+    return source is not None
+
+
+async def _provision(
+    exercise: Exercise, workspace_path: Path, verbose: bool, timeout: float | None
+) -> str | None:
+    """Do run_setup's work; return how the workspace was provisioned, or None."""
     setup_script = exercise.path / "setup.sh"
 
-    if not setup_script.exists():
+    if not exercise.setup:
+        if not setup_script.exists():
+            print(
+                f"Error: setup.sh not found for exercise '{exercise.name}' at {setup_script}"
+            )
+            return None
+
+        if not os.access(setup_script, os.X_OK):
+            print(f"Error: setup.sh for exercise '{exercise.name}' is not executable.")
+            print(f"Fix with: chmod +x {setup_script}")
+            return None
+
+    template = await asyncio.to_thread(cache.lookup, exercise)
+    if template is not None:
+        strategy = await asyncio.to_thread(cache.refresh, template, workspace_path)
+        if verbose:
+            print(f"Workspace restored from cache ({strategy}).")
+        return "cache"
+
+    # Start from an empty directory so leftovers from a previous attempt can't
+    # leak into the template stored below.
+    workspace_path.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(cache.clear_directory, workspace_path)
+
+    if await asyncio.to_thread(
+        prebuilt.restore, exercise, workspace_path, _git_env(exercise)
+    ):
+        source = "the prebuilt bundle"
+    else:
+        source = await _build_workspace(
+            exercise, workspace_path, verbose=verbose, timeout=timeout
+        )
+        if source is None:
+            return None
+
+    absorbed = await asyncio.to_thread(objectstore.absorb, workspace_path)
+    if absorbed and verbose:
         print(
-            f"Error: setup.sh not found for exercise '{exercise.name}' at {setup_script}"
+            f"Objects moved to the shared object store at {objectstore.OBJECT_STORE}."
         )
-        return False
+    stored = await asyncio.to_thread(cache.store, exercise, workspace_path)
+    if verbose:
+        suffix = " and cached as a template" if stored is not None else ""
+        print(f"Workspace created from {source}{suffix}.")
+    return source
 
-    if not os.access(setup_script, os.X_OK):
-        print(f"Error: setup.sh for exercise '{exercise.name}' is not executable.")
-        print(f"Fix with: chmod +x {setup_script}")
-        return False
 
-    workspace_exercise_path = _workspace_path(exercise)
-    workspace_exercise_path.mkdir(parents=True, exist_ok=True)
+def _verify_checks(exercise: Exercise, repo: Repo, trace: Trace) -> Verification:
+    """Evaluate the exercise's [[checks]], timing each one as a step of trace.
 
-    result = subprocess.run(
-        [str(setup_script), str(workspace_exercise_path)],
-        capture_output=True,
-        text=True,
+    They run in the order gitgym.checkstats expects to fail soonest, and
+    their outcomes are added to its statistics.
+    """
+    try:
+        checks = parse_checks(exercise.checks)
+    except CheckError as e:
+        msg = f"Error: invalid [[checks]] for exercise '{exercise.name}': {e}"
+        return Verification(False, msg, True)
+    key = f"{exercise.path.parent.name}/{exercise.path.name}"
+    try:
+        results = run_checks(
+            checkstats.order(checks, checkstats.exercise_stats(key)),
+            repo,
+            step=trace.step,
+        )
+    except GitPoolError as e:
+        return Verification(False, f"Error: {e}", True)
+    checkstats.record(key, results)
+    reports = [
+        CheckReport(r.check.label, r.passed, r.detail, r.seconds) for r in results
+    ]
+    if not all(r.passed for r in results):
+        return Verification(False, results[-1].detail, False, reports, len(checks))
+    return Verification(
+        True, f"All {len(results)} checks passed.", False, reports, len(checks)
     )
 
-    if result.returncode != 0:
-        print(
-            f"Error: setup.sh for exercise '{exercise.name}' failed (exit code {result.returncode})."
+
+def _verify_goal(exercise: Exercise, repo: Repo) -> Verification | None:
+    """Compare the workspace with the [goal] digest; None when it doesn't match."""
+    try:
+        covers, expected = golden.parse_goal(exercise.goal)
+    except golden.GoalError as e:
+        msg = f"Error: invalid [goal] for exercise '{exercise.name}': {e}"
+        return Verification(False, msg, True)
+    try:
+        actual = golden.digest(repo, covers)
+    except GitPoolError as e:
+        return Verification(False, f"Error: {e}", True)
+    if actual == expected:
+        return Verification(True, "The repository matches the goal state.", False)
+    return None
+
+
+def goal_digest(exercise: Exercise, covers: tuple[str, ...]) -> str:
+    """Return the [goal] digest of the exercise's workspace in its current state.
+
+    For exercise authors, after solving the exercise by hand (see
+    gitgym.golden). Raises GitPoolError if the workspace can't be read.
+    """
+    workspace = _workspace_path(exercise)
+    if not workspace.is_dir():
+        raise GitPoolError(f"exercise repo not found at {workspace}")
+    learner_config = bool(exercise.environment.get("learner_config", False))
+    env = _git_env(exercise, learner_config=learner_config)
+    repo = Repo(workspace, git_batch(exercise), env)
+    return golden.digest(repo, covers)
+
+
+def _load_verify_module(path: Path) -> ModuleType:
+    """Import verify.py, or return the module loaded earlier if it hasn't changed.
+
+    The source is compiled directly rather than through the import system,
+    which would write a __pycache__ directory into the exercise and change
+    its cache digest.
+    """
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _VERIFY_MODULES.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    module = ModuleType(f"gitgym_verify_{path.parent.parent.name}_{path.parent.name}")
+    module.__file__ = str(path)
+    exec(compile(path.read_bytes(), str(path), "exec"), module.__dict__)
+    _VERIFY_MODULES[path] = (stamp, module)
+    return module
+
+
+def _verify_module(exercise: Exercise, verify_module: Path, repo: Repo) -> Verification:
+    """Call check(repo) from the exercise's verify.py."""
+    try:
+        check = getattr(_load_verify_module(verify_module), "check", None)
+        if not callable(check):
+            msg = f"Error: verify.py for exercise '{exercise.name}' has no check(repo) function"
+            return Verification(False, msg, True)
+        result = check(repo)
+    except Exception:
+        msg = (
+            f"Error: verify.py for exercise '{exercise.name}' raised an exception:\n"
+            f"{traceback.format_exc().strip()}"
         )
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-        print(
-            "This looks like a bug in the exercise definition. "
-            "Please file a bug report at https://github.com/enerrio/git-gym/issues"
+        return Verification(False, msg, True)
+    if not isinstance(result, Result):
+        msg = (
+            f"Error: check() in verify.py for exercise '{exercise.name}' must return "
+            f"gitgym.repo.Result, not {type(result).__name__}"
         )
-        return False
+        return Verification(False, msg, True)
+    return Verification(result.passed, result.message, False)
 
-    return True
+
+def _global_config_files() -> tuple[Path, ...]:
+    """The learner's global git config files, as git looks them up."""
+    xdg = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path.home() / ".gitconfig", Path(xdg) / "git" / "config"
 
 
 def run_verify(exercise: Exercise) -> tuple[bool, str, bool]:
-    """Run verify.sh for the exercise, passing the workspace path as $1.
+    """Verify the exercise: its [[checks]] first, then verify.py or verify.sh.
+
+    verify.sh is passed the workspace path as $1.
 
     Returns (success, output, is_script_error) where:
     - success: True if exit code 0 (goal met).
-    - output: combined stdout/stderr from the script.
+    - output: combined stdout/stderr from the script, followed by a line
+      like "3/4 checks passing" when the goal isn't met and the verifier
+      reported individual checks.
     - is_script_error: True when the failure is a script/configuration problem
       rather than the user simply not having met the goal yet.  This includes
       missing or non-executable scripts, a missing workspace directory, and
       exit codes other than 0 or 1.  Exit code 1 is the conventional
       "goal not met" signal, so is_script_error is False in that case.
+
+    See run_verification for the per-check details, and run_verify_async
+    for use from a coroutine.
+    """
+    return asyncio.run(run_verify_async(exercise))
+
+
+async def run_verify_async(
+    exercise: Exercise,
+    *,
+    timeout: float | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> tuple[bool, str, bool]:
+    """Verify the exercise without blocking the event loop (see run_verify).
+
+    Takes the same timeout and semaphore as run_verification_async.
+    """
+    async with _limit(semaphore):
+        result = await _verify(exercise, timeout)
+    output = result.output
+    if not result.success and not result.is_script_error and result.progress:
+        output = f"{output}\n{result.progress}".strip()
+    return result.success, output, result.is_script_error
+
+
+def run_verification(exercise: Exercise, *, explain: bool = False) -> Verification:
+    """Verify the exercise and return the result with the checks it reported.
+
+    verify.sh runs in the hermetic git environment (see _git_env), unless
+    the exercise sets learner_config in its [environment] table, with the
+    helpers from shell/verify_env.sh (gitgym_resolve, gitgym_report, ...)
+    available through BASH_ENV. It may report its checks as JSON lines on
+    the descriptor in GITGYM_RESULTS_FD (see gitgym.verification).
+
+    An exercise whose [goal] table has a digest is checked against it first
+    (see gitgym.golden): when the workspace matches, the goal is met and
+    nothing else runs.
+
+    Checks are evaluated in-process (see gitgym.checks); the first one that
+    fails is reported as "goal not met" and no script is run. An exercise
+    with checks and no script passes when they all do. An exercise that
+    ships verify.py has its check() called in-process with a Repo (see
+    gitgym.repo) instead of running verify.sh; an exception or a return
+    value that isn't a Result counts as a script error.
+
+    When the workspace is in the same state as at the last verification of
+    this exercise (see gitgym.verifycache), that result is returned without
+    running anything. Script errors are never reused. Every fresh result
+    with checks is recorded as a "checks" metrics event.
+
+    A verification still running after VERIFY_TIMEOUT seconds, or the
+    exercise's verify_timeout from its [environment] table, is stopped and
+    reported as a script error naming the step that hung (and the commands
+    still running, e.g. a git waiting for an editor). verify.sh's whole
+    process group is killed, as are the git commands verify.py or a check
+    started through the Repo (see Repo.stop); their thread is left to finish
+    on its own.
+
+    With explain=True the result's steps say what each step took and how
+    many processes it started (see gitgym.explain). The cached result and
+    the bash workers (see verify_workers) are not used then, so every step
+    runs as it would the first time.
+
+    This runs run_verification_async in a new event loop.
     """
+    return asyncio.run(run_verification_async(exercise, explain=explain))
+
+
+async def run_verification_async(
+    exercise: Exercise,
+    *,
+    timeout: float | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    explain: bool = False,
+) -> Verification:
+    """Verify the exercise without blocking the event loop (see run_verification).
+
+    verify.sh runs as an asyncio subprocess; fingerprinting the workspace
+    runs in a worker thread, and [goal], [[checks]] and verify.py in a
+    daemon thread that a timeout doesn't wait for. timeout overrides the
+    exercise's verify timeout; cancelling the task also kills verify.sh's
+    whole process group, or the git commands the Repo is running. At most
+    ASYNC_CONCURRENCY setups and verifications run at once per event loop,
+    or as many as semaphore allows when one is given.
+    """
+    async with _limit(semaphore):
+        return await _verify(exercise, timeout, explain)
+
+
+def _outcome(result: Verification) -> str:
+    """Describe a verifier's result in a step of the trace."""
+    if result.is_script_error:
+        return "error"
+    return "goal met" if result.success else "goal not met"
+
+
+async def _verify(
+    exercise: Exercise, timeout: float | None, explain: bool = False
+) -> Verification:
+    """Do run_verification's work."""
     workspace_exercise_path = _workspace_path(exercise)
 
     if not workspace_exercise_path.exists():
@@ -76,30 +798,237 @@ def run_verify(exercise: Exercise) -> tuple[bool, str, bool]:
             f"Exercise repo not found at {workspace_exercise_path}.\n"
             f"Run 'gitgym reset' to re-create it."
         )
-        return False, msg, True
+        return Verification(False, msg, True)
+
+    if timeout is None:
+        timeout = verify_timeout(exercise)
+    learner_config = bool(exercise.environment.get("learner_config", False))
+    key = f"{exercise.path.parent.name}/{exercise.path.name}"
+    trace = Trace(count=explain)
+    with trace.step("fingerprint"):
+        digest = await asyncio.to_thread(
+            verifycache.fingerprint,
+            workspace_exercise_path,
+            salt=f"{__version__}\0{cache.definition_digest(exercise)}\0{learner_config}",
+            extra=_global_config_files() if learner_config else (),
+        )
+    if not explain:
+        cached = verifycache.lookup(key, digest)
+        if cached is not None:
+            return cached
+
+    env = _git_env(exercise, learner_config=learner_config)
+    start = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            result = await _run_verifiers(exercise, workspace_exercise_path, env, trace)
+    except TimeoutError:
+        msg = (
+            f"Error: verifying exercise '{exercise.name}' did not finish within "
+            f"{timeout:g} seconds and was stopped"
+        )
+        msg += f" while running {trace.stopped_in}." if trace.stopped_in else "."
+        if trace.hung:
+            msg += "\nStill running: " + "; ".join(trace.hung)
+        return Verification(False, msg, True, steps=trace.steps if explain else [])
+    finally:
+        trace.close()
+    if explain:
+        result.steps = trace.steps
+    if result.checks:
+        metrics.record(
+            "checks",
+            exercise=key,
+            ok=result.success,
+            seconds=round(time.perf_counter() - start, 3),
+            checks=[
+                {
+                    "check": c.id,
+                    "ok": c.passed,
+                    "seconds": None if c.seconds is None else round(c.seconds, 4),
+                }
+                for c in result.checks
+            ],
+        )
+    if not result.is_script_error:
+        verifycache.store(key, digest, result)
+    return result
+
+
+async def _run_in_worker(
+    verify_script: Path,
+    workspace_exercise_path: Path,
+    env: dict[str, str],
+    on_stop: Callable[[int], None] | None = None,
+) -> tuple[int, str, bytes] | None:
+    """Run verify.sh in the workspace's bash worker; None to run it directly.
+
+    A cancelled (or timed-out) verification kills the worker, and with it
+    the script, after calling on_stop with the worker's process group.
+    """
+    worker = _BASH_WORKERS.get(
+        workspace_exercise_path, {**env, "BASH_ENV": str(_VERIFY_ENV_SCRIPT)}
+    )
+    try:
+        ran = await asyncio.to_thread(
+            worker.run, verify_script, [str(workspace_exercise_path)]
+        )
+    except asyncio.CancelledError:
+        pid = worker.pid
+        if on_stop is not None and pid is not None:
+            on_stop(pid)
+        worker.kill()
+        raise
+    except BashWorkerError:
+        return None
+    if ran is None:
+        return None
+    returncode, output, reports = ran
+    lines = [line.rstrip("\r") for line in output.splitlines()]
+    return returncode, "\n".join(lines), reports
+
+
+async def _in_thread(func: Callable, /, *args):
+    """Run func(*args) in a daemon thread of its own, like asyncio.to_thread.
+
+    to_thread's executor is waited for when asyncio.run returns, so a
+    verify.py or check that hangs would hold up a verification that has
+    already timed out; this thread is left behind instead when the awaiting
+    task is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    context = contextvars.copy_context()
+
+    def _settle(result, error: BaseException | None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run() -> None:
+        result, error = None, None
+        try:
+            result = context.run(func, *args)
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(_settle, result, error)
+        except RuntimeError:
+            # The loop is closed: nobody is waiting any more.
+            pass
+
+    threading.Thread(target=_run, name="gitgym-verify", daemon=True).start()
+    return await future
+
+
+async def _run_in_thread(repo: Repo, trace: Trace, func: Callable, /, *args):
+    """Run an in-process verifier using repo in a thread (see _in_thread).
 
+    A cancelled (or timed-out) verification stops repo, killing the git
+    commands it is running after noting them in trace.
+    """
+    try:
+        return await _in_thread(func, *args)
+    except asyncio.CancelledError:
+        repo.stop(functools.partial(trace.stopped, leader=True))
+        raise
+
+
+async def _run_verifiers(
+    exercise: Exercise,
+    workspace_exercise_path: Path,
+    env: dict[str, str],
+    trace: Trace,
+) -> Verification:
+    """Run the exercise's checks and verify.py or verify.sh (see run_verification).
+
+    Each verifier that runs is a step of trace.
+    """
     verify_script = exercise.path / "verify.sh"
+    verify_module = exercise.path / "verify.py"
+    repo = Repo(workspace_exercise_path, git_batch(exercise), env)
+    has_verifier = bool(
+        exercise.checks or verify_module.exists() or verify_script.exists()
+    )
+
+    if exercise.goal:
+        with trace.step("[goal]") as step:
+            result = await _run_in_thread(repo, trace, _verify_goal, exercise, repo)
+            step.detail = "no match" if result is None else _outcome(result)
+        if result is not None:
+            return result
+        if not has_verifier:
+            return Verification(
+                False, "The repository doesn't match the goal state yet.", False
+            )
+
+    if exercise.checks:
+        with trace.step("[[checks]]") as step:
+            result = await _run_in_thread(
+                repo, trace, _verify_checks, exercise, repo, trace
+            )
+            step.detail = _outcome(result)
+        for check_step, check in zip(step.steps, result.checks):
+            check_step.detail = "passed" if check.passed else "failed"
+        if not result.success or not (verify_module.exists() or verify_script.exists()):
+            return result
+
+    if verify_module.exists():
+        with trace.step("verify.py") as step:
+            result = await _run_in_thread(
+                repo, trace, _verify_module, exercise, verify_module, repo
+            )
+            step.detail = _outcome(result)
+        return result
 
     if not verify_script.exists():
         msg = f"Error: verify.sh not found for exercise '{exercise.name}' at {verify_script}"
-        return False, msg, True
+        return Verification(False, msg, True)
 
     if not os.access(verify_script, os.X_OK):
         msg = (
             f"Error: verify.sh for exercise '{exercise.name}' is not executable.\n"
             f"Fix with: chmod +x {verify_script}"
         )
-        return False, msg, True
+        return Verification(False, msg, True)
 
-    result = subprocess.run(
-        [str(verify_script), str(workspace_exercise_path)],
-        capture_output=True,
-        text=True,
-    )
+    with trace.step("verify.sh") as step:
+        ran = None
+        # Not when explaining: the worker's cost isn't what a first run pays.
+        if _use_bash_workers and not trace.count and runs_in_worker(verify_script):
+            ran = await _run_in_worker(
+                verify_script, workspace_exercise_path, env, trace.stopped
+            )
+        if ran is not None:
+            returncode, output, reports = ran
+            checks, total = parse_reports(reports)
+        else:
+            # A file rather than a pipe, so a script that reports a lot can't
+            # block on it while we wait for the script to exit.
+            with tempfile.TemporaryFile() as reports:
+                fd = reports.fileno()
+                returncode, output = await _run_script(
+                    [str(verify_script), str(workspace_exercise_path)],
+                    {
+                        **trace.script_env(env),
+                        "BASH_ENV": str(_VERIFY_ENV_SCRIPT),
+                        "GITGYM_RESULTS_FD": str(fd),
+                    },
+                    None,
+                    pass_fds=(fd,),
+                    on_stop=trace.stopped,
+                )
+                reports.seek(0)
+                checks, total = parse_reports(reports.read())
+        trace.script_commands(step)
+        step.detail = f"exit {returncode}"
 
-    output = (result.stdout + result.stderr).strip()
-    success = result.returncode == 0
+    output = output.strip()
+    success = returncode == 0
     # Exit code 1 is the conventional "goal not met" signal from verify scripts.
     # Any other non-zero exit code indicates an unexpected script error.
-    is_script_error = not success and result.returncode != 1
-    return success, output, is_script_error
+    is_script_error = not success and returncode != 1
+    return Verification(success, output, is_script_error, checks, total)
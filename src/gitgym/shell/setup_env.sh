@@ -0,0 +1,16 @@
+# Sourced through BASH_ENV before an exercise's setup.sh runs.
+#
+# Wraps git so that every invocation gets the next timestamp in a fixed
+# sequence starting at GITGYM_SETUP_EPOCH. Commits made by setup.sh therefore
+# have the same hashes on every run and every machine, while still being
+# ordered in time the way the script created them.
+
+__gitgym_tick=0
+
+git() {
+	__gitgym_tick=$((__gitgym_tick + 1))
+	local __gitgym_when=$((${GITGYM_SETUP_EPOCH:-0} + __gitgym_tick * 60))
+	GIT_AUTHOR_DATE="@${__gitgym_when} +0000" \
+		GIT_COMMITTER_DATE="@${__gitgym_when} +0000" \
+		command git "$@"
+}
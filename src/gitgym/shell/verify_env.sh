@@ -0,0 +1,161 @@
+# Sourced through BASH_ENV before an exercise's verify.sh runs.
+#
+# Helpers that answer questions about the repository from one long-lived
+# `git cat-file --batch-check` coprocess instead of a git process each.
+# The coprocess starts on first use, in the current directory, so call them
+# after `cd "$EXERCISE_DIR"`. Results go into a variable rather than stdout,
+# because $(...) would run the helper -- and its coprocess -- in a subshell.
+#
+#   gitgym_resolve VAR REV       VAR=object id of REV; status 1 if missing
+#   gitgym_object_type VAR REV   VAR=blob/tree/commit/tag; status 1 if missing
+#
+# Example:
+#   gitgym_resolve head HEAD && gitgym_resolve main refs/heads/main
+#   [ "$head" = "$main" ] || { echo "HEAD is not at main"; exit 1; }
+
+__gitgym_batch_check() {
+	if [ -z "${__gitgym_cat_pid:-}" ]; then
+		coproc __GITGYM_CAT { command git cat-file --batch-check 2>/dev/null; }
+		__gitgym_cat_pid=$__GITGYM_CAT_PID
+		__gitgym_cat_in=${__GITGYM_CAT[1]}
+		__gitgym_cat_out=${__GITGYM_CAT[0]}
+	fi
+	printf '%s\n' "$1" >&"$__gitgym_cat_in"
+	IFS=' ' read -r __gitgym_oid __gitgym_type __gitgym_size <&"$__gitgym_cat_out"
+	[ -n "$__gitgym_size" ]
+}
+
+gitgym_resolve() {
+	__gitgym_batch_check "$2" || return 1
+	printf -v "$1" '%s' "$__gitgym_oid"
+}
+
+gitgym_object_type() {
+	__gitgym_batch_check "$2" || return 1
+	printf -v "$1" '%s' "$__gitgym_type"
+}
+
+# Helpers that report individual checks to gitgym as JSON lines on the
+# descriptor in GITGYM_RESULTS_FD (see gitgym.verification), so `verify` and
+# `watch` can show partial progress. They do nothing when the script runs
+# outside gitgym. The exit code still decides whether the goal is met.
+#
+#   gitgym_total N                      the script has N checks in all
+#   gitgym_report ID ok|fail [MESSAGE]  one check's outcome; with bash 5 its
+#                                       time since the previous report (or
+#                                       the start of the script) is included
+#
+# Example:
+#   gitgym_total 2
+#   if [ "$(git branch --show-current)" != bugfix ]; then
+#       gitgym_report on-branch fail "Switch to bugfix."; exit 1
+#   fi
+#   gitgym_report on-branch ok
+
+# EPOCHREALTIME (bash 5+) in microseconds, empty on older shells.
+__gitgym_since=${EPOCHREALTIME:-}
+__gitgym_since=${__gitgym_since/./}
+
+__gitgym_json_string() {
+	local s=$2
+	s=${s//\\/\\\\}
+	s=${s//\"/\\\"}
+	s=${s//$'\n'/\\n}
+	s=${s//$'\r'/\\r}
+	s=${s//$'\t'/\\t}
+	printf -v "$1" '"%s"' "$s"
+}
+
+__gitgym_emit() {
+	[ -n "${GITGYM_RESULTS_FD:-}" ] || return 0
+	printf '%s\n' "$1" >&"$GITGYM_RESULTS_FD"
+}
+
+gitgym_total() {
+	__gitgym_emit "{\"total\": $(($1))}"
+}
+
+gitgym_report() {
+	local ok=false id message timing=""
+	case ${2:-} in
+	ok | pass) ok=true ;;
+	esac
+	__gitgym_json_string id "$1"
+	__gitgym_json_string message "${3:-}"
+	local now=${EPOCHREALTIME:-}
+	now=${now/./}
+	if [ -n "$now" ] && [ -n "$__gitgym_since" ]; then
+		local us=$((now - __gitgym_since))
+		printf -v timing ', "seconds": %d.%06d' $((us / 1000000)) $((us % 1000000))
+		__gitgym_since=$now
+	fi
+	__gitgym_emit "{\"id\": $id, \"ok\": $ok, \"message\": $message$timing}"
+}
+
+# A snapshot of the refs, the branch and `git status` from two git processes
+# (see gitgym.snapshot), for scripts that would otherwise run one git command
+# per question. Call it after `cd "$EXERCISE_DIR"`, and again after changing
+# the repository. It sets:
+#
+#   GITGYM_HEAD      the commit HEAD points at (empty before the first commit)
+#   GITGYM_BRANCH    the checked-out branch (empty when HEAD is detached)
+#   GITGYM_REFS      associative array: full ref name -> object id
+#   GITGYM_STATUS    array of "XY path" entries from `git status
+#                    --porcelain=v2`: X is the index, Y the work tree, '.' is
+#                    unchanged; "??" untracked, unmerged entries use the
+#                    usual UU/AA/... pairs
+#
+# Example:
+#   gitgym_snapshot
+#   [ "$GITGYM_BRANCH" = main ] || { echo "Switch to main."; exit 1; }
+#   [ -n "${GITGYM_REFS[refs/heads/feature]:-}" ] || { echo "Create feature."; exit 1; }
+#   [ ${#GITGYM_STATUS[@]} -eq 0 ] || { echo "Commit your changes."; exit 1; }
+
+__gitgym_skip_fields() {
+	# Drop the first $2 space-separated fields of $1 into __gitgym_rest.
+	__gitgym_rest=$1
+	local i
+	for ((i = 0; i < $2; i++)); do
+		__gitgym_rest=${__gitgym_rest#* }
+	done
+}
+
+gitgym_snapshot() {
+	declare -gA GITGYM_REFS=()
+	declare -ga GITGYM_STATUS=()
+	GITGYM_HEAD=""
+	GITGYM_BRANCH=""
+	local name oid entry orig
+	while IFS=' ' read -r oid name; do
+		GITGYM_REFS[$name]=$oid
+	done < <(command git for-each-ref --format='%(objectname) %(refname)')
+	while IFS= read -r -d '' entry; do
+		case $entry in
+		'# branch.oid '*)
+			oid=${entry#'# branch.oid '}
+			[ "$oid" = "(initial)" ] || GITGYM_HEAD=$oid
+			;;
+		'# branch.head '*)
+			name=${entry#'# branch.head '}
+			[ "$name" = "(detached)" ] || GITGYM_BRANCH=$name
+			;;
+		'1 '*)
+			__gitgym_skip_fields "$entry" 8
+			GITGYM_STATUS+=("${entry:2:2} $__gitgym_rest")
+			;;
+		'2 '*)
+			__gitgym_skip_fields "$entry" 9
+			GITGYM_STATUS+=("${entry:2:2} $__gitgym_rest")
+			# The path it was renamed from follows as its own entry.
+			IFS= read -r -d '' orig
+			;;
+		'u '*)
+			__gitgym_skip_fields "$entry" 10
+			GITGYM_STATUS+=("${entry:2:2} $__gitgym_rest")
+			;;
+		'? '*)
+			GITGYM_STATUS+=("?? ${entry#'? '}")
+			;;
+		esac
+	done < <(command git --no-optional-locks status --porcelain=v2 --branch -z --untracked-files=all)
+}
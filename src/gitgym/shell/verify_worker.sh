@@ -0,0 +1,52 @@
+# The loop behind gitgym.bashworker: runs verify.sh scripts on request in
+# one long-lived bash, so watch mode doesn't start an interpreter (and
+# source verify_env.sh through BASH_ENV) for every change.
+#
+# Requests arrive on stdin as NUL-terminated fields:
+#
+#   load SCRIPT            define SCRIPT's contents as a function; replies
+#                          "ok" or "error" (a syntax error)
+#   run OUT REPORTS N ARG...
+#                          call the loaded script with N arguments in a
+#                          subshell, with stdout and stderr in OUT and
+#                          GITGYM_RESULTS_FD writing to REPORTS; replies
+#                          with its exit status
+#
+# Each reply is one line on stdout. The subshell keeps everything a script
+# changes -- cd, set -e, exit, variables, traps, a gitgym_resolve
+# coprocess -- from reaching the next run. The loop ends when stdin closes.
+
+while IFS= read -r -d '' __gitgym_request; do
+	case $__gitgym_request in
+	load)
+		IFS= read -r -d '' __gitgym_script
+		if __gitgym_body=$(<"$__gitgym_script") &&
+			eval "__gitgym_verify() {
+$__gitgym_body
+}" 2>/dev/null; then
+			echo ok
+		else
+			unset -f __gitgym_verify
+			echo error
+		fi
+		;;
+	run)
+		IFS= read -r -d '' __gitgym_out
+		IFS= read -r -d '' __gitgym_reports
+		IFS= read -r -d '' __gitgym_argc
+		__gitgym_args=()
+		for ((__gitgym_i = 0; __gitgym_i < __gitgym_argc; __gitgym_i++)); do
+			IFS= read -r -d '' __gitgym_arg
+			__gitgym_args+=("$__gitgym_arg")
+		done
+		(
+			export GITGYM_RESULTS_FD=3
+			# gitgym_report times the first check from the start of the run.
+			__gitgym_since=${EPOCHREALTIME:-}
+			__gitgym_since=${__gitgym_since/./}
+			__gitgym_verify "${__gitgym_args[@]}"
+		) </dev/null >"$__gitgym_out" 2>&1 3>"$__gitgym_reports"
+		echo "$?"
+		;;
+	esac
+done
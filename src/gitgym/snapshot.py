@@ -0,0 +1,322 @@
+"""Everything a verifier usually asks about a repository, read in one pass.
+
+Most verify scripts spend their time starting git, not in the work git does:
+each ``git rev-parse``, ``git branch --list`` or ``git log -1`` is a new
+process. :func:`take` asks three questions at once instead, running the
+commands side by side::
+
+    git for-each-ref      every ref, its object, type, peeled tag and symref
+    git status --porcelain=v2 --branch -z
+                          HEAD, the branch, its upstream and every changed,
+                          staged, unmerged or untracked file
+    git log -z            every commit reachable from the refs and HEAD (or
+                          from the revisions given), with tree, parents,
+                          author, committer and message
+
+and returns a :class:`RepoSnapshot`: an immutable answer sheet that can be
+queried any number of times for free. It is a picture of one moment; take a
+new one after changing the repository. In verify.py, ``repo.snapshot()``
+takes one per verification. verify.sh can call ``gitgym_snapshot`` (see
+shell/verify_env.sh) for the refs, branch and status.
+
+``python benchmarks/verify_bench.py`` compares taking a snapshot with running
+each exercise's verify.sh.
+"""
+
+import heapq
+import subprocess
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+
+from gitgym.gitpool import Commit
+from gitgym.repo import operation_in
+
+_REF_FORMAT = "%(refname)%00%(objectname)%00%(objecttype)%00%(*objectname)%00%(symref)"
+_LOG_FORMAT = "%H%x00%T%x00%P%x00%an <%ae> %ad%x00%cn <%ce> %cd%x00%B"
+_LOG_FIELDS = 6
+
+# Where git looks for a short name, in order (see gitrevisions(7)).
+_REF_PREFIXES = ("refs/", "refs/tags/", "refs/heads/", "refs/remotes/")
+
+
+class SnapshotError(Exception):
+    """Raised when the repository can't be read (e.g. it isn't one)."""
+
+
+@dataclass(frozen=True)
+class Ref:
+    name: str
+    # The object the ref points at (for a symbolic ref, its target's).
+    oid: str
+    type: str
+    # For an annotated tag, the object it finally points at.
+    peeled: str | None = None
+    # For a symbolic ref, the ref it points to.
+    symref: str | None = None
+
+    @property
+    def target(self) -> str:
+        """The object id with tags peeled."""
+        return self.peeled or self.oid
+
+
+@dataclass(frozen=True)
+class StatusEntry:
+    """One line of ``git status --porcelain=v2``."""
+
+    # '1' changed, '2' renamed or copied, 'u' unmerged, '?' untracked.
+    kind: str
+    # Index and work tree status letters ('.' for unchanged), e.g. 'M.'.
+    xy: str
+    path: str
+    # For a rename or copy, the path it came from.
+    orig_path: str | None = None
+
+    @property
+    def staged(self) -> bool:
+        return self.kind in ("1", "2") and self.xy[0] != "."
+
+    @property
+    def unstaged(self) -> bool:
+        return self.kind in ("1", "2") and self.xy[1] != "."
+
+
+@dataclass(frozen=True)
+class RepoSnapshot:
+    # The commit HEAD points at, or None before the first commit.
+    head: str | None
+    # The checked-out branch, or None when HEAD is detached.
+    head_branch: str | None
+    upstream: str | None
+    ahead: int
+    behind: int
+    operation: str | None
+    # Full ref name -> Ref.
+    refs: Mapping[str, Ref] = field(repr=False)
+    status: tuple[StatusEntry, ...] = field(repr=False)
+    # Object id -> Commit, for every commit the log covered.
+    commits: Mapping[str, Commit] = field(repr=False)
+
+    @property
+    def branches(self) -> dict[str, str]:
+        """Short branch name -> commit id."""
+        return {
+            name.removeprefix("refs/heads/"): ref.oid
+            for name, ref in self.refs.items()
+            if name.startswith("refs/heads/")
+        }
+
+    @property
+    def tags(self) -> dict[str, str]:
+        """Short tag name -> the object it finally points at (peeled)."""
+        return {
+            name.removeprefix("refs/tags/"): ref.target
+            for name, ref in self.refs.items()
+            if name.startswith("refs/tags/")
+        }
+
+    def ref(self, name: str) -> Ref | None:
+        """Return the ref a full or short name means, the way git looks it up."""
+        for prefix in ("", *_REF_PREFIXES):
+            if prefix + name in self.refs:
+                return self.refs[prefix + name]
+        return self.refs.get(f"refs/remotes/{name}/HEAD")
+
+    def resolve(self, name: str) -> str | None:
+        """Return the object id of HEAD, a ref name or a full commit id.
+
+        Revision expressions ('HEAD~2', 'main:file') aren't understood; use
+        :class:`gitgym.repo.Repo` for those.
+        """
+        if name == "HEAD":
+            return self.head
+        ref = self.ref(name)
+        if ref is not None:
+            return ref.oid
+        return name if name in self.commits else None
+
+    def commit(self, name: str) -> Commit | None:
+        """Return the commit a name resolves to (tags are peeled), or None."""
+        ref = self.ref(name) if name != "HEAD" else None
+        oid = ref.target if ref is not None else self.resolve(name)
+        return self.commits.get(oid) if oid else None
+
+    def log(
+        self, include: str | list[str], exclude: list[str] | None = None
+    ) -> list[Commit]:
+        """Return the commits reachable from include but not from exclude.
+
+        The same walk as :meth:`gitgym.gitpool.GitBatch.commits` (newest
+        committer date first), over the commits in the snapshot.
+        """
+        if isinstance(include, str):
+            include = [include]
+        hidden: set[str] = set()
+        stack = [c.oid for c in map(self.commit, exclude or []) if c is not None]
+        while stack:
+            oid = stack.pop()
+            if oid in hidden or oid not in self.commits:
+                continue
+            hidden.add(oid)
+            stack.extend(self.commits[oid].parents)
+
+        result = []
+        seen = set(hidden)
+        heap = []
+        for commit in map(self.commit, include):
+            if commit is not None and commit.oid not in seen:
+                seen.add(commit.oid)
+                heapq.heappush(heap, (-commit.committer_time, commit.oid, commit))
+        while heap:
+            _, _, commit = heapq.heappop(heap)
+            result.append(commit)
+            for parent in commit.parents:
+                if parent not in seen and parent in self.commits:
+                    seen.add(parent)
+                    parent_commit = self.commits[parent]
+                    heapq.heappush(
+                        heap, (-parent_commit.committer_time, parent, parent_commit)
+                    )
+        return result
+
+    @property
+    def clean(self) -> bool:
+        """Whether nothing is staged, modified, unmerged or untracked."""
+        return not self.status
+
+    @property
+    def staged(self) -> list[str]:
+        return [entry.path for entry in self.status if entry.staged]
+
+    @property
+    def unstaged(self) -> list[str]:
+        return [entry.path for entry in self.status if entry.unstaged]
+
+    @property
+    def untracked(self) -> list[str]:
+        return [entry.path for entry in self.status if entry.kind == "?"]
+
+    @property
+    def conflicted(self) -> list[str]:
+        return [entry.path for entry in self.status if entry.kind == "u"]
+
+
+def _parse_refs(output: str) -> dict[str, Ref]:
+    refs = {}
+    for line in output.splitlines():
+        name, oid, kind, peeled, symref = line.split("\0")
+        refs[name] = Ref(name, oid, kind, peeled or None, symref or None)
+    return refs
+
+
+def _parse_status(output: str) -> tuple[dict[str, str], list[StatusEntry]]:
+    """Return the '# branch.*' headers and the entries of porcelain v2 -z output."""
+    headers: dict[str, str] = {}
+    entries = []
+    items = iter(output.split("\0"))
+    for item in items:
+        if not item:
+            continue
+        kind = item[0]
+        if kind == "#":
+            key, _, value = item[2:].partition(" ")
+            headers[key] = value
+        elif kind == "1":
+            fields = item.split(" ", 8)
+            entries.append(StatusEntry(kind, fields[1], fields[8]))
+        elif kind == "2":
+            fields = item.split(" ", 9)
+            entries.append(StatusEntry(kind, fields[1], fields[9], next(items)))
+        elif kind == "u":
+            fields = item.split(" ", 10)
+            entries.append(StatusEntry(kind, fields[1], fields[10]))
+        elif kind == "?":
+            entries.append(StatusEntry(kind, "??", item[2:]))
+    return headers, entries
+
+
+def _parse_log(output: str) -> dict[str, Commit]:
+    commits = {}
+    fields = output.split("\0")
+    for i in range(0, len(fields) - _LOG_FIELDS + 1, _LOG_FIELDS):
+        oid, tree, parents, author, committer, message = fields[i : i + _LOG_FIELDS]
+        commits[oid] = Commit(
+            oid, tree, tuple(parents.split()), author, committer, message
+        )
+    return commits
+
+
+def take(
+    path: Path, env: dict[str, str] | None = None, revs: list[str] | None = None
+) -> RepoSnapshot:
+    """Read the refs, status and history of the repository at path.
+
+    The log covers every commit reachable from revs, or from all refs and
+    HEAD by default. Nothing is written to the repository: status doesn't
+    refresh the index. Raises SnapshotError when a command fails.
+    """
+    commands = [
+        ["git", "for-each-ref", f"--format={_REF_FORMAT}"],
+        [
+            "git",
+            "--no-optional-locks",
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            "-z",
+            "--untracked-files=all",
+        ],
+        [
+            "git",
+            "log",
+            "-z",
+            "--no-use-mailmap",
+            "--date=raw",
+            f"--format={_LOG_FORMAT}",
+            *(revs if revs is not None else ["--all"]),
+            "--",
+        ],
+    ]
+    try:
+        procs = [
+            subprocess.Popen(
+                command,
+                cwd=path,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+            )
+            for command in commands
+        ]
+    except OSError as e:
+        raise SnapshotError(f"could not run git in {path}: {e}") from e
+    outputs = []
+    for name, proc in zip(("for-each-ref", "status", "log"), procs):
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise SnapshotError(
+                f"git {name} failed: {stderr.decode(errors='replace').strip()}"
+            )
+        outputs.append(stdout.decode(errors="replace"))
+
+    headers, status = _parse_status(outputs[1])
+    head = headers.get("branch.oid")
+    branch = headers.get("branch.head")
+    ahead = behind = 0
+    if "branch.ab" in headers:
+        a, b = headers["branch.ab"].split()
+        ahead, behind = int(a), -int(b)
+    return RepoSnapshot(
+        head=None if head in (None, "(initial)") else head,
+        head_branch=None if branch in (None, "(detached)") else branch,
+        upstream=headers.get("branch.upstream"),
+        ahead=ahead,
+        behind=behind,
+        operation=operation_in(path / ".git"),
+        refs=MappingProxyType(_parse_refs(outputs[0])),
+        status=tuple(status),
+        commits=MappingProxyType(_parse_log(outputs[2])),
+    )
@@ -0,0 +1,101 @@
+"""Verification results, and the JSON-lines protocol verify scripts report checks with.
+
+verify.sh (and anything it runs) may describe its individual checks by
+writing one JSON object per line to the file descriptor named in
+GITGYM_RESULTS_FD::
+
+    {"total": 3}
+    {"id": "on-branch", "ok": true, "message": "On bugfix.", "seconds": 0.004}
+    {"id": "committed", "ok": false, "message": "fix.txt is not committed."}
+
+``id`` and ``ok`` are required, ``message`` and ``seconds`` optional.
+``total`` announces how many checks there are, so a script that stops at
+its first failure still reports "1/3 checks passing". The exit code keeps
+deciding success; lines that don't parse are ignored, and a script that
+writes nothing is judged exactly as before. The gitgym_report and
+gitgym_total helpers in shell/verify_env.sh write these lines.
+
+[[checks]] (see gitgym.checks) are reported the same way.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CheckReport:
+    id: str
+    passed: bool
+    message: str = ""
+    # None when the verifier didn't time the check
+    seconds: float | None = None
+
+
+@dataclass
+class Step:
+    """A timed part of a verification, as shown by 'gitgym verify --explain'."""
+
+    name: str
+    # None when the step's end wasn't seen (e.g. a git command verify.sh ran
+    # under bash 4)
+    seconds: float | None = 0.0
+    # Processes started during the step, including its steps'; None when
+    # not counted
+    processes: int | None = None
+    # The step's outcome, e.g. "passed" or "exit 1"
+    detail: str = ""
+    steps: list["Step"] = field(default_factory=list)
+
+
+@dataclass
+class Verification:
+    success: bool
+    output: str
+    # A broken exercise or workspace rather than an unmet goal (see run_verify)
+    is_script_error: bool
+    checks: list[CheckReport] = field(default_factory=list)
+    # How many checks the verifier has, when known; checks can stop early
+    total: int | None = None
+    # True when the result was reused from gitgym.verifycache
+    cached: bool = False
+    # What the verification did, step by step; only filled in by
+    # run_verification(explain=True)
+    steps: list[Step] = field(default_factory=list)
+
+    @property
+    def progress(self) -> str:
+        """'3/4 checks passing', or '' when no checks were reported."""
+        if not self.checks:
+            return ""
+        passed = sum(check.passed for check in self.checks)
+        total = max(self.total or 0, len(self.checks))
+        return f"{passed}/{total} checks passing"
+
+
+def parse_reports(data: bytes) -> tuple[list[CheckReport], int | None]:
+    """Decode the check reports a verify script wrote, and its announced total."""
+    checks = []
+    total = None
+    for line in data.decode(errors="replace").splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        if isinstance(entry.get("total"), int) and not isinstance(entry["total"], bool):
+            total = entry["total"]
+        if not isinstance(entry.get("id"), str) or not isinstance(
+            entry.get("ok"), bool
+        ):
+            continue
+        seconds = entry.get("seconds")
+        checks.append(
+            CheckReport(
+                id=entry["id"],
+                passed=entry["ok"],
+                message=str(entry.get("message", "")),
+                seconds=float(seconds) if isinstance(seconds, (int, float)) else None,
+            )
+        )
+    return checks, total
@@ -0,0 +1,104 @@
+"""Verify every provisioned workspace at once.
+
+``gitgym verify --all`` runs :func:`gitgym.runner.run_verification` (the
+verification behind run_verify) for each exercise whose workspace exists,
+on a bounded pool of worker threads, the same way :mod:`gitgym.prepare`
+runs setups. Verifiers spend their time in bash and git subprocesses, so
+threads are enough to overlap them.
+"""
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from gitgym.config import WORKSPACE_DIR
+from gitgym.exercise import Exercise
+from gitgym.prepare import default_jobs
+from gitgym.runner import run_verification
+
+
+@dataclass
+class VerifyResult:
+    key: str
+    topic: str
+    name: str
+    ok: bool
+    seconds: float
+    # What the verifier printed.
+    output: str = ""
+    # A broken exercise or workspace rather than an unmet goal.
+    is_script_error: bool = False
+    # "3/4 checks passing", or "" when the verifier didn't report checks.
+    progress: str = ""
+
+
+def _exercise_key(exercise: Exercise) -> str:
+    """Derive the progress key (topic_dir/exercise_dir) from the exercise path."""
+    return f"{exercise.path.parent.name}/{exercise.path.name}"
+
+
+def _workspace_path(exercise: Exercise) -> Path:
+    return WORKSPACE_DIR / exercise.path.parent.name / exercise.path.name
+
+
+def provisioned(exercises: list[Exercise]) -> list[Exercise]:
+    """Return the exercises whose workspace exists and isn't empty."""
+    return [
+        ex
+        for ex in exercises
+        if _workspace_path(ex).is_dir() and any(_workspace_path(ex).iterdir())
+    ]
+
+
+def _verify_one(exercise: Exercise) -> VerifyResult:
+    """Verify one exercise; an exception fails it rather than the whole run."""
+    start = time.perf_counter()
+    try:
+        result = run_verification(exercise)
+    except Exception as e:
+        return VerifyResult(
+            key=_exercise_key(exercise),
+            topic=exercise.topic,
+            name=exercise.name,
+            ok=False,
+            seconds=time.perf_counter() - start,
+            output=f"Error: verifying exercise '{exercise.name}' failed: {e!r}",
+            is_script_error=True,
+        )
+    return VerifyResult(
+        key=_exercise_key(exercise),
+        topic=exercise.topic,
+        name=exercise.name,
+        ok=result.success,
+        seconds=time.perf_counter() - start,
+        output=result.output,
+        is_script_error=result.is_script_error,
+        progress=result.progress,
+    )
+
+
+def verify_all(
+    exercises: list[Exercise],
+    *,
+    jobs: int | None = None,
+    on_result: Callable[[VerifyResult], None] | None = None,
+) -> list[VerifyResult]:
+    """Verify every exercise with a provisioned workspace, at most jobs at a time.
+
+    Exercises without a workspace are left out. on_result is called from the
+    calling thread as each verification finishes. Results are returned in
+    the order of exercises.
+    """
+    jobs = max(1, jobs or default_jobs())
+    pending = provisioned(exercises)
+    results: dict[str, VerifyResult] = {}
+    with ThreadPoolExecutor(max_workers=min(jobs, len(pending) or 1)) as pool:
+        futures = [pool.submit(_verify_one, ex) for ex in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.key] = result
+            if on_result:
+                on_result(result)
+    return [results[_exercise_key(ex)] for ex in pending]
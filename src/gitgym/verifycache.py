@@ -0,0 +1,160 @@
+"""Reuse the last verify result while the workspace hasn't changed.
+
+Watch mode re-verifies on every filesystem event, including the ones git
+causes itself: ``git status`` rewriting the index with fresh stat data, lock
+files coming and going. :func:`fingerprint` summarises everything a verify
+script can observe, and the last result for each exercise is kept in
+VERIFY_CACHE_FILE together with the fingerprint it was computed for.
+
+The fingerprint covers:
+
+- the contents of HEAD, packed-refs, config and the other files directly
+  in ``.git`` (MERGE_HEAD, ORIG_HEAD, BISECT_LOG, ...), and of everything
+  under ``refs/``, ``info/`` and the rebase/cherry-pick state directories
+- the index entries (path, mode, object id, stage), but not their stat data
+- the size and mtime of every reflog, since ``git stash list`` reads one
+- the mode, size and mtime of every file in the working tree, and the
+  contents of files modified in the last RACY_SECONDS, whose mtime might
+  not change when they are written again
+
+Objects are left out: verify scripts only reach them through refs and the
+index. Reading the cache never raises; a damaged file is a miss.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from gitgym.config import VERIFY_CACHE_FILE
+from gitgym.gitfs.index import read_index
+from gitgym.verification import CheckReport, Verification
+
+# Files this recent are hashed by content: a second write within the
+# filesystem's timestamp granularity can leave mtime and size unchanged.
+RACY_SECONDS = 2
+
+# .git subdirectories whose files are hashed by content.
+_STATE_DIRS = ("refs", "info", "rebase-merge", "rebase-apply", "sequencer")
+
+# Serialises the read-modify-write in store() (gitgym verify --all stores
+# from several threads).
+_store_lock = threading.Lock()
+
+
+def _hash_tree(h, root: Path, label: str, *, contents: bool, racy_ns: int) -> None:
+    """Feed every file under root to h, by content or by stat data."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if label == "worktree" and dirpath == str(root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+        rel_dir = os.path.relpath(dirpath, root)
+        h.update(f"{label}-dir\0{rel_dir}\0".encode())
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.lstat(path)
+                h.update(
+                    f"{os.path.join(rel_dir, name)}\0{st.st_mode}\0{st.st_size}\0".encode()
+                )
+                if os.path.islink(path):
+                    h.update(os.readlink(path).encode(errors="surrogateescape"))
+                elif contents or st.st_mtime_ns >= racy_ns:
+                    with open(path, "rb") as f:
+                        h.update(hashlib.sha256(f.read()).digest())
+                else:
+                    h.update(f"{st.st_mtime_ns}\0".encode())
+            except OSError:
+                h.update(b"?\0")
+
+
+def fingerprint(repo: Path, *, salt: str = "", extra: tuple[Path, ...] = ()) -> str:
+    """Return a digest of the workspace state a verify script can observe.
+
+    salt is mixed in as is (e.g. a digest of the exercise definition); the
+    contents of each file in extra (e.g. the learner's global git config)
+    are hashed too.
+    """
+    racy_ns = time.time_ns() - RACY_SECONDS * 1_000_000_000
+    h = hashlib.sha256(f"{salt}\0{repo}\0".encode())
+    for path in extra:
+        try:
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            h.update(b"-\0")
+
+    git_dir = repo / ".git"
+    if git_dir.is_dir():
+        for entry in sorted(git_dir.iterdir()):
+            name = entry.name
+            if name == "index":
+                try:
+                    data = entry.read_bytes()
+                except OSError:
+                    continue
+                try:
+                    h.update(repr(read_index(data)).encode())
+                except ValueError:
+                    h.update(data)
+            elif name in _STATE_DIRS:
+                _hash_tree(h, entry, name, contents=True, racy_ns=racy_ns)
+            elif name == "logs":
+                _hash_tree(h, entry, name, contents=False, racy_ns=racy_ns)
+            elif entry.is_file() and not name.endswith(".lock"):
+                try:
+                    h.update(f"git\0{name}\0".encode() + entry.read_bytes())
+                except OSError:
+                    pass
+    _hash_tree(h, repo, "worktree", contents=False, racy_ns=racy_ns)
+    return h.hexdigest()
+
+
+def _load() -> dict:
+    try:
+        data = json.loads(VERIFY_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def lookup(key: str, digest: str) -> Verification | None:
+    """Return the stored result for the exercise if it was computed for digest."""
+    entry = _load().get(key)
+    if not isinstance(entry, dict) or entry.get("fingerprint") != digest:
+        return None
+    try:
+        return Verification(
+            success=bool(entry["success"]),
+            output=str(entry["output"]),
+            is_script_error=False,
+            checks=[CheckReport(**check) for check in entry.get("checks", [])],
+            total=entry.get("total"),
+            cached=True,
+        )
+    except (KeyError, TypeError):
+        return None
+
+
+def store(key: str, digest: str, result: Verification) -> None:
+    """Remember the result of verifying the exercise in the state digest."""
+    with _store_lock:
+        data = _load()
+        data[key] = {
+            "fingerprint": digest,
+            "success": result.success,
+            "output": result.output,
+            "checks": [asdict(check) for check in result.checks],
+            "total": result.total,
+        }
+        tmp = VERIFY_CACHE_FILE.with_name(
+            f".{VERIFY_CACHE_FILE.name}.{os.getpid()}.tmp"
+        )
+        try:
+            VERIFY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, VERIFY_CACHE_FILE)
+        except OSError:
+            tmp.unlink(missing_ok=True)
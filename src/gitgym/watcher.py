@@ -12,7 +12,7 @@ import click
 from gitgym.config import EXERCISES_DIR, WORKSPACE_DIR
 from gitgym.display import print_error, print_success
 from gitgym.exercise import Exercise
-from gitgym.runner import run_verify
+from gitgym.runner import run_verify, verify_workers
 
 POLL_INTERVAL = 1  # seconds
 
@@ -132,9 +132,10 @@ def watch_and_verify(
     """Watch the exercise workspace and run verify.sh whenever a change is detected.
 
     Displays the verify output after each change.  Stops (returns) when
-    verification succeeds.  Call ``on_completed(exercise_key)`` callback (if
-    provided) so the caller can update progress without this module needing to
-    import ``progress``.
+    verification succeeds.  verify.sh runs in a long-lived bash worker (see
+    gitgym.runner.verify_workers) that is stopped when watching ends.  Call
+    ``on_completed(exercise_key)`` callback (if provided) so the caller can
+    update progress without this module needing to import ``progress``.
 
     Parameters
     ----------
@@ -166,23 +167,25 @@ def watch_and_verify(
     )
 
     try:
-        for _ in watch(exercise, poll_interval=poll_interval):
-            success, output, is_script_error = run_verify(exercise)
-
-            if output:
-                click.echo(output)
-
-            if success:
-                print_success("Exercise complete! Great work.")
-                if on_completed is not None:
-                    on_completed()
-                return
-            elif is_script_error:
-                print_error(
-                    "The verify script encountered an unexpected error.\n"
-                    "Try 'gitgym reset' to restore the exercise."
-                )
-            else:
-                print_error("Not quite right yet. Keep trying!")
+        # verify.sh runs in a bash worker kept waiting between changes.
+        with verify_workers():
+            for _ in watch(exercise, poll_interval=poll_interval):
+                success, output, is_script_error = run_verify(exercise)
+
+                if output:
+                    click.echo(output)
+
+                if success:
+                    print_success("Exercise complete! Great work.")
+                    if on_completed is not None:
+                        on_completed()
+                    return
+                elif is_script_error:
+                    print_error(
+                        "The verify script encountered an unexpected error.\n"
+                        "Try 'gitgym reset' to restore the exercise."
+                    )
+                else:
+                    print_error("Not quite right yet. Keep trying!")
     except KeyboardInterrupt:
         click.echo("\nWatch mode stopped.")
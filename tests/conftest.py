@@ -0,0 +1,61 @@
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory):
+    """Point the template cache at a fresh directory so tests never touch ~/.gitgym."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    with mock.patch("gitgym.cache.CACHE_DIR", cache_dir):
+        yield cache_dir
+
+
+@pytest.fixture(autouse=True)
+def _no_prewarm_worker(tmp_path_factory):
+    """Stage into a temp directory and never launch the background worker process."""
+    staging_dir = tmp_path_factory.mktemp("staging")
+    with (
+        mock.patch("gitgym.prewarm.STAGING_DIR", staging_dir),
+        mock.patch("gitgym.prewarm._launch") as launch,
+    ):
+        yield launch
+
+
+@pytest.fixture(autouse=True)
+def _isolated_git_config(tmp_path_factory):
+    """Write the managed git config for scripts into a temp directory."""
+    config_file = tmp_path_factory.mktemp("home") / "gitconfig"
+    with mock.patch("gitgym.runner.GIT_CONFIG_FILE", config_file):
+        yield config_file
+
+
+@pytest.fixture(autouse=True)
+def _no_object_store():
+    """Keep workspaces self-contained unless a test enables the shared store."""
+    with mock.patch("gitgym.objectstore.OBJECT_STORE", None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_metrics(tmp_path_factory):
+    """Record setup timings into a temp file instead of ~/.gitgym/metrics.jsonl."""
+    metrics_file = tmp_path_factory.mktemp("metrics") / "metrics.jsonl"
+    with mock.patch("gitgym.metrics.METRICS_FILE", metrics_file):
+        yield metrics_file
+
+
+@pytest.fixture(autouse=True)
+def _isolated_verify_cache(tmp_path_factory):
+    """Keep verify results in a temp file instead of ~/.gitgym/verify_cache.json."""
+    cache_file = tmp_path_factory.mktemp("verify") / "verify_cache.json"
+    with mock.patch("gitgym.verifycache.VERIFY_CACHE_FILE", cache_file):
+        yield cache_file
+
+
+@pytest.fixture(autouse=True)
+def _isolated_check_stats(tmp_path_factory):
+    """Count check outcomes in a temp file instead of ~/.gitgym/check_stats.json."""
+    stats_file = tmp_path_factory.mktemp("checkstats") / "check_stats.json"
+    with mock.patch("gitgym.checkstats.CHECK_STATS_FILE", stats_file):
+        yield stats_file
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from gitgym.bashworker import BashWorker, BashWorkerError, WorkerPool, runs_in_worker
+from gitgym.runner import _VERIFY_ENV_SCRIPT
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "BASH_ENV": str(_VERIFY_ENV_SCRIPT)}
+
+
+def _script(path: Path, body: str) -> Path:
+    path.write_text("#!/usr/bin/env bash\n" + body)
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def worker():
+    worker = BashWorker(_env())
+    yield worker
+    worker.close()
+
+
+def test_run_returns_status_output_and_reports(tmp_path, worker):
+    script = _script(
+        tmp_path / "verify.sh",
+        'echo "checking $1"\necho oops >&2\ngitgym_total 1\ngitgym_report a fail\n'
+        "exit 1\n",
+    )
+    returncode, output, reports = worker.run(script, ["some dir"])
+    assert returncode == 1
+    assert output == "checking some dir\noops\n"
+    assert b'{"total": 1}' in reports
+    assert b'"id": "a", "ok": false' in reports
+
+
+def test_runs_do_not_affect_each_other(tmp_path, worker):
+    (tmp_path / "ws").mkdir()
+    script = _script(
+        tmp_path / "verify.sh",
+        'echo "$PWD ${LEAK:-unset} $(type -t leaked || echo none) $-"\n'
+        'cd "$1"\n'
+        "set -euo pipefail\n"
+        "export LEAK=yes\n"
+        "leaked() { :; }\n"
+        "trap 'echo bye' EXIT\n"
+        "false\n"
+        "echo unreachable\n",
+    )
+    first = worker.run(script, [str(tmp_path / "ws")])
+    second = worker.run(script, [str(tmp_path / "ws")])
+    assert first == second
+    assert first[0] == 1
+    cwd, leak, leaked, flags, bye = first[1].split()
+    assert (cwd, leak, leaked, bye) == (os.getcwd(), "unset", "none", "bye")
+    assert "e" not in flags
+
+
+def test_script_is_reloaded_when_it_changes(tmp_path, worker):
+    script = _script(tmp_path / "verify.sh", "echo one\n")
+    assert worker.run(script, [])[1] == "one\n"
+    _script(script, "echo two; exit 0\n")
+    assert worker.run(script, [])[1] == "two\n"
+
+
+def test_syntax_error_is_left_to_the_caller(tmp_path, worker):
+    script = _script(tmp_path / "verify.sh", "if then\n")
+    assert worker.run(script, []) is None
+    good = _script(tmp_path / "good.sh", "exit 0\n")
+    assert worker.run(good, [])[0] == 0
+
+
+def test_worker_restarts_after_dying(tmp_path, worker):
+    script = _script(tmp_path / "verify.sh", "echo $$\n")
+    first = worker.run(script, [])[1]
+    os.kill(int(first), 9)
+    second = worker.run(script, [])[1]
+    assert second != first
+    assert worker.run(script, [])[1] == second
+
+
+def test_worker_that_keeps_dying_raises(tmp_path, worker):
+    script = _script(tmp_path / "verify.sh", "kill -9 $$\n")
+    with pytest.raises(BashWorkerError, match="keeps exiting"):
+        worker.run(script, [])
+
+
+def test_kill_stops_a_running_script(tmp_path, worker):
+    script = _script(tmp_path / "verify.sh", "sleep 30\n")
+    threading.Timer(0.3, worker.kill).start()
+    start = time.monotonic()
+    with pytest.raises(BashWorkerError, match="was killed"):
+        worker.run(script, [])
+    assert time.monotonic() - start < 10
+    assert worker.run(_script(tmp_path / "ok.sh", "exit 0\n"), [])[0] == 0
+
+
+def test_runs_in_worker(tmp_path):
+    assert runs_in_worker(_script(tmp_path / "a.sh", ""))
+    (tmp_path / "b.sh").write_text("#!/bin/sh\nexit 0\n")
+    assert not runs_in_worker(tmp_path / "b.sh")
+    (tmp_path / "c.sh").write_text("#!/usr/bin/env python3\n")
+    assert not runs_in_worker(tmp_path / "c.sh")
+    assert not runs_in_worker(tmp_path / "missing.sh")
+
+
+def test_pool_keeps_one_worker_per_workspace(tmp_path):
+    pool = WorkerPool(max_workers=2)
+    a, b, c = (tmp_path / name for name in "abc")
+    for path in (a, b, c):
+        path.mkdir()
+    try:
+        first = pool.get(a, _env())
+        assert pool.get(a, _env()) is first
+        assert pool.get(a, {**_env(), "X": "1"}) is not first
+        pool.get(b, _env())
+        pool.get(c, _env())
+        assert pool.get(a, _env()) is not first
+    finally:
+        pool.close()
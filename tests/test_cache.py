@@ -0,0 +1,237 @@
+import json
+import os
+import stat
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gitgym import cache
+from gitgym.exercise import Exercise
+
+
+def _make_exercise(exercise_dir: Path, name: str = "test_exercise") -> Exercise:
+    return Exercise(
+        name=name,
+        topic="Test",
+        title="Test Exercise",
+        description="A test exercise.",
+        goal_summary="A test goal.",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+@pytest.fixture
+def exercise(tmp_path):
+    exercise_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercise_dir.mkdir(parents=True)
+    setup = exercise_dir / "setup.sh"
+    setup.write_text("#!/usr/bin/env bash\necho one\n")
+    setup.chmod(setup.stat().st_mode | stat.S_IXUSR)
+    (exercise_dir / "exercise.toml").write_text("[exercise]\n")
+    return _make_exercise(exercise_dir)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    ws = tmp_path / "workspace"
+    (ws / ".git" / "objects").mkdir(parents=True)
+    (ws / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (ws / "hello.txt").write_text("hello\n")
+    return ws
+
+
+# --- exercise_digest ---
+
+
+def test_digest_is_stable(exercise):
+    assert cache.exercise_digest(exercise) == cache.exercise_digest(exercise)
+
+
+def test_digest_changes_when_setup_changes(exercise):
+    before = cache.exercise_digest(exercise)
+    (exercise.path / "setup.sh").write_text("#!/usr/bin/env bash\necho two\n")
+    assert cache.exercise_digest(exercise) != before
+
+
+def test_digest_changes_when_other_file_changes(exercise):
+    before = cache.exercise_digest(exercise)
+    (exercise.path / "exercise.toml").write_text("[exercise]\nname = 'x'\n")
+    assert cache.exercise_digest(exercise) != before
+
+
+def test_digest_changes_with_executable_bit(exercise):
+    before = cache.exercise_digest(exercise)
+    (exercise.path / "setup.sh").chmod(0o644)
+    assert cache.exercise_digest(exercise) != before
+
+
+# --- lookup / store / restore ---
+
+
+def test_lookup_miss_returns_none(exercise):
+    assert cache.lookup(exercise) is None
+
+
+def test_store_then_lookup_hits(exercise, workspace):
+    stored = cache.store(exercise, workspace)
+    assert stored is not None
+    assert cache.lookup(exercise) == stored
+    assert (stored / "hello.txt").read_text() == "hello\n"
+
+
+def test_store_writes_meta(exercise, workspace, _isolated_cache):
+    cache.store(exercise, workspace)
+    meta_path = _isolated_cache / cache.exercise_digest(exercise) / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    assert meta["exercise"] == "01_basics/01_init"
+    assert meta["size"] > 0
+
+
+def test_store_twice_keeps_single_entry(exercise, workspace):
+    cache.store(exercise, workspace)
+    cache.store(exercise, workspace)
+    assert len(cache.cache_stats()["entries"]) == 1
+
+
+def test_restore_replaces_destination_contents(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "stray.txt").write_text("left over")
+    cache.restore(template, dest)
+    assert not (dest / "stray.txt").exists()
+    assert (dest / "hello.txt").read_text() == "hello\n"
+    assert (dest / ".git" / "HEAD").exists()
+
+
+def test_restore_keeps_destination_directory(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    inode = dest.stat().st_ino
+    cache.restore(template, dest)
+    assert dest.stat().st_ino == inode
+
+
+def test_restore_preserves_executable_bit(exercise, workspace, tmp_path):
+    script = workspace / "test.sh"
+    script.write_text("#!/usr/bin/env bash\n")
+    script.chmod(0o755)
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    cache.restore(template, dest)
+    assert os.access(dest / "test.sh", os.X_OK)
+
+
+# --- eviction ---
+
+
+def _store_variant(tmp_path, workspace, name: str) -> Exercise:
+    exercise_dir = tmp_path / "exercises" / "01_basics" / name
+    exercise_dir.mkdir(parents=True)
+    (exercise_dir / "setup.sh").write_text(f"# {name}\n")
+    ex = _make_exercise(exercise_dir, name=name)
+    cache.store(ex, workspace)
+    return ex
+
+
+def test_evict_removes_least_recently_used(tmp_path, workspace, _isolated_cache):
+    old = _store_variant(tmp_path, workspace, "01_old")
+    new = _store_variant(tmp_path, workspace, "02_new")
+    os.utime(_isolated_cache / cache.exercise_digest(old) / "meta.json", (1, 1))
+
+    entry_size = cache.cache_stats()["entries"][0]["size"]
+    removed = cache.evict(max_bytes=entry_size)
+
+    assert removed == [cache.exercise_digest(old)]
+    assert cache.lookup(old) is None
+    assert cache.lookup(new) is not None
+
+
+def test_lookup_refreshes_last_used(tmp_path, workspace, _isolated_cache):
+    first = _store_variant(tmp_path, workspace, "01_first")
+    second = _store_variant(tmp_path, workspace, "02_second")
+    for ex in (first, second):
+        os.utime(_isolated_cache / cache.exercise_digest(ex) / "meta.json", (1, 1))
+    cache.lookup(first)
+
+    entry_size = cache.cache_stats()["entries"][0]["size"]
+    removed = cache.evict(max_bytes=entry_size)
+
+    assert removed == [cache.exercise_digest(second)]
+
+
+def test_store_enforces_size_cap(tmp_path, workspace):
+    with mock.patch("gitgym.cache.CACHE_MAX_BYTES", 1):
+        _store_variant(tmp_path, workspace, "01_a")
+        latest = _store_variant(tmp_path, workspace, "02_b")
+    entries = cache.cache_stats()["entries"]
+    assert [e["digest"] for e in entries] == [cache.exercise_digest(latest)]
+
+
+# --- stats / clear ---
+
+
+def test_stats_empty_cache():
+    stats = cache.cache_stats()
+    assert stats["entries"] == []
+    assert stats["total_bytes"] == 0
+
+
+def test_stats_reports_total_size(exercise, workspace):
+    cache.store(exercise, workspace)
+    stats = cache.cache_stats()
+    assert stats["total_bytes"] == stats["entries"][0]["size"]
+
+
+def test_clear_removes_everything(exercise, workspace):
+    cache.store(exercise, workspace)
+    assert cache.clear_cache() == 1
+    assert cache.lookup(exercise) is None
+
+
+def test_clear_empty_cache_returns_zero():
+    assert cache.clear_cache() == 0
+
+
+# --- refresh ---
+
+
+def test_refresh_repairs_in_place(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    cache.restore(template, dest)
+    (dest / "hello.txt").write_text("changed\n")
+    (dest / "stray.txt").write_text("left over")
+    strategy = cache.refresh(template, dest)
+    assert strategy.startswith("incremental: 2 changed")
+    assert (dest / "hello.txt").read_text() == "hello\n"
+    assert not (dest / "stray.txt").exists()
+
+
+def test_refresh_unchanged(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    cache.restore(template, dest)
+    assert cache.refresh(template, dest) == "incremental: unchanged"
+
+
+def test_refresh_empty_destination_does_full_restore(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    dest = tmp_path / "dest"
+    strategy = cache.refresh(template, dest)
+    assert not strategy.startswith("incremental")
+    assert (dest / "hello.txt").read_text() == "hello\n"
+
+
+def test_refresh_without_manifest_does_full_restore(exercise, workspace, tmp_path):
+    template = cache.store(exercise, workspace)
+    (template.parent / "manifest.json").unlink()
+    dest = tmp_path / "dest"
+    cache.restore(template, dest)
+    (dest / "stray.txt").write_text("left over")
+    strategy = cache.refresh(template, dest)
+    assert not strategy.startswith("incremental")
+    assert not (dest / "stray.txt").exists()
@@ -0,0 +1,233 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym.checks import CheckError, parse_checks, run_checks
+from gitgym.gitpool import GitBatch
+from gitgym.repo import Repo
+
+
+def _env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(),
+    ).stdout.strip()
+
+
+def _commit(repo: Path, name: str, message: str | None = None) -> None:
+    (repo / f"{name}.txt").write_text(f"{name}\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", message or f"Add {name}")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main: a-b, feature: a-b-c-d (checked out)."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _commit(repo, "a")
+    _commit(repo, "b")
+    _git(repo, "switch", "-q", "-c", "feature")
+    _commit(repo, "c")
+    _commit(repo, "d", "Fix the d file\n\nCloses #4.")
+    _git(repo, "config", "alias.st", "status")
+    return repo
+
+
+@pytest.fixture
+def run(repo):
+    batch = GitBatch(repo)
+
+    def run(*entries: dict):
+        return run_checks(parse_checks(list(entries)), Repo(repo, batch, _env()))
+
+    yield run
+    batch.close()
+
+
+def _passed(results) -> bool:
+    return all(r.passed for r in results)
+
+
+# --- parse_checks ---
+
+
+@pytest.mark.parametrize(
+    "entry, error",
+    [
+        ({"type": "nope"}, "unknown type 'nope'"),
+        ({}, "unknown type None"),
+        ({"type": "branch"}, "missing name"),
+        ({"type": "branch", "name": "x", "extra": 1}, "unknown key extra"),
+        ({"type": "commit_count", "rev": "HEAD"}, "needs count, min or max"),
+        ({"type": "commit_count", "rev": "HEAD", "count": "2"}, "must be an integer"),
+        ({"type": "message"}, "needs matches or not_matches"),
+        ({"type": "message", "matches": "("}, "invalid matches pattern"),
+        ({"type": "ref"}, "needs one of branch, tag or name"),
+        (
+            {"type": "ref", "branch": "a", "tag": "b"},
+            "needs one of branch, tag or name",
+        ),
+        ({"type": "ref", "name": "main"}, "must be a full ref name"),
+        ({"type": "ref", "tag": "v1", "annotated": "yes"}, "must be true or false"),
+        ({"type": "branch", "name": 1}, "name must be a string"),
+        ({"type": "file_committed", "path": ["a"]}, "path must be a string"),
+        ({"type": "commit_count", "rev": 2, "count": 1}, "rev must be a string"),
+        ({"type": "config", "key": "a.b", "value": True}, "value must be a string"),
+        ({"type": "branch", "name": "x", "message": 3}, "message must be a string"),
+    ],
+)
+def test_parse_checks_rejects_invalid_entries(entry, error):
+    with pytest.raises(CheckError, match=r"checks\[0\]") as excinfo:
+        parse_checks([entry])
+    assert error in str(excinfo.value)
+
+
+def test_parse_checks_keeps_custom_message():
+    (check,) = parse_checks([{"type": "branch", "name": "x", "message": "Go to x"}])
+    assert check.kind == "branch"
+    assert check.params == {"name": "x"}
+    assert check.message == "Go to x"
+    assert check.label == "branch name=x"
+
+
+# --- individual checks ---
+
+
+def test_branch(run, repo):
+    assert _passed(run({"type": "branch", "name": "feature"}))
+    (result,) = run({"type": "branch", "name": "main"})
+    assert result.detail == "You are on branch 'feature', not 'main'."
+    _git(repo, "switch", "-q", "--detach")
+    (result,) = run({"type": "branch", "name": "feature"})
+    assert "detached" in result.detail
+
+
+def test_ref(run, repo):
+    _git(repo, "tag", "light", "main")
+    _git(repo, "tag", "-a", "v1", "-m", "One", "main")
+    _git(repo, "pack-refs", "--all")
+    assert _passed(
+        run(
+            {"type": "ref", "branch": "main", "target": "feature~2"},
+            {"type": "ref", "branch": "gone", "exists": False},
+            {"type": "ref", "tag": "v1", "annotated": True, "target": "main"},
+            {"type": "ref", "tag": "light", "annotated": False},
+            {"type": "ref", "name": "refs/heads/feature"},
+        )
+    )
+    cases = [
+        ({"branch": "gone"}, "Branch 'gone' does not exist."),
+        ({"branch": "main", "exists": False}, "Branch 'main' still exists."),
+        ({"tag": "light", "annotated": True}, "Tag 'light' is a lightweight tag"),
+        ({"tag": "v1", "annotated": False}, "Tag 'v1' is an annotated tag"),
+        ({"tag": "v1", "target": "feature"}, "Tag 'v1' does not point to the same"),
+        ({"branch": "main", "target": "nope"}, "'nope' does not exist."),
+    ]
+    for params, detail in cases:
+        (result,) = run({"type": "ref", **params})
+        assert result.detail.startswith(detail), result.detail
+
+
+def test_no_operation(run, repo):
+    assert _passed(run({"type": "no_operation"}))
+    (repo / ".git" / "rebase-merge").mkdir()
+    (result,) = run({"type": "no_operation"})
+    assert result.detail == "There is a rebase in progress; finish or abort it first."
+
+
+def test_file_committed(run, repo):
+    assert _passed(run({"type": "file_committed", "path": "d.txt"}))
+    (repo / "d.txt").write_text("changed\n")
+    (result,) = run({"type": "file_committed", "path": "d.txt"})
+    assert "differs" in result.detail
+    (result,) = run({"type": "file_committed", "path": "d.txt", "rev": "main"})
+    assert result.detail == "'d.txt' is not committed in main."
+    (repo / "a.txt").unlink()
+    (result,) = run({"type": "file_committed", "path": "a.txt"})
+    assert "missing from the working tree" in result.detail
+
+
+def test_commit_count(run):
+    assert _passed(run({"type": "commit_count", "rev": "feature", "count": 4}))
+    assert _passed(
+        run({"type": "commit_count", "rev": "feature", "since": "main", "count": 2})
+    )
+    (result,) = run({"type": "commit_count", "rev": "main", "min": 3})
+    assert result.detail == "Expected at least 3 commit(s) in main, found 2."
+    (result,) = run({"type": "commit_count", "rev": "feature", "max": 1})
+    assert result.detail == "Expected at most 1 commit(s) in feature, found 4."
+    (result,) = run({"type": "commit_count", "rev": "nope", "count": 1})
+    assert result.detail == "'nope' does not exist."
+
+
+def test_config(run, repo):
+    assert _passed(run({"type": "config", "key": "alias.st", "value": "status"}))
+    assert _passed(run({"type": "config", "key": "Alias.ST", "value": "status"}))
+    (result,) = run({"type": "config", "key": "alias.co", "value": "checkout"})
+    assert result.detail == "'alias.co' is not set."
+    _git(repo, "config", "branch.Feature.remote", "origin")
+    assert _passed(
+        run({"type": "config", "key": "branch.Feature.remote", "value": "origin"})
+    )
+
+
+def test_message(run):
+    assert _passed(run({"type": "message", "matches": "^Fix", "not_matches": "WIP"}))
+    assert _passed(run({"type": "message", "matches": "^Closes #4"}))
+    (result,) = run({"type": "message", "rev": "main", "matches": "^Fix"})
+    assert result.detail == "The message of main ('Add b') should match /^Fix/."
+    (result,) = run({"type": "message", "not_matches": "d file"})
+    assert "should not match" in result.detail
+
+
+# --- run_checks ---
+
+
+def test_run_checks_stops_at_first_failure(run):
+    results = run(
+        {"type": "no_operation"},
+        {"type": "branch", "name": "main", "message": "Switch to main."},
+        {"type": "branch", "name": "feature"},
+    )
+    assert [r.passed for r in results] == [True, False]
+    assert results[1].detail == "Switch to main."
+    assert all(r.seconds >= 0 for r in results)
+
+
+def test_run_checks_evaluates_each_check_inside_step(repo):
+    from contextlib import contextmanager
+
+    entered = []
+
+    @contextmanager
+    def step(name):
+        entered.append(name)
+        yield
+
+    batch = GitBatch(repo)
+    try:
+        checks = parse_checks(
+            [{"type": "branch", "name": "feature"}, {"type": "no_operation"}]
+        )
+        run_checks(checks, Repo(repo, batch, _env()), step=step)
+    finally:
+        batch.close()
+    assert entered == [c.label for c in checks]
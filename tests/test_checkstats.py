@@ -0,0 +1,176 @@
+import json
+import threading
+
+from gitgym import checkstats
+from gitgym.checks import CheckResult, parse_checks
+from gitgym.exercise import Exercise
+
+CHECKS = parse_checks(
+    [
+        {"type": "commit_count", "rev": "HEAD", "count": 2},
+        {"type": "message", "matches": "^Fix"},
+        {"type": "branch", "name": "main"},
+        {"type": "no_operation"},
+    ]
+)
+
+
+def _kinds(checks):
+    return [check.kind for check in checks]
+
+
+def test_order_without_statistics_runs_cheap_checks_first():
+    assert _kinds(checkstats.order(CHECKS, {})) == [
+        "branch",
+        "no_operation",
+        "message",
+        "commit_count",
+    ]
+
+
+def test_order_keeps_declared_order_for_ties():
+    checks = parse_checks([{"type": "branch", "name": "a"}, {"type": "no_operation"}])
+    assert checkstats.order(checks, {}) == checks
+    assert checkstats.order(checks[::-1], {}) == checks[::-1]
+
+
+def test_order_runs_frequent_failures_first():
+    stats = {
+        "branch name=main": {"runs": 10, "failures": 0, "seconds": 0.001},
+        "no_operation": {"runs": 10, "failures": 0, "seconds": 0.001},
+        "message matches=^Fix": {"runs": 10, "failures": 9, "seconds": 0.001},
+        "commit_count rev=HEAD count=2": {"runs": 10, "failures": 0, "seconds": 0.001},
+    }
+    assert _kinds(checkstats.order(CHECKS, stats))[0] == "message"
+
+
+def test_order_lets_cheap_failing_check_gate_expensive_one():
+    checks = parse_checks(
+        [
+            {"type": "commit_count", "rev": "HEAD", "count": 2},
+            {"type": "branch", "name": "main"},
+        ]
+    )
+    stats = {
+        # Fails more often, but costs a hundred times as much.
+        "commit_count rev=HEAD count=2": {"runs": 10, "failures": 8, "seconds": 0.5},
+        "branch name=main": {"runs": 10, "failures": 4, "seconds": 0.005},
+    }
+    assert _kinds(checkstats.order(checks, stats)) == ["branch", "commit_count"]
+
+
+def test_order_is_deterministic_for_a_stats_file():
+    stats = {"message matches=^Fix": {"runs": 3, "failures": 1, "seconds": 0.002}}
+    first = checkstats.order(CHECKS, stats)
+    assert all(checkstats.order(CHECKS, stats) == first for _ in range(5))
+
+
+def test_record_counts_runs_failures_and_time(_isolated_check_stats):
+    branch, no_operation = parse_checks(
+        [{"type": "branch", "name": "main"}, {"type": "no_operation"}]
+    )
+    checkstats.record(
+        "01_t/01_e",
+        [
+            CheckResult(branch, True, "", 0.25),
+            CheckResult(no_operation, False, "x", 0.5),
+        ],
+    )
+    checkstats.record("01_t/01_e", [CheckResult(branch, False, "y", 0.25)])
+
+    stats = checkstats.exercise_stats("01_t/01_e")
+    assert stats["branch name=main"] == {"runs": 2, "failures": 1, "seconds": 0.5}
+    assert stats["no_operation"] == {"runs": 1, "failures": 1, "seconds": 0.5}
+    data = json.loads(_isolated_check_stats.read_text())
+    assert data["version"] == 1
+
+
+def test_record_from_threads_loses_nothing():
+    (branch,) = parse_checks([{"type": "branch", "name": "main"}])
+    threads = [
+        threading.Thread(
+            target=checkstats.record,
+            args=("01_t/01_e", [CheckResult(branch, False, "", 0.0)]),
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert checkstats.exercise_stats("01_t/01_e")["branch name=main"]["runs"] == 8
+
+
+def test_damaged_file_counts_as_no_statistics(_isolated_check_stats):
+    _isolated_check_stats.write_text("{not json")
+    assert checkstats.load() == {"version": 1, "exercises": {}}
+    assert checkstats.exercise_stats("01_t/01_e") == {}
+
+
+def test_damaged_entries_count_as_no_statistics(_isolated_check_stats):
+    _isolated_check_stats.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "exercises": {
+                    "01_t/01_e": {
+                        "branch name=main": "lots",
+                        "no_operation": {"runs": "3", "failures": 1, "seconds": 0.1},
+                        "commit_count rev=HEAD count=2": {"runs": 2},
+                    },
+                    "01_t/02_e": [],
+                },
+            }
+        )
+    )
+    stats = checkstats.exercise_stats("01_t/01_e")
+    assert checkstats.order(CHECKS, stats) == checkstats.order(CHECKS, {})
+
+    checkstats.record("01_t/01_e", [CheckResult(CHECKS[2], True, "", 0.001)])
+    checkstats.record("01_t/02_e", [CheckResult(CHECKS[2], False, "", 0.001)])
+    entry = checkstats.exercise_stats("01_t/01_e")["branch name=main"]
+    assert (entry["runs"], entry["failures"]) == (1, 0)
+    assert checkstats.exercise_stats("01_t/02_e")["branch name=main"]["failures"] == 1
+
+
+def test_summary_lists_checks_in_run_order(tmp_path):
+    exercise = Exercise(
+        name="e",
+        topic="T",
+        title="E",
+        description="",
+        goal_summary="",
+        hints=[],
+        path=tmp_path / "01_t" / "01_e",
+        checks=[{"type": "no_operation"}, {"type": "branch", "name": "main"}],
+    )
+    plain = Exercise(
+        name="p",
+        topic="T",
+        title="P",
+        description="",
+        goal_summary="",
+        hints=[],
+        path=tmp_path / "01_t" / "02_p",
+    )
+    (branch,) = parse_checks([{"type": "branch", "name": "main"}])
+    checkstats.record("01_t/01_e", [CheckResult(branch, False, "", 0.00001)])
+
+    summary = checkstats.summary([exercise, plain])
+    (entry,) = summary["exercises"]
+    assert entry["exercise"] == "01_t/01_e"
+    assert [row["check"] for row in entry["checks"]] == [
+        "branch name=main",
+        "no_operation",
+    ]
+    assert entry["checks"][0]["runs"] == 1
+    assert entry["checks"][0]["mean_seconds"] == 0.00001
+    assert entry["checks"][1]["mean_seconds"] is None
+
+
+def test_clear_removes_statistics(_isolated_check_stats):
+    (branch,) = parse_checks([{"type": "branch", "name": "main"}])
+    checkstats.record("01_t/01_e", [CheckResult(branch, True, "", 0.0)])
+    checkstats.clear()
+    assert not _isolated_check_stats.exists()
+    checkstats.clear()
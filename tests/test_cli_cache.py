@@ -0,0 +1,63 @@
+"""Integration tests for the `gitgym cache` command group."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from gitgym import cache
+from gitgym.cli import main
+from gitgym.exercise import Exercise
+
+
+def _invoke(args):
+    runner = CliRunner()
+    with patch("gitgym.cli._is_git_installed", return_value=True):
+        return runner.invoke(main, ["cache"] + args)
+
+
+def _store_template(tmp_path: Path) -> None:
+    exercise_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercise_dir.mkdir(parents=True)
+    (exercise_dir / "setup.sh").write_text("#!/usr/bin/env bash\n")
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "hello.txt").write_text("hello\n")
+    exercise = Exercise(
+        name="init",
+        topic="Basics",
+        title="Initialize a Repository",
+        description="A description.",
+        goal_summary="A goal.",
+        hints=[],
+        path=exercise_dir,
+    )
+    cache.store(exercise, workspace)
+
+
+def test_cache_stats_empty_exits_zero():
+    result = _invoke(["stats"])
+    assert result.exit_code == 0, result.output
+    assert "Templates: 0" in result.output
+
+
+def test_cache_stats_lists_entries(tmp_path):
+    _store_template(tmp_path)
+    result = _invoke(["stats"])
+    assert result.exit_code == 0, result.output
+    assert "Templates: 1" in result.output
+    assert "01_basics/01_init" in result.output
+
+
+def test_cache_clear_removes_templates(tmp_path):
+    _store_template(tmp_path)
+    result = _invoke(["clear"])
+    assert result.exit_code == 0, result.output
+    assert "Removed 1" in result.output
+    assert cache.cache_stats()["entries"] == []
+
+
+def test_cache_appears_in_help():
+    runner = CliRunner()
+    result = runner.invoke(main, ["--help"])
+    assert "cache" in result.output
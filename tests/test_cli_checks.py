@@ -0,0 +1,71 @@
+"""Integration tests for the `gitgym checks` command group."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from gitgym import checkstats
+from gitgym.checks import CheckResult, parse_checks
+from gitgym.cli import main
+from gitgym.exercise import Exercise
+
+
+def _exercise(path: Path, checks: list[dict]) -> Exercise:
+    return Exercise(
+        name="init",
+        topic="Basics",
+        title="Initialize a Repository",
+        description="A description.",
+        goal_summary="A goal.",
+        hints=[],
+        path=path,
+        checks=checks,
+    )
+
+
+def _invoke(args, exercises):
+    runner = CliRunner()
+    with (
+        patch("gitgym.cli._is_git_installed", return_value=True),
+        patch("gitgym.cli.load_all_exercises", return_value=exercises),
+    ):
+        return runner.invoke(main, ["checks"] + args)
+
+
+def test_checks_stats_without_checks(tmp_path):
+    result = _invoke(["stats"], [_exercise(tmp_path / "01_basics" / "01_init", [])])
+    assert result.exit_code == 0, result.output
+    assert "No exercise has [[checks]]" in result.output
+
+
+def test_checks_stats_shows_run_order_and_counts(tmp_path):
+    exercise = _exercise(
+        tmp_path / "01_basics" / "01_init",
+        [{"type": "commit_count", "rev": "HEAD", "min": 1}, {"type": "no_operation"}],
+    )
+    check, _ = parse_checks(exercise.checks)
+    for passed in (False, False, True, False):
+        checkstats.record(
+            "01_basics/01_init", [CheckResult(check, passed, "", 0.00001)]
+        )
+
+    result = _invoke(["stats"], [exercise])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    first = next(line for line in lines if line.strip().startswith("1."))
+    second = next(line for line in lines if line.strip().startswith("2."))
+    assert "commit_count rev=HEAD min=1" in first
+    assert "4 runs" in first
+    assert "75% failed" in first
+    assert "no_operation" in second
+    assert "never run" in second
+
+
+def test_checks_clear(tmp_path, _isolated_check_stats):
+    (check,) = parse_checks([{"type": "no_operation"}])
+    checkstats.record("01_basics/01_init", [CheckResult(check, True, "", 0.0)])
+    result = _invoke(["clear"], [])
+    assert result.exit_code == 0, result.output
+    assert "cleared" in result.output
+    assert not _isolated_check_stats.exists()
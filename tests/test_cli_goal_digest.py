@@ -0,0 +1,93 @@
+"""Integration tests for the `gitgym goal-digest` command."""
+
+import re
+import subprocess
+import tomllib
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from gitgym.cli import main
+from gitgym.exercise import Exercise
+
+
+def _exercise(tmp_path: Path) -> Exercise:
+    exercise_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercise_dir.mkdir(parents=True)
+    workspace = tmp_path / "workspace" / "01_basics" / "01_init"
+    workspace.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=workspace, check=True)
+    return Exercise(
+        name="init",
+        topic="Basics",
+        title="Initialize a Repository",
+        description="",
+        goal_summary="",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def _invoke(args, current_key, exercises, tmp_path):
+    runner = CliRunner()
+    with ExitStack() as stack:
+        stack.enter_context(patch("gitgym.cli._is_git_installed", return_value=True))
+        stack.enter_context(
+            patch("gitgym.cli.get_current_exercise", return_value=current_key)
+        )
+        stack.enter_context(
+            patch("gitgym.cli.load_all_exercises", return_value=exercises)
+        )
+        stack.enter_context(
+            patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises")
+        )
+        stack.enter_context(
+            patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace")
+        )
+        return runner.invoke(main, ["goal-digest", *args])
+
+
+def test_goal_digest_prints_a_goal_table(tmp_path):
+    result = _invoke([], "01_basics/01_init", [_exercise(tmp_path)], tmp_path)
+    assert result.exit_code == 0, result.output
+    goal = tomllib.loads(result.output)["goal"]
+    assert goal["covers"] == ["head", "branches", "ancestry", "operation"]
+    assert re.fullmatch(r"[0-9a-f]{64}", goal["digest"])
+
+
+def test_goal_digest_covers_option(tmp_path):
+    exercise = _exercise(tmp_path)
+    default = _invoke([], "01_basics/01_init", [exercise], tmp_path)
+    status = _invoke(
+        ["--covers", "head", "--covers", "status"],
+        "01_basics/01_init",
+        [exercise],
+        tmp_path,
+    )
+    assert status.exit_code == 0, status.output
+    goal = tomllib.loads(status.output)["goal"]
+    assert goal["covers"] == ["head", "status"]
+    assert goal["digest"] != tomllib.loads(default.output)["goal"]["digest"]
+
+
+def test_goal_digest_uses_the_exercise_covers(tmp_path):
+    exercise = _exercise(tmp_path)
+    exercise.goal = {"covers": ["tags"], "digest": "0" * 64}
+    result = _invoke([], "01_basics/01_init", [exercise], tmp_path)
+    assert tomllib.loads(result.output)["goal"]["covers"] == ["tags"]
+
+
+def test_goal_digest_no_exercise_in_progress(tmp_path):
+    result = _invoke([], None, [], tmp_path)
+    assert result.exit_code == 1
+    assert "No exercise is currently in progress" in result.output
+
+
+def test_goal_digest_missing_workspace(tmp_path):
+    exercise = _exercise(tmp_path)
+    exercise.path = tmp_path / "exercises" / "01_basics" / "02_missing"
+    result = _invoke([], "01_basics/02_missing", [exercise], tmp_path)
+    assert result.exit_code == 1
+    assert "not found" in result.output
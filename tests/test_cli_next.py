@@ -182,3 +182,73 @@ def test_next_appears_in_help():
     with patch("gitgym.cli._is_git_installed", return_value=True):
         result = runner.invoke(main, ["--help"])
     assert "next" in result.output
+
+
+def _make_second_exercise(exercises_dir: Path) -> Exercise:
+    exercise_dir = exercises_dir / "01_basics" / "02_staging"
+    exercise_dir.mkdir(parents=True)
+    (exercise_dir / "exercise.toml").write_text(
+        '[exercise]\nname = "staging"\ntopic = "Basics"\ntitle = "Staging"\n'
+        'description = "Stage files."\n[goal]\nsummary = "Staged."\n'
+    )
+    setup_script = exercise_dir / "setup.sh"
+    setup_script.write_text(
+        '#!/usr/bin/env bash\nset -euo pipefail\ntouch "$1/staged_marker.txt"\n'
+    )
+    setup_script.chmod(setup_script.stat().st_mode | stat.S_IEXEC)
+    return Exercise(
+        name="staging",
+        topic="Basics",
+        title="Staging",
+        description="Stage files.",
+        goal_summary="Staged.",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def test_next_launches_prewarm_for_following_exercise(_no_prewarm_worker):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        workspace = tmpdir / "workspace"
+        exercises_dir = tmpdir / "exercises"
+
+        ex1 = _make_real_exercise(exercises_dir)
+        ex2 = _make_second_exercise(exercises_dir)
+
+        result = _invoke_next(
+            [ex1, ex2],
+            {"exercises": {}},
+            workspace,
+            tmpdir / "progress.json",
+            exercises_dir,
+        )
+        assert result.exit_code == 0, result.output
+        _no_prewarm_worker.assert_called_once_with(["01_basics/02_staging"])
+
+
+def test_next_uses_prewarmed_workspace():
+    from gitgym import prewarm
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        workspace = tmpdir / "workspace"
+        exercises_dir = tmpdir / "exercises"
+
+        ex1 = _make_real_exercise(exercises_dir)
+        ex2 = _make_second_exercise(exercises_dir)
+        progress = {"exercises": {"01_basics/01_init": {"status": "completed"}}}
+
+        with (
+            patch("gitgym.prewarm.EXERCISES_DIR", exercises_dir),
+            patch("gitgym.runner.EXERCISES_DIR", exercises_dir),
+        ):
+            prewarm.prewarm(["01_basics/02_staging"])
+        assert prewarm.is_staged(ex2)
+
+        result = _invoke_next(
+            [ex1, ex2], progress, workspace, tmpdir / "progress.json", exercises_dir
+        )
+        assert result.exit_code == 0, result.output
+        assert (workspace / "01_basics" / "02_staging" / "staged_marker.txt").exists()
+        assert not prewarm.is_staged(ex2)
@@ -0,0 +1,131 @@
+"""Integration tests for the `gitgym prepare` command."""
+
+import stat
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from gitgym.cli import main
+from gitgym.exercise import Exercise
+
+
+def _make_exercise(
+    exercises_dir: Path, topic_dir: str, name: str, topic: str, script: str = ""
+) -> Exercise:
+    exercise_dir = exercises_dir / topic_dir / f"01_{name}"
+    exercise_dir.mkdir(parents=True)
+    setup = exercise_dir / "setup.sh"
+    setup.write_text(
+        "#!/usr/bin/env bash\nset -euo pipefail\n"
+        + (script or 'touch "$1/prepared.txt"\n')
+    )
+    setup.chmod(setup.stat().st_mode | stat.S_IEXEC)
+    return Exercise(
+        name=name,
+        topic=topic,
+        title=name.title(),
+        description="",
+        goal_summary="",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def _invoke_prepare(args, exercises, tmp_path):
+    runner = CliRunner()
+    workspace = tmp_path / "workspace"
+    with ExitStack() as stack:
+        stack.enter_context(patch("gitgym.cli._is_git_installed", return_value=True))
+        stack.enter_context(
+            patch("gitgym.cli.load_all_exercises", return_value=exercises)
+        )
+        stack.enter_context(patch("gitgym.runner.EXERCISES_DIR", tmp_path / "ex"))
+        stack.enter_context(patch("gitgym.runner.WORKSPACE_DIR", workspace))
+        stack.enter_context(patch("gitgym.prepare.WORKSPACE_DIR", workspace))
+        result = runner.invoke(main, ["prepare", *args])
+    return result, workspace
+
+
+def test_prepare_requires_all_or_topic(tmp_path):
+    result, _ = _invoke_prepare([], [], tmp_path)
+    assert result.exit_code == 1
+    assert "--all or at least one --topic" in result.output
+
+
+def test_prepare_all_sets_up_every_exercise(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_basics", "init", "Basics"),
+        _make_exercise(tmp_path / "ex", "02_branching", "branch", "Branching"),
+    ]
+    result, workspace = _invoke_prepare(["--all", "-j", "2"], exercises, tmp_path)
+
+    assert result.exit_code == 0, result.output
+    assert (workspace / "01_basics" / "01_init" / "prepared.txt").exists()
+    assert (workspace / "02_branching" / "01_branch" / "prepared.txt").exists()
+    assert "Prepared 2 exercise(s)" in result.output
+    assert "01_basics/01_init" in result.output
+
+
+def test_prepare_topic_by_name_or_directory(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_basics", "init", "Basics"),
+        _make_exercise(tmp_path / "ex", "02_branching", "branch", "Branching"),
+    ]
+    for topic in ("basics", "01_basics"):
+        result, workspace = _invoke_prepare(["--topic", topic], exercises, tmp_path)
+        assert result.exit_code == 0, result.output
+        assert (workspace / "01_basics" / "01_init" / "prepared.txt").exists()
+        assert not (workspace / "02_branching").exists()
+
+
+def test_prepare_unknown_topic(tmp_path):
+    exercises = [_make_exercise(tmp_path / "ex", "01_basics", "init", "Basics")]
+    result, _ = _invoke_prepare(["--topic", "nope"], exercises, tmp_path)
+    assert result.exit_code == 1
+    assert "No exercises found for topic nope" in result.output
+
+
+def test_prepare_failure_summary(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_basics", "init", "Basics"),
+        _make_exercise(
+            tmp_path / "ex",
+            "02_branching",
+            "branch",
+            "Branching",
+            "echo oops >&2\nexit 1\n",
+        ),
+    ]
+    result, workspace = _invoke_prepare(["--all"], exercises, tmp_path)
+
+    assert result.exit_code == 1
+    assert "1 failed" in result.output
+    assert "Failures:" in result.output
+    assert "oops" in result.output
+    assert (workspace / "01_basics" / "01_init" / "prepared.txt").exists()
+
+
+def test_prepare_leaves_existing_workspaces(tmp_path):
+    exercises = [_make_exercise(tmp_path / "ex", "01_basics", "init", "Basics")]
+    existing = tmp_path / "workspace" / "01_basics" / "01_init"
+    existing.mkdir(parents=True)
+    (existing / "mine.txt").write_text("work")
+
+    result, _ = _invoke_prepare(["--all"], exercises, tmp_path)
+    assert result.exit_code == 0
+    assert "1 skipped" in result.output
+    assert (existing / "mine.txt").exists()
+
+    result, _ = _invoke_prepare(["--all", "--force"], exercises, tmp_path)
+    assert result.exit_code == 0
+    assert not (existing / "mine.txt").exists()
+
+
+def test_prepare_does_not_touch_progress(tmp_path):
+    exercises = [_make_exercise(tmp_path / "ex", "01_basics", "init", "Basics")]
+    with patch("gitgym.cli.mark_in_progress") as mark:
+        result, _ = _invoke_prepare(["--all"], exercises, tmp_path)
+    assert result.exit_code == 0
+    mark.assert_not_called()
@@ -266,3 +266,35 @@ def test_start_skips_completed_exercises():
         )
         assert result.exit_code == 0
         assert "Staging Files" in result.output
+
+
+def test_start_verbose_reports_provisioning():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        workspace = tmpdir / "workspace"
+        workspace.mkdir()
+        progress_file = tmpdir / "progress.json"
+        exercises_dir = tmpdir / "exercises"
+
+        ex = _make_real_exercise(exercises_dir)
+
+        result = _invoke_start(
+            [ex],
+            {"exercises": {}},
+            ["init", "--verbose"],
+            workspace,
+            progress_file,
+            exercises_dir,
+        )
+        assert result.exit_code == 0, result.output
+        assert "setup.sh" in result.output
+
+        result = _invoke_start(
+            [ex],
+            {"exercises": {}},
+            ["init", "--verbose"],
+            workspace,
+            progress_file,
+            exercises_dir,
+        )
+        assert "restored from cache" in result.output
@@ -0,0 +1,59 @@
+"""Integration tests for the `gitgym store` command group."""
+
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from gitgym.cli import main
+
+
+def _invoke(args):
+    runner = CliRunner()
+    with patch("gitgym.cli._is_git_installed", return_value=True):
+        return runner.invoke(main, ["store"] + args)
+
+
+def test_store_stats_disabled_exits_zero():
+    with patch("gitgym.objectstore.OBJECT_STORE", None):
+        result = _invoke(["stats"])
+    assert result.exit_code == 0, result.output
+    assert "disabled" in result.output
+    assert "GITGYM_OBJECT_STORE" in result.output
+
+
+def test_store_stats_shows_path(tmp_path):
+    store = tmp_path / "store.git"
+    with patch("gitgym.objectstore.OBJECT_STORE", store):
+        result = _invoke(["stats"])
+    assert result.exit_code == 0, result.output
+    assert str(store) in result.output
+    assert "Workspaces:" in result.output
+
+
+def test_store_dissociate_reports_and_clears_cache(tmp_path):
+    with (
+        patch("gitgym.cli.dissociate_all", return_value=(2, [])),
+        patch("gitgym.cli.clear_cache") as clear,
+    ):
+        result = _invoke(["dissociate"])
+    assert result.exit_code == 0, result.output
+    assert "Dissociated 2 workspace(s)" in result.output
+    clear.assert_called_once()
+
+
+def test_store_dissociate_failure_exits_nonzero(tmp_path):
+    broken = tmp_path / "01_basics" / "01_init"
+    with (
+        patch("gitgym.cli.dissociate_all", return_value=(0, [broken])),
+        patch("gitgym.cli.clear_cache"),
+    ):
+        result = _invoke(["dissociate"])
+    assert result.exit_code == 1
+    assert str(broken) in result.output
+
+
+def test_store_appears_in_help():
+    runner = CliRunner()
+    with patch("gitgym.cli._is_git_installed", return_value=True):
+        result = runner.invoke(main, ["--help"])
+    assert "store" in result.output
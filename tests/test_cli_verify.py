@@ -67,7 +67,7 @@ def _invoke_verify(current_key, exercises):
 
 
 def _invoke_verify_with_real_runner(
-    current_key, exercises, workspace_dir, progress_file, exercises_dir
+    current_key, exercises, workspace_dir, progress_file, exercises_dir, args=()
 ):
     # Ensure the workspace exercise directory exists so run_verify doesn't
     # fail with a "repo not found" error before reaching the script check.
@@ -84,7 +84,7 @@ def _invoke_verify_with_real_runner(
         stack.enter_context(patch("gitgym.runner.WORKSPACE_DIR", workspace_dir))
         stack.enter_context(patch("gitgym.runner.EXERCISES_DIR", exercises_dir))
         stack.enter_context(patch("gitgym.progress.PROGRESS_FILE", progress_file))
-        return runner.invoke(main, ["verify"])
+        return runner.invoke(main, ["verify", *args])
 
 
 # --- Tests for "no exercise in progress" ---
@@ -476,3 +476,167 @@ def test_verify_exit_1_does_not_show_unexpected_error():
         )
         assert "Keep trying" in result.output
         assert "unexpected error" not in result.output.lower()
+
+
+# --- Tests for verify --all ---
+
+
+def _make_all_exercise(
+    exercises_dir: Path, topic_dir: str, name: str, topic: str, exit_code: int
+) -> Exercise:
+    exercise_dir = exercises_dir / topic_dir / f"01_{name}"
+    exercise_dir.mkdir(parents=True)
+    verify_script = exercise_dir / "verify.sh"
+    verify_script.write_text(
+        f'#!/usr/bin/env bash\necho "{name} says {exit_code}"\nexit {exit_code}\n'
+    )
+    verify_script.chmod(verify_script.stat().st_mode | stat.S_IEXEC)
+    return Exercise(
+        name=name,
+        topic=topic,
+        title=name.title(),
+        description="",
+        goal_summary="",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def _invoke_verify_all(args, exercises, tmp_path, provisioned):
+    workspace = tmp_path / "workspace"
+    for exercise in provisioned:
+        path = workspace / exercise.path.parent.name / exercise.path.name
+        path.mkdir(parents=True)
+        (path / "file.txt").write_text("work\n")
+    progress_file = tmp_path / "progress.json"
+    runner = CliRunner()
+    with ExitStack() as stack:
+        stack.enter_context(patch("gitgym.cli._is_git_installed", return_value=True))
+        stack.enter_context(
+            patch("gitgym.cli.load_all_exercises", return_value=exercises)
+        )
+        stack.enter_context(patch("gitgym.runner.WORKSPACE_DIR", workspace))
+        stack.enter_context(patch("gitgym.runner.EXERCISES_DIR", tmp_path / "ex"))
+        stack.enter_context(patch("gitgym.verifyall.WORKSPACE_DIR", workspace))
+        stack.enter_context(patch("gitgym.progress.PROGRESS_FILE", progress_file))
+        result = runner.invoke(main, ["verify", "--all", *args])
+    progress = json.loads(progress_file.read_text()) if progress_file.exists() else {}
+    return result, progress
+
+
+def test_verify_all_marks_passing_workspaces_completed(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 0)
+    branch = _make_all_exercise(
+        tmp_path / "ex", "02_branching", "branch", "Branching", 0
+    )
+    result, progress = _invoke_verify_all([], [init, branch], tmp_path, [init, branch])
+
+    assert result.exit_code == 0, result.output
+    assert "2/2 exercise(s) passing" in result.output
+    assert progress["exercises"]["01_basics/01_init"]["status"] == "completed"
+    assert progress["exercises"]["02_branching/01_branch"]["status"] == "completed"
+
+
+def test_verify_all_groups_results_by_topic(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 0)
+    branch = _make_all_exercise(
+        tmp_path / "ex", "02_branching", "branch", "Branching", 1
+    )
+    result, _ = _invoke_verify_all(
+        ["-j", "2"], [init, branch], tmp_path, [init, branch]
+    )
+
+    lines = result.output.splitlines()
+    headers = {line.split()[0]: i for i, line in enumerate(lines) if line[:1].isalpha()}
+    assert {"Basics", "Branching"} <= headers.keys(), result.output
+    basics, branching = headers["Basics"], headers["Branching"]
+    assert "1/1" in lines[basics]
+    assert "init" in lines[basics + 1]
+    assert "0/1" in lines[branching]
+    assert "branch" in lines[branching + 1]
+
+
+def test_verify_all_exits_nonzero_when_a_goal_is_unmet(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 0)
+    branch = _make_all_exercise(
+        tmp_path / "ex", "02_branching", "branch", "Branching", 1
+    )
+    result, progress = _invoke_verify_all([], [init, branch], tmp_path, [init, branch])
+
+    assert result.exit_code == 1
+    assert "1/2 exercise(s) passing" in result.output
+    assert progress["exercises"]["01_basics/01_init"]["status"] == "completed"
+    assert "02_branching/01_branch" not in progress["exercises"]
+
+
+def test_verify_all_lists_script_errors(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 3)
+    result, _ = _invoke_verify_all([], [init], tmp_path, [init])
+
+    assert result.exit_code == 1
+    assert "1 error(s)" in result.output
+    assert "01_basics/01_init" in result.output
+    assert "init says 3" in result.output
+
+
+def test_verify_all_skips_exercises_without_a_workspace(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 0)
+    branch = _make_all_exercise(
+        tmp_path / "ex", "02_branching", "branch", "Branching", 1
+    )
+    result, progress = _invoke_verify_all([], [init, branch], tmp_path, [init])
+
+    assert result.exit_code == 0, result.output
+    assert "Branching" not in result.output
+    assert "1/1 exercise(s) passing" in result.output
+
+
+def test_verify_all_without_workspaces_says_so(tmp_path):
+    init = _make_all_exercise(tmp_path / "ex", "01_basics", "init", "Basics", 0)
+    result, _ = _invoke_verify_all([], [init], tmp_path, [])
+
+    assert result.exit_code == 1
+    assert "No exercise workspaces to verify" in result.output
+
+
+def test_verify_jobs_requires_all():
+    runner = CliRunner()
+    with patch("gitgym.cli._is_git_installed", return_value=True):
+        result = runner.invoke(main, ["verify", "-j", "2"])
+    assert result.exit_code == 1
+    assert "--jobs can only be used with --all" in result.output
+
+
+# --- Tests for verify --explain ---
+
+
+def test_verify_explain_lists_steps_before_the_verdict(tmp_path):
+    ex = _make_real_exercise(tmp_path / "exercises", verify_exits_zero=False)
+    ex.environment = {"verify_timeout": 12}
+    result = _invoke_verify_with_real_runner(
+        "01_basics/01_init",
+        [ex],
+        tmp_path / "workspace",
+        tmp_path / "progress.json",
+        tmp_path / "exercises",
+        args=["--explain"],
+    )
+
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    assert lines[0] == "Verification steps (timeout 12s):"
+    assert lines[1].split()[0] == "fingerprint"
+    verify_sh = lines[2].split()
+    assert verify_sh[0] == "verify.sh"
+    assert verify_sh[-4:] == ["1", "process", "exit", "1"]
+    assert lines[3].split()[0] == "total"
+    assert "Not done yet." in result.output
+    assert "Keep trying" in result.output
+
+
+def test_verify_explain_rejects_all():
+    runner = CliRunner()
+    with patch("gitgym.cli._is_git_installed", return_value=True):
+        result = runner.invoke(main, ["verify", "--all", "--explain"])
+    assert result.exit_code == 1
+    assert "--explain can't be used with --all" in result.output
@@ -120,6 +120,75 @@ def test_load_exercise_no_hints(tmp_path):
     assert ex.hints == []
 
 
+def test_load_exercise_setup_defaults_to_empty(exercise_dir):
+    ex = load_exercise(exercise_dir)
+    assert ex.setup == {}
+
+
+def test_load_exercise_parses_setup_table(tmp_path):
+    (tmp_path / "exercise.toml").write_text(
+        textwrap.dedent("""\
+            [exercise]
+            name = "log"
+            topic = "Basics"
+            title = "Read the Log"
+            description = "Look at history."
+
+            [goal]
+            summary = "Find the commit."
+
+            [[setup.commits]]
+            message = "Initial commit"
+            files = { "README.md" = "hi" }
+        """)
+    )
+    ex = load_exercise(tmp_path)
+    assert ex.setup["commits"][0]["message"] == "Initial commit"
+
+
+def test_load_exercise_parses_environment_table(tmp_path):
+    (tmp_path / "exercise.toml").write_text(
+        textwrap.dedent("""\
+            [exercise]
+            name = "aliases"
+            topic = "Advanced"
+            title = "Aliases"
+            description = "Configure aliases."
+
+            [goal]
+            summary = "Aliases exist."
+
+            [environment]
+            learner_config = true
+        """)
+    )
+    assert load_exercise(tmp_path).environment == {"learner_config": True}
+
+
+def test_load_exercise_parses_checks_array(tmp_path):
+    (tmp_path / "exercise.toml").write_text(
+        textwrap.dedent("""\
+            [exercise]
+            name = "switch"
+            topic = "Branching"
+            title = "Switch"
+            description = "Switch branches."
+
+            [goal]
+            summary = "On bugfix."
+
+            [[checks]]
+            type = "branch"
+            name = "bugfix"
+        """)
+    )
+    assert load_exercise(tmp_path).checks == [{"type": "branch", "name": "bugfix"}]
+
+
+def test_load_exercise_checks_default_to_empty(exercise_dir):
+    assert load_exercise(exercise_dir).checks == []
+
+
 def test_load_exercise_missing_toml_raises(tmp_path):
     with pytest.raises(FileNotFoundError):
         load_exercise(tmp_path)
@@ -0,0 +1,192 @@
+import os
+import struct
+import subprocess
+
+import pytest
+
+from gitgym.gitfs.objects import (
+    MODE_EXECUTABLE,
+    MODE_FILE,
+    MODE_TREE,
+    encode_tree,
+    hash_object,
+    parse_tree,
+)
+from gitgym.gitfs.index import read_index
+from gitgym.gitfs.pack import _index, write_pack
+from gitgym.gitfs.repo import RepoWriter
+
+IDENT = "Git Gym <gitgym@example.com> 1767225600 +0000"
+
+
+def _git(repo, *args, stdin=None):
+    return (
+        subprocess.run(
+            ["git", *args],
+            cwd=repo,
+            input=stdin,
+            capture_output=True,
+            check=True,
+        )
+        .stdout.decode()
+        .strip()
+    )
+
+
+def _simple_repo(directory, *, pack=True):
+    repo = RepoWriter(directory, head="main")
+    files = {
+        "README.md": (MODE_FILE, repo.add_blob(b"# Project\n")),
+        "bin/run.sh": (MODE_EXECUTABLE, repo.add_blob(b"echo hi\n")),
+        "src/a/b.txt": (MODE_FILE, repo.add_blob(b"deep\n")),
+    }
+    first = repo.add_commit(repo.write_tree(files), [], IDENT, IDENT, b"first\n")
+    files["README.md"] = (MODE_FILE, repo.add_blob(b"# Project v2\n"))
+    second = repo.add_commit(repo.write_tree(files), [first], IDENT, IDENT, b"second\n")
+    repo.set_ref("refs/heads/main", second)
+    repo.set_ref("refs/heads/old", first)
+    repo.set_ref("refs/tags/v1", repo.add_tag(first, "v1", IDENT, b"release\n"))
+    repo.checkout(second)
+    repo.finish(pack=pack)
+    return repo
+
+
+# --- objects ---
+
+
+@pytest.mark.parametrize("data", [b"", b"hello\n", bytes(range(256))])
+def test_hash_object_matches_git(tmp_path, data):
+    assert hash_object("blob", data) == _git(
+        tmp_path, "hash-object", "--stdin", stdin=data
+    )
+
+
+def test_encode_tree_matches_git_mktree(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    blob = _git(tmp_path, "hash-object", "-w", "--stdin", stdin=b"x")
+    sub = _git(tmp_path, "mktree", stdin=f"100644 blob {blob}\tf\n".encode())
+    entries = [
+        (MODE_FILE, "a.b", blob),
+        (MODE_TREE, "a", sub),
+        (MODE_FILE, "a-", blob),
+        (MODE_EXECUTABLE, "Z", blob),
+    ]
+    listing = "".join(
+        f"{mode.rjust(6, '0')} {'tree' if mode == MODE_TREE else 'blob'} {sha}\t{name}\n"
+        for mode, name, sha in entries
+    )
+    expected = _git(tmp_path, "mktree", stdin=listing.encode())
+    assert hash_object("tree", encode_tree(entries)) == expected
+
+
+def test_parse_tree_round_trips():
+    entries = [(MODE_FILE, "a", "1" * 40), (MODE_TREE, "b", "2" * 40)]
+    assert parse_tree(encode_tree(entries)) == entries
+
+
+# --- pack ---
+
+
+def test_write_pack_passes_verify_pack(tmp_path):
+    objects = [
+        (hash_object("blob", data), "blob", data)
+        for data in (b"one\n", b"two\n", b"x" * 5000)
+    ]
+    pack = write_pack(objects, tmp_path)
+    output = _git(tmp_path, "verify-pack", "-v", str(pack.with_suffix(".idx")))
+    for sha, _kind, _data in objects:
+        assert sha in output
+
+
+def test_index_uses_large_offset_table():
+    sha = bytes(20)
+    idx = _index([(sha, 0x80000010, 0)], b"\0" * 20)
+    # header (8) + fanout (1024) + sha (20) + crc (4)
+    offset_entry = struct.unpack(">I", idx[1056:1060])[0]
+    assert offset_entry == 0x80000000
+    assert struct.unpack(">Q", idx[1060:1068])[0] == 0x80000010
+
+
+# --- RepoWriter ---
+
+
+@pytest.mark.parametrize("pack", [True, False])
+def test_repo_writer_passes_fsck(tmp_path, pack):
+    _simple_repo(tmp_path, pack=pack)
+    subprocess.run(["git", "fsck", "--strict", "--full"], cwd=tmp_path, check=True)
+    packs = list((tmp_path / ".git" / "objects" / "pack").glob("*.pack"))
+    assert len(packs) == (1 if pack else 0)
+
+
+def test_repo_writer_worktree_is_clean(tmp_path):
+    _simple_repo(tmp_path)
+    assert _git(tmp_path, "status", "--porcelain") == ""
+    assert (tmp_path / "README.md").read_text() == "# Project v2\n"
+    assert os.access(tmp_path / "bin" / "run.sh", os.X_OK)
+
+
+def test_repo_writer_refs_and_tags(tmp_path):
+    _simple_repo(tmp_path)
+    assert _git(tmp_path, "symbolic-ref", "HEAD") == "refs/heads/main"
+    assert _git(tmp_path, "rev-parse", "old") == _git(tmp_path, "rev-parse", "main~1")
+    assert _git(tmp_path, "cat-file", "-t", "v1") == "tag"
+    assert _git(tmp_path, "rev-parse", "v1^{}") == _git(tmp_path, "rev-parse", "old")
+
+
+def test_repo_writer_stage(tmp_path):
+    repo = RepoWriter(tmp_path)
+    repo.stage("new.txt", b"new\n")
+    repo.finish()
+    assert _git(tmp_path, "status", "--porcelain") == "A  new.txt"
+
+
+def test_repo_writer_empty_repository(tmp_path):
+    RepoWriter(tmp_path, head="trunk").finish()
+    assert _git(tmp_path, "rev-parse", "--git-dir") == ".git"
+    assert _git(tmp_path, "symbolic-ref", "--short", "HEAD") == "trunk"
+
+
+def test_repo_writer_checkout_rejects_non_commit(tmp_path):
+    repo = RepoWriter(tmp_path)
+    blob = repo.add_blob(b"x")
+    with pytest.raises(ValueError, match="not a commit"):
+        repo.checkout(blob)
+
+
+# --- index reader ---
+
+
+@pytest.mark.parametrize("version", ["2", "3", "4"])
+def test_read_index_matches_ls_files(tmp_path, version):
+    _simple_repo(tmp_path)
+    (tmp_path / "intent.txt").write_text("later\n")
+    # An intent-to-add entry carries the extended flags of version 3+.
+    _git(tmp_path, "add", "-N", "intent.txt")
+    _git(tmp_path, "update-index", "--index-version", version)
+    entries = read_index((tmp_path / ".git" / "index").read_bytes())
+    listed = [f"{mode:o} {sha} {stage}\t{path}" for path, mode, sha, stage in entries]
+    assert listed == _git(tmp_path, "ls-files", "--stage").splitlines()
+
+
+def test_read_index_reports_conflict_stages(tmp_path):
+    _simple_repo(tmp_path)
+    _git(tmp_path, "switch", "-q", "-c", "side", "old")
+    (tmp_path / "README.md").write_text("side\n")
+    ident = ["-c", "user.name=A", "-c", "user.email=a@x"]
+    _git(tmp_path, *ident, "commit", "-q", "-am", "side")
+    subprocess.run(["git", *ident, "merge", "main"], cwd=tmp_path, capture_output=True)
+    entries = read_index((tmp_path / ".git" / "index").read_bytes())
+    assert [stage for path, _, _, stage in entries if path == "README.md"] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("data", [b"", b"DIRC", b"XXXX\0\0\0\2\0\0\0\0"])
+def test_read_index_rejects_garbage(data):
+    with pytest.raises(ValueError):
+        read_index(data)
+
+
+def test_read_index_rejects_truncated_file(tmp_path):
+    _simple_repo(tmp_path)
+    data = (tmp_path / ".git" / "index").read_bytes()
+    with pytest.raises(ValueError):
+        read_index(data[:40])
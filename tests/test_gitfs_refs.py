@@ -0,0 +1,204 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym.gitfs.refs import (
+    RefError,
+    dwim_ref,
+    head_branch,
+    list_refs,
+    peel,
+    peel_ref,
+    read_head,
+    read_symref,
+    resolve_ref,
+    valid_name,
+)
+from gitgym.gitfs.repo import RepoWriter
+
+IDENT = "Test <test@example.com> 1767225600 +0000"
+
+
+def _env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(),
+    ).stdout.strip()
+
+
+def _for_each_ref(repo: Path, prefix: str = "refs/") -> dict[str, str]:
+    out = _git(repo, "for-each-ref", "--format=%(refname) %(objectname)", prefix)
+    return dict(line.split(" ") for line in out.splitlines())
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main: a-b; feature at a; tags light (b), v1 (annotated, a), v1-signed (tag of v1)."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    for name in "ab":
+        (repo / name).write_text(name)
+        _git(repo, "add", name)
+        _git(repo, "commit", "-q", "-m", name)
+    _git(repo, "branch", "feature", "HEAD~1")
+    _git(repo, "tag", "light")
+    _git(repo, "tag", "-a", "v1", "-m", "One", "HEAD~1")
+    _git(repo, "tag", "-a", "v1-signed", "-m", "Again", "v1")
+    _git(repo, "update-ref", "refs/remotes/origin/main", "HEAD")
+    _git(repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/main")
+    return repo
+
+
+def _check_against_git(repo: Path) -> None:
+    git_dir = repo / ".git"
+    assert list_refs(git_dir) == _for_each_ref(repo)
+    assert list_refs(git_dir, "refs/tags/") == _for_each_ref(repo, "refs/tags/")
+    for name in _for_each_ref(repo):
+        assert resolve_ref(git_dir, name) == _git(repo, "rev-parse", name)
+        assert peel_ref(git_dir, name) == _git(repo, "rev-parse", f"{name}^{{}}")
+    assert resolve_ref(git_dir, "HEAD") == _git(repo, "rev-parse", "HEAD")
+
+
+def test_loose_refs_match_git(repo):
+    _check_against_git(repo)
+
+
+def test_packed_refs_match_git(repo):
+    _git(repo, "pack-refs", "--all")
+    assert not (repo / ".git" / "refs" / "tags" / "v1").exists()
+    _check_against_git(repo)
+
+
+def test_packed_objects_match_git(repo):
+    _git(repo, "gc", "-q")
+    _check_against_git(repo)
+
+
+def test_loose_ref_shadows_packed_one(repo):
+    _git(repo, "pack-refs", "--all")
+    _git(repo, "branch", "-f", "feature", "main")
+    git_dir = repo / ".git"
+    assert resolve_ref(git_dir, "refs/heads/feature") == _git(repo, "rev-parse", "main")
+    _check_against_git(repo)
+
+
+def test_deleted_packed_ref_is_gone(repo):
+    _git(repo, "pack-refs", "--all")
+    _git(repo, "branch", "-D", "feature")
+    _git(repo, "tag", "-d", "v1")
+    assert resolve_ref(repo / ".git", "refs/heads/feature") is None
+    _check_against_git(repo)
+
+
+def test_dwim_ref_follows_git_rules(repo):
+    git_dir = repo / ".git"
+    # Ambiguous: git picks the tag over the branch.
+    _git(repo, "tag", "feature", "HEAD")
+    expected = {
+        "main": "refs/heads/main",
+        "feature": "refs/tags/feature",
+        "v1": "refs/tags/v1",
+        "origin": "refs/remotes/origin/HEAD",
+        "origin/main": "refs/remotes/origin/main",
+        "HEAD": "HEAD",
+    }
+    for name, full in expected.items():
+        assert dwim_ref(git_dir, name) == (full, _git(repo, "rev-parse", name))
+    for name in ("HEAD~1", "main:a", _git(repo, "rev-parse", "HEAD"), "nope"):
+        assert dwim_ref(git_dir, name) is None
+
+
+def test_head_symbolic_detached_and_unborn(repo, tmp_path):
+    git_dir = repo / ".git"
+    assert head_branch(git_dir) == "main"
+    assert read_head(git_dir) == ("refs/heads/main", _git(repo, "rev-parse", "HEAD"))
+
+    _git(repo, "switch", "-q", "--detach", "HEAD~1")
+    assert head_branch(git_dir) is None
+    assert read_head(git_dir) == (None, _git(repo, "rev-parse", "HEAD"))
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    _git(empty, "init", "-q", "-b", "trunk")
+    assert read_head(empty / ".git") == ("refs/heads/trunk", None)
+    assert list_refs(empty / ".git") == {}
+
+
+def test_symbolic_refs(repo):
+    git_dir = repo / ".git"
+    assert (
+        read_symref(git_dir, "refs/remotes/origin/HEAD") == "refs/remotes/origin/main"
+    )
+    assert read_symref(git_dir, "refs/heads/main") is None
+    _git(repo, "symbolic-ref", "refs/heads/dangling", "refs/heads/nope")
+    assert resolve_ref(git_dir, "refs/heads/dangling") is None
+    assert "refs/heads/dangling" not in list_refs(git_dir)
+
+
+def test_peel_follows_tag_chains(repo):
+    git_dir = repo / ".git"
+    tag = _git(repo, "rev-parse", "v1-signed")
+    assert peel(git_dir, tag) == _git(repo, "rev-parse", "HEAD~1")
+    assert peel(git_dir, "0" * 40) is None
+
+
+def test_peels_tags_in_a_repo_writer_pack(tmp_path):
+    writer = RepoWriter(tmp_path / "built")
+    tree = writer.write_tree({})
+    commit = writer.add_commit(tree, [], IDENT, IDENT, b"Initial\n")
+    tag = writer.add_tag(commit, "v1", IDENT, b"One\n")
+    writer.set_ref("refs/heads/main", commit)
+    writer.set_ref("refs/tags/v1", tag)
+    writer.finish()
+    git_dir = tmp_path / "built" / ".git"
+    assert not any((git_dir / "objects").glob("??/*"))
+    assert peel_ref(git_dir, "refs/tags/v1") == commit
+    assert resolve_ref(git_dir, "refs/tags/v1") == tag
+
+
+def test_objects_borrowed_through_alternates(repo, tmp_path):
+    clone = tmp_path / "clone"
+    _git(tmp_path, "clone", "-q", "--shared", str(repo), str(clone))
+    assert not any((clone / ".git" / "objects").glob("??/*"))
+    assert peel_ref(clone / ".git", "refs/tags/v1") == _git(repo, "rev-parse", "v1^{}")
+
+
+def test_linked_worktree(repo, tmp_path):
+    other = tmp_path / "other"
+    _git(repo, "worktree", "add", "-q", str(other), "feature")
+    git_dir = Path(_git(other, "rev-parse", "--absolute-git-dir"))
+    assert head_branch(git_dir) == "feature"
+    assert resolve_ref(git_dir, "HEAD") == _git(repo, "rev-parse", "feature")
+    assert list_refs(git_dir) == _for_each_ref(other)
+
+
+def test_reftable_is_refused(repo):
+    (repo / ".git" / "reftable").mkdir()
+    with pytest.raises(RefError, match="reftable"):
+        list_refs(repo / ".git")
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["refs/../config", "refs/heads/x.lock", "refs/heads/", "main", "refs/heads/a b"],
+)
+def test_invalid_names_are_not_read(repo, name):
+    assert not valid_name(name)
+    assert resolve_ref(repo / ".git", name) is None
@@ -0,0 +1,240 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym.gitpool import GitBatch, GitPool, GitPoolError, parse_commit
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(),
+    ).stdout.strip()
+
+
+def _commit(repo: Path, name: str, when: int) -> None:
+    (repo / f"{name}.txt").write_text(f"{name}\n")
+    _git(repo, "add", ".")
+    subprocess.run(
+        ["git", "commit", "-q", "-m", f"Add {name}\n\nBody of {name}."],
+        cwd=repo,
+        check=True,
+        env={
+            **_env(),
+            "GIT_AUTHOR_DATE": f"@{when} +0000",
+            "GIT_COMMITTER_DATE": f"@{when} +0000",
+        },
+    )
+
+
+def _env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main: a-b-c, feature: branches at b with d-e, merged back as m."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _commit(repo, "a", 1000)
+    _commit(repo, "b", 2000)
+    _git(repo, "checkout", "-q", "-b", "feature")
+    _commit(repo, "d", 3000)
+    _commit(repo, "e", 5000)
+    _git(repo, "checkout", "-q", "main")
+    _commit(repo, "c", 4000)
+    _git(repo, "tag", "-a", "-m", "release", "v1")
+    return repo
+
+
+@pytest.fixture
+def batch(repo):
+    batch = GitBatch(repo)
+    yield batch
+    batch.close()
+
+
+def test_resolve_matches_rev_parse(repo, batch):
+    for rev in ("HEAD", "main", "feature~1", "v1", "main:a.txt", "HEAD^{tree}"):
+        assert batch.resolve(rev) == _git(repo, "rev-parse", rev)
+
+
+def test_missing_revision_returns_none(batch):
+    assert batch.resolve("no-such-branch") is None
+    assert batch.read("HEAD:missing.txt") is None
+    assert batch.commit("no-such-branch") is None
+    assert batch.resolve("") is None
+    assert batch.resolve("HEAD\nHEAD") is None
+
+
+def test_info_and_read(batch):
+    oid, kind, size = batch.info("main:a.txt")
+    assert kind == "blob" and size == 2
+    assert batch.read(oid) == ("blob", b"a\n")
+
+
+def test_commit_peels_tags_and_parses_fields(repo, batch):
+    commit = batch.commit("v1")
+    assert commit.oid == _git(repo, "rev-parse", "main")
+    assert commit.tree == _git(repo, "rev-parse", "main^{tree}")
+    assert commit.parents == (_git(repo, "rev-parse", "main~1"),)
+    assert commit.subject == "Add c"
+    assert commit.message == "Add c\n\nBody of c.\n"
+    assert commit.committer_time == 4000
+    assert commit.author.startswith("Test <test@example.com> 4000")
+
+
+def test_commits_matches_rev_list(repo, batch):
+    cases = [
+        (["main"], None),
+        (["feature"], ["main"]),
+        (["main", "feature"], None),
+        (["main"], ["feature"]),
+        (["main"], ["main"]),
+    ]
+    for include, exclude in cases:
+        args = include + [f"^{rev}" for rev in exclude or []]
+        expected = _git(repo, "rev-list", *args).split()
+        assert [c.oid for c in batch.commits(include, exclude)] == expected
+
+
+def test_answers_follow_new_commits(repo, batch):
+    before = batch.resolve("HEAD")
+    _commit(repo, "f", 6000)
+    assert batch.resolve("HEAD") != before
+    assert batch.commit("HEAD").subject == "Add f"
+
+
+def test_restarts_dead_process(repo, batch):
+    batch.resolve("HEAD")
+    batch._procs["--batch-check"].kill()
+    batch._procs["--batch-check"].wait()
+    assert batch.resolve("HEAD") == _git(repo, "rev-parse", "HEAD")
+
+
+def test_close_stops_processes(batch):
+    batch.resolve("HEAD")
+    batch.read("HEAD")
+    procs = list(batch._procs.values())
+    batch.close()
+    assert all(proc.poll() is not None for proc in procs)
+    assert batch.resolve("HEAD") is not None
+
+
+def test_stop_kills_processes_for_good(batch):
+    batch.resolve("HEAD")
+    proc = batch._procs["--batch-check"]
+    batch.stop()
+    assert proc.wait(timeout=5) is not None
+    with pytest.raises(GitPoolError, match="was stopped"):
+        batch.resolve("HEAD")
+
+
+def test_parse_commit_skips_signature_continuation_lines():
+    data = (
+        b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+        b"author A <a@x> 1 +0000\n"
+        b"committer C <c@x> 2 +0000\n"
+        b"gpgsig -----BEGIN PGP SIGNATURE-----\n"
+        b" \n"
+        b" abc\n"
+        b" -----END PGP SIGNATURE-----\n"
+        b"\n"
+        b"Signed\n"
+    )
+    commit = parse_commit("0" * 40, data)
+    assert commit.parents == ()
+    assert commit.committer_time == 2
+    assert commit.subject == "Signed"
+
+
+def test_pool_reuses_batch_for_same_repo(repo):
+    pool = GitPool()
+    try:
+        assert pool.get(repo) is pool.get(repo)
+    finally:
+        pool.close()
+
+
+def test_pool_replaces_batch_for_recreated_repo(repo, tmp_path):
+    pool = GitPool()
+    try:
+        old = pool.get(repo)
+        old.resolve("HEAD")
+        proc = old._procs["--batch-check"]
+        shutil.move(repo, tmp_path / "moved")
+        repo.mkdir()
+        _git(repo, "init", "-q", "-b", "main")
+        _commit(repo, "z", 1000)
+        new = pool.get(repo)
+        assert new is not old
+        assert proc.poll() is not None
+        assert new.commit("HEAD").subject == "Add z"
+    finally:
+        pool.close()
+
+
+def test_pool_replaces_stopped_batch(repo):
+    pool = GitPool()
+    try:
+        old = pool.get(repo)
+        old.stop()
+        new = pool.get(repo)
+        assert new is not old
+        assert new.resolve("HEAD") == _git(repo, "rev-parse", "HEAD")
+    finally:
+        pool.close()
+
+
+def test_pool_evicts_least_recently_used(tmp_path):
+    repos = []
+    for name in ("one", "two", "three"):
+        path = tmp_path / name
+        path.mkdir()
+        _git(path, "init", "-q")
+        repos.append(path)
+    pool = GitPool(max_repos=2)
+    try:
+        first = pool.get(repos[0])
+        second = pool.get(repos[1])
+        pool.get(repos[0])
+        pool.get(repos[2])
+        assert pool.get(repos[0]) is first
+        assert pool.get(repos[1]) is not second
+    finally:
+        pool.close()
+
+
+def test_evicted_batch_keeps_answering_without_keeping_processes(tmp_path):
+    repos = []
+    for name in ("one", "two"):
+        path = tmp_path / name
+        path.mkdir()
+        _git(path, "init", "-q", "-b", "main")
+        _commit(path, name, 1000)
+        repos.append(path)
+    pool = GitPool(max_repos=1)
+    try:
+        held = pool.get(repos[0])
+        held.resolve("HEAD")
+        proc = held._procs["--batch-check"]
+        pool.get(repos[1])
+        assert proc.poll() is not None
+        assert held.commit("HEAD").subject == "Add one"
+        assert held._procs == {}
+    finally:
+        pool.close()
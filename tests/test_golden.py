@@ -0,0 +1,141 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym import golden
+from gitgym.gitpool import GitBatch
+from gitgym.repo import Repo
+
+
+def _env(name: str = "Test", date: str = "2026-01-01T00:00:00Z") -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": name,
+        "GIT_AUTHOR_EMAIL": f"{name.lower()}@example.com",
+        "GIT_COMMITTER_NAME": name,
+        "GIT_COMMITTER_EMAIL": f"{name.lower()}@example.com",
+        "GIT_AUTHOR_DATE": date,
+        "GIT_COMMITTER_DATE": date,
+    }
+
+
+def _git(repo: Path, *args: str, env: dict[str, str] | None = None) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env or _env(),
+    ).stdout.strip()
+
+
+def _make_repo(path: Path, commits: list[str], env: dict[str, str] | None = None):
+    """A repo on main with one commit per file name, each adding that file."""
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main", env=env)
+    for name in commits:
+        (path / name).write_text(f"{name}\n")
+        _git(path, "add", name, env=env)
+        _git(path, "commit", "-q", "-m", f"Add {name}", env=env)
+    return path
+
+
+def _digest(path: Path, covers=golden.DEFAULT_COVERS) -> str:
+    batch = GitBatch(path)
+    try:
+        return golden.digest(Repo(path, batch, _env()), covers)
+    finally:
+        batch.close()
+
+
+def test_digest_ignores_authors_dates_and_messages(tmp_path):
+    ours = _make_repo(tmp_path / "ours", ["a.txt", "b.txt"])
+    theirs = _make_repo(
+        tmp_path / "theirs",
+        ["a.txt", "b.txt"],
+        env=_env("Learner", "2026-06-15T12:34:56Z"),
+    )
+    _git(theirs, "commit", "--amend", "-q", "-m", "A different message")
+    assert _git(ours, "rev-parse", "HEAD") != _git(theirs, "rev-parse", "HEAD")
+    assert _digest(ours) == _digest(theirs)
+
+
+def test_digest_sees_trees_and_checked_out_branch(tmp_path):
+    repo = _make_repo(tmp_path / "repo", ["a.txt"])
+    before = _digest(repo)
+
+    _git(repo, "branch", "feature")
+    with_branch = _digest(repo)
+    assert with_branch != before
+
+    _git(repo, "switch", "-q", "feature")
+    assert _digest(repo) != with_branch
+    assert _digest(repo, ("branches",)) == _digest(repo, ("branches",))
+
+
+def test_ancestry_distinguishes_history_with_the_same_tree(tmp_path):
+    two_commits = _make_repo(tmp_path / "two", ["a.txt", "b.txt"])
+    squashed = _make_repo(tmp_path / "one", [])
+    for name in ("a.txt", "b.txt"):
+        (squashed / name).write_text(f"{name}\n")
+    _git(squashed, "add", ".")
+    _git(squashed, "commit", "-q", "-m", "Both")
+
+    assert _digest(two_commits, ("head", "branches")) == _digest(
+        squashed, ("head", "branches")
+    )
+    assert _digest(two_commits, ("ancestry",)) != _digest(squashed, ("ancestry",))
+
+
+def test_operation_and_status_components(tmp_path):
+    repo = _make_repo(tmp_path / "repo", ["a.txt"])
+    clean = _digest(repo, ("operation", "status"))
+
+    (repo / "untracked.txt").write_text("new\n")
+    dirty = _digest(repo, ("operation", "status"))
+    assert dirty != clean
+    assert _digest(repo, ("operation",)) == _digest(repo, ("operation",))
+
+    (repo / ".git" / "MERGE_HEAD").write_text(_git(repo, "rev-parse", "HEAD") + "\n")
+    batch = GitBatch(repo)
+    try:
+        description = golden.describe(Repo(repo, batch, _env()), ("operation",))
+    finally:
+        batch.close()
+    assert description == "operation merge\n"
+
+
+def test_tags_are_peeled(tmp_path):
+    repo = _make_repo(tmp_path / "repo", ["a.txt"])
+    _git(repo, "tag", "-a", "v1", "-m", "Version 1")
+    tree = _git(repo, "rev-parse", "HEAD^{tree}")
+    batch = GitBatch(repo)
+    try:
+        description = golden.describe(Repo(repo, batch, _env()), ("tags",))
+    finally:
+        batch.close()
+    assert description == f"tag v1 {tree}\n"
+
+
+@pytest.mark.parametrize(
+    ("goal", "error"),
+    [
+        ({}, "64-character"),
+        ({"digest": "abc"}, "64-character"),
+        ({"digest": "0" * 64, "covers": []}, "non-empty"),
+        ({"digest": "0" * 64, "covers": ["head", "moon"]}, "unknown component moon"),
+    ],
+)
+def test_parse_goal_rejects_invalid_specs(goal, error):
+    with pytest.raises(golden.GoalError, match=error):
+        golden.parse_goal(goal)
+
+
+def test_parse_goal_defaults():
+    assert golden.parse_goal({"digest": "A" * 64}) == (
+        golden.DEFAULT_COVERS,
+        "a" * 64,
+    )
@@ -0,0 +1,264 @@
+import os
+import subprocess
+import tomllib
+from unittest import mock
+
+import pytest
+
+from gitgym.config import EXERCISES_DIR
+from gitgym.history import (
+    HistoryError,
+    build_repository,
+    parse_spec,
+)
+
+EPOCH = 1767225600
+
+SPEC = tomllib.loads(
+    """
+[setup]
+head = "main"
+
+[[setup.commits]]
+id = "base"
+message = "Initial commit"
+files = { "README.md" = "# Project\\n" }
+
+[[setup.commits]]
+message = "Add script"
+files = { "run.sh" = { content = "echo hi\\n", executable = true } }
+
+[[setup.commits]]
+branch = "feature"
+from = "base"
+message = "Feature work"
+files = { "feature.txt" = "feature\\n" }
+
+[[setup.commits]]
+branch = "main"
+merge = ["feature"]
+message = "Merge feature"
+files = { "feature.txt" = "feature\\n" }
+
+[[setup.commits]]
+message = "Remove README"
+delete = ["README.md"]
+
+[[setup.tags]]
+name = "v1.0"
+commit = "base"
+message = "Release 1.0"
+
+[[setup.tags]]
+name = "light"
+commit = "feature"
+
+[setup.branches]
+release = "base"
+
+[setup.staged]
+"notes.txt" = "staged\\n"
+
+[setup.worktree]
+"scratch.txt" = "dirty\\n"
+
+[setup.config]
+"alias.st" = "status"
+"""
+)["setup"]
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    d = tmp_path / "repo"
+    build_repository(SPEC, d, EPOCH)
+    return d
+
+
+# --- parse_spec ---
+
+
+def test_parse_spec_resolves_parents():
+    history = parse_spec(SPEC, EPOCH)
+    parents = [c.parents for c in history.commits]
+    assert parents == [[], [1], [1], [2, 3], [4]]
+
+
+def test_parse_spec_timestamps_advance():
+    history = parse_spec(SPEC, EPOCH)
+    stamps = [c.timestamp for c in history.commits]
+    assert stamps == sorted(stamps)
+    assert len(set(stamps)) == len(stamps)
+
+
+def test_parse_spec_head_defaults_to_first_branch():
+    history = parse_spec({"commits": [{"branch": "trunk", "message": "x"}]}, EPOCH)
+    assert history.head == "trunk"
+
+
+def test_parse_spec_unknown_ref_raises():
+    with pytest.raises(HistoryError, match="unknown commit or branch 'nope'"):
+        parse_spec({"commits": [{"message": "x", "from": "nope"}]}, EPOCH)
+
+
+def test_parse_spec_missing_message_raises():
+    with pytest.raises(HistoryError, match="message"):
+        parse_spec({"commits": [{"files": {}}]}, EPOCH)
+
+
+def test_parse_spec_bad_head_raises():
+    with pytest.raises(HistoryError, match="no branch named"):
+        parse_spec({"head": "other", "commits": [{"message": "x"}]}, EPOCH)
+
+
+def test_parse_spec_duplicate_id_raises():
+    spec = {"commits": [{"id": "a", "message": "x"}, {"id": "a", "message": "y"}]}
+    with pytest.raises(HistoryError, match="duplicate id"):
+        parse_spec(spec, EPOCH)
+
+
+def test_parse_spec_bad_identity_raises():
+    with pytest.raises(HistoryError, match="Name <email>"):
+        parse_spec({"commits": [{"message": "x", "author": "nobody"}]}, EPOCH)
+
+
+# --- build_repository ---
+
+
+def test_build_passes_fsck(repo):
+    subprocess.run(["git", "fsck", "--strict"], cwd=repo, check=True)
+
+
+def test_build_checks_out_head(repo):
+    assert _git(repo, "symbolic-ref", "--short", "HEAD") == "main"
+    assert _git(repo, "log", "--format=%s", "-1") == "Remove README"
+    assert (repo / "feature.txt").read_text() == "feature\n"
+    assert not (repo / "README.md").exists()
+
+
+def test_build_creates_merge_commit(repo):
+    parents = _git(repo, "log", "--format=%P", "-1", "HEAD~1").split()
+    assert len(parents) == 2
+
+
+def test_build_sets_executable_bit(repo):
+    assert os.access(repo / "run.sh", os.X_OK)
+    assert _git(repo, "ls-files", "-s", "run.sh").startswith("100755")
+
+
+def test_build_creates_tags(repo):
+    base = _git(repo, "rev-parse", "main~3")
+    assert _git(repo, "cat-file", "-t", "v1.0") == "tag"
+    assert _git(repo, "rev-parse", "v1.0^{commit}") == base
+    assert _git(repo, "cat-file", "-t", "light") == "commit"
+    assert _git(repo, "rev-parse", "light") == _git(repo, "rev-parse", "feature")
+
+
+def test_build_creates_extra_branches(repo):
+    assert _git(repo, "rev-parse", "release") == _git(repo, "rev-parse", "v1.0^{}")
+
+
+def test_build_stages_and_dirties_worktree(repo):
+    status = _git(repo, "status", "--porcelain")
+    assert "A  notes.txt" in status
+    assert "?? scratch.txt" in status
+
+
+def test_build_writes_config_and_identity(repo):
+    assert _git(repo, "config", "alias.st") == "status"
+    assert _git(repo, "config", "user.name") == "Git Gym"
+
+
+def test_build_is_reproducible(tmp_path):
+    one, two = tmp_path / "one", tmp_path / "two"
+    build_repository(SPEC, one, EPOCH)
+    build_repository(SPEC, two, EPOCH)
+    assert _git(one, "rev-parse", "main", "feature", "v1.0") == _git(
+        two, "rev-parse", "main", "feature", "v1.0"
+    )
+
+
+def test_build_runs_no_processes(tmp_path):
+    with mock.patch("subprocess.run") as run, mock.patch("subprocess.Popen") as popen:
+        build_repository(SPEC, tmp_path / "repo", EPOCH)
+    run.assert_not_called()
+    popen.assert_not_called()
+
+
+def test_build_deleting_directory_removes_contents(tmp_path):
+    spec = {
+        "commits": [
+            {"message": "add", "files": {"docs/a.md": "a", "docs/sub/b.md": "b"}},
+            {"message": "drop", "delete": ["docs"]},
+        ]
+    }
+    d = tmp_path / "repo"
+    build_repository(spec, d, EPOCH)
+    assert _git(d, "ls-tree", "-r", "--name-only", "HEAD") == ""
+
+
+def test_build_without_commits(tmp_path):
+    d = tmp_path / "repo"
+    spec = {"worktree": {"hello.txt": "hi\n"}}
+    build_repository(spec, d, EPOCH)
+    assert (d / ".git").is_dir()
+    assert (d / "hello.txt").read_text() == "hi\n"
+    assert _git(d, "status", "--porcelain") == "?? hello.txt"
+
+
+def test_build_matches_setup_script_tree(tmp_path):
+    """A spec mirroring bisect/setup.sh produces the same tree at HEAD."""
+    script_repo = tmp_path / "script"
+    script_repo.mkdir()
+    subprocess.run(
+        [str(EXERCISES_DIR / "09_advanced" / "02_bisect" / "setup.sh"), script_repo],
+        capture_output=True,
+        check=True,
+    )
+    calc_good = "#!/usr/bin/env bash\necho 42\n"
+    calc_bad = "#!/usr/bin/env bash\n# Optimized calculation\necho 41\n"
+    spec = {
+        "commits": [
+            {
+                "message": "Add calculation script",
+                "files": {"calc.sh": {"content": calc_good, "executable": True}},
+            },
+            {
+                "message": "Add logging helper",
+                "files": {"log_helper.sh": "# logging\n"},
+            },
+            {
+                "message": "Add README",
+                "files": {"README.txt": "# Calculator Project\n"},
+            },
+            {
+                "message": "Optimize calculation algorithm",
+                "files": {"calc.sh": {"content": calc_bad, "executable": True}},
+            },
+            {"message": "Add unit test stubs", "files": {"tests.txt": "# tests\n"}},
+            {
+                "message": "Add usage documentation",
+                "files": {"USAGE.txt": "Usage: ./calc.sh\n"},
+            },
+            {"message": "Bump version to 1.1", "files": {"version.txt": "1.1\n"}},
+        ]
+    }
+    spec_repo = tmp_path / "spec"
+    build_repository(spec, spec_repo, EPOCH)
+
+    assert _git(spec_repo, "rev-parse", "HEAD^{tree}") == _git(
+        script_repo, "rev-parse", "HEAD^{tree}"
+    )
+
+
+@pytest.mark.parametrize("path", ["../escape", "/abs", ".git/config", "a//b", "a\nb"])
+def test_parse_spec_rejects_bad_paths(path):
+    spec = {"commits": [{"message": "x", "files": {path: "bad"}}]}
+    with pytest.raises(HistoryError, match="invalid path"):
+        parse_spec(spec, EPOCH)
@@ -0,0 +1,191 @@
+import os
+import subprocess
+from collections import Counter
+from unittest import mock
+
+import pytest
+
+from gitgym import materialize as m
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small real git repository with a commit, a symlink and an executable."""
+    src = tmp_path / "src"
+    src.mkdir()
+    subprocess.run(["git", "init", "-q", str(src)], check=True)
+    (src / "hello.txt").write_text("hello\n")
+    (src / "run.sh").write_text("#!/usr/bin/env bash\n")
+    (src / "run.sh").chmod(0o755)
+    os.symlink("hello.txt", src / "link.txt")
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Git Gym",
+        "GIT_AUTHOR_EMAIL": "gitgym@example.com",
+        "GIT_COMMITTER_NAME": "Git Gym",
+        "GIT_COMMITTER_EMAIL": "gitgym@example.com",
+    }
+    subprocess.run(["git", "-C", str(src), "add", "."], check=True, env=env)
+    subprocess.run(
+        ["git", "-C", str(src), "commit", "-qm", "Initial commit"], check=True, env=env
+    )
+    return src
+
+
+def _git(path, *args):
+    return subprocess.run(
+        ["git", "-C", str(path), *args], capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_is_immutable_object_loose():
+    assert m._is_immutable_object(".git/objects/ab/" + "c" * 38)
+
+
+def test_is_immutable_object_pack():
+    assert m._is_immutable_object(".git/objects/pack/pack-" + "a" * 40 + ".pack")
+    assert m._is_immutable_object(".git/objects/pack/pack-" + "a" * 40 + ".idx")
+
+
+def test_mutable_files_are_not_immutable_objects():
+    for rel in (".git/index", ".git/HEAD", ".git/refs/heads/main", "hello.txt"):
+        assert not m._is_immutable_object(rel)
+    assert not m._is_immutable_object(".git/objects/info/packs")
+
+
+def test_materialize_produces_valid_repo(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    assert _git(dest, "status", "--porcelain") == ""
+    assert _git(dest, "log", "--format=%s") == "Initial commit\n"
+    subprocess.run(["git", "-C", str(dest), "fsck", "--strict"], check=True)
+
+
+def test_materialize_hardlinks_objects(repo, tmp_path):
+    dest = tmp_path / "dest"
+    strategy = m.materialize(repo, dest)
+    head = _git(dest, "rev-parse", "HEAD").strip()
+    obj = f".git/objects/{head[:2]}/{head[2:]}"
+    assert (dest / obj).stat().st_ino == (repo / obj).stat().st_ino
+    assert "hardlink" in strategy
+
+
+def test_materialize_never_links_mutable_files(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    for rel in (".git/index", ".git/HEAD", "hello.txt"):
+        assert (dest / rel).stat().st_ino != (repo / rel).stat().st_ino
+
+
+def test_materialize_preserves_symlinks_and_modes(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    assert os.readlink(dest / "link.txt") == "hello.txt"
+    assert os.access(dest / "run.sh", os.X_OK)
+
+
+def test_materialize_preserves_mtime(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    assert (dest / "hello.txt").stat().st_mtime_ns == (
+        repo / "hello.txt"
+    ).stat().st_mtime_ns
+
+
+def test_materialize_falls_back_to_copy_without_reflink(repo, tmp_path):
+    dest = tmp_path / "dest"
+    with mock.patch("gitgym.materialize._reflink", return_value=False):
+        strategy = m.materialize(repo, dest)
+    assert strategy == "hardlink+copy"
+
+
+def test_materialize_falls_back_when_hardlink_fails(repo, tmp_path):
+    dest = tmp_path / "dest"
+    with (
+        mock.patch("gitgym.materialize.os.link", side_effect=OSError("EXDEV")),
+        mock.patch("gitgym.materialize._reflink", return_value=False),
+    ):
+        strategy = m.materialize(repo, dest)
+    assert strategy == "copy"
+    assert _git(dest, "status", "--porcelain") == ""
+
+
+def test_describe_orders_strategies():
+    assert m.describe(Counter(copy=2, hardlink=1)) == "hardlink+copy"
+    assert m.describe(Counter(reflink=3, hardlink=1)) == "reflink+hardlink"
+    assert m.describe(Counter()) == "copy"
+
+
+# --- manifest / sync ---
+
+
+def test_manifest_records_files_dirs_and_symlinks(repo):
+    entries = m.manifest(repo)
+    assert entries["link.txt"] == ["l", "hello.txt"]
+    assert entries[".git"] == ["d"]
+    kind, size, executable, _digest = entries["run.sh"]
+    assert (kind, size, executable) == ("f", len("#!/usr/bin/env bash\n"), True)
+    assert entries["hello.txt"][2] is False
+
+
+def test_sync_unchanged_touches_nothing(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    inode = (dest / "hello.txt").stat().st_ino
+    strategy, changed = m.sync(repo, dest, m.manifest(repo))
+    assert (strategy, changed) == ("unchanged", 0)
+    assert (dest / "hello.txt").stat().st_ino == inode
+
+
+def test_sync_repairs_only_what_changed(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    untouched = (dest / "run.sh").stat().st_ino
+    (dest / "hello.txt").write_text("edited\n")
+    (dest / "stray.txt").write_text("new\n")
+    (dest / "newdir").mkdir()
+    (dest / "newdir" / "file").write_text("x")
+    (dest / "link.txt").unlink()
+    _git(dest, "checkout", "-qb", "feature")
+    (dest / ".git" / "MERGE_HEAD").write_text("0" * 40 + "\n")
+
+    _strategy, changed = m.sync(repo, dest, m.manifest(repo))
+
+    assert changed > 0
+    assert m.manifest(dest) == m.manifest(repo)
+    assert (dest / "run.sh").stat().st_ino == untouched
+    assert _git(dest, "symbolic-ref", "HEAD") == _git(repo, "symbolic-ref", "HEAD")
+    assert not (dest / ".git" / "refs" / "heads" / "feature").exists()
+    assert _git(dest, "status", "--porcelain") == ""
+
+
+def test_sync_removes_new_objects(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    (dest / "extra.txt").write_text("extra\n")
+    _git(dest, "add", "extra.txt")
+    _git(
+        dest,
+        "-c",
+        "user.name=x",
+        "-c",
+        "user.email=x@example.com",
+        "commit",
+        "-qm",
+        "more",
+    )
+    m.sync(repo, dest, m.manifest(repo))
+    assert sorted(_git(dest, "rev-list", "--all").split()) == sorted(
+        _git(repo, "rev-list", "--all").split()
+    )
+    assert m.manifest(dest) == m.manifest(repo)
+
+
+def test_sync_replaces_file_with_directory(repo, tmp_path):
+    dest = tmp_path / "dest"
+    m.materialize(repo, dest)
+    (dest / "hello.txt").unlink()
+    (dest / "hello.txt").mkdir()
+    (dest / "hello.txt" / "inner").write_text("x")
+    m.sync(repo, dest, m.manifest(repo))
+    assert (dest / "hello.txt").read_text() == "hello\n"
@@ -0,0 +1,49 @@
+import json
+from unittest import mock
+
+from gitgym import metrics
+
+
+def test_record_appends_json_lines(_isolated_metrics):
+    metrics.record("setup", exercise="01_basics/01_init", seconds=0.5)
+    metrics.record("setup", exercise="01_basics/02_staging", seconds=1.0)
+    lines = _isolated_metrics.read_text().splitlines()
+    assert [json.loads(line)["exercise"] for line in lines] == [
+        "01_basics/01_init",
+        "01_basics/02_staging",
+    ]
+    assert "at" in json.loads(lines[0])
+
+
+def test_load_filters_by_event():
+    metrics.record("setup", seconds=1)
+    metrics.record("other", seconds=2)
+    assert [e["seconds"] for e in metrics.load("setup")] == [1]
+    assert len(metrics.load()) == 2
+
+
+def test_load_skips_torn_lines(_isolated_metrics):
+    metrics.record("setup", seconds=1)
+    with open(_isolated_metrics, "a") as f:
+        f.write('{"event": "set')
+    assert len(metrics.load()) == 1
+
+
+def test_load_missing_file_returns_empty():
+    assert metrics.load() == []
+
+
+def test_record_rotates_large_file(_isolated_metrics):
+    with mock.patch("gitgym.metrics.METRICS_MAX_BYTES", 10):
+        metrics.record("setup", seconds=1)
+        metrics.record("setup", seconds=2)
+    rotated = _isolated_metrics.with_name(_isolated_metrics.name + ".1")
+    assert json.loads(rotated.read_text())["seconds"] == 1
+    assert [e["seconds"] for e in metrics.load()] == [2]
+
+
+def test_record_never_raises(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    with mock.patch("gitgym.metrics.METRICS_FILE", blocker / "metrics.jsonl"):
+        metrics.record("setup", seconds=1)
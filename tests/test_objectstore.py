@@ -0,0 +1,175 @@
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gitgym import objectstore
+from gitgym.runner import hermetic_env
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _make_repo(path: Path, content: str = "hello\n") -> Path:
+    path.mkdir(parents=True)
+    _git(path, "init", "-q", "-b", "main")
+    (path / "README.md").write_text(content)
+    _git(path, "add", "README.md")
+    _git(
+        path,
+        "-c",
+        "user.name=Test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "-q",
+        "-m",
+        "Initial commit",
+    )
+    return path
+
+
+def _local_objects(repo: Path) -> list[Path]:
+    return objectstore._object_files(repo / ".git" / "objects")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store_dir = tmp_path / "store.git"
+    with mock.patch("gitgym.objectstore.OBJECT_STORE", store_dir):
+        yield store_dir
+
+
+# --- absorb ---
+
+
+def test_absorb_disabled_leaves_repo_alone(tmp_path):
+    repo = _make_repo(tmp_path / "repo")
+    with mock.patch("gitgym.objectstore.OBJECT_STORE", None):
+        assert objectstore.absorb(repo) is False
+    assert _local_objects(repo)
+    assert not (repo / ".git" / "objects" / "info" / "alternates").exists()
+
+
+def test_absorb_non_repo_returns_false(tmp_path, store):
+    (tmp_path / "plain").mkdir()
+    assert objectstore.absorb(tmp_path / "plain") is False
+    assert not store.exists()
+
+
+def test_absorb_moves_objects_into_store(tmp_path, store):
+    repo = _make_repo(tmp_path / "repo")
+    head = _git(repo, "rev-parse", "HEAD").strip()
+
+    assert objectstore.absorb(repo) is True
+
+    assert _local_objects(repo) == []
+    assert objectstore.borrows(repo)
+    assert _git(repo, "rev-parse", "HEAD").strip() == head
+    assert _git(repo, "show", "HEAD:README.md") == "hello\n"
+    _git(repo, "fsck", "--no-progress")
+
+
+def test_absorb_shares_identical_objects(tmp_path, store):
+    first = _make_repo(tmp_path / "first")
+    second = _make_repo(tmp_path / "second")
+    objectstore.absorb(first)
+    before = objectstore.store_stats()["loose"]
+
+    objectstore.absorb(second)
+
+    # Same README blob and tree; only the commit (different timestamp) may differ.
+    assert objectstore.store_stats()["loose"] - before <= 1
+    assert _git(second, "show", "HEAD:README.md") == "hello\n"
+
+
+def test_absorb_is_idempotent(tmp_path, store):
+    repo = _make_repo(tmp_path / "repo")
+    objectstore.absorb(repo)
+    objectstore.absorb(repo)
+    alternates = repo / ".git" / "objects" / "info" / "alternates"
+    assert alternates.read_text().splitlines() == [str(store / "objects")]
+
+
+def test_store_is_configured_never_to_prune(tmp_path, store):
+    objectstore.absorb(_make_repo(tmp_path / "repo"))
+    assert _git(store, "config", "gc.pruneExpire").strip() == "never"
+    assert _git(store, "config", "gc.auto").strip() == "0"
+
+
+# --- dissociate ---
+
+
+def test_dissociate_copies_objects_back(tmp_path, store):
+    repo = _make_repo(tmp_path / "repo")
+    objectstore.absorb(repo)
+
+    assert objectstore.dissociate(repo, hermetic_env()) is True
+
+    assert not objectstore.borrows(repo)
+    assert not (repo / ".git" / "objects" / "info" / "alternates").exists()
+    # The repository must survive the store going away.
+    subprocess.run(["rm", "-rf", str(store)], check=True)
+    assert _git(repo, "show", "HEAD:README.md") == "hello\n"
+    _git(repo, "fsck", "--no-progress")
+
+
+def test_dissociate_without_alternates_is_noop(tmp_path, store):
+    repo = _make_repo(tmp_path / "repo")
+    assert objectstore.dissociate(repo, hermetic_env()) is True
+
+
+def test_dissociate_ignores_ambient_git_settings(tmp_path, store, monkeypatch):
+    repo = _make_repo(tmp_path / "repo")
+    objectstore.absorb(repo)
+    # Would point repack at another repository if it leaked through.
+    monkeypatch.setenv("GIT_DIR", str(tmp_path / "nowhere"))
+    monkeypatch.setenv("GIT_CONFIG_PARAMETERS", "'pack.packSizeLimit'='1'")
+
+    assert objectstore.dissociate(repo, hermetic_env()) is True
+
+    monkeypatch.delenv("GIT_DIR")
+    assert len(list((repo / ".git" / "objects" / "pack").glob("*.pack"))) == 1
+    _git(repo, "fsck", "--no-progress")
+
+
+def test_dissociate_all_reports_counts(tmp_path, store):
+    root = tmp_path / "workspace"
+    borrowed = _make_repo(root / "01_basics" / "01_init")
+    _make_repo(root / "01_basics" / "02_staging")
+    objectstore.absorb(borrowed)
+
+    done, failed = objectstore.dissociate_all(hermetic_env(), [root])
+
+    assert (done, failed) == (1, [])
+    assert not objectstore.borrows(borrowed)
+
+
+# --- store_stats ---
+
+
+def test_store_stats_disabled():
+    with mock.patch("gitgym.objectstore.OBJECT_STORE", None):
+        stats = objectstore.store_stats()
+    assert stats["path"] is None
+    assert stats["loose"] == 0
+
+
+def test_store_stats_counts_borrowers(tmp_path, store):
+    root = tmp_path / "workspace"
+    repo = _make_repo(root / "01_basics" / "01_init")
+    objectstore.absorb(repo)
+    with mock.patch("gitgym.objectstore.WORKSPACE_DIR", root):
+        stats = objectstore.store_stats()
+    assert stats["path"] == store
+    assert stats["workspaces"] == 1
+    assert stats["loose"] == 3
+    assert stats["bytes"] > 0
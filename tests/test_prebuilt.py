@@ -0,0 +1,117 @@
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gitgym import prebuilt
+from gitgym.config import EXERCISES_DIR
+from gitgym.exercise import load_exercise
+from gitgym.runner import _git_env, build_workspace, prebuild, run_setup
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def _state(repo: Path) -> dict:
+    """Everything a verify script could look at."""
+    if not (repo / ".git").exists():
+        return {"files": sorted(p.name for p in repo.iterdir())}
+    return {
+        "refs": _git(repo, "for-each-ref", "--format=%(objectname) %(refname)"),
+        "head": _git(repo, "symbolic-ref", "-q", "HEAD"),
+        "status": _git(repo, "status", "--porcelain=v2", "--branch"),
+        "index": _git(repo, "ls-files", "--stage"),
+        "stash": _git(repo, "stash", "list"),
+        "objects": sorted(
+            _git(repo, "cat-file", "--batch-all-objects", "--batch-check").splitlines()
+        ),
+    }
+
+
+@pytest.fixture
+def prebuilt_dir(tmp_path):
+    directory = tmp_path / "prebuilt"
+    with mock.patch("gitgym.prebuilt.PREBUILT_DIR", directory):
+        yield directory
+
+
+def _exercise(key: str):
+    return load_exercise(EXERCISES_DIR / key)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "01_basics/01_init",
+        "06_undoing/02_unstage",
+        "08_stashing/01_stash_basics",
+        "04_merging/03_merge_conflict",
+    ],
+)
+def test_restore_matches_setup(key, tmp_path, prebuilt_dir):
+    exercise = _exercise(key)
+    expected = tmp_path / "expected"
+    expected.mkdir()
+    assert build_workspace(exercise, expected) is not None
+
+    assert prebuild(exercise, prebuilt_dir / key) is True
+    restored = tmp_path / "restored"
+    assert prebuilt.restore(exercise, restored, _git_env(exercise)) is True
+
+    assert _state(restored) == _state(expected)
+    if (restored / ".git").exists():
+        _git(restored, "fsck", "--no-progress", "--no-dangling")
+
+
+def test_prebuild_leaves_the_managed_git_config_alone(
+    prebuilt_dir, _isolated_git_config
+):
+    assert prebuild(_exercise("01_basics/01_init"), prebuilt_dir / "01_basics/01_init")
+    assert not _isolated_git_config.exists()
+
+
+def test_pack_pins_are_removed(tmp_path, prebuilt_dir):
+    exercise = _exercise("06_undoing/02_unstage")
+    assert prebuild(exercise, prebuilt_dir / "06_undoing/02_unstage") is True
+    restored = tmp_path / "restored"
+    prebuilt.restore(exercise, restored, _git_env(exercise))
+    assert "gitgym-prebuilt" not in _git(restored, "for-each-ref")
+    assert not (restored / ".git" / "refs" / "gitgym-prebuilt").exists()
+
+
+def test_lookup_missing_returns_none(prebuilt_dir):
+    assert prebuilt.lookup(_exercise("01_basics/02_staging")) is None
+
+
+def test_restore_stale_digest_returns_false(tmp_path, prebuilt_dir):
+    exercise = _exercise("01_basics/02_staging")
+    prebuild(exercise, prebuilt_dir / "01_basics/02_staging")
+    (prebuilt_dir / "01_basics/02_staging" / "digest").write_text("stale\n")
+    destination = tmp_path / "ws"
+    assert prebuilt.restore(exercise, destination, _git_env(exercise)) is False
+
+
+def test_restore_corrupt_bundle_leaves_destination_empty(tmp_path, prebuilt_dir):
+    exercise = _exercise("01_basics/02_staging")
+    prebuild(exercise, prebuilt_dir / "01_basics/02_staging")
+    (prebuilt_dir / "01_basics/02_staging" / "repo.bundle").write_bytes(b"junk")
+    destination = tmp_path / "ws"
+    assert prebuilt.restore(exercise, destination, _git_env(exercise)) is False
+    assert list(destination.iterdir()) == []
+
+
+def test_run_setup_uses_prebuilt(tmp_path, prebuilt_dir, capsys):
+    exercise = _exercise("02_committing/01_amend")
+    prebuild(exercise, prebuilt_dir / "02_committing/01_amend")
+    capsys.readouterr()
+    with (
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+        mock.patch("gitgym.runner._build_workspace") as build,
+    ):
+        assert run_setup(exercise, verbose=True) is True
+    build.assert_not_called()
+    assert "prebuilt bundle" in capsys.readouterr().out
@@ -0,0 +1,155 @@
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from gitgym.exercise import Exercise
+from gitgym.prepare import prepare
+
+
+def _make_exercise(exercises_dir: Path, topic: str, name: str, script: str) -> Exercise:
+    exercise_dir = exercises_dir / topic / name
+    exercise_dir.mkdir(parents=True)
+    setup = exercise_dir / "setup.sh"
+    setup.write_text("#!/usr/bin/env bash\nset -euo pipefail\n" + script)
+    setup.chmod(setup.stat().st_mode | stat.S_IEXEC)
+    return Exercise(
+        name=name,
+        topic="Test",
+        title=name,
+        description="",
+        goal_summary="",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def _run(exercises, workspace_dir, **kwargs):
+    exercises_dir = exercises[0].path.parent.parent
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", exercises_dir),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+        mock.patch("gitgym.prepare.WORKSPACE_DIR", workspace_dir),
+    ):
+        return prepare(exercises, **kwargs)
+
+
+def test_prepare_sets_up_every_exercise(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", 'touch "$1/done"\n')
+        for i in range(4)
+    ]
+    workspace = tmp_path / "ws"
+    results = _run(exercises, workspace, jobs=2)
+
+    assert [r.key for r in results] == [f"01_t/0{i}_e" for i in range(4)]
+    assert all(r.ok and not r.skipped for r in results)
+    for i in range(4):
+        assert (workspace / "01_t" / f"0{i}_e" / "done").exists()
+
+
+def test_prepare_runs_in_parallel(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "sleep 0.3\n")
+        for i in range(4)
+    ]
+    start = time.perf_counter()
+    _run(exercises, tmp_path / "ws", jobs=4)
+    assert time.perf_counter() - start < 1.0
+
+
+def test_prepare_bounds_concurrency(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(6)
+    ]
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_setup(exercise):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return True
+
+    with mock.patch("gitgym.prepare.run_setup", side_effect=fake_setup):
+        _run(exercises, tmp_path / "ws", jobs=2)
+    assert peak == 2
+
+
+def test_prepare_captures_failure_output_per_exercise(tmp_path):
+    good = _make_exercise(tmp_path / "ex", "01_t", "01_good", 'echo "fine"\n')
+    bad = _make_exercise(tmp_path / "ex", "01_t", "02_bad", 'echo "boom" >&2\nexit 3\n')
+    results = _run([good, bad], tmp_path / "ws", jobs=2)
+
+    assert results[0].ok is True
+    assert results[0].output == ""
+    assert results[1].ok is False
+    assert "exit code 3" in results[1].output
+    assert "boom" in results[1].output
+
+
+def test_prepare_reports_an_exception_as_a_failure(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(3)
+    ]
+
+    def fake_setup(exercise):
+        if exercise.name == "01_e":
+            raise OSError(28, "No space left on device")
+        return True
+
+    with mock.patch("gitgym.prepare.run_setup", side_effect=fake_setup):
+        results = _run(exercises, tmp_path / "ws", jobs=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert "setup of exercise '01_e' failed" in results[1].output
+    assert "No space left on device" in results[1].output
+
+
+def test_prepare_restores_stdout(tmp_path):
+    exercise = _make_exercise(tmp_path / "ex", "01_t", "01_e", "")
+    before = sys.stdout
+    _run([exercise], tmp_path / "ws")
+    assert sys.stdout is before
+
+
+def test_prepare_skips_existing_workspaces(tmp_path):
+    exercise = _make_exercise(tmp_path / "ex", "01_t", "01_e", 'touch "$1/fresh"\n')
+    workspace = tmp_path / "ws"
+    existing = workspace / "01_t" / "01_e"
+    existing.mkdir(parents=True)
+    (existing / "learner_work.txt").write_text("keep me")
+
+    results = _run([exercise], workspace)
+    assert results[0].skipped is True
+    assert (existing / "learner_work.txt").exists()
+    assert not (existing / "fresh").exists()
+
+
+def test_prepare_force_recreates_existing_workspaces(tmp_path):
+    exercise = _make_exercise(tmp_path / "ex", "01_t", "01_e", 'touch "$1/fresh"\n')
+    workspace = tmp_path / "ws"
+    existing = workspace / "01_t" / "01_e"
+    existing.mkdir(parents=True)
+    (existing / "learner_work.txt").write_text("discard me")
+
+    results = _run([exercise], workspace, force=True)
+    assert results[0].skipped is False
+    assert not (existing / "learner_work.txt").exists()
+    assert (existing / "fresh").exists()
+
+
+def test_prepare_reports_each_result(tmp_path):
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(3)
+    ]
+    seen = []
+    _run(exercises, tmp_path / "ws", jobs=3, on_result=lambda r: seen.append(r.key))
+    assert sorted(seen) == [f"01_t/0{i}_e" for i in range(3)]
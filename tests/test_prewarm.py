@@ -0,0 +1,159 @@
+import stat
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gitgym import prewarm
+from gitgym.exercise import Exercise
+
+
+def _make_exercise(exercises_dir: Path, topic_dir: str, exercise_dir: str) -> Exercise:
+    path = exercises_dir / topic_dir / exercise_dir
+    path.mkdir(parents=True)
+    (path / "exercise.toml").write_text(
+        "[exercise]\n"
+        f'name = "{exercise_dir}"\n'
+        'topic = "Test"\ntitle = "T"\ndescription = "D"\n'
+        '[goal]\nsummary = "G"\n'
+    )
+    setup = path / "setup.sh"
+    setup.write_text(
+        '#!/usr/bin/env bash\nset -euo pipefail\necho "ready" > "$1/file.txt"\n'
+    )
+    setup.chmod(setup.stat().st_mode | stat.S_IXUSR)
+    return Exercise(
+        name=exercise_dir,
+        topic="Test",
+        title="T",
+        description="D",
+        goal_summary="G",
+        hints=[],
+        path=path,
+    )
+
+
+@pytest.fixture
+def exercises(tmp_path):
+    exercises_dir = tmp_path / "exercises"
+    exs = [
+        _make_exercise(exercises_dir, "01_basics", "01_init"),
+        _make_exercise(exercises_dir, "01_basics", "02_staging"),
+        _make_exercise(exercises_dir, "02_committing", "01_amend"),
+        _make_exercise(exercises_dir, "02_committing", "02_diff"),
+    ]
+    with (
+        mock.patch("gitgym.prewarm.EXERCISES_DIR", exercises_dir),
+        mock.patch("gitgym.runner.EXERCISES_DIR", exercises_dir),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        yield exs
+
+
+# --- upcoming ---
+
+
+def test_upcoming_skips_current_and_completed(exercises):
+    progress = {
+        "exercises": {
+            "01_basics/01_init": {"status": "completed"},
+            "01_basics/02_staging": {"status": "in_progress"},
+        }
+    }
+    result = prewarm.upcoming(exercises, progress, exercises[1])
+    assert result == exercises[2:4]
+
+
+def test_upcoming_respects_prewarm_count(exercises):
+    with mock.patch("gitgym.prewarm.PREWARM_COUNT", 1):
+        result = prewarm.upcoming(exercises, {"exercises": {}}, exercises[0])
+    assert result == [exercises[1]]
+
+
+def test_upcoming_includes_earlier_incomplete_exercises(exercises):
+    """Like `gitgym next`, an earlier skipped exercise comes first."""
+    result = prewarm.upcoming(exercises, {"exercises": {}}, exercises[2])
+    assert result == exercises[0:2]
+
+
+# --- prewarm / is_staged ---
+
+
+def test_prewarm_stages_exercises(exercises):
+    assert prewarm.prewarm(["01_basics/02_staging", "02_committing/01_amend"]) == 2
+    assert prewarm.is_staged(exercises[1])
+    assert prewarm.is_staged(exercises[2])
+    assert not prewarm.is_staged(exercises[0])
+
+
+def test_prewarm_skips_already_staged(exercises):
+    prewarm.prewarm(["01_basics/02_staging"])
+    assert prewarm.prewarm(["01_basics/02_staging"]) == 0
+
+
+def test_prewarm_ignores_unknown_keys(exercises):
+    assert prewarm.prewarm(["99_nope/01_missing"]) == 0
+
+
+def test_prewarm_exits_when_lock_is_held(exercises, _no_prewarm_worker):
+    import fcntl
+
+    prewarm.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    with open(prewarm.STAGING_DIR / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert prewarm.prewarm(["01_basics/02_staging"]) == 0
+    assert not prewarm.is_staged(exercises[1])
+
+
+def test_staged_copy_is_stale_after_exercise_changes(exercises):
+    prewarm.prewarm(["01_basics/02_staging"])
+    with open(exercises[1].path / "setup.sh", "a") as f:
+        f.write("# edited\n")
+    assert not prewarm.is_staged(exercises[1])
+
+
+# --- claim ---
+
+
+def test_claim_moves_staged_workspace(exercises, tmp_path):
+    prewarm.prewarm(["01_basics/02_staging"])
+    workspace = tmp_path / "ws" / "01_basics" / "02_staging"
+    assert prewarm.claim(exercises[1], workspace) is True
+    assert (workspace / "file.txt").read_text() == "ready\n"
+    assert not prewarm.is_staged(exercises[1])
+
+
+def test_claim_into_empty_directory(exercises, tmp_path):
+    prewarm.prewarm(["01_basics/02_staging"])
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    assert prewarm.claim(exercises[1], workspace) is True
+
+
+def test_claim_refuses_non_empty_workspace(exercises, tmp_path):
+    prewarm.prewarm(["01_basics/02_staging"])
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (workspace / "work.txt").write_text("learner work")
+    assert prewarm.claim(exercises[1], workspace) is False
+    assert (workspace / "work.txt").exists()
+
+
+def test_claim_without_staged_copy_returns_false(exercises, tmp_path):
+    assert prewarm.claim(exercises[0], tmp_path / "ws") is False
+
+
+# --- spawn_worker ---
+
+
+def test_spawn_worker_launches_for_unstaged(exercises, _no_prewarm_worker):
+    prewarm.spawn_worker(exercises[1:3])
+    _no_prewarm_worker.assert_called_once_with(
+        ["01_basics/02_staging", "02_committing/01_amend"]
+    )
+
+
+def test_spawn_worker_skips_when_all_staged(exercises, _no_prewarm_worker):
+    prewarm.prewarm(["01_basics/02_staging"])
+    prewarm.spawn_worker([exercises[1]])
+    _no_prewarm_worker.assert_not_called()
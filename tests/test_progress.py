@@ -8,6 +8,7 @@ from gitgym.progress import (
     increment_hints_used,
     load_progress,
     mark_completed,
+    mark_completed_many,
     mark_in_progress,
     reset_all_progress,
     reset_exercise_progress,
@@ -232,6 +233,38 @@ def test_mark_completed_new_exercise_creates_entry(tmp_path):
     assert result["exercises"]["01_basics/02_staging"]["status"] == "completed"
 
 
+def test_mark_completed_many_marks_every_key_in_one_write(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    data = {
+        "version": 1,
+        "exercises": {
+            "01_basics/01_init": {"status": "in_progress", "hints_used": 2},
+            "01_basics/03_status": {"status": "in_progress"},
+        },
+    }
+    progress_file.write_text(json.dumps(data))
+
+    with (
+        mock.patch("gitgym.progress.PROGRESS_FILE", progress_file),
+        mock.patch("gitgym.progress.save_progress", wraps=save_progress) as save,
+    ):
+        mark_completed_many(["01_basics/01_init", "01_basics/02_staging"])
+        result = load_progress()
+
+    assert save.call_count == 1
+    exercises = result["exercises"]
+    assert exercises["01_basics/01_init"]["status"] == "completed"
+    assert exercises["01_basics/01_init"]["hints_used"] == 2
+    assert exercises["01_basics/02_staging"]["status"] == "completed"
+    assert exercises["01_basics/03_status"]["status"] == "in_progress"
+
+
+def test_mark_completed_many_with_no_keys_does_not_write(tmp_path):
+    with _patch_progress_file(tmp_path):
+        mark_completed_many([])
+    assert not (tmp_path / "progress.json").exists()
+
+
 def test_increment_hints_used_from_zero(tmp_path):
     with _patch_progress_file(tmp_path):
         increment_hints_used("01_basics/01_init")
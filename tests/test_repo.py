@@ -0,0 +1,138 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym.gitpool import GitBatch, GitPoolError
+from gitgym.repo import Repo, StoppedError
+
+
+def _env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(),
+    ).stdout.strip()
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    (path / "a.txt").write_text("a\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "First")
+    return path
+
+
+@pytest.fixture
+def batch(path):
+    batch = GitBatch(path)
+    yield batch
+    batch.close()
+
+
+def test_lookups_are_memoized_for_the_call(path, batch):
+    repo = Repo(path, batch, _env())
+    first = repo.resolve("HEAD")
+    assert repo.commit("HEAD").subject == "First"
+    assert repo.read("HEAD:a.txt") == ("blob", b"a\n")
+
+    (path / "b.txt").write_text("b\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "Second")
+    # The same Repo keeps answering from its memo; a new one sees the commit.
+    assert repo.resolve("HEAD") == first
+    assert repo.commit("HEAD").subject == "First"
+    assert Repo(path, batch, _env()).commit("HEAD").subject == "Second"
+
+
+def test_head_branch_and_operation(path, batch):
+    repo = Repo(path, batch, _env())
+    assert repo.head_branch() == "main"
+    assert repo.operation() is None
+    _git(path, "switch", "-q", "--detach")
+    assert repo.head_branch() is None
+    (path / ".git" / "MERGE_HEAD").write_text(repo.resolve("HEAD") + "\n")
+    assert repo.operation() == "merge"
+
+
+def test_refs_are_read_without_git(path, batch):
+    from unittest import mock
+
+    _git(path, "tag", "-a", "v1", "-m", "One")
+    _git(path, "pack-refs", "--all")
+    _git(path, "branch", "feature")
+    head = _git(path, "rev-parse", "HEAD")
+    tag = _git(path, "rev-parse", "v1")
+    repo = Repo(path, batch, _env())
+    with (
+        mock.patch("subprocess.Popen") as popen,
+        mock.patch.object(batch, "info") as info,
+    ):
+        assert repo.refs("refs/heads/") == {
+            "refs/heads/feature": head,
+            "refs/heads/main": head,
+        }
+        assert repo.resolve("v1") == tag
+        assert repo.resolve("feature") == head
+        assert repo.head_branch() == "main"
+    popen.assert_not_called()
+    info.assert_not_called()
+    assert repo.resolve("HEAD~0") == head
+
+
+def test_config_reads_once_and_normalises_keys(path, batch):
+    _git(path, "config", "alias.st", "status")
+    _git(path, "config", "branch.Topic.remote", "origin")
+    repo = Repo(path, batch, _env())
+    assert repo.config("Alias.St") == "status"
+    assert repo.config("branch.Topic.remote") == "origin"
+    assert repo.config("branch.topic.remote") is None
+    assert repo.config("user.signingkey") is None
+
+
+def test_git_runs_in_workspace(path, batch):
+    result = Repo(path, batch, _env()).git("log", "--format=%s")
+    assert result.returncode == 0
+    assert result.stdout.strip() == "First"
+
+
+def test_stop_kills_running_git_commands(path, batch):
+    import threading
+    import time
+
+    env = {**_env(), "GIT_EDITOR": "sleep 30 #"}
+    repo = Repo(path, batch, env)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(repo.git("commit", "--allow-empty"))
+    )
+    thread.start()
+    while not repo._running:
+        time.sleep(0.01)
+    groups = []
+    repo.stop(groups.append)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert results[0].returncode != 0
+    assert len(groups) == 1
+    with pytest.raises(StoppedError):
+        repo.git("status")
+    with pytest.raises(GitPoolError):
+        batch.resolve("HEAD")
@@ -1,5 +1,8 @@
+import shutil
 import stat
+import subprocess
 import textwrap
+from contextlib import contextmanager
 from pathlib import Path
 from unittest import mock
 
@@ -625,3 +628,1393 @@ def test_run_verify_missing_workspace_suggests_reset(tmp_path):
         _success, output, _is_script_error = run_verify(exercise)
 
     assert "gitgym reset" in output
+
+
+# --- run_setup: template cache tests ---
+
+
+def _counting_setup(exercises_dir: Path, counter: Path) -> None:
+    _write_script(
+        exercises_dir / "setup.sh",
+        textwrap.dedent(f"""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            echo run >> "{counter}"
+            echo "content" > "$1/file.txt"
+        """),
+    )
+
+
+def test_run_setup_second_run_restores_from_cache(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    counter = tmp_path / "runs.txt"
+    _counting_setup(exercises_dir, counter)
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        assert run_setup(exercise) is True
+        (workspace_dir / "01_basics" / "01_init" / "file.txt").write_text("edited")
+        assert run_setup(exercise) is True
+
+    assert counter.read_text().count("run") == 1
+    restored = workspace_dir / "01_basics" / "01_init" / "file.txt"
+    assert restored.read_text() == "content\n"
+
+
+def test_run_setup_cache_removes_stray_files(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    _counting_setup(exercises_dir, tmp_path / "runs.txt")
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        run_setup(exercise)
+        stray = workspace_dir / "01_basics" / "01_init" / "stray.txt"
+        stray.write_text("learner file")
+        run_setup(exercise)
+
+    assert not stray.exists()
+
+
+def test_run_setup_reruns_script_when_it_changes(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    counter = tmp_path / "runs.txt"
+    _counting_setup(exercises_dir, counter)
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        run_setup(exercise)
+        with open(exercises_dir / "setup.sh", "a") as f:
+            f.write("# changed\n")
+        run_setup(exercise)
+
+    assert counter.read_text().count("run") == 2
+
+
+def test_run_setup_failure_is_not_cached(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+
+    _write_script(exercises_dir / "setup.sh", "#!/usr/bin/env bash\nexit 1\n")
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        assert run_setup(exercise) is False
+        assert run_setup(exercise) is False
+
+
+def test_run_setup_verbose_reports_strategy(tmp_path, capsys):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    _counting_setup(exercises_dir, tmp_path / "runs.txt")
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        run_setup(exercise, verbose=True)
+        first = capsys.readouterr().out
+        shutil.rmtree(workspace_dir)
+        run_setup(exercise, verbose=True)
+        second = capsys.readouterr().out
+
+    assert "setup.sh" in first
+    assert "restored from cache" in second
+    assert "copy" in second or "reflink" in second
+
+
+# --- run_setup: deterministic environment tests ---
+
+
+def _run_real_setup(exercise_dir: Path, workspace_dir: Path) -> Path:
+    """Run a shipped exercise's setup through run_setup with a cold cache."""
+    from gitgym import cache
+    from gitgym.config import EXERCISES_DIR
+    from gitgym.exercise import load_exercise
+
+    exercise = load_exercise(exercise_dir)
+    cache.clear_cache()
+    with mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir):
+        assert run_setup(exercise) is True
+    return workspace_dir / exercise_dir.relative_to(EXERCISES_DIR)
+
+
+def _git_output(repo: Path, *args: str) -> str:
+    import subprocess
+
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_run_setup_pins_identity_and_dates(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    env_dump = tmp_path / "env.txt"
+
+    _write_script(
+        exercises_dir / "setup.sh",
+        textwrap.dedent(f"""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            echo "$GIT_AUTHOR_NAME|$GIT_COMMITTER_EMAIL|$GIT_AUTHOR_DATE" > "{env_dump}"
+        """),
+    )
+
+    exercise = _make_exercise(exercises_dir)
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+        mock.patch.dict("os.environ", {"GIT_AUTHOR_NAME": "Someone Else"}),
+    ):
+        run_setup(exercise)
+
+    assert env_dump.read_text().strip() == (
+        "Git Gym|gitgym@example.com|@1767225600 +0000"
+    )
+
+
+def test_run_setup_commit_hashes_are_reproducible(tmp_path):
+    from gitgym.config import EXERCISES_DIR
+
+    bisect = EXERCISES_DIR / "09_advanced" / "02_bisect"
+    first = _run_real_setup(bisect, tmp_path / "one")
+    second = _run_real_setup(bisect, tmp_path / "two")
+
+    assert _git_output(first, "rev-parse", "HEAD") == _git_output(
+        second, "rev-parse", "HEAD"
+    )
+
+
+def test_run_setup_commit_dates_tick_forward(tmp_path):
+    from gitgym.config import EXERCISES_DIR
+
+    repo = _run_real_setup(EXERCISES_DIR / "09_advanced" / "02_bisect", tmp_path / "ws")
+    dates = [int(d) for d in _git_output(repo, "log", "--format=%ct").split()]
+
+    assert len(set(dates)) == len(dates)
+    assert dates == sorted(dates, reverse=True)
+
+
+# --- declarative [setup] tests ---
+
+
+def _make_spec_exercise(exercise_dir: Path, setup: dict) -> Exercise:
+    exercise_dir.mkdir(parents=True)
+    (exercise_dir / "exercise.toml").write_text("[exercise]\n")
+    exercise = _make_exercise(exercise_dir)
+    exercise.setup = setup
+    return exercise
+
+
+def test_run_setup_builds_from_spec_without_script(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    workspace_dir = tmp_path / "workspace"
+    exercise = _make_spec_exercise(
+        exercises_dir,
+        {"commits": [{"message": "Initial commit", "files": {"a.txt": "a\n"}}]},
+    )
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        assert run_setup(exercise) is True
+
+    repo = workspace_dir / "01_basics" / "01_init"
+    assert (repo / "a.txt").read_text() == "a\n"
+    assert _git_output(repo, "log", "--format=%s") == "Initial commit"
+
+
+def test_run_setup_invalid_spec_prints_error(tmp_path, capsys):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercise = _make_spec_exercise(
+        exercises_dir, {"commits": [{"message": "x", "from": "missing"}]}
+    )
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        assert run_setup(exercise) is False
+
+    out = capsys.readouterr().out
+    assert "unknown commit or branch 'missing'" in out
+    assert "file a bug report" in out
+
+
+# --- hermetic environment tests ---
+
+
+def _hostile_home(tmp_path: Path) -> Path:
+    """A HOME whose ~/.gitconfig would break or stall scripts if it were read."""
+    home = tmp_path / "home"
+    hooks = home / "hooks"
+    hooks.mkdir(parents=True)
+    _write_script(hooks / "pre-commit", "#!/bin/sh\nexit 1\n")
+    (home / ".gitconfig").write_text(
+        textwrap.dedent(f"""\
+            [commit]
+            \tgpgSign = true
+            [gpg]
+            \tprogram = false
+            [core]
+            \thooksPath = {hooks}
+            [alias]
+            \tst = status
+        """)
+    )
+    return home
+
+
+def test_git_env_replaces_global_and_system_config(tmp_path):
+    from gitgym.runner import GIT_CONFIG, _git_env
+
+    exercise = _make_exercise(tmp_path)
+    with mock.patch.dict(
+        "os.environ", {"GIT_DIR": "/elsewhere", "GIT_EXEC_PATH": "/x"}
+    ):
+        env = _git_env(exercise)
+
+    assert env["GIT_CONFIG_NOSYSTEM"] == "1"
+    assert Path(env["GIT_CONFIG_GLOBAL"]).read_text() == GIT_CONFIG
+    assert env["LC_ALL"] == "C"
+    assert "GIT_DIR" not in env
+    assert env["GIT_EXEC_PATH"] == "/x"
+
+
+def test_hermetic_env_writes_the_config_safely_from_threads(tmp_path):
+    import os
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+
+    from gitgym.runner import GIT_CONFIG, hermetic_env
+
+    replace = os.replace
+
+    def slow_replace(src, dst):
+        # Widen the window between writing the temporary file and moving it.
+        time.sleep(0.005)
+        replace(src, dst)
+
+    for trial in range(5):
+        config_file = tmp_path / str(trial) / "gitconfig"
+        barrier = Barrier(8)
+
+        def write():
+            barrier.wait()
+            return hermetic_env()["GIT_CONFIG_GLOBAL"]
+
+        with (
+            mock.patch("gitgym.runner.GIT_CONFIG_FILE", config_file),
+            mock.patch("os.replace", slow_replace),
+            ThreadPoolExecutor(8) as pool,
+        ):
+            paths = [f.result() for f in [pool.submit(write) for _ in range(8)]]
+        assert set(paths) == {str(config_file)}
+        assert config_file.read_text() == GIT_CONFIG
+
+
+def test_git_env_learner_config_keeps_global_config(tmp_path):
+    from gitgym.runner import _git_env
+
+    env = _git_env(_make_exercise(tmp_path), learner_config=True)
+    assert "GIT_CONFIG_GLOBAL" not in env
+    assert "GIT_CONFIG_NOSYSTEM" not in env
+
+
+def test_git_env_applies_exercise_overrides(tmp_path):
+    from gitgym.runner import _git_env
+
+    exercise = _make_exercise(tmp_path)
+    exercise.environment = {
+        "git_config": {"merge.conflictStyle": "diff3", "core.autocrlf": False},
+        "variables": {"EDITOR": "true"},
+    }
+    env = _git_env(exercise)
+
+    assert env["GIT_CONFIG_COUNT"] == "2"
+    assert env["GIT_CONFIG_KEY_0"] == "merge.conflictStyle"
+    assert env["GIT_CONFIG_VALUE_0"] == "diff3"
+    assert env["GIT_CONFIG_VALUE_1"] == "False"
+    assert env["EDITOR"] == "true"
+
+
+def test_run_setup_ignores_learner_gitconfig(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    _write_script(
+        exercises_dir / "setup.sh",
+        textwrap.dedent("""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            cd "$1"
+            git init --quiet --initial-branch=main
+            echo hi > a.txt
+            git add a.txt
+            git commit --quiet -m "Initial commit"
+        """),
+    )
+    workspace_dir = tmp_path / "workspace"
+    home = _hostile_home(tmp_path)
+
+    with (
+        mock.patch.dict("os.environ", {"HOME": str(home)}),
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+    ):
+        assert run_setup(_make_exercise(exercises_dir)) is True
+
+    repo = workspace_dir / "01_basics" / "01_init"
+    assert "gpgsig" not in _git_output(repo, "cat-file", "-p", "HEAD")
+
+
+def _alias_verify_exercise(tmp_path: Path, environment: dict) -> Exercise:
+    exercises_dir = tmp_path / "exercises" / "09_advanced" / "04_aliases"
+    exercises_dir.mkdir(parents=True)
+    _write_script(
+        exercises_dir / "verify.sh",
+        '#!/usr/bin/env bash\ncd "$1"\n[ "$(git config alias.st)" = status ]\n',
+    )
+    (tmp_path / "workspace" / "09_advanced" / "04_aliases").mkdir(parents=True)
+    exercise = _make_exercise(exercises_dir)
+    exercise.environment = environment
+    return exercise
+
+
+def test_run_verify_hides_learner_config_by_default(tmp_path):
+    exercise = _alias_verify_exercise(tmp_path, {})
+    with (
+        mock.patch.dict("os.environ", {"HOME": str(_hostile_home(tmp_path))}),
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        success, _, _ = run_verify(exercise)
+    assert success is False
+
+
+def test_run_verify_learner_config_sees_global_aliases(tmp_path):
+    exercise = _alias_verify_exercise(tmp_path, {"learner_config": True})
+    with (
+        mock.patch.dict("os.environ", {"HOME": str(_hostile_home(tmp_path))}),
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        success, _, _ = run_verify(exercise)
+    assert success is True
+
+
+# --- run_setup: shared object store ---
+
+
+def test_run_setup_moves_objects_to_shared_store(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    workspace_dir = tmp_path / "workspace"
+    store = tmp_path / "store.git"
+    _write_script(
+        exercises_dir / "setup.sh",
+        textwrap.dedent("""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            cd "$1"
+            git init -q
+            echo hello > README.md
+            git add README.md
+            git commit -q -m "Initial commit"
+        """),
+    )
+
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+        mock.patch("gitgym.objectstore.OBJECT_STORE", store),
+    ):
+        assert run_setup(_make_exercise(exercises_dir)) is True
+        # The restored copy borrows from the store as well.
+        assert run_setup(_make_exercise(exercises_dir)) is True
+
+    repo = workspace_dir / "01_basics" / "01_init"
+    alternates = repo / ".git" / "objects" / "info" / "alternates"
+    assert alternates.read_text().strip() == str(store / "objects")
+    assert not list((repo / ".git" / "objects").glob("??/*"))
+    assert _git_output(repo, "show", "HEAD:README.md") == "hello"
+
+
+# --- run_setup: timeouts, streaming and timing ---
+
+
+def _slow_setup_exercise(tmp_path: Path, timeout: float) -> Exercise:
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    _write_script(
+        exercises_dir / "setup.sh",
+        textwrap.dedent(f"""\
+            #!/usr/bin/env bash
+            echo started
+            (sleep 30; touch {tmp_path}/survivor) &
+            sleep 30
+        """),
+    )
+    exercise = _make_exercise(exercises_dir)
+    exercise.environment = {"setup_timeout": timeout}
+    return exercise
+
+
+def test_run_setup_times_out_and_kills_process_group(tmp_path, capsys):
+    import time
+
+    exercise = _slow_setup_exercise(tmp_path, 0.5)
+    start = time.monotonic()
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        assert run_setup(exercise) is False
+    assert time.monotonic() - start < 10
+
+    out = capsys.readouterr().out
+    assert "did not finish within 0.5 seconds" in out
+    assert "started" in out
+    # The background subshell was killed along with the script.
+    time.sleep(0.2)
+    assert not (tmp_path / "survivor").exists()
+
+
+def test_run_setup_verbose_streams_output(tmp_path, capsys):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    _write_script(
+        exercises_dir / "setup.sh",
+        "#!/usr/bin/env bash\necho one\necho two >&2\n",
+    )
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        assert run_setup(_make_exercise(exercises_dir), verbose=True) is True
+    out = capsys.readouterr().out
+    assert "  | one\n  | two\n" in out
+
+
+def test_run_setup_records_timing(tmp_path):
+    from gitgym import metrics
+
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    _write_script(exercises_dir / "setup.sh", "#!/usr/bin/env bash\n")
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        run_setup(_make_exercise(exercises_dir))
+        run_setup(_make_exercise(exercises_dir))
+
+    first, second = metrics.load("setup")
+    assert first["exercise"] == "01_basics/01_init"
+    assert first["source"] == "setup.sh"
+    assert first["ok"] is True
+    assert first["seconds"] >= 0
+    assert second["source"] == "cache"
+
+
+def test_run_setup_failure_is_recorded(tmp_path):
+    from gitgym import metrics
+
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    _write_script(exercises_dir / "setup.sh", "#!/usr/bin/env bash\nexit 3\n")
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        run_setup(_make_exercise(exercises_dir))
+    (entry,) = metrics.load("setup")
+    assert entry["ok"] is False
+    assert entry["source"] is None
+
+
+# --- run_setup: incremental reset ---
+
+
+def test_run_setup_resets_conflicted_merge_in_place(tmp_path, capsys):
+    from gitgym.config import EXERCISES_DIR
+    from gitgym.exercise import load_exercise
+
+    exercise = load_exercise(EXERCISES_DIR / "04_merging" / "03_merge_conflict")
+    workspace_dir = tmp_path / "workspace"
+    with mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir):
+        assert run_setup(exercise) is True
+        repo = workspace_dir / "04_merging" / "03_merge_conflict"
+        pristine = _git_output(repo, "status", "--porcelain=v2", "--branch")
+        refs = _git_output(repo, "for-each-ref")
+        branches = _git_output(repo, "branch", "--format=%(refname:short)").split()
+        other = next(b for b in branches if b != "main")
+
+        subprocess.run(["git", "merge", other], cwd=repo, capture_output=True)
+        (repo / "scratch.txt").write_text("notes\n")
+        assert (repo / ".git" / "MERGE_HEAD").exists()
+        capsys.readouterr()
+
+        with mock.patch("gitgym.runner._build_workspace") as build:
+            assert run_setup(exercise, verbose=True) is True
+        build.assert_not_called()
+
+    assert "incremental" in capsys.readouterr().out
+    assert not (repo / ".git" / "MERGE_HEAD").exists()
+    assert not (repo / "scratch.txt").exists()
+    assert _git_output(repo, "status", "--porcelain=v2", "--branch") == pristine
+    assert _git_output(repo, "for-each-ref") == refs
+
+
+# --- run_verify: cat-file helpers ---
+
+
+def test_run_verify_provides_cat_file_helpers(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+    repo.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@x", "commit", "-q"]
+        + ["--allow-empty", "-m", "init"],
+        cwd=repo,
+        check=True,
+    )
+    _write_script(
+        exercises_dir / "verify.sh",
+        textwrap.dedent("""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            cd "$1"
+            gitgym_resolve head HEAD
+            gitgym_resolve main refs/heads/main
+            gitgym_object_type kind HEAD^{tree}
+            echo "$head $kind"
+            [ "$head" = "$main" ]
+            ! gitgym_resolve missing refs/heads/nope
+        """),
+    )
+    exercise = _make_exercise(exercises_dir)
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        success, output, _ = run_verify(exercise)
+    assert success is True, output
+    head = _git_output(repo, "rev-parse", "HEAD")
+    assert output.strip() == f"{head.strip()} tree"
+
+
+def test_run_verify_provides_snapshot_helper(tmp_path):
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+    repo.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo, check=True)
+    (repo / "a b.txt").write_text("a\n")
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@x", "commit", "-q"]
+        + ["-m", "init"],
+        cwd=repo,
+        check=True,
+    )
+    subprocess.run(["git", "mv", "a b.txt", "c.txt"], cwd=repo, check=True)
+    (repo / "new file.txt").write_text("n\n")
+    _write_script(
+        exercises_dir / "verify.sh",
+        textwrap.dedent("""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            cd "$1"
+            gitgym_snapshot
+            echo "$GITGYM_BRANCH $GITGYM_HEAD ${GITGYM_REFS[refs/heads/main]}"
+            printf '%s\\n' "${GITGYM_STATUS[@]}"
+        """),
+    )
+    exercise = _make_exercise(exercises_dir)
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        success, output, _ = run_verify(exercise)
+    assert success is True, output
+    head = _git_output(repo, "rev-parse", "HEAD").strip()
+    assert output.splitlines() == [
+        f"main {head} {head}",
+        "R. c.txt",
+        "?? new file.txt",
+    ]
+
+
+def test_git_batch_is_shared_per_workspace(tmp_path):
+    from gitgym.runner import git_batch
+
+    exercise = _make_exercise(tmp_path / "exercises" / "01_basics" / "01_init")
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+    repo.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        batch = git_batch(exercise)
+        assert git_batch(exercise) is batch
+        assert batch.repo == repo
+
+
+# --- run_verify: declarative checks ---
+
+
+def _checks_exercise(tmp_path: Path, checks: list[dict]) -> Exercise:
+    """An exercise with the given [[checks]] and a workspace repo on 'main'."""
+    exercises_dir = tmp_path / "exercises" / "01_basics" / "01_init"
+    exercises_dir.mkdir(parents=True)
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+    repo.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo, check=True)
+    exercise = _make_exercise(exercises_dir)
+    exercise.checks = checks
+    return exercise
+
+
+def _verify_with_checks(tmp_path: Path, exercise: Exercise):
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        return run_verify(exercise)
+
+
+def test_run_verify_checks_without_script(tmp_path):
+    exercise = _checks_exercise(
+        tmp_path, [{"type": "no_operation"}, {"type": "branch", "name": "main"}]
+    )
+    assert _verify_with_checks(tmp_path, exercise) == (
+        True,
+        "All 2 checks passed.",
+        False,
+    )
+
+
+def test_run_verify_failed_check_is_goal_not_met(tmp_path):
+    exercise = _checks_exercise(tmp_path, [{"type": "branch", "name": "feature"}])
+    _write_script(exercise.path / "verify.sh", "#!/usr/bin/env bash\nexit 0\n")
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert success is False
+    assert output == "You are on branch 'main', not 'feature'.\n0/1 checks passing"
+    assert is_script_error is False
+
+
+def test_run_verify_runs_script_after_checks_pass(tmp_path):
+    exercise = _checks_exercise(tmp_path, [{"type": "branch", "name": "main"}])
+    _write_script(
+        exercise.path / "verify.sh", "#!/usr/bin/env bash\necho from script\nexit 1\n"
+    )
+    assert _verify_with_checks(tmp_path, exercise) == (False, "from script", False)
+
+
+def test_run_verify_invalid_checks_is_script_error(tmp_path):
+    exercise = _checks_exercise(tmp_path, [{"type": "bogus"}])
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert success is False
+    assert "invalid [[checks]]" in output
+    assert is_script_error is True
+
+
+def test_run_verify_records_check_timings(tmp_path):
+    from gitgym import metrics
+
+    exercise = _checks_exercise(
+        tmp_path, [{"type": "no_operation"}, {"type": "branch", "name": "x"}]
+    )
+    _verify_with_checks(tmp_path, exercise)
+    (entry,) = metrics.load("checks")
+    assert entry["exercise"] == "01_basics/01_init"
+    assert entry["ok"] is False
+    assert [c["check"] for c in entry["checks"]] == ["no_operation", "branch name=x"]
+    assert [c["ok"] for c in entry["checks"]] == [True, False]
+
+
+def test_run_verify_runs_cheap_checks_first_and_counts_them(tmp_path):
+    from gitgym import checkstats
+
+    exercise = _checks_exercise(
+        tmp_path,
+        [
+            {"type": "message", "matches": "^Fix"},
+            {"type": "branch", "name": "feature"},
+        ],
+    )
+    success, output, _ = _verify_with_checks(tmp_path, exercise)
+    assert success is False
+    assert output.startswith("You are on branch 'main', not 'feature'.")
+    stats = checkstats.exercise_stats("01_basics/01_init")
+    assert stats["branch name=feature"]["runs"] == 1
+    assert stats["branch name=feature"]["failures"] == 1
+    assert "message matches=^Fix" not in stats
+
+
+# --- run_verify: goal digest ---
+
+
+def _goal_exercise(tmp_path: Path, verify: str | None) -> Exercise:
+    """A checks exercise with one commit, its [goal] digest set to that state."""
+    from gitgym.golden import DEFAULT_COVERS
+    from gitgym.runner import goal_digest
+
+    exercise = _checks_exercise(tmp_path, [])
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+    (repo / "a.txt").write_text("a\n")
+    identity = ["-c", "user.name=T", "-c", "user.email=t@example.com"]
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    subprocess.run(["git", *identity, "commit", "-q", "-m", "A"], cwd=repo, check=True)
+    if verify is not None:
+        _write_script(exercise.path / "verify.sh", "#!/usr/bin/env bash\n" + verify)
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        exercise.goal = {"digest": goal_digest(exercise, DEFAULT_COVERS)}
+    return exercise
+
+
+def test_run_verify_goal_digest_match_skips_scripts(tmp_path):
+    exercise = _goal_exercise(tmp_path, "echo 'should not run'\nexit 3\n")
+    assert _verify_with_checks(tmp_path, exercise) == (
+        True,
+        "The repository matches the goal state.",
+        False,
+    )
+
+
+def test_run_verify_goal_digest_mismatch_falls_back_to_script(tmp_path):
+    exercise = _goal_exercise(tmp_path, "echo 'Create branch feature.'\nexit 1\n")
+    subprocess.run(
+        ["git", "branch", "other"],
+        cwd=tmp_path / "workspace" / "01_basics" / "01_init",
+        check=True,
+    )
+    assert _verify_with_checks(tmp_path, exercise) == (
+        False,
+        "Create branch feature.",
+        False,
+    )
+
+
+def test_run_verify_goal_digest_without_other_verifiers(tmp_path):
+    exercise = _goal_exercise(tmp_path, None)
+    assert _verify_with_checks(tmp_path, exercise)[0] is True
+    (
+        tmp_path / "workspace" / "01_basics" / "01_init" / ".git" / "MERGE_HEAD"
+    ).write_text("0" * 40 + "\n")
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert (success, is_script_error) == (False, False)
+    assert "doesn't match the goal state" in output
+
+
+def test_run_verify_invalid_goal_is_script_error(tmp_path):
+    exercise = _goal_exercise(tmp_path, "exit 0\n")
+    exercise.goal = {"digest": "nope"}
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert (success, is_script_error) == (False, True)
+    assert "invalid [goal]" in output
+
+
+# --- run_verify: verify.py ---
+
+
+def _verify_py_exercise(tmp_path: Path, source: str) -> Exercise:
+    exercise = _checks_exercise(tmp_path, [])
+    (exercise.path / "verify.py").write_text(textwrap.dedent(source))
+    return exercise
+
+
+def test_run_verify_calls_verify_py_check(tmp_path):
+    exercise = _verify_py_exercise(
+        tmp_path,
+        """\
+        from gitgym.repo import Result
+
+        def check(repo):
+            branch = repo.head_branch()
+            return Result(branch == "main", f"on {branch}")
+        """,
+    )
+    _write_script(exercise.path / "verify.sh", "#!/usr/bin/env bash\nexit 3\n")
+    assert _verify_with_checks(tmp_path, exercise) == (True, "on main", False)
+
+
+def test_run_verify_py_is_loaded_once_until_changed(tmp_path):
+    exercise = _verify_py_exercise(
+        tmp_path,
+        """\
+        from gitgym.repo import Result
+
+        calls = []
+
+        def check(repo):
+            calls.append(1)
+            return Result(False, f"call {len(calls)}")
+        """,
+    )
+    # Bypass the result cache so that check() is called every time.
+    with mock.patch("gitgym.verifycache.lookup", return_value=None):
+        assert _verify_with_checks(tmp_path, exercise)[1] == "call 1"
+        assert _verify_with_checks(tmp_path, exercise)[1] == "call 2"
+        source = exercise.path / "verify.py"
+        source.write_text(source.read_text() + "\n# edited\n")
+        assert _verify_with_checks(tmp_path, exercise)[1] == "call 1"
+    assert not (exercise.path / "__pycache__").exists()
+
+
+def test_run_verify_py_exception_is_script_error(tmp_path):
+    exercise = _verify_py_exercise(tmp_path, "def check(repo):\n    1 / 0\n")
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert success is False
+    assert "ZeroDivisionError" in output
+    assert is_script_error is True
+
+
+def test_run_verify_py_must_return_result(tmp_path):
+    exercise = _verify_py_exercise(tmp_path, "def check(repo):\n    return True\n")
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert "must return gitgym.repo.Result, not bool" in output
+    assert is_script_error is True
+
+
+def test_run_verify_py_without_check_is_script_error(tmp_path):
+    exercise = _verify_py_exercise(tmp_path, "x = 1\n")
+    success, output, is_script_error = _verify_with_checks(tmp_path, exercise)
+    assert "has no check(repo) function" in output
+    assert is_script_error is True
+
+
+def test_run_verify_checks_run_before_verify_py(tmp_path):
+    exercise = _verify_py_exercise(
+        tmp_path,
+        "from gitgym.repo import Result\n\ndef check(repo):\n"
+        "    return Result(True, 'ok')\n",
+    )
+    exercise.checks = [{"type": "branch", "name": "other"}]
+    assert _verify_with_checks(tmp_path, exercise)[0] is False
+
+
+# --- run_verify: result cache ---
+
+
+def test_run_verify_reuses_result_until_workspace_changes(tmp_path):
+    exercise = _checks_exercise(tmp_path, [])
+    counter = tmp_path / "runs"
+    _write_script(
+        exercise.path / "verify.sh",
+        f"#!/usr/bin/env bash\necho run >> {counter}\n"
+        'test -f "$1/done.txt" || { echo "Not yet."; exit 1; }\n',
+    )
+    repo = tmp_path / "workspace" / "01_basics" / "01_init"
+
+    assert _verify_with_checks(tmp_path, exercise) == (False, "Not yet.", False)
+    assert _verify_with_checks(tmp_path, exercise) == (False, "Not yet.", False)
+    assert counter.read_text().count("run") == 1
+
+    (repo / "done.txt").write_text("yes\n")
+    assert _verify_with_checks(tmp_path, exercise)[0] is True
+    assert counter.read_text().count("run") == 2
+
+
+def test_run_verify_does_not_reuse_script_errors(tmp_path):
+    exercise = _checks_exercise(tmp_path, [])
+    counter = tmp_path / "runs"
+    _write_script(
+        exercise.path / "verify.sh",
+        f"#!/usr/bin/env bash\necho run >> {counter}\nexit 2\n",
+    )
+    _verify_with_checks(tmp_path, exercise)
+    _verify_with_checks(tmp_path, exercise)
+    assert counter.read_text().count("run") == 2
+
+
+def test_run_verify_reruns_when_exercise_changes(tmp_path):
+    exercise = _checks_exercise(tmp_path, [])
+    _write_script(exercise.path / "verify.sh", "#!/usr/bin/env bash\nexit 1\n")
+    assert _verify_with_checks(tmp_path, exercise)[0] is False
+    _write_script(exercise.path / "verify.sh", "#!/usr/bin/env bash\nexit 0\n")
+    assert _verify_with_checks(tmp_path, exercise)[0] is True
+
+
+# --- run_verify: structured check reports ---
+
+
+def test_run_verification_collects_reported_checks(tmp_path):
+    from gitgym import metrics
+    from gitgym.runner import run_verification
+
+    exercise = _checks_exercise(tmp_path, [])
+    _write_script(
+        exercise.path / "verify.sh",
+        textwrap.dedent("""\
+            #!/usr/bin/env bash
+            set -euo pipefail
+            gitgym_total 3
+            gitgym_report exists ok
+            gitgym_report "on branch" fail "Switch to 'feature'."
+            echo "Switch to 'feature'."
+            exit 1
+        """),
+    )
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        result = run_verification(exercise)
+        _, output, _ = run_verify(exercise)
+
+    assert result.success is False
+    assert result.total == 3
+    assert [(c.id, c.passed, c.message) for c in result.checks] == [
+        ("exists", True, ""),
+        ("on branch", False, "Switch to 'feature'."),
+    ]
+    assert all(c.seconds is not None and c.seconds >= 0 for c in result.checks)
+    assert output == "Switch to 'feature'.\n1/3 checks passing"
+    (entry,) = metrics.load("checks")
+    assert [c["check"] for c in entry["checks"]] == ["exists", "on branch"]
+
+
+def test_run_verification_cached_result_keeps_checks(tmp_path):
+    from gitgym.runner import run_verification
+
+    exercise = _checks_exercise(tmp_path, [])
+    _write_script(
+        exercise.path / "verify.sh",
+        "#!/usr/bin/env bash\ngitgym_report only fail nope\nexit 1\n",
+    )
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        first = run_verification(exercise)
+        second = run_verification(exercise)
+    assert first.cached is False
+    assert second.cached is True
+    assert second.checks == first.checks
+
+
+def test_run_verify_without_reports_keeps_plain_output(tmp_path):
+    exercise = _checks_exercise(tmp_path, [])
+    _write_script(
+        exercise.path / "verify.sh", "#!/usr/bin/env bash\necho 'Not yet.'\nexit 1\n"
+    )
+    assert _verify_with_checks(tmp_path, exercise) == (False, "Not yet.", False)
+
+
+# --- async API ---
+
+
+def _verify_exercises(tmp_path: Path, count: int, script: str) -> list[Exercise]:
+    exercises = []
+    for i in range(count):
+        exercise_dir = tmp_path / "exercises" / "01_basics" / f"0{i}_e"
+        exercise_dir.mkdir(parents=True)
+        (tmp_path / "workspace" / "01_basics" / f"0{i}_e").mkdir(parents=True)
+        _write_script(exercise_dir / "verify.sh", "#!/usr/bin/env bash\n" + script)
+        exercises.append(_make_exercise(exercise_dir, name=f"e{i}"))
+    return exercises
+
+
+@contextmanager
+def _patched_dirs(tmp_path: Path):
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", tmp_path / "exercises"),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", tmp_path / "workspace"),
+    ):
+        yield
+
+
+def test_run_verify_async_runs_verifications_concurrently(tmp_path):
+    import asyncio
+    import time
+
+    from gitgym.runner import run_verify_async
+
+    exercises = _verify_exercises(tmp_path, 4, "sleep 0.4\necho done\n")
+
+    async def verify_all():
+        return await asyncio.gather(
+            *(run_verify_async(ex, semaphore=asyncio.Semaphore(4)) for ex in exercises)
+        )
+
+    start = time.monotonic()
+    with _patched_dirs(tmp_path):
+        results = asyncio.run(verify_all())
+    assert time.monotonic() - start < 1.4
+    assert results == [(True, "done", False)] * 4
+
+
+def test_run_verify_async_semaphore_limits_concurrency(tmp_path):
+    import asyncio
+    import time
+
+    from gitgym.runner import run_verify_async
+
+    exercises = _verify_exercises(tmp_path, 4, "sleep 0.3\n")
+
+    async def verify_all():
+        semaphore = asyncio.Semaphore(1)
+        return await asyncio.gather(
+            *(run_verify_async(ex, semaphore=semaphore) for ex in exercises)
+        )
+
+    start = time.monotonic()
+    with _patched_dirs(tmp_path):
+        asyncio.run(verify_all())
+    assert time.monotonic() - start >= 1.2
+
+
+def test_run_verify_async_default_limit(tmp_path):
+    import asyncio
+    import time
+
+    from gitgym.runner import run_verify_async
+
+    exercises = _verify_exercises(tmp_path, 3, "sleep 0.3\n")
+
+    async def verify_all():
+        return await asyncio.gather(*(run_verify_async(ex) for ex in exercises))
+
+    start = time.monotonic()
+    with _patched_dirs(tmp_path), mock.patch("gitgym.runner.ASYNC_CONCURRENCY", 1):
+        asyncio.run(verify_all())
+    assert time.monotonic() - start >= 0.9
+
+
+def test_run_verification_async_timeout_kills_process_group(tmp_path):
+    import asyncio
+    import time
+
+    from gitgym.runner import run_verification_async
+
+    (exercise,) = _verify_exercises(
+        tmp_path, 1, f"(sleep 30; touch {tmp_path}/survivor) &\nsleep 30\n"
+    )
+    start = time.monotonic()
+    with _patched_dirs(tmp_path):
+        result = asyncio.run(run_verification_async(exercise, timeout=0.5))
+    assert time.monotonic() - start < 10
+    assert result.success is False
+    assert result.is_script_error is True
+    assert "did not finish within 0.5 seconds" in result.output
+    time.sleep(0.2)
+    assert not (tmp_path / "survivor").exists()
+
+
+def test_run_verify_async_cancellation_kills_script(tmp_path):
+    import asyncio
+    import os
+
+    from gitgym.runner import run_verify_async
+
+    pid_file = tmp_path / "pid"
+    (exercise,) = _verify_exercises(tmp_path, 1, f"echo $$ > {pid_file}\nsleep 30\n")
+
+    async def cancel_midway():
+        task = asyncio.create_task(run_verify_async(exercise))
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    with _patched_dirs(tmp_path):
+        assert asyncio.run(cancel_midway()) is True
+    pid = int(pid_file.read_text())
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        pass
+    else:
+        raise AssertionError("verify.sh is still running")
+
+
+def test_run_setup_async_timeout_overrides_exercise_setting(tmp_path, capsys):
+    import asyncio
+
+    from gitgym.runner import run_setup_async
+
+    exercise = _slow_setup_exercise(tmp_path, 60)
+    with _patched_dirs(tmp_path):
+        assert asyncio.run(run_setup_async(exercise, timeout=0.5)) is False
+    assert "did not finish within 0.5 seconds" in capsys.readouterr().out
+
+
+def test_run_setup_async_provisions_workspaces_concurrently(tmp_path):
+    import asyncio
+
+    from gitgym.runner import run_setup_async
+
+    exercises = []
+    for i in range(3):
+        exercise_dir = tmp_path / "exercises" / "01_basics" / f"0{i}_e"
+        exercise_dir.mkdir(parents=True)
+        _write_script(
+            exercise_dir / "setup.sh", '#!/usr/bin/env bash\ntouch "$1/ready"\n'
+        )
+        exercises.append(_make_exercise(exercise_dir))
+
+    async def setup_all():
+        return await asyncio.gather(*(run_setup_async(ex) for ex in exercises))
+
+    with _patched_dirs(tmp_path):
+        assert asyncio.run(setup_all()) == [True, True, True]
+    for i in range(3):
+        assert (tmp_path / "workspace" / "01_basics" / f"0{i}_e" / "ready").exists()
+
+
+# --- run_verify: bash workers ---
+
+
+def test_verify_workers_reuse_one_bash_per_workspace(tmp_path):
+    from gitgym.runner import _BASH_WORKERS, run_verification, verify_workers
+
+    (exercise,) = _verify_exercises(
+        tmp_path,
+        1,
+        'cd "$1"\ngitgym_total 2\ngitgym_report a ok\necho "$$ $(ls | wc -l)"\n'
+        "exit 1\n",
+    )
+    workspace = tmp_path / "workspace" / "01_basics" / "00_e"
+    with _patched_dirs(tmp_path):
+        with verify_workers():
+            first = run_verification(exercise)
+            (workspace / "change").touch()
+            second = run_verification(exercise)
+        # Outside the block, verify.sh is its own process again.
+        (workspace / "change2").touch()
+        third = run_verification(exercise)
+
+    assert first.output.split()[1] == "0"
+    assert second.output.split()[1] == "1"
+    assert first.output.split()[0] == second.output.split()[0]
+    assert third.output.split()[0] != second.output.split()[0]
+    assert second.progress == "1/2 checks passing"
+    assert _BASH_WORKERS._workers == {}
+
+
+def test_verify_workers_fall_back_for_other_interpreters(tmp_path):
+    from gitgym.runner import verify_workers
+
+    (exercise,) = _verify_exercises(tmp_path, 1, "")
+    _write_script(exercise.path / "verify.sh", "#!/bin/sh\necho plain sh\nexit 0\n")
+    with _patched_dirs(tmp_path), verify_workers():
+        success, output, is_script_error = run_verify(exercise)
+    assert (success, output, is_script_error) == (True, "plain sh", False)
+
+
+def test_verify_workers_report_syntax_errors_like_bash(tmp_path):
+    from gitgym.runner import verify_workers
+
+    (exercise,) = _verify_exercises(tmp_path, 1, "if then\n")
+    with _patched_dirs(tmp_path), verify_workers():
+        success, output, is_script_error = run_verify(exercise)
+    assert success is False
+    assert is_script_error is True
+    assert "syntax error" in output
+
+
+def test_verify_workers_timeout_kills_the_script(tmp_path):
+    import asyncio
+    import os
+    import time
+
+    from gitgym.runner import run_verify_async, verify_workers
+
+    pid_file = tmp_path / "pid"
+    (exercise,) = _verify_exercises(
+        tmp_path, 1, f"sleep 30 &\necho $! > {pid_file}\nwait\n"
+    )
+    with _patched_dirs(tmp_path), verify_workers():
+        success, output, is_script_error = asyncio.run(
+            run_verify_async(exercise, timeout=0.5)
+        )
+    assert (success, is_script_error) == (False, True)
+    assert "did not finish within 0.5 seconds" in output
+    pid = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        raise AssertionError("the script's child is still running")
+
+
+# --- run_verify: timeout and explain ---
+
+
+def _git_workspace(tmp_path: Path) -> Path:
+    workspace = tmp_path / "workspace" / "01_basics" / "00_e"
+    subprocess.run(["git", "init", "-q", "-b", "main", workspace], check=True)
+    return workspace
+
+
+def test_run_verify_stops_at_the_exercise_verify_timeout(tmp_path):
+    import time
+
+    (exercise,) = _verify_exercises(tmp_path, 1, 'cd "$1"\ngit commit --allow-empty\n')
+    _git_workspace(tmp_path)
+    # An editor that never returns, as a learner's vim would without a terminal.
+    exercise.environment = {
+        "verify_timeout": 0.5,
+        "variables": {
+            "GIT_EDITOR": "sleep 30 #",
+            "GIT_AUTHOR_NAME": "Test",
+            "GIT_AUTHOR_EMAIL": "test@example.com",
+            "GIT_COMMITTER_NAME": "Test",
+            "GIT_COMMITTER_EMAIL": "test@example.com",
+        },
+    }
+    start = time.monotonic()
+    with _patched_dirs(tmp_path):
+        success, output, is_script_error = run_verify(exercise)
+    assert time.monotonic() - start < 10
+    assert (success, is_script_error) == (False, True)
+    assert "within 0.5 seconds and was stopped while running verify.sh." in output
+    assert "Still running: " in output
+    assert "sleep 30" in output
+
+
+def test_timeout_names_the_check_that_hung(tmp_path):
+    import asyncio
+    import time
+
+    from gitgym.runner import run_verification_async
+
+    (exercise,) = _verify_exercises(tmp_path, 1, "exit 0\n")
+    exercise.checks = [{"type": "branch", "name": "main"}]
+    _git_workspace(tmp_path)
+
+    def slow_branch(repo, name):
+        time.sleep(3)
+        return ""
+
+    start = time.monotonic()
+    with (
+        _patched_dirs(tmp_path),
+        mock.patch.dict("gitgym.checks._CHECKS", {"branch": slow_branch}),
+    ):
+        result = asyncio.run(run_verification_async(exercise, timeout=0.3))
+    # Returns at the timeout, without waiting for the check to finish.
+    assert time.monotonic() - start < 2
+    assert result.is_script_error is True
+    assert "while running [[checks]] > branch name=main." in result.output
+
+
+def test_timeout_kills_the_git_command_verify_py_is_stuck_in(tmp_path):
+    import time
+
+    (exercise,) = _verify_exercises(tmp_path, 1, "exit 0\n")
+    (exercise.path / "verify.py").write_text(
+        "from gitgym.repo import Result\n\n"
+        "def check(repo):\n"
+        '    repo.git("commit", "--allow-empty")\n'
+        '    return Result(True, "committed")\n'
+    )
+    _git_workspace(tmp_path)
+    exercise.environment = {
+        "verify_timeout": 0.5,
+        "variables": {
+            "GIT_EDITOR": "sleep 31 #",
+            "GIT_AUTHOR_NAME": "Test",
+            "GIT_AUTHOR_EMAIL": "test@example.com",
+            "GIT_COMMITTER_NAME": "Test",
+            "GIT_COMMITTER_EMAIL": "test@example.com",
+        },
+    }
+    start = time.monotonic()
+    with _patched_dirs(tmp_path):
+        success, output, is_script_error = run_verify(exercise)
+    assert time.monotonic() - start < 10
+    assert (success, is_script_error) == (False, True)
+    assert "within 0.5 seconds and was stopped while running verify.py." in output
+    assert "Still running: git commit --allow-empty" in output
+    assert "sleep 31" in output
+    ps = subprocess.run(["ps", "-A", "-o", "args="], capture_output=True, text=True)
+    assert "sleep 31" not in ps.stdout
+
+
+def test_explain_times_each_step_and_counts_processes(tmp_path):
+    from gitgym.runner import run_verification
+
+    (exercise,) = _verify_exercises(
+        tmp_path,
+        1,
+        'cd "$1"\ngit rev-parse --git-dir >/dev/null\ngit status --short\nexit 1\n',
+    )
+    exercise.checks = [{"type": "branch", "name": "main"}]
+    _git_workspace(tmp_path)
+    with _patched_dirs(tmp_path):
+        run_verification(exercise)
+        result = run_verification(exercise, explain=True)
+
+    assert result.cached is False
+    assert [step.name for step in result.steps] == [
+        "fingerprint",
+        "[[checks]]",
+        "verify.sh",
+    ]
+    fingerprint, checks, script = result.steps
+    assert fingerprint.processes == 0
+    assert checks.detail == "goal met"
+    assert [(s.name, s.detail) for s in checks.steps] == [
+        ("branch name=main", "passed")
+    ]
+    assert script.detail == "exit 1"
+    assert [s.name for s in script.steps] == [
+        "git rev-parse --git-dir",
+        "git status --short",
+    ]
+    # bash itself, then the two git commands it ran
+    assert script.processes == 3
+    assert all(s.seconds is not None and s.seconds >= 0 for s in result.steps)
+
+
+def test_explain_is_off_by_default(tmp_path):
+    from gitgym.runner import run_verification
+
+    (exercise,) = _verify_exercises(tmp_path, 1, "exit 0\n")
+    with _patched_dirs(tmp_path):
+        assert run_verification(exercise).steps == []
@@ -0,0 +1,195 @@
+import dataclasses
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gitgym.gitpool import GitBatch
+from gitgym.repo import Repo
+from gitgym.snapshot import SnapshotError, take
+
+
+def _env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(),
+    ).stdout.strip()
+
+
+def _commit(repo: Path, name: str, content: str, message: str) -> str:
+    (repo / name).write_text(content)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _commit(path, "a.txt", "a\n", "First")
+    _commit(path, "b.txt", "b\n", "Second\n\nWith a body.")
+    return path
+
+
+def test_refs_and_head(path):
+    head = _git(path, "rev-parse", "HEAD")
+    _git(path, "branch", "feature", "HEAD~1")
+    _git(path, "tag", "light")
+    _git(path, "tag", "-a", "v1", "-m", "Release", "HEAD~1")
+
+    snapshot = take(path, _env())
+
+    assert snapshot.head == head
+    assert snapshot.head_branch == "main"
+    assert snapshot.branches == {
+        "main": head,
+        "feature": _git(path, "rev-parse", "HEAD~1"),
+    }
+    assert snapshot.tags == {"light": head, "v1": _git(path, "rev-parse", "HEAD~1")}
+    v1 = snapshot.refs["refs/tags/v1"]
+    assert v1.type == "tag"
+    assert v1.oid == _git(path, "rev-parse", "v1")
+    assert snapshot.resolve("v1") == v1.oid
+    assert snapshot.commit("v1").subject == "First"
+    assert snapshot.resolve("refs/heads/feature") == snapshot.resolve("feature")
+    assert snapshot.resolve("HEAD~1") is None
+    assert snapshot.resolve("nope") is None
+
+
+def test_commits_match_the_object_store(path):
+    snapshot = take(path, _env())
+    batch = GitBatch(path)
+    try:
+        assert len(snapshot.commits) == 2
+        for oid, commit in snapshot.commits.items():
+            assert batch.commit(oid) == commit
+    finally:
+        batch.close()
+    assert snapshot.commit("HEAD").message == "Second\n\nWith a body.\n"
+
+
+def test_log_walks_the_snapshot(path):
+    _git(path, "switch", "-q", "-c", "feature")
+    _commit(path, "c.txt", "c\n", "Third")
+    _commit(path, "d.txt", "d\n", "Fourth")
+
+    snapshot = take(path, _env())
+
+    assert [c.subject for c in snapshot.log("feature", ["main"])] == [
+        "Fourth",
+        "Third",
+    ]
+    assert len(snapshot.log("HEAD")) == 4
+    assert snapshot.log("nope") == []
+
+
+def test_log_can_be_limited_to_revisions(path):
+    _git(path, "switch", "-q", "-c", "feature")
+    _commit(path, "c.txt", "c\n", "Third")
+    _git(path, "switch", "-q", "main")
+
+    snapshot = take(path, _env(), revs=["main"])
+
+    assert {c.subject for c in snapshot.commits.values()} == {"First", "Second"}
+
+
+def test_status(path):
+    (path / "a.txt").write_text("changed\n")
+    (path / "new.txt").write_text("new\n")
+    (path / "staged.txt").write_text("staged\n")
+    _git(path, "add", "staged.txt")
+    _git(path, "mv", "b.txt", "renamed.txt")
+    (path / "dir").mkdir()
+    (path / "dir" / "nested.txt").write_text("n\n")
+
+    snapshot = take(path, _env())
+
+    assert not snapshot.clean
+    assert sorted(snapshot.staged) == ["renamed.txt", "staged.txt"]
+    assert snapshot.unstaged == ["a.txt"]
+    assert sorted(snapshot.untracked) == ["dir/nested.txt", "new.txt"]
+    (renamed,) = [e for e in snapshot.status if e.kind == "2"]
+    assert (renamed.path, renamed.orig_path) == ("renamed.txt", "b.txt")
+
+
+def test_conflict_and_operation(path):
+    _git(path, "switch", "-q", "-c", "other", "HEAD~1")
+    _commit(path, "b.txt", "theirs\n", "Other b")
+    _git(path, "switch", "-q", "main")
+    subprocess.run(
+        ["git", "merge", "-q", "other"], cwd=path, capture_output=True, env=_env()
+    )
+
+    snapshot = take(path, _env())
+
+    assert snapshot.operation == "merge"
+    assert snapshot.conflicted == ["b.txt"]
+
+
+def test_detached_and_unborn_head(path, tmp_path):
+    _git(path, "switch", "-q", "--detach", "HEAD~1")
+    snapshot = take(path, _env())
+    assert snapshot.head_branch is None
+    assert snapshot.head == _git(path, "rev-parse", "HEAD")
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    _git(empty, "init", "-q", "-b", "main")
+    snapshot = take(empty, _env())
+    assert snapshot.head is None
+    assert snapshot.head_branch == "main"
+    assert snapshot.refs == {}
+    assert snapshot.commits == {}
+    assert snapshot.clean
+
+
+def test_snapshot_is_immutable(path):
+    snapshot = take(path, _env())
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.head = None
+    with pytest.raises(TypeError):
+        snapshot.refs["refs/heads/x"] = snapshot.refs["refs/heads/main"]
+    with pytest.raises(TypeError):
+        snapshot.commits["x"] = None
+
+
+def test_taking_a_snapshot_leaves_the_index_alone(path):
+    index = path / ".git" / "index"
+    os.utime(path / "a.txt", (0, 0))
+    before = index.stat().st_mtime_ns
+    take(path, _env())
+    assert index.stat().st_mtime_ns == before
+
+
+def test_not_a_repository(tmp_path):
+    with pytest.raises(SnapshotError, match="for-each-ref"):
+        take(tmp_path, {**_env(), "GIT_CEILING_DIRECTORIES": str(tmp_path.parent)})
+
+
+def test_repo_snapshot_is_taken_once_per_call(path):
+    batch = GitBatch(path)
+    try:
+        repo = Repo(path, batch, _env())
+        first = repo.snapshot()
+        _commit(path, "c.txt", "c\n", "Third")
+        assert repo.snapshot() is first
+        assert Repo(path, batch, _env()).snapshot().commit("HEAD").subject == "Third"
+    finally:
+        batch.close()
@@ -0,0 +1,47 @@
+from gitgym.verification import CheckReport, Verification, parse_reports
+
+
+def test_parse_reports_reads_checks_and_total():
+    data = (
+        b'{"total": 3}\n'
+        b'{"id": "branch", "ok": true, "message": "On main.", "seconds": 0.25}\n'
+        b'{"id": "commit", "ok": false}\n'
+    )
+    checks, total = parse_reports(data)
+    assert total == 3
+    assert checks == [
+        CheckReport("branch", True, "On main.", 0.25),
+        CheckReport("commit", False, "", None),
+    ]
+
+
+def test_parse_reports_skips_malformed_lines():
+    data = (
+        b"not json\n"
+        b"[1, 2]\n"
+        b'{"id": "no-ok"}\n'
+        b'{"id": 3, "ok": true}\n'
+        b'{"id": "x", "ok": "yes"}\n'
+        b'{"total": true}\n'
+        b'{"id": "good", "ok": true, "seconds": "slow"}\n'
+    )
+    checks, total = parse_reports(data)
+    assert total is None
+    assert checks == [CheckReport("good", True, "", None)]
+
+
+def test_parse_reports_empty():
+    assert parse_reports(b"") == ([], None)
+
+
+def test_progress_counts_against_announced_total():
+    checks = [CheckReport("a", True), CheckReport("b", False)]
+    assert Verification(False, "", False, checks, total=4).progress == (
+        "1/4 checks passing"
+    )
+    assert Verification(False, "", False, checks).progress == "1/2 checks passing"
+    # A total smaller than what was reported is ignored.
+    assert Verification(False, "", False, checks, total=1).progress == (
+        "1/2 checks passing"
+    )
+    assert Verification(True, "", False).progress == ""
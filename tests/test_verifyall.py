@@ -0,0 +1,170 @@
+import stat
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from gitgym.exercise import Exercise
+from gitgym.runner import run_verification
+from gitgym.verifyall import verify_all
+
+
+def _make_exercise(exercises_dir: Path, topic: str, name: str, script: str) -> Exercise:
+    exercise_dir = exercises_dir / topic / name
+    exercise_dir.mkdir(parents=True)
+    verify = exercise_dir / "verify.sh"
+    verify.write_text("#!/usr/bin/env bash\nset -euo pipefail\n" + script)
+    verify.chmod(verify.stat().st_mode | stat.S_IEXEC)
+    return Exercise(
+        name=name,
+        topic="Test",
+        title=name,
+        description="",
+        goal_summary="",
+        hints=[],
+        path=exercise_dir,
+    )
+
+
+def _provision(workspace_dir: Path, exercise: Exercise) -> None:
+    workspace = workspace_dir / exercise.path.parent.name / exercise.path.name
+    workspace.mkdir(parents=True)
+    (workspace / "file.txt").write_text("content\n")
+
+
+def _run(exercises, workspace_dir, **kwargs):
+    exercises_dir = exercises[0].path.parent.parent
+    with (
+        mock.patch("gitgym.runner.EXERCISES_DIR", exercises_dir),
+        mock.patch("gitgym.runner.WORKSPACE_DIR", workspace_dir),
+        mock.patch("gitgym.verifyall.WORKSPACE_DIR", workspace_dir),
+    ):
+        return verify_all(exercises, **kwargs)
+
+
+def test_verify_all_verifies_provisioned_workspaces(tmp_path):
+    workspace = tmp_path / "ws"
+    passing = _make_exercise(tmp_path / "ex", "01_t", "01_pass", "exit 0\n")
+    failing = _make_exercise(
+        tmp_path / "ex", "01_t", "02_fail", 'echo "Not yet."\nexit 1\n'
+    )
+    broken = _make_exercise(tmp_path / "ex", "01_t", "03_broken", "exit 3\n")
+    missing = _make_exercise(tmp_path / "ex", "01_t", "04_missing", "exit 0\n")
+    for exercise in (passing, failing, broken):
+        _provision(workspace, exercise)
+
+    results = _run([passing, failing, broken, missing], workspace, jobs=2)
+
+    assert [r.key for r in results] == [
+        "01_t/01_pass",
+        "01_t/02_fail",
+        "01_t/03_broken",
+    ]
+    assert [r.ok for r in results] == [True, False, False]
+    assert [r.is_script_error for r in results] == [False, False, True]
+    assert results[1].output == "Not yet."
+
+
+def test_verify_all_skips_empty_workspaces(tmp_path):
+    workspace = tmp_path / "ws"
+    exercise = _make_exercise(tmp_path / "ex", "01_t", "01_e", "exit 0\n")
+    (workspace / "01_t" / "01_e").mkdir(parents=True)
+
+    assert _run([exercise], workspace) == []
+
+
+def test_verify_all_reports_check_progress(tmp_path):
+    workspace = tmp_path / "ws"
+    exercise = _make_exercise(
+        tmp_path / "ex",
+        "01_t",
+        "01_e",
+        "gitgym_total 2\ngitgym_report first ok\ngitgym_report second fail\nexit 1\n",
+    )
+    _provision(workspace, exercise)
+
+    (result,) = _run([exercise], workspace)
+    assert result.progress == "1/2 checks passing"
+
+
+def test_verify_all_runs_in_parallel(tmp_path):
+    workspace = tmp_path / "ws"
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "sleep 0.3\n")
+        for i in range(4)
+    ]
+    for exercise in exercises:
+        _provision(workspace, exercise)
+
+    start = time.perf_counter()
+    results = _run(exercises, workspace, jobs=4)
+    assert time.perf_counter() - start < 1.0
+    assert all(r.ok for r in results)
+
+
+def test_verify_all_bounds_concurrency(tmp_path):
+    workspace = tmp_path / "ws"
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(6)
+    ]
+    for exercise in exercises:
+        _provision(workspace, exercise)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def counting_verification(exercise):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return run_verification(exercise)
+
+    with mock.patch(
+        "gitgym.verifyall.run_verification", side_effect=counting_verification
+    ):
+        results = _run(exercises, workspace, jobs=2)
+
+    assert peak <= 2
+    assert len(results) == 6
+
+
+def test_verify_all_calls_on_result_for_each_exercise(tmp_path):
+    workspace = tmp_path / "ws"
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(3)
+    ]
+    for exercise in exercises:
+        _provision(workspace, exercise)
+    seen = []
+
+    _run(exercises, workspace, jobs=3, on_result=lambda r: seen.append(r.key))
+
+    assert sorted(seen) == [f"01_t/0{i}_e" for i in range(3)]
+
+
+def test_verify_all_reports_an_exception_as_a_script_error(tmp_path):
+    workspace = tmp_path / "ws"
+    exercises = [
+        _make_exercise(tmp_path / "ex", "01_t", f"0{i}_e", "") for i in range(3)
+    ]
+    for exercise in exercises:
+        _provision(workspace, exercise)
+
+    def flaky_verification(exercise):
+        if exercise.name == "01_e":
+            raise OSError(13, "Permission denied")
+        return run_verification(exercise)
+
+    with mock.patch(
+        "gitgym.verifyall.run_verification", side_effect=flaky_verification
+    ):
+        results = _run(exercises, workspace, jobs=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].is_script_error is True
+    assert "verifying exercise '01_e' failed" in results[1].output
+    assert "Permission denied" in results[1].output
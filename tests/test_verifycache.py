@@ -0,0 +1,125 @@
+import os
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gitgym import verifycache
+from gitgym.verification import CheckReport, Verification
+from gitgym.verifycache import fingerprint
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@x", *args],
+        cwd=repo,
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "a.txt").write_text("a\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "first")
+    return repo
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Move path's mtime into the past, out of the racy window."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_fingerprint_is_stable(repo):
+    assert fingerprint(repo) == fingerprint(repo)
+
+
+def test_fingerprint_ignores_index_stat_refresh(repo):
+    _age(repo / "a.txt")
+    before = fingerprint(repo)
+    # Rewrites the index with fresh stat data but the same entries.
+    _git(repo, "update-index", "--really-refresh")
+    _git(repo, "status")
+    assert fingerprint(repo) == before
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda repo: (repo / "a.txt").write_text("b\n"),
+        lambda repo: (repo / "new.txt").write_text("new\n"),
+        lambda repo: (repo / "a.txt").unlink(),
+        lambda repo: _git(repo, "branch", "feature"),
+        lambda repo: _git(repo, "switch", "-q", "-c", "feature"),
+        lambda repo: _git(repo, "rm", "-q", "--cached", "a.txt"),
+        lambda repo: _git(repo, "config", "alias.st", "status"),
+        lambda repo: _git(repo, "commit", "-q", "--allow-empty", "-m", "second"),
+        lambda repo: (repo / ".git" / "MERGE_HEAD").write_text("x\n"),
+        lambda repo: (repo / ".git" / "rebase-merge").mkdir(),
+    ],
+)
+def test_fingerprint_changes_with_state(repo, change):
+    before = fingerprint(repo)
+    change(repo)
+    assert fingerprint(repo) != before
+
+
+def test_fingerprint_sees_same_size_rewrite_within_racy_window(repo):
+    path = repo / "a.txt"
+    before = fingerprint(repo)
+    st = path.stat()
+    path.write_text("z\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert fingerprint(repo) != before
+
+
+def test_fingerprint_sees_stash_drop(repo):
+    for content in ("x\n", "y\n"):
+        (repo / "a.txt").write_text(content)
+        _git(repo, "stash", "-q")
+    before = fingerprint(repo)
+    # Dropping the older entry leaves refs/stash alone but rewrites the reflog.
+    _git(repo, "stash", "drop", "-q", "stash@{1}")
+    assert fingerprint(repo) != before
+
+
+def test_fingerprint_mixes_in_salt_and_extra_files(repo, tmp_path):
+    assert fingerprint(repo, salt="a") != fingerprint(repo, salt="b")
+    extra = tmp_path / "gitconfig"
+    before = fingerprint(repo, extra=(extra,))
+    extra.write_text("[alias]\n\tst = status\n")
+    assert fingerprint(repo, extra=(extra,)) != before
+
+
+def test_lookup_and_store_round_trip():
+    assert verifycache.lookup("01_basics/01_init", "abc") is None
+    result = Verification(
+        False, "Not yet.", False, [CheckReport("branch", True, "", 0.01)], total=2
+    )
+    verifycache.store("01_basics/01_init", "abc", result)
+    cached = verifycache.lookup("01_basics/01_init", "abc")
+    assert cached == Verification(
+        False,
+        "Not yet.",
+        False,
+        [CheckReport("branch", True, "", 0.01)],
+        total=2,
+        cached=True,
+    )
+    assert verifycache.lookup("01_basics/01_init", "def") is None
+    assert verifycache.lookup("01_basics/02_staging", "abc") is None
+
+
+def test_lookup_ignores_damaged_file(tmp_path):
+    damaged = tmp_path / "verify_cache.json"
+    damaged.write_text("{not json")
+    with mock.patch("gitgym.verifycache.VERIFY_CACHE_FILE", damaged):
+        assert verifycache.lookup("01_basics/01_init", "abc") is None
+        verifycache.store("01_basics/01_init", "abc", Verification(True, "ok", False))
+        assert verifycache.lookup("01_basics/01_init", "abc").success is True